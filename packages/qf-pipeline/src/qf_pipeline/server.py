@@ -14,13 +14,12 @@ Tool naming convention (ADR-007):
 """
 
 import asyncio
-import json
 import subprocess
 import time
 import traceback
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
@@ -34,10 +33,12 @@ from .wrappers import (
     get_supported_types,
     # Validator - used by step2_validate_content
     validate_markdown,
+    # Exporter - used by step4_export
+    ExportPipeline,
     # Errors
     WrapperError,
     # NOTE: RFC-012 - These are now OBSOLETE (replaced by subprocess):
-    # - generate_all_xml, create_qti_package (step4_export uses scripts)
+    # - generate_all_xml, create_qti_package (step4_export uses ExportPipeline)
     # - validate_file, validate_resources, copy_resources (subprocess)
 )
 from .tools import (
@@ -47,6 +48,7 @@ from .tools import (
     get_current_session,
     # Step 0 tools - ADR-015 Flexible Project Initialization
     step0_add_file,
+    step0_add_urls,
     step0_analyze,
     # Step 1 tools - RFC-013 core
     step1_start,
@@ -72,7 +74,9 @@ from .tools import (
     read_project_file,
     write_project_file,
 )
-from .utils.logger import log_action, log_event
+from .utils.logger import LogSpan, log_action, log_event, log_spans
+from .utils.concurrency import run_blocking, run_subprocess
+from .utils.url_fetcher import close_client, is_url
 
 # Create server instance
 server = Server("qf-pipeline")
@@ -148,7 +152,8 @@ async def list_tools() -> List[Tool]:
                 "ADR-015: Add a file to an existing project. "
                 "Can be called multiple times. "
                 "Auto-detects file type and places in correct folder. "
-                "Returns conversion hints if file needs MarkItDown."
+                "Returns conversion hints if file needs MarkItDown. "
+                "URLs (file_path or urls) are fetched concurrently and saved as .md."
             ),
             inputSchema={
                 "type": "object",
@@ -159,7 +164,12 @@ async def list_tools() -> List[Tool]:
                     },
                     "file_path": {
                         "type": "string",
-                        "description": "Path to file to add (local path)",
+                        "description": "Path to file to add (local path or URL)",
+                    },
+                    "urls": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "URLs to fetch into the project (saved as .md in target_folder, default 'materials')",
                     },
                     "file_type": {
                         "type": "string",
@@ -171,7 +181,7 @@ async def list_tools() -> List[Tool]:
                         "description": "Target folder: 'auto', 'questions', 'materials', 'questions/resources'. Default: 'auto'",
                     },
                 },
-                "required": ["project_path", "file_path"],
+                "required": ["project_path"],
             },
         ),
         Tool(
@@ -456,6 +466,10 @@ async def list_tools() -> List[Tool]:
                         "type": "boolean",
                         "description": "Also count markdown files in each folder",
                         "default": False
+                    },
+                    "changed_since": {
+                        "type": "string",
+                        "description": "List markdown files added, changed or removed after this time (ISO 8601, e.g. 2026-03-01T09:00:00, or Unix timestamp)"
                     }
                 }
             },
@@ -908,10 +922,37 @@ async def handle_step0_add_file(arguments: dict) -> List[TextContent]:
             text="Fel: project_path krävs. Ange sökväg till projektmappen."
         )]
 
+    urls = list(arguments.get("urls") or [])
+    if file_path and is_url(file_path):
+        urls.insert(0, file_path)
+        file_path = None
+
+    if urls and not file_path:
+        target_folder = arguments.get("target_folder", "auto")
+        result = await step0_add_urls(
+            project_path=project_path,
+            urls=urls,
+            target_folder="materials" if target_folder == "auto" else target_folder,
+        )
+        if "error" in result:
+            return [TextContent(
+                type="text",
+                text=f"❌ Fel: {result['error'].get('message', 'Okänt fel')}"
+            )]
+        lines = ["✅ URL:ER HÄMTADE" if result["success"] else "❌ INGA URL:ER KUNDE HÄMTAS", ""]
+        for added in result["files_added"]:
+            lines.append(f"✓ {added['url']} → {added['copied_to']}")
+        for failed in result["failed"]:
+            lines.append(f"✗ {failed['url']}: {failed['error']}")
+        lines.append("")
+        lines.append(result["message"])
+        lines.append("Om NEJ till fler filer: Kör step0_analyze för att fortsätta")
+        return [TextContent(type="text", text="\n".join(lines))]
+
     if not file_path:
         return [TextContent(
             type="text",
-            text="Fel: file_path krävs. Ange sökväg till filen som ska läggas till."
+            text="Fel: file_path eller urls krävs. Ange sökväg till filen som ska läggas till."
         )]
 
     result = await step0_add_file(
@@ -924,7 +965,7 @@ async def handle_step0_add_file(arguments: dict) -> List[TextContent]:
     if result.get("success"):
         file_info = result.get("file_added", {})
         lines = [
-            "✅ FIL TILLAGD",
+            "✅ FILEN FINNS REDAN I PROJEKTET" if result.get("already_added") else "✅ FIL TILLAGD",
             "",
             f"Original: {file_info.get('original')}",
             f"Kopierad till: {file_info.get('copied_to')}",
@@ -1169,12 +1210,11 @@ async def handle_step2_validate(arguments: dict) -> List[TextContent]:
         )
 
     try:
-        # Run step1_validate.py via subprocess (RFC-012)
-        result = subprocess.run(
+        # Run step1_validate.py via subprocess (RFC-012), without blocking
+        # the event loop. The process is killed if the call is cancelled.
+        result = await run_subprocess(
             ['python3', 'scripts/step1_validate.py', str(file_path), '--verbose'],
             cwd=qti_core_path,
-            capture_output=True,
-            text=True,
             timeout=60
         )
 
@@ -1399,7 +1439,8 @@ async def handle_step3_autofix(arguments: dict) -> List[TextContent]:
     try:
         if content:
             # Fix content string
-            result, fixed_content = autofix_content(
+            result, fixed_content = await run_blocking(
+                autofix_content,
                 content,
                 max_rounds=max_rounds,
                 project_path=project_path
@@ -1453,7 +1494,8 @@ async def handle_step3_autofix(arguments: dict) -> List[TextContent]:
                     text=f"Error: File not found: {file_path}"
                 )]
 
-            result = autofix_file(
+            result = await run_blocking(
+                autofix_file,
                 input_path,
                 output_path=input_path if save else None,
                 max_rounds=max_rounds,
@@ -1462,6 +1504,13 @@ async def handle_step3_autofix(arguments: dict) -> List[TextContent]:
 
             # Log summary if session active (detailed logs in step3_iterations.jsonl)
             if project_path:
+                # Timing of each validate → fix round
+                log_spans(
+                    str(project_path),
+                    session.session_id if session else "",
+                    "step3_autofix",
+                    result.span
+                )
                 log_event(
                     str(project_path),
                     session.session_id if session else "",
@@ -1557,14 +1606,44 @@ async def handle_pipeline_route(arguments: dict) -> List[TextContent]:
 # Step 4: Export
 # =============================================================================
 
+# Per-step time limits in seconds (same limits the RFC-012 subprocesses had)
+STEP_TIMEOUTS = {
+    'validate': 60,
+    'create_folder': 30,
+    'copy_resources': 60,
+    'generate_xml': 120,
+    'create_zip': 60,
+}
+
+# Quiz folder -> lock held while an export writes to it, including a step
+# that timed out or was cancelled but has not stopped yet
+_export_locks: Dict[str, asyncio.Lock] = {}
+
+
+def _export_lock(quiz_dir: Path) -> asyncio.Lock:
+    """Lock serialising exports into the same quiz folder."""
+    return _export_locks.setdefault(str(quiz_dir), asyncio.Lock())
+
+
+async def _wait_for_step(step: asyncio.Future) -> None:
+    """Wait for an abandoned pipeline step to reach its cancel checkpoint."""
+    try:
+        await asyncio.shield(step)
+    except Exception:
+        pass
+
+
 async def handle_step4_export(arguments: dict) -> List[TextContent]:
     """
-    Handle step4_export - export to QTI package using ALL 5 scripts sequentially.
+    Handle step4_export - export to QTI package running ALL 5 steps in-process.
 
-    RFC-012: Run actual scripts instead of wrappers to guarantee:
+    RFC-012: The export must behave exactly like the scripts:
     1. apply_resource_mapping() is called (fixes critical image path bug)
     2. Consistency with manual terminal workflow
     3. Scripts = source of truth
+
+    ExportPipeline shares its step code with the scripts and writes the same
+    files, but parses the markdown once and avoids five interpreter starts.
     """
     session = get_current_session()
     start_time = time.time()
@@ -1644,50 +1723,42 @@ async def handle_step4_export(arguments: dict) -> List[TextContent]:
                 "output_dir": str(output_dir),
                 "output_name": quiz_name,
                 "language": language,
-                "method": "subprocess"
+                "method": "in_process"
             }
         )
 
-    # Scripts to run sequentially
-    # NOTE: step3/4/5 need explicit --quiz-dir because they can't auto-detect
-    # when output is outside qti-core/output/ (which is where they look by default)
-    scripts = [
-        {
-            'name': 'step1_validate.py',
-            'args': [str(file_path), '--verbose'],
-            'description': 'Validerar markdown format',
-            'timeout': 60
-        },
-        {
-            'name': 'step2_create_folder.py',
-            'args': [str(file_path), '--output-dir', str(output_dir), '--output-name', quiz_name],
-            'description': 'Skapar output-struktur',
-            'timeout': 30
-        },
-        {
-            'name': 'step3_copy_resources.py',
-            'args': ['--markdown-file', str(file_path), '--quiz-dir', str(quiz_dir), '--verbose'],
-            'description': 'Kopierar och byter namn pa resurser',
-            'timeout': 60
-        },
-        {
-            'name': 'step4_generate_xml.py',
-            'args': ['--markdown-file', str(file_path), '--quiz-dir', str(quiz_dir), '--language', language, '--verbose'],
-            'description': 'Genererar QTI XML-filer (+ apply_resource_mapping)',
-            'timeout': 120
-        },
-        {
-            'name': 'step5_create_zip.py',
-            'args': ['--quiz-dir', str(quiz_dir), '--output-name', f"{quiz_name}.zip", '--verbose'],
-            'description': 'Skapar QTI-paket (ZIP)',
-            'timeout': 60
-        }
-    ]
+    # Stage timings (parse, resources, XML per type, manifest, zip) are
+    # logged as span_end events nested under this span
+    export_span = LogSpan(
+        session.project_path if session else None,
+        session.session_id if session else "",
+        "step4_export",
+        "export",
+        data={"file": file_path, "output_name": quiz_name}
+    ).start()
+
+    # Steps run in-process by ExportPipeline: the markdown file is parsed
+    # once and the questions, resource mapping and XML stay in memory.
+    # Each step writes the same files as its script in qti-core/scripts/.
+    pipeline = ExportPipeline(
+        markdown_file=file_path,
+        output_dir=output_dir,
+        quiz_name=quiz_name,
+        language=language,
+        verbose=True,
+    )
+    step_descriptions = {
+        'validate': 'Validerar markdown format',
+        'create_folder': 'Skapar output-struktur',
+        'copy_resources': 'Kopierar och byter namn pa resurser',
+        'generate_xml': 'Genererar QTI XML-filer (+ apply_resource_mapping)',
+        'create_zip': 'Skapar QTI-paket (ZIP)',
+    }
 
     # Collect output
     all_output = []
     all_output.append("=" * 70)
-    all_output.append("QTI EXPORT - SUBPROCESS APPROACH (RFC-012)")
+    all_output.append("QTI EXPORT - IN-PROCESS PIPELINE")
     all_output.append("=" * 70)
     all_output.append(f"Source: {file_path}")
     all_output.append(f"Output: {output_dir}")
@@ -1695,104 +1766,118 @@ async def handle_step4_export(arguments: dict) -> List[TextContent]:
     all_output.append(f"Language: {language}")
     all_output.append("")
 
-    # Run each script
-    for i, script in enumerate(scripts, 1):
-        all_output.append(f"\n{'=' * 70}")
-        all_output.append(f"STEG {i}/5: {script['name']}")
-        all_output.append(f"{script['description']}")
-        all_output.append(f"{'=' * 70}\n")
+    # Run each step (one export per quiz folder at a time)
+    total_steps = len(ExportPipeline.STEPS)
+    async with _export_lock(quiz_dir):
+        for i, (step_name, script_name) in enumerate(ExportPipeline.STEPS, 1):
+            all_output.append(f"\n{'=' * 70}")
+            all_output.append(f"STEG {i}/{total_steps}: {script_name}")
+            all_output.append(f"{step_descriptions[step_name]}")
+            all_output.append(f"{'=' * 70}\n")
+
+            # Steps run on the worker pool so the server keeps answering other
+            # calls. On timeout or client cancellation the pipeline is told to
+            # stop; the step is awaited until it reaches its next checkpoint
+            # (per question or file), so the export lock is only released once
+            # nothing writes to the quiz folder any more.
+            step = asyncio.ensure_future(run_blocking(pipeline.run_step, step_name))
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.shield(step),
+                    timeout=STEP_TIMEOUTS[step_name]
+                )
+            except asyncio.TimeoutError:
+                pipeline.cancel()
+                await _wait_for_step(step)
+                export_span.end(error=f"timeout in {step_name}")
+                all_output.append(
+                    f"\n❌ TIMEOUT i {script_name} (>{STEP_TIMEOUTS[step_name]}s)"
+                )
+                if session:
+                    log_action(
+                        session.project_path,
+                        "step4_export",
+                        f"Timeout in {script_name}: step {step_name}"
+                    )
+                return [TextContent(type="text", text="\n".join(all_output))]
+            except asyncio.CancelledError:
+                pipeline.cancel()
+                await _wait_for_step(step)
+                export_span.end(error=f"cancelled in {step_name}")
+                if session:
+                    log_action(
+                        session.project_path,
+                        "step4_export",
+                        f"Cancelled during {script_name}"
+                    )
+                raise
 
-        try:
-            result = subprocess.run(
-                ['python3', f"scripts/{script['name']}"] + script['args'],
-                cwd=qti_core_path,
-                capture_output=True,
-                text=True,
-                timeout=script['timeout']
-            )
+            export_span.add(result.span)
 
             # Append output
-            all_output.append(result.stdout)
+            all_output.append(result.output)
 
             # Check for errors
-            if result.returncode != 0:
-                all_output.append(f"\n❌ FEL i {script['name']}!")
-                all_output.append(f"\nStderr:\n{result.stderr}")
+            if not result.success:
+                export_span.end(error=f"{step_name} failed")
+                all_output.append(f"\n❌ FEL i {script_name}!")
+                all_output.append(f"\nStderr:\n{result.error_output}")
 
                 # Log error
                 if session:
                     log_action(
                         session.project_path,
                         "step4_export",
-                        f"Error in {script['name']}: exit {result.returncode}"
+                        f"Error in {script_name}: step {step_name} failed"
                     )
 
                 return [TextContent(type="text", text="\n".join(all_output))]
 
-            all_output.append(f"✓ {script['name']} slutford!\n")
-
-        except subprocess.TimeoutExpired:
-            all_output.append(f"\n❌ TIMEOUT i {script['name']} (>{script['timeout']}s)!")
-            return [TextContent(type="text", text="\n".join(all_output))]
-
-        except Exception as e:
-            all_output.append(f"\n❌ EXCEPTION i {script['name']}: {str(e)}")
-            return [TextContent(type="text", text="\n".join(all_output))]
+            all_output.append(f"✓ {script_name} slutford!\n")
 
     duration_ms = int((time.time() - start_time) * 1000)
 
     # Success - update session state
-    question_count = 0
-    zip_path = ""
+    question_count = pipeline.question_count
+    zip_path = pipeline.zip_path or str(output_dir / f"{quiz_name}.zip")
+    zip_file = Path(zip_path)
+    export_span.set(
+        question_count=question_count,
+        bytes_written=await run_blocking(lambda: zip_file.stat().st_size if zip_file.exists() else 0)
+    )
+    export_span.end()
     try:
-        # Read package_info.json to get ZIP path
-        package_info_path = quiz_dir / ".workflow" / "package_info.json"
-
-        if package_info_path.exists():
-            with open(package_info_path) as f:
-                package_info = json.load(f)
-
-            zip_path = package_info.get('zip_path', str(output_dir / f"{quiz_name}.zip"))
-
-            # Try to get question count from xml_files.json
-            xml_files_path = quiz_dir / ".workflow" / "xml_files.json"
-            if xml_files_path.exists():
-                with open(xml_files_path) as f:
-                    xml_info = json.load(f)
-                question_count = xml_info.get('xml_count', 0)
-
-            # Update session
-            if session:
-                session.log_export(zip_path, question_count)
+        if session:
+            session.log_export(zip_path, question_count)
 
-                # Log tool_end (TIER 1)
-                log_event(
-                    project_path=session.project_path,
-                    session_id=session.session_id,
-                    tool="step4_export",
-                    event="tool_end",
-                    level="info",
-                    data={
-                        "success": True,
-                        "question_count": question_count,
-                        "output_file": zip_path,
-                    },
-                    duration_ms=duration_ms
-                )
+            # Log tool_end (TIER 1)
+            log_event(
+                project_path=session.project_path,
+                session_id=session.session_id,
+                tool="step4_export",
+                event="tool_end",
+                level="info",
+                data={
+                    "success": True,
+                    "question_count": question_count,
+                    "output_file": zip_path,
+                },
+                duration_ms=duration_ms
+            )
 
-                # Log export_complete (TIER 2)
-                log_event(
-                    project_path=session.project_path,
-                    session_id=session.session_id,
-                    tool="step4_export",
-                    event="export_complete",
-                    level="info",
-                    data={
-                        "output_file": zip_path,
-                        "question_count": question_count,
-                        "format": "QTI 2.1"
-                    }
-                )
+            # Log export_complete (TIER 2)
+            log_event(
+                project_path=session.project_path,
+                session_id=session.session_id,
+                tool="step4_export",
+                event="export_complete",
+                level="info",
+                data={
+                    "output_file": zip_path,
+                    "question_count": question_count,
+                    "format": "QTI 2.1"
+                }
+            )
 
     except Exception as e:
         all_output.append(f"\n⚠️  Warning: Could not update session state: {e}")
@@ -1823,12 +1908,32 @@ async def handle_list_types() -> List[TextContent]:
 
 async def handle_list_projects(arguments: dict) -> List[TextContent]:
     """Handle list_projects - list configured MQG folders."""
-    from .utils.config import list_projects, ConfigError
+    from .utils.config import list_projects, get_changed_files, ConfigError
 
     include_files = arguments.get("include_files", False)
+    changed_since = arguments.get("changed_since")
+    since = None
+    if changed_since:
+        try:
+            since = float(changed_since)
+        except ValueError:
+            try:
+                since = datetime.fromisoformat(str(changed_since).replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                return [TextContent(
+                    type="text",
+                    text=f"Ogiltig tid for changed_since: {changed_since} (anvand ISO 8601)"
+                )]
 
+    # File counts come from the cached file index; the first call for a
+    # folder still walks it, so keep that off the event loop
     try:
-        result = list_projects(include_files=include_files)
+        result = await run_blocking(list_projects, include_files=include_files)
+        changes = {}
+        if since is not None:
+            for p in result['projects']:
+                if p['exists']:
+                    changes[p['path']] = await run_blocking(get_changed_files, p['path'], since)
     except ConfigError as e:
         return [TextContent(type="text", text=f"Konfigurationsfel: {e}")]
 
@@ -1842,6 +1947,16 @@ async def handle_list_projects(arguments: dict) -> List[TextContent]:
             lines.append(f"     {p['description']}")
         if include_files and p.get('md_file_count') is not None:
             lines.append(f"     Filer: {p['md_file_count']} markdown")
+        if p['path'] in changes:
+            changed = changes[p['path']]['changed']
+            removed = changes[p['path']]['removed']
+            lines.append(f"     Andrade sedan {changed_since}: {len(changed)}, borttagna: {len(removed)}")
+            for f in changed[:10]:
+                lines.append(f"       ~ {f['relative_path']}")
+            for path in removed[:10]:
+                lines.append(f"       - {path}")
+            if len(changed) > 10 or len(removed) > 10:
+                lines.append("       ...")
         lines.append("")
 
     if result['default_output_dir']:
@@ -2731,8 +2846,11 @@ async def handle_step1_apply_fix(arguments: dict) -> List[TextContent]:
 
 async def run_server():
     """Run the MCP server with stdio transport."""
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream, server.create_initialization_options())
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream, server.create_initialization_options())
+    finally:
+        await close_client()
 
 
 def main():
@@ -26,6 +26,13 @@ from .parser import (
     ParsedQuestion,
 )
 
+# Question offsets for step1_review / manual_fix / delete
+from .question_index import (
+    QuestionIndex,
+    QuestionSpan,
+    get_question_index,
+)
+
 # Kept: Decision logging
 from .decision_logger import (
     log_decision,
@@ -46,6 +53,9 @@ __all__ = [
     # Parsing
     'parse_file',
     'ParsedQuestion',
+    'QuestionIndex',
+    'QuestionSpan',
+    'get_question_index',
     # Decision logging
     'log_decision',
     'log_session_start',
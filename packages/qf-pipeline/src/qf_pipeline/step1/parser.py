@@ -1,10 +1,16 @@
 """
 Parse markdown file into individual questions.
 Handles multiple input formats.
+
+parse_file() finds the question headers with one compiled regex over the
+whole file. The questions it returns only hold their position; raw_content
+and detected_type are worked out the first time they are read, so listing
+the questions of a large file does not copy or classify every block.
 """
 
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
 from typing import List, Optional
 
 
@@ -13,10 +19,22 @@ class ParsedQuestion:
     """A parsed question from the source file."""
     question_id: str           # Q001, Q002, etc.
     title: Optional[str]       # Title if present
-    raw_content: str           # Original content
     line_start: int            # Starting line in file
     line_end: int              # Ending line in file
-    detected_type: Optional[str]  # Detected question type
+    # Position of the question in the file content
+    source: str = field(default='', repr=False, compare=False)
+    start: int = 0
+    end: int = 0
+
+    @cached_property
+    def raw_content(self) -> str:
+        """Original content."""
+        return self.source[self.start:self.end]
+
+    @cached_property
+    def detected_type(self) -> Optional[str]:
+        """Detected question type."""
+        return detect_question_type(self.raw_content)
 
 
 # Question delimiters for different formats
@@ -31,6 +49,17 @@ QUESTION_PATTERNS = [
     r'^##\s*(Q\d{3}[A-Z]?)\s*(.*?)$',
 ]
 
+# QUESTION_PATTERNS as one regex over the whole content (tried in the same
+# order; whitespace may not run into the next line)
+_BOUNDARY_RE = re.compile(
+    r'^(?:'
+    r'#[^\S\n]*(?P<qid>Q\d{3}[A-Z]?)'
+    r'|#[^\S\n]*Question[^\S\n]*(?P<number>\d+):?'
+    r'|##[^\S\n]*(?P<alt_qid>Q\d{3}[A-Z]?)'
+    r')[^\S\n]*(?P<title>.*)$',
+    re.MULTILINE | re.IGNORECASE
+)
+
 
 def parse_file(content: str) -> List[ParsedQuestion]:
     """
@@ -42,55 +71,58 @@ def parse_file(content: str) -> List[ParsedQuestion]:
     Returns:
         List of ParsedQuestion objects
     """
-    lines = content.split('\n')
-    questions = []
-
-    # Find all question boundaries
-    boundaries = []  # [(line_num, question_id, title), ...]
-
-    for i, line in enumerate(lines):
-        for pattern in QUESTION_PATTERNS:
-            match = re.match(pattern, line, re.IGNORECASE)
-            if match:
-                q_id = match.group(1)
-                title = match.group(2).strip() if match.group(2) else None
+    # Find all question boundaries: (offset, line_num, question_id, title)
+    boundaries = []
+    line_num = 0
+    counted_to = 0
+
+    for match in _BOUNDARY_RE.finditer(content):
+        number = match.group('number')
+        if number is not None:
+            # Normalize question ID
+            q_id = f"Q{int(number):03d}"
+        else:
+            # Ensure uppercase
+            q_id = (match.group('qid') or match.group('alt_qid')).upper()
+        title = match.group('title').strip() or None
 
-                # Normalize question ID
-                if q_id.isdigit():
-                    q_id = f"Q{int(q_id):03d}"
-                else:
-                    # Ensure uppercase
-                    q_id = q_id.upper()
+        line_num += content.count('\n', counted_to, match.start())
+        counted_to = match.start()
+        boundaries.append((match.start(), line_num, q_id, title))
 
-                boundaries.append((i, q_id, title))
-                break
+    total_lines = line_num + content.count('\n', counted_to) + 1
 
-    # Extract content between boundaries
-    for idx, (line_num, q_id, title) in enumerate(boundaries):
+    questions = []
+    for idx, (offset, line_num, q_id, title) in enumerate(boundaries):
         # End is either next question or end of file
         if idx + 1 < len(boundaries):
-            end_line = boundaries[idx + 1][0]
+            end_line = boundaries[idx + 1][1]
+            # Content ends before the line break that precedes the next header
+            end = boundaries[idx + 1][0] - 1
         else:
-            end_line = len(lines)
-
-        # Extract raw content
-        raw_content = '\n'.join(lines[line_num:end_line])
-
-        # Detect question type
-        detected_type = detect_question_type(raw_content)
+            end_line = total_lines
+            end = len(content)
 
         questions.append(ParsedQuestion(
             question_id=q_id,
             title=title,
-            raw_content=raw_content,
             line_start=line_num + 1,  # 1-indexed
             line_end=end_line,
-            detected_type=detected_type
+            source=content,
+            start=offset,
+            end=end,
         ))
 
     return questions
 
 
+# Patterns used by detect_question_type()
+_TYPE_RE = re.compile(r'(?:\^type|@type:)\s*(\w+)', re.IGNORECASE)
+_TABLE_RE = re.compile(r'\|\s*\w+\s*\|')
+_OPTION_RE = re.compile(r'^(?:[A-F]|\d+)[.)]\s', re.MULTILINE)
+_ANSWER_RE = re.compile(r'(?:answer|svar|rätt).*?([A-F](?:\s*,\s*[A-F])*)', re.IGNORECASE)
+
+
 def detect_question_type(content: str) -> Optional[str]:
     """
     Detect question type from content.
@@ -98,13 +130,13 @@ def detect_question_type(content: str) -> Optional[str]:
     Returns:
         Question type string or None if unclear
     """
-    content_lower = content.lower()
-
     # Explicit type declaration (both Legacy and QFMD syntax)
-    type_match = re.search(r'(?:\^type|@type:)\s*(\w+)', content, re.IGNORECASE)
+    type_match = _TYPE_RE.search(content)
     if type_match:
         return normalize_type(type_match.group(1))
 
+    content_lower = content.lower()
+
     # Infer from content patterns
     if '{{blank' in content_lower or '{{blank-' in content_lower:
         return 'text_entry'
@@ -112,15 +144,14 @@ def detect_question_type(content: str) -> Optional[str]:
     if '{{dropdown' in content_lower or '{{dropdown-' in content_lower:
         return 'inline_choice'
 
-    if re.search(r'\|\s*\w+\s*\|', content):  # Table pattern
+    if _TABLE_RE.search(content):  # Table pattern
         if 'pair' in content_lower or 'match' in content_lower:
             return 'match'
 
     # Check for options/choices
-    if re.search(r'^[A-F][.)]\s', content, re.MULTILINE) or \
-       re.search(r'^\d+[.)]\s', content, re.MULTILINE):
+    if _OPTION_RE.search(content):
         # Has options - but single or multiple?
-        answer_match = re.search(r'(?:answer|svar|rätt).*?([A-F](?:\s*,\s*[A-F])*)', content, re.IGNORECASE)
+        answer_match = _ANSWER_RE.search(content)
         if answer_match:
             answer = answer_match.group(1)
             if ',' in answer:
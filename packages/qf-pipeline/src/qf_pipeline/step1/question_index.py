@@ -0,0 +1,274 @@
+"""
+Question offset index for the Step 1 tools.
+
+step1_review, step1_manual_fix and step1_delete used to re-read the file
+and search it with DOTALL regexes on every call, and deleting ran a global
+str.replace plus several re.sub passes over the whole file. On files with
+1000+ questions that made every call rescan everything.
+
+QuestionIndex scans a file once and records, per question, where its block
+starts and ends (character offsets and lines) and a hash of its content.
+Lookups are dict hits. Replacing or deleting a question splices only its
+span and shifts the offsets of the questions after it.
+
+A block is the text between two boundaries: a separator line (---) or a
+question header (# Q001 / ## Q001 / # Question 1, as in parser.py). YAML
+frontmatter at the top of the file is never part of a block; a leading
+--- block only counts as frontmatter if it is a YAML mapping without a
+question header or ^identifier (a file may also start with a separator).
+The question ID is the block's ^identifier, else an ID in its header.
+
+Indexes are cached per file. Each use re-reads the file and compares it
+with the cached content (reading is cheap; the scan was the cost), so a
+file edited outside the tools is scanned again - even a same-size edit
+within the mtime granularity of a network share - and never overwritten
+with stale content.
+"""
+
+import hashlib
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+# Separator line, or a question header (same formats as parser.QUESTION_PATTERNS)
+_BOUNDARY_RE = re.compile(
+    r'^(?:(?P<sep>---)[ \t]*$|#{1,2}[ \t]*(?:Q\d{3}|Question[ \t]*\d+))',
+    re.MULTILINE | re.IGNORECASE
+)
+_FRONTMATTER_RE = re.compile(r'---[ \t]*\n(?P<yaml>.*?)^---[ \t]*$\n?', re.MULTILINE | re.DOTALL)
+_SEPARATOR_RE = re.compile(r'---[ \t]*(?:\n|\Z)')
+# Separator lines pasted along with a question
+_SEPARATOR_EDGES_RE = re.compile(r'\A---[ \t]*\n|\n---[ \t]*\Z')
+_IDENTIFIER_RE = re.compile(r'\^identifier\s+(\S+)')
+_HEADER_ID_RE = re.compile(r'#.*?(Q\d+|[A-Z]+_[A-Z]+_Q\d+)')
+
+
+@dataclass
+class QuestionSpan:
+    """
+    Location of one question block.
+
+    Attributes:
+        question_id: ^identifier or header ID
+        start: Offset of the first character of the block
+        end: Offset just past the block (next boundary or end of file)
+        line_start: First line of the block (1-indexed)
+        line_end: Last line of the block
+        content_hash: SHA-1 of the block text (stripped)
+    """
+    question_id: str
+    start: int
+    end: int
+    line_start: int
+    line_end: int
+    content_hash: str
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha1(text.strip().encode('utf-8')).hexdigest()
+
+
+def _frontmatter_end(content: str) -> int:
+    """Offset just past the YAML frontmatter (0 if the file has none)."""
+    match = _FRONTMATTER_RE.match(content)
+    if not match:
+        return 0
+    front = match.group('yaml')
+    if _IDENTIFIER_RE.search(front) or any(not m.group('sep') for m in _BOUNDARY_RE.finditer(front)):
+        return 0  # A question after a leading separator
+    try:
+        data = yaml.safe_load(front)
+    except yaml.YAMLError:
+        return 0
+    return match.end() if isinstance(data, dict) else 0
+
+
+def _question_id(block: str) -> Optional[str]:
+    match = _IDENTIFIER_RE.search(block) or _HEADER_ID_RE.search(block)
+    return match.group(1) if match else None
+
+
+class QuestionIndex:
+    """Question blocks of one markdown file, located by ID."""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.spans: List[QuestionSpan] = []
+        self._by_id: Dict[str, QuestionSpan] = {}
+        self._body_start = 0
+        self._build()
+
+    def _build(self) -> None:
+        """Scan the whole content (one pass over the boundaries)."""
+        content = self.content
+        self.spans = []
+        self._by_id = {}
+
+        self._body_start = block_start = _frontmatter_end(content)
+        line = content.count('\n', 0, block_start) + 1
+
+        for match in _BOUNDARY_RE.finditer(content, block_start):
+            boundary = match.start()
+            next_start = boundary
+            if match.group('sep'):
+                newline = content.find('\n', match.end())
+                next_start = len(content) if newline < 0 else newline + 1
+            self._add(block_start, boundary, line)
+            line += content.count('\n', block_start, next_start)
+            block_start = next_start
+        self._add(block_start, len(content), line)
+
+    def _add(self, start: int, end: int, line: int) -> None:
+        block = self.content[start:end]
+        question_id = _question_id(block) if block.strip() else None
+        if question_id is None:
+            return
+        span = QuestionSpan(
+            question_id=question_id,
+            start=start,
+            end=end,
+            line_start=line,
+            line_end=line + block.rstrip('\n').count('\n'),
+            content_hash=_hash(block),
+        )
+        self.spans.append(span)
+        # First occurrence wins, like the old regex search
+        self._by_id.setdefault(question_id, span)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get(self, question_id: str) -> Optional[QuestionSpan]:
+        """
+        Block of a question.
+
+        Falls back to the first block that mentions the ID anywhere (the old
+        lookup did the same for IDs that only appear in a header or text).
+        """
+        span = self._by_id.get(question_id)
+        if span is None:
+            span = next((s for s in self.spans if question_id in self.text(s)), None)
+        return span
+
+    def text(self, span: QuestionSpan) -> str:
+        """Text of a block, without surrounding whitespace."""
+        return self.content[span.start:span.end].strip()
+
+    def questions(self) -> Dict[str, str]:
+        """Question ID -> block text, for every indexed question."""
+        return {qid: self.text(span) for qid, span in self._by_id.items()}
+
+    def replace(self, question_id: str, new_content: str) -> Optional[QuestionSpan]:
+        """
+        Replace a question's block, keeping its separators and blank lines.
+
+        Returns:
+            The updated span, or None if the question is not in the file
+        """
+        span = self.get(question_id)
+        if span is None:
+            return None
+        old = self.content[span.start:span.end]
+        body = _SEPARATOR_EDGES_RE.sub('', new_content.strip()).strip()
+        lead = old[:len(old) - len(old.lstrip())]
+        trail = old[len(old.rstrip()):]
+        new = lead + body + trail
+        new_id = _question_id(new)
+
+        if new_id is None or _BOUNDARY_RE.search(new, len(lead) + 1):
+            # The new content splits the block or drops its ID: scan again
+            start = span.start
+            self.content = self.content[:start] + new + self.content[span.end:]
+            self._build()
+            return next((s for s in self.spans if s.end > start), None)
+
+        self._splice(span.start, span.end, new, keep=span)
+        if new_id != span.question_id:
+            if self._by_id.get(span.question_id) is span:
+                del self._by_id[span.question_id]
+            span.question_id = new_id
+            self._by_id.setdefault(new_id, span)
+        span.line_end = span.line_start + new.rstrip('\n').count('\n')
+        span.content_hash = _hash(new)
+        return span
+
+    def delete(self, question_id: str) -> Optional[QuestionSpan]:
+        """
+        Remove a question's block together with one adjacent separator.
+
+        The separator after the block is removed if there is one, else the
+        one before it (never a frontmatter delimiter).
+
+        Returns:
+            The removed span, or None if the question is not in the file
+        """
+        span = self.get(question_id)
+        if span is None:
+            return None
+        start, end = span.start, span.end
+        after = _SEPARATOR_RE.match(self.content, end)
+        if after:
+            end = after.end()
+        else:
+            # Separator line just before the block (the last question)
+            position = start
+            while position > self._body_start and self.content[position - 1] in ' \t\n':
+                position -= 1
+            line_start = self.content.rfind('\n', 0, position) + 1
+            if line_start >= self._body_start and self.content[line_start:position] == '---':
+                start = line_start
+
+        self._splice(start, end, '', keep=None)
+        self.spans.remove(span)
+        if self._by_id.get(span.question_id) is span:
+            del self._by_id[span.question_id]
+            duplicate = next((s for s in self.spans if s.question_id == span.question_id), None)
+            if duplicate is not None:
+                self._by_id[span.question_id] = duplicate
+        return span
+
+    def _splice(self, start: int, end: int, new: str, keep: Optional[QuestionSpan]) -> None:
+        """Replace content[start:end] and shift the spans that follow."""
+        chars = len(new) - (end - start)
+        lines = new.count('\n') - self.content.count('\n', start, end)
+        self.content = self.content[:start] + new + self.content[end:]
+        for span in self.spans:
+            if span is keep:
+                span.end += chars
+            elif span.start >= end:
+                span.start += chars
+                span.end += chars
+                span.line_start += lines
+                span.line_end += lines
+
+    def save(self, path: Path) -> None:
+        """Write the content back to the file."""
+        Path(path).write_text(self.content, encoding='utf-8')
+
+
+_indexes: Dict[str, QuestionIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_question_index(file_path: Path) -> QuestionIndex:
+    """
+    Index of a markdown file, scanned again only if the file changed.
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    path = Path(file_path).expanduser().resolve()
+    content = path.read_text(encoding='utf-8')
+    key = str(path)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None and index.content == content:
+            return index
+    index = QuestionIndex(content)
+    with _indexes_lock:
+        _indexes[key] = index
+    return index
@@ -11,6 +11,7 @@ from .session import (
 
 from .step0_tools import (
     step0_add_file,
+    step0_add_urls,
     step0_analyze,
 )
 
@@ -64,6 +65,7 @@ __all__ = [
     "set_current_session",
     # Step 0 tools - ADR-015 Flexible Project Initialization
     "step0_add_file",
+    "step0_add_urls",
     "step0_analyze",
     # Step 1 tools - NEW MINIMAL (Vision A)
     "step1_review",
@@ -9,6 +9,7 @@ from typing import Any, Dict, List, Optional
 
 from ..utils.session_manager import SessionManager
 from ..utils.url_fetcher import is_url, fetch_url_to_markdown
+from ..utils.concurrency import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -96,8 +97,11 @@ async def start_session_tool(
         source_file = str(local_path)
         logger.info(f"URL fetched to: {source_file}")
 
+    # create_session copies the source file and materials folder - run it
+    # on the worker pool so large copies don't block the event loop
     manager = SessionManager()
-    result = manager.create_session(
+    result = await run_blocking(
+        manager.create_session,
         output_folder=output_folder,
         source_file=source_file,
         project_name=project_name,
@@ -2,18 +2,22 @@
 
 Provides tools for:
 - step0_add_file: Add files to existing project
+- step0_add_urls: Fetch web pages (concurrently) into an existing project
 - step0_analyze: Analyze project and recommend workflow
 """
 
+import hashlib
 import logging
 import re
 import shutil
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..utils.session_manager import SessionManager, ENTRY_POINT_REQUIREMENTS
-from ..utils.sources import update_sources_yaml
+from ..utils.sources import compact_sources, get_sources_registry, update_sources_yaml
 from ..utils.logger import log_event
+from ..utils.concurrency import run_blocking
+from ..utils.url_fetcher import fetch_many
 from .session import get_current_session, set_current_session
 
 logger = logging.getLogger(__name__)
@@ -68,6 +72,15 @@ def needs_conversion(file_path: Path) -> bool:
     return file_path.suffix.lower() in CONVERTIBLE_EXTENSIONS
 
 
+def file_content_hash(file_path: Path) -> str:
+    """Content hash recorded in sources.yaml ("sha256:<hex>")."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return f"sha256:{digest.hexdigest()}"
+
+
 async def step0_add_file(
     project_path: str,
     file_path: str,
@@ -135,44 +148,62 @@ async def step0_add_file(
     target_dir = project / target_folder
     target_dir.mkdir(parents=True, exist_ok=True)
 
-    # Copy file
-    dest_path = target_dir / source.name
-
-    # Check for existing file
-    if dest_path.exists():
-        # Generate unique name
-        counter = 1
-        stem = source.stem
-        while dest_path.exists():
-            dest_path = target_dir / f"{stem}_{counter}{source.suffix}"
-            counter += 1
-
-    shutil.copy2(source, dest_path)
-
-    # Determine relative path for sources.yaml
-    relative_path = str(dest_path.relative_to(project))
-
-    # Register in sources.yaml
-    source_entry = {
-        "path": relative_path,
-        "type": file_type if file_type != "auto" else detected_type,
-        "location": "local",
-        "metadata": {
-            "original_path": str(source),
-            "added_by": "step0_add_file",
+    # Same content already added to this folder: keep the registered copy
+    content_hash = await run_blocking(file_content_hash, source)
+    existing = get_sources_registry(project).find_hash(content_hash)
+    already_added = (
+        existing is not None
+        and Path(existing["path"]).parent.as_posix() == Path(target_folder).as_posix()
+        and (project / existing["path"]).is_file()
+    )
+
+    if already_added:
+        dest_path = project / existing["path"]
+        relative_path = str(existing["path"])
+        logger.info(f"{source.name} already added as {relative_path}")
+    else:
+        # Copy file
+        dest_path = target_dir / source.name
+
+        # Check for existing file
+        if dest_path.exists():
+            # Generate unique name
+            counter = 1
+            stem = source.stem
+            while dest_path.exists():
+                dest_path = target_dir / f"{stem}_{counter}{source.suffix}"
+                counter += 1
+
+        await run_blocking(shutil.copy2, source, dest_path)
+
+        # Determine relative path for sources.yaml
+        relative_path = str(dest_path.relative_to(project))
+
+        # Register in sources.yaml
+        source_entry = {
+            "path": relative_path,
+            "type": file_type if file_type != "auto" else detected_type,
+            "location": "local",
+            "hash": content_hash,
+            "metadata": {
+                "original_path": str(source),
+                "added_by": "step0_add_file",
+            }
         }
-    }
 
-    # Update sources.yaml
-    try:
-        update_sources_yaml(
-            project,
-            [source_entry],
-            updated_by="qf-pipeline:step0_add_file",
-            append=True
-        )
-    except Exception as e:
-        logger.warning(f"Could not update sources.yaml: {e}")
+        # Update sources.yaml
+        try:
+            update_sources_yaml(
+                project,
+                [source_entry],
+                updated_by="qf-pipeline:step0_add_file",
+                append=True
+            )
+        except Exception as e:
+            logger.warning(f"Could not update sources.yaml: {e}")
+
+        # Keep sources.yaml itself current for tools that read it directly
+        await run_blocking(compact_sources, project)
 
     # Load session if exists
     session = get_current_session()
@@ -210,6 +241,7 @@ async def step0_add_file(
         },
         "needs_conversion": needs_conversion(source),
         "is_resource": is_resource_file(source),
+        "already_added": already_added,
     }
 
     # Add conversion hint
@@ -225,6 +257,8 @@ async def step0_add_file(
         )
     else:
         response["message"] = f"Fil tillagd: {source.name} → {relative_path}"
+    if already_added:
+        response["message"] = f"Filen finns redan i projektet: {source.name} → {relative_path}"
 
     # Add next step hint
     response["next_step"] = "Kör step0_analyze() för att få rekommenderat arbetsflöde."
@@ -232,21 +266,26 @@ async def step0_add_file(
     return response
 
 
-async def step0_analyze(project_path: str) -> Dict[str, Any]:
-    """Analyze project contents and recommend workflow (ADR-015).
+async def step0_add_urls(
+    project_path: str,
+    urls: List[str],
+    target_folder: str = "materials"
+) -> Dict[str, Any]:
+    """Fetch URLs into an existing project and register them as sources.
 
-    Examines what files exist in the project and suggests the appropriate
-    entry point / workflow based on content.
+    Pages are fetched concurrently (fetch_many: shared connection pool and
+    HTTP cache) and saved as markdown in target_folder.
 
     Args:
         project_path: Path to project directory
+        urls: URLs to fetch
+        target_folder: Folder in the project for the fetched files
 
     Returns:
-        dict with analysis results and recommendations
+        dict with success status, fetched files and failed URLs
     """
     project = Path(project_path).resolve()
 
-    # Validate project exists
     if not project.exists():
         return {
             "success": False,
@@ -256,7 +295,80 @@ async def step0_analyze(project_path: str) -> Dict[str, Any]:
             }
         }
 
-    # Analyze project contents
+    results = await fetch_many(urls, project / target_folder)
+
+    files_added = []
+    failed = []
+    source_entries = []
+    for url, (ok, message, local_path) in zip(urls, results):
+        if not ok:
+            failed.append({"url": url, "error": message})
+            continue
+        relative_path = str(local_path.relative_to(project))
+        files_added.append({"url": url, "copied_to": relative_path, "message": message})
+        source_entries.append({
+            "path": relative_path,
+            "type": detect_file_type(local_path),
+            "location": "url",
+            "metadata": {
+                "original_url": url,
+                "added_by": "step0_add_file",
+            }
+        })
+
+    if source_entries:
+        try:
+            update_sources_yaml(
+                project,
+                source_entries,
+                updated_by="qf-pipeline:step0_add_file",
+                append=True
+            )
+        except Exception as e:
+            logger.warning(f"Could not update sources.yaml: {e}")
+        await run_blocking(compact_sources, project)
+
+    session = get_current_session()
+    if session is None:
+        try:
+            session = SessionManager.load_from_path(project_path)
+            set_current_session(session)
+        except Exception:
+            pass
+
+    if session:
+        log_event(
+            project_path=project,
+            session_id=session.session_id,
+            tool="step0_add_file",
+            event="urls_added",
+            level="warn" if failed else "info",
+            data={
+                "urls": len(urls),
+                "fetched": len(files_added),
+                "failed": len(failed),
+                "target_folder": target_folder,
+            }
+        )
+
+    return {
+        "success": bool(files_added),
+        "files_added": files_added,
+        "failed": failed,
+        "message": f"{len(files_added)} av {len(urls)} URL:er hämtade till {target_folder}/",
+        "next_step": "Kör step0_analyze() för att få rekommenderat arbetsflöde.",
+    }
+
+
+def _scan_project(project: Path) -> Dict[str, List[Dict[str, Any]]]:
+    """Scan materials/, questions/ and questions/resources/ (blocking I/O).
+
+    Args:
+        project: Resolved project directory
+
+    Returns:
+        dict with materials, questions, resources and other file lists
+    """
     analysis = {
         "materials": [],
         "questions": [],
@@ -313,17 +425,27 @@ async def step0_analyze(project_path: str) -> Dict[str, Any]:
                         "type": detect_file_type(f),
                     })
 
-    # Determine recommendation
-    has_materials = len(analysis["materials"]) > 0
-    has_questions = len(analysis["questions"]) > 0
-    has_resources = len(analysis["resources"]) > 0
+    return analysis
 
-    # Check if any questions file has QFMD format
+
+def _check_question_files(
+    project: Path,
+    questions: List[Dict[str, Any]]
+) -> Tuple[bool, bool, List[str]]:
+    """Check question files for QFMD markers (blocking I/O).
+
+    Args:
+        project: Resolved project directory
+        questions: File info dicts from _scan_project()
+
+    Returns:
+        (has_qfmd, has_markdown_questions, needs_conversion_files)
+    """
     has_qfmd = False
     has_markdown_questions = False
     needs_conversion_files = []
 
-    for q in analysis["questions"]:
+    for q in questions:
         if q.get("needs_conversion"):
             needs_conversion_files.append(q["name"])
         elif q["type"] == "markdown" and q.get("estimated_questions", 0) > 0:
@@ -337,6 +459,47 @@ async def step0_analyze(project_path: str) -> Dict[str, Any]:
             except Exception:
                 pass
 
+    return has_qfmd, has_markdown_questions, needs_conversion_files
+
+
+async def step0_analyze(project_path: str) -> Dict[str, Any]:
+    """Analyze project contents and recommend workflow (ADR-015).
+
+    Examines what files exist in the project and suggests the appropriate
+    entry point / workflow based on content.
+
+    Args:
+        project_path: Path to project directory
+
+    Returns:
+        dict with analysis results and recommendations
+    """
+    project = Path(project_path).resolve()
+
+    # Validate project exists
+    if not project.exists():
+        return {
+            "success": False,
+            "error": {
+                "type": "project_not_found",
+                "message": f"Projekt hittades inte: {project_path}"
+            }
+        }
+
+    # Scan the project folders off the event loop (rglob and file reads
+    # can take a while on large projects)
+    analysis = await run_blocking(_scan_project, project)
+
+    # Determine recommendation
+    has_materials = len(analysis["materials"]) > 0
+    has_questions = len(analysis["questions"]) > 0
+    has_resources = len(analysis["resources"]) > 0
+
+    # Check if any questions file has QFMD format
+    has_qfmd, has_markdown_questions, needs_conversion_files = await run_blocking(
+        _check_question_files, project, analysis["questions"]
+    )
+
     # Determine recommended flow
     if not has_materials and not has_questions:
         # Empty project
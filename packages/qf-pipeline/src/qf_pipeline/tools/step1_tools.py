@@ -12,13 +12,13 @@ Date: 2026-01-28
 Previous: 947 lines → Now: ~200 lines
 """
 
-import re
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 
 from ..step1.decision_logger import log_decision
 from ..step1.frontmatter import add_frontmatter, remove_frontmatter, update_frontmatter
+from ..step1.question_index import get_question_index
 
 
 # =============================================================================
@@ -45,16 +45,13 @@ async def step1_review(
     if not path.exists():
         return {"success": False, "error": f"File not found: {file_path}"}
 
-    content = path.read_text(encoding='utf-8')
-
-    # Parse questions (simple regex extraction)
-    questions = _extract_questions(content)
+    index = get_question_index(path)
 
     # Build review summary
     result = {
         "success": True,
         "file": str(path),
-        "total_questions": len(questions),
+        "total_questions": len(index),
         "questions_with_errors": [],
         "available_actions": [
             "step1_manual_fix(question_id, new_content) - Provide corrected content",
@@ -73,10 +70,13 @@ async def step1_review(
             error_by_question[qid].append(err)
 
         for qid, q_errors in error_by_question.items():
+            span = index.get(qid)
             result["questions_with_errors"].append({
                 "question_id": qid,
                 "errors": q_errors,
-                "content_preview": _get_question_preview(questions.get(qid, ""))
+                "content_preview": _get_question_preview(index.text(span) if span else ""),
+                "line": span.line_start if span else None,
+                "content_hash": span.content_hash if span else None,
             })
 
     return result
@@ -106,18 +106,14 @@ async def step1_manual_fix(
     if not path.exists():
         return {"success": False, "error": f"File not found: {file_path}"}
 
-    content = path.read_text(encoding='utf-8')
-
-    # Find and replace question
-    old_question = _find_question_by_id(content, question_id)
-    if not old_question:
+    # Find and replace question (only its span is rewritten)
+    index = get_question_index(path)
+    span = index.replace(question_id, new_content)
+    if span is None:
         return {"success": False, "error": f"Question not found: {question_id}"}
 
-    # Replace content
-    new_file_content = content.replace(old_question, new_content)
-
     # Save
-    path.write_text(new_file_content, encoding='utf-8')
+    index.save(path)
 
     # Log decision
     project_path = _get_project_path(path)
@@ -138,6 +134,7 @@ async def step1_manual_fix(
         "question_id": question_id,
         "action": "manual_fix",
         "reason": reason,
+        "line": span.line_start,
         "file": str(path)
     }
 
@@ -164,18 +161,13 @@ async def step1_delete(
     if not path.exists():
         return {"success": False, "error": f"File not found: {file_path}"}
 
-    content = path.read_text(encoding='utf-8')
-
-    # Find question
-    question = _find_question_by_id(content, question_id)
-    if not question:
+    # Remove question (including one adjacent separator)
+    index = get_question_index(path)
+    if index.delete(question_id) is None:
         return {"success": False, "error": f"Question not found: {question_id}"}
 
-    # Remove question (including surrounding separators)
-    new_content = _remove_question(content, question)
-
     # Save
-    path.write_text(new_content, encoding='utf-8')
+    index.save(path)
 
     # Log decision
     project_path = _get_project_path(path)
@@ -229,57 +221,6 @@ async def step1_skip(
 # Helper Functions
 # =============================================================================
 
-def _extract_questions(content: str) -> Dict[str, str]:
-    """Extract questions from markdown content."""
-    questions = {}
-
-    # Split by --- separators
-    parts = re.split(r'\n---\n', content)
-
-    for part in parts:
-        # Find question ID (^identifier or in header)
-        id_match = re.search(r'\^identifier\s+(\S+)', part)
-        if not id_match:
-            id_match = re.search(r'#.*?(Q\d+|[A-Z]+_[A-Z]+_Q\d+)', part)
-
-        if id_match:
-            qid = id_match.group(1)
-            questions[qid] = part.strip()
-
-    return questions
-
-
-def _find_question_by_id(content: str, question_id: str) -> Optional[str]:
-    """Find a specific question in content."""
-    # Pattern to match question block
-    pattern = rf'(---\n.*?\^identifier\s+{re.escape(question_id)}.*?(?=\n---|\Z))'
-    match = re.search(pattern, content, re.DOTALL)
-
-    if match:
-        return match.group(1)
-
-    # Try alternative pattern (question ID in header)
-    pattern = rf'(---\n.*?{re.escape(question_id)}.*?(?=\n---|\Z))'
-    match = re.search(pattern, content, re.DOTALL)
-
-    return match.group(1) if match else None
-
-
-def _remove_question(content: str, question: str) -> str:
-    """Remove question from content, cleaning up separators."""
-    # Remove the question
-    new_content = content.replace(question, '')
-
-    # Clean up double separators
-    new_content = re.sub(r'\n---\n\s*\n---\n', '\n---\n', new_content)
-
-    # Clean up leading/trailing separators
-    new_content = re.sub(r'^\s*---\s*\n', '', new_content)
-    new_content = re.sub(r'\n---\s*$', '', new_content)
-
-    return new_content.strip()
-
-
 def _get_question_preview(content: str, max_lines: int = 5) -> str:
     """Get preview of question content."""
     lines = content.split('\n')[:max_lines]
@@ -26,11 +26,13 @@ import uuid
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # Import validator from qti-core
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent.parent / "qti-core"))
 from src.parser.markdown_parser import MarkdownQuizParser
+from src.parser.parse_result import BlockResult, ParseResult, block_hash
+from src.spans import Span, span
 
 
 def get_timestamp() -> str:
@@ -90,6 +92,7 @@ class Step3Result:
     remaining_errors: List[Dict] = field(default_factory=list)
     message: str = ""
     session_id: str = ""
+    span: Optional[Span] = None  # Timing of each round (qti-core src/spans.py)
 
 
 # Built-in fix rules (used if no learned rules exist)
@@ -288,9 +291,9 @@ class Step3AutoFix:
     Auto-fix mechanical errors through iteration.
 
     Workflow:
-    1. Validate markdown
+    1. Validate markdown (only blocks changed since the last round)
     2. Categorize errors (mechanical vs pedagogical)
-    3. If mechanical: fix 1 error → save → loop
+    3. If mechanical: fix all independent errors → loop
     4. If pedagogical: return "needs M5"
     5. If valid: return "ready for Step 4"
     6. Max rounds protection
@@ -318,109 +321,137 @@ class Step3AutoFix:
         self.fix_rules = load_fix_rules(project_path)
         self.iteration_log: List[Dict] = []
 
+        # Per-block validation results keyed by block hash. A fix changes a
+        # few lines, so each round only re-parses the blocks it touched.
+        self._block_cache: Dict[str, BlockResult] = {}
+
     def run(self) -> Step3Result:
         """
         Run the auto-fix iteration loop.
 
         Returns:
-            Step3Result with status and details
+            Step3Result with status and details; result.span times each
+            round (validate and fix stages)
         """
+        with span('autofix', max_rounds=self.max_rounds) as autofix_span:
+            result = self._run()
+            autofix_span.set(status=result.status, rounds=result.rounds,
+                             fixes_applied=len(result.fixes_applied))
+        result.span = autofix_span
+        return result
+
+    def _run(self) -> Step3Result:
+        """Validation → fix loop of run()."""
         fixes_applied = []
 
         for round_num in range(self.max_rounds):
-            # Validate current content
-            validation = self._validate()
-
-            # Check if valid
-            if validation['valid']:
-                result = Step3Result(
-                    status="valid",
-                    rounds=round_num,
-                    fixes_applied=fixes_applied,
-                    message=f"✅ Valid after {round_num} fix(es)",
-                    session_id=self.session_id
-                )
-                self._finalize(result)
-                return result
-
-            # Categorize errors
-            errors = validation['errors']
-            mechanical, pedagogical = self._categorize_errors(errors)
-
-            # If only pedagogical errors remain, exit to M5
-            if not mechanical and pedagogical:
-                result = Step3Result(
-                    status="needs_m5",
-                    rounds=round_num,
-                    fixes_applied=fixes_applied,
-                    remaining_errors=pedagogical,
-                    message=f"❌ {len(pedagogical)} pedagogical error(s) - needs M5",
-                    session_id=self.session_id
-                )
-                self._finalize(result)
-                return result
-
-            # If no errors but not valid (shouldn't happen)
-            if not mechanical and not pedagogical:
-                result = Step3Result(
-                    status="error",
-                    rounds=round_num,
-                    fixes_applied=fixes_applied,
-                    message="Unexpected state: no errors but not valid",
-                    session_id=self.session_id
-                )
-                self._finalize(result)
-                return result
-
-            # Pick one mechanical error to fix (highest confidence rule first)
-            error, rule = self._pick_best_fix(mechanical)
-
-            if not rule:
-                # No rule for any mechanical error
-                result = Step3Result(
-                    status="needs_step1",
-                    rounds=round_num,
-                    fixes_applied=fixes_applied,
-                    remaining_errors=mechanical,
-                    message=f"❌ No fix rule for: {mechanical[0].get('message', 'unknown')}",
-                    session_id=self.session_id
-                )
-                self._finalize(result)
-                return result
-
-            # Apply fix
-            fix_result = self._apply_fix(error, rule)
-
-            # Update rule stats
-            rule.update_stats(fix_result.success)
-
-            if fix_result.success:
-                fixes_applied.append(fix_result)
-
-                # Log iteration
-                if self.project_path:
-                    log_iteration(
-                        self.project_path,
-                        self.session_id,
-                        round_num,
-                        error,
-                        rule,
-                        fix_result,
-                        self.file_path
+            with span('round', round=round_num) as round_span:
+                # Validate current content
+                with span('validate', cached_blocks=len(self._block_cache)) as validate_span:
+                    validation = self._validate()
+                    validate_span.set(questions=validation.total_questions,
+                                      errors=len(validation.errors))
+
+                # Check if valid
+                if validation.valid:
+                    result = Step3Result(
+                        status="valid",
+                        rounds=round_num,
+                        fixes_applied=fixes_applied,
+                        message=f"✅ Valid after {len(fixes_applied)} fix(es)",
+                        session_id=self.session_id
                     )
-
-                self._log_iteration_internal(round_num, error, rule, fix_result)
-            else:
-                # Fix failed - continue to next round (might pick different error)
-                pass
+                    self._finalize(result)
+                    return result
+
+                # Categorize errors
+                errors = validation.errors
+                mechanical, pedagogical = self._categorize_errors(errors)
+
+                # If only pedagogical errors remain, exit to M5
+                if not mechanical and pedagogical:
+                    result = Step3Result(
+                        status="needs_m5",
+                        rounds=round_num,
+                        fixes_applied=fixes_applied,
+                        remaining_errors=pedagogical,
+                        message=f"❌ {len(pedagogical)} pedagogical error(s) - needs M5",
+                        session_id=self.session_id
+                    )
+                    self._finalize(result)
+                    return result
+
+                # If no errors but not valid (shouldn't happen)
+                if not mechanical and not pedagogical:
+                    result = Step3Result(
+                        status="error",
+                        rounds=round_num,
+                        fixes_applied=fixes_applied,
+                        message="Unexpected state: no errors but not valid",
+                        session_id=self.session_id
+                    )
+                    self._finalize(result)
+                    return result
+
+                # Plan one fix per independent target (highest confidence first)
+                planned = self._plan_fixes(mechanical)
+                round_span.set(mechanical=len(mechanical), planned=len(planned))
+
+                if not planned:
+                    # No rule for any mechanical error
+                    result = Step3Result(
+                        status="needs_step1",
+                        rounds=round_num,
+                        fixes_applied=fixes_applied,
+                        remaining_errors=mechanical,
+                        message=f"❌ No fix rule for: {mechanical[0].get('message', 'unknown')}",
+                        session_id=self.session_id
+                    )
+                    self._finalize(result)
+                    return result
+
+                # Apply all planned fixes in this round, then revalidate once
+                round_succeeded = False
+                fixes_before = len(fixes_applied)
+                for error, rule in planned:
+                    fix_result = self._apply_fix(error, rule)
+
+                    if not fix_result.success and round_succeeded:
+                        # An earlier fix this round may already have covered this
+                        # error - revalidation decides, don't count it against the rule
+                        continue
+
+                    # Update rule stats
+                    rule.update_stats(fix_result.success)
+
+                    if fix_result.success:
+                        round_succeeded = True
+                        fixes_applied.append(fix_result)
+
+                        # Log iteration
+                        if self.project_path:
+                            log_iteration(
+                                self.project_path,
+                                self.session_id,
+                                round_num,
+                                error,
+                                rule,
+                                fix_result,
+                                self.file_path
+                            )
+
+                        self._log_iteration_internal(round_num, error, rule, fix_result)
+                    # Failed fixes: the next round revalidates and may plan differently
+                round_span.set(fixes_applied=len(fixes_applied) - fixes_before)
 
         # Max rounds reached
-        final_validation = self._validate()
+        with span('validate', cached_blocks=len(self._block_cache)):
+            final_validation = self._validate()
         result = Step3Result(
             status="max_rounds",
             rounds=self.max_rounds,
             fixes_applied=fixes_applied,
-            remaining_errors=final_validation.get('errors', []),
+            remaining_errors=final_validation.errors,
             message=f"⚠️ Max rounds ({self.max_rounds}) reached",
             session_id=self.session_id
         )
@@ -439,10 +470,14 @@ class Step3AutoFix:
                 self.file_path
             )
 
-    def _validate(self) -> Dict[str, Any]:
-        """Validate current content using markdown_parser."""
+    def _validate(self) -> ParseResult:
+        """Validate current content, re-checking only changed blocks."""
         parser = MarkdownQuizParser(self.content)
-        return parser.validate()
+        result = parser.parse_and_validate(block_cache=self._block_cache)
+
+        # Keep only the current blocks so the cache doesn't grow per round
+        self._block_cache = {block_hash(block.text): block for block in result.blocks}
+        return result
 
     def _categorize_errors(
         self,
@@ -496,26 +531,40 @@ class Step3AutoFix:
 
         return mechanical, pedagogical
 
-    def _pick_best_fix(
+    def _plan_fixes(
         self,
         mechanical_errors: List[Dict]
-    ) -> Tuple[Optional[Dict], Optional[FixRule]]:
+    ) -> List[Tuple[Dict, FixRule]]:
         """
-        Pick the best error/rule combination.
-        Prioritizes highest confidence rules.
+        Pick the fixes to apply in one round.
+
+        Every mechanical error with a matching rule gets a fix, except that
+        errors with the same fix target are fixed once (e.g. the ^type colon
+        fix rewrites every ^type: line in the file). Highest confidence
+        rules come first.
         """
-        best_error = None
-        best_rule = None
-        best_confidence = 0.0
+        planned = []
+        targets = set()
 
         for error in mechanical_errors:
             rule = self._match_rule(error)
-            if rule and rule.confidence >= best_confidence:
-                best_error = error
-                best_rule = rule
-                best_confidence = rule.confidence
-
-        return best_error, best_rule
+            if not rule:
+                continue
+            target = self._fix_target(error, rule)
+            if target in targets:
+                continue
+            targets.add(target)
+            planned.append((error, rule))
+
+        planned.sort(key=lambda item: item[1].confidence, reverse=True)
+        return planned
+
+    def _fix_target(self, error: Dict, rule: FixRule) -> Tuple[str, ...]:
+        """Key identifying what a fix changes (fixes with equal keys overlap)."""
+        if rule.fix_function == 'fix_metadata_colon':
+            # Global regex per metadata field
+            return (rule.fix_function, error.get('field', ''))
+        return (rule.fix_function, error.get('question_id', ''), error.get('message', ''))
 
     def _match_rule(self, error: Dict) -> Optional[FixRule]:
         """Find the best fix rule matching this error (highest confidence)."""
@@ -4,26 +4,49 @@ from .session_manager import (
     SessionManager,
     get_timestamp,
 )
-from .logger import log_action, log_event
-from .config import list_projects, get_project_files, ConfigError
+from .logger import (
+    LogSpan,
+    flush_logs,
+    get_session_state,
+    log_action,
+    log_event,
+    log_spans,
+    rotate_session_log,
+)
+from .config import list_projects, get_project_files, get_changed_files, ConfigError
 from .sources import (
+    SourcesRegistry,
+    compact_sources,
     create_empty_sources_yaml,
+    get_sources_registry,
     update_sources_yaml,
     read_sources_yaml,
 )
 from .methodology import copy_methodology, verify_methodology
+from .concurrency import run_blocking, run_subprocess
 
 __all__ = [
     "SessionManager",
     "get_timestamp",
     "log_action",
     "log_event",
+    "LogSpan",
+    "log_spans",
+    "flush_logs",
+    "get_session_state",
+    "rotate_session_log",
     "list_projects",
     "get_project_files",
+    "get_changed_files",
     "ConfigError",
     "create_empty_sources_yaml",
     "update_sources_yaml",
     "read_sources_yaml",
+    "compact_sources",
+    "SourcesRegistry",
+    "get_sources_registry",
     "copy_methodology",
     "verify_methodology",
+    "run_blocking",
+    "run_subprocess",
 ]
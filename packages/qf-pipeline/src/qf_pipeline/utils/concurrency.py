@@ -0,0 +1,114 @@
+"""Run blocking work off the MCP event loop.
+
+The stdio server handles every tool call on one asyncio event loop. Any
+blocking call inside an ``async def`` handler (subprocess.run, large file
+copies, parsing a big markdown file) stops the server from answering other
+tool calls until it returns.
+
+- run_blocking(): run a sync function on a small, bounded thread pool
+- run_subprocess(): asyncio subprocess with timeout and kill-on-cancel
+"""
+
+import asyncio
+import functools
+import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on concurrent blocking jobs (exports, autofix, file scans).
+# Keeps a burst of tool calls from starting an unbounded number of threads.
+MAX_WORKERS = 4
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the shared worker pool (created on first use)."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=MAX_WORKERS,
+            thread_name_prefix="qf-worker"
+        )
+    return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking function on the worker pool and await its result.
+
+    If the awaiting task is cancelled, the await is abandoned but the
+    function keeps running in its thread. Long jobs that must stop early
+    need their own cancel flag (see ExportPipeline.cancel()).
+
+    Args:
+        func: Synchronous function to run
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns (exceptions are re-raised)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _get_executor(),
+        functools.partial(func, *args, **kwargs)
+    )
+
+
+async def run_subprocess(
+    cmd: List[str],
+    cwd: Optional[Union[str, Path]] = None,
+    timeout: Optional[float] = None,
+) -> subprocess.CompletedProcess:
+    """Run a command without blocking the event loop.
+
+    Behaves like ``subprocess.run(cmd, capture_output=True, text=True,
+    timeout=timeout)``: returns a CompletedProcess and raises
+    subprocess.TimeoutExpired on timeout. The child process is killed on
+    timeout and when the calling task is cancelled.
+
+    Args:
+        cmd: Command and arguments
+        cwd: Working directory
+        timeout: Seconds before the process is killed (None = no limit)
+
+    Returns:
+        CompletedProcess with decoded stdout/stderr
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        cwd=str(cwd) if cwd else None,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        await _kill(proc)
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    except asyncio.CancelledError:
+        logger.info(f"Cancelled, killing subprocess: {cmd[:2]}")
+        await _kill(proc)
+        raise
+
+    return subprocess.CompletedProcess(
+        cmd,
+        proc.returncode,
+        stdout.decode("utf-8", errors="replace"),
+        stderr.decode("utf-8", errors="replace"),
+    )
+
+
+async def _kill(proc: asyncio.subprocess.Process) -> None:
+    """Kill a subprocess and reap it."""
+    if proc.returncode is None:
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+    await proc.wait()
@@ -10,6 +10,7 @@ from typing import List
 
 # Import QTI_GENERATOR_PATH from wrappers
 from ..wrappers import QTI_GENERATOR_PATH
+from .file_index import get_file_index
 
 
 class ConfigError(Exception):
@@ -68,7 +69,8 @@ def list_projects(include_files: bool = False) -> dict:
     """List configured MQG folders with status.
 
     Args:
-        include_files: If True, count markdown files in each folder.
+        include_files: If True, count markdown files in each folder
+            (from the cached file index, see utils/file_index.py).
 
     Returns:
         Dictionary with projects, default_output_dir, count, config_path.
@@ -91,13 +93,7 @@ def list_projects(include_files: bool = False) -> dict:
         }
 
         if include_files and exists:
-            md_files = [
-                f for f in path.rglob("*.md")
-                if not f.name.startswith('.')
-                and 'README' not in f.name
-                and '_archive' not in str(f)
-            ]
-            project['md_file_count'] = len(md_files)
+            project['md_file_count'] = get_file_index(path).count()
 
         projects.append(project)
 
@@ -110,26 +106,30 @@ def list_projects(include_files: bool = False) -> dict:
 
 
 def get_project_files(project_path: str) -> List[dict]:
-    """List markdown files in a project folder."""
+    """List markdown files in a project folder.
+
+    Served from the cached file index: only folders that changed since the
+    last call are listed again (file mtimes are at most FILE_STAT_TTL
+    seconds old).
+    """
     path = Path(project_path).expanduser()
     if not path.exists():
         return []
+    return get_file_index(path).files()
+
+
+def get_changed_files(project_path: str, since: float) -> dict:
+    """Markdown files added, modified or removed after a point in time.
+
+    Args:
+        project_path: Project folder
+        since: Unix timestamp
 
-    files = []
-    for md_file in path.rglob("*.md"):
-        if md_file.name.startswith('.'):
-            continue
-        if 'README' in md_file.name:
-            continue
-        if '_archive' in str(md_file):
-            continue
-
-        files.append({
-            'path': str(md_file),
-            'relative_path': str(md_file.relative_to(path)),
-            'name': md_file.name,
-            'mtime': md_file.stat().st_mtime
-        })
-
-    files.sort(key=lambda x: x['relative_path'])
-    return files
+    Returns:
+        Dict with 'changed' (file dicts like get_project_files) and
+        'removed' (relative paths of files removed since then)
+    """
+    path = Path(project_path).expanduser()
+    if not path.exists():
+        return {'changed': [], 'removed': []}
+    return get_file_index(path).changed_since(since)
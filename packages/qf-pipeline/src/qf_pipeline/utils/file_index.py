@@ -0,0 +1,214 @@
+"""Cached index of the markdown files in project folders.
+
+list_projects(include_files=True) and get_project_files() used to run
+rglob("*.md") plus a stat per file on every call. On a network drive with
+thousands of archived files that takes seconds.
+
+ProjectFileIndex keeps, per directory, its mtime, its subdirectories and
+its markdown files. Revalidating costs one stat per directory: only
+directories whose mtime changed (a file or folder was added, removed or
+renamed in them) are listed again. Editing a file in place does not touch
+its directory, so callers that need current file mtimes pass max_age and
+directories whose files were stat'ed longer ago than that are re-listed
+too. It also answers "what changed since T" from the index.
+
+File watching (inotify) is not used: it needs an extra dependency and
+does not report changes made from other machines on network drives.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# How long (seconds) get_project_files() trusts cached file mtimes
+FILE_STAT_TTL = 30.0
+
+# Removed files remembered for changed_since()
+MAX_REMOVED = 10000
+
+
+def is_project_file(path: Path) -> bool:
+    """Markdown files listed for a project (same rules as before indexing)."""
+    name = path.name
+    return (
+        name.endswith('.md')
+        and not name.startswith('.')
+        and 'README' not in name
+        and '_archive' not in str(path)
+    )
+
+
+@dataclass
+class _Dir:
+    """Cached listing of one directory."""
+    mtime_ns: int
+    subdirs: List[str]
+    # File name -> (mtime, wall-clock time the index first saw the file)
+    files: Dict[str, tuple] = field(default_factory=dict)
+    stat_time: float = 0.0  # time.monotonic() when files were last stat'ed
+
+
+class ProjectFileIndex:
+    """Markdown files below one project folder, revalidated by mtime."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self._dirs: Dict[str, _Dir] = {}
+        # Relative path -> wall-clock time the removal was noticed
+        self._removed: Dict[str, float] = {}
+        self._built = False
+        # Sorted listing, rebuilt after a refresh changed something
+        self._listing: Optional[List[dict]] = None
+        self._lock = threading.Lock()
+
+    def refresh(self, max_age: Optional[float] = None) -> None:
+        """Bring the index up to date.
+
+        Args:
+            max_age: Also re-list directories whose files were stat'ed more
+                than this many seconds ago (None: directory mtimes only)
+        """
+        with self._lock:
+            self._refresh(max_age)
+
+    def _refresh(self, max_age: Optional[float]) -> None:
+        now = time.monotonic()
+        wall_now = time.time()
+        seen = set()
+        stack = [str(self.root)]
+        while stack:
+            dir_path = stack.pop()
+            seen.add(dir_path)
+            cached = self._dirs.get(dir_path)
+            try:
+                mtime_ns = os.stat(dir_path).st_mtime_ns
+            except OSError:
+                continue
+            if (cached is None or cached.mtime_ns != mtime_ns
+                    or (max_age is not None and now - cached.stat_time > max_age)):
+                cached = self._scan(dir_path, mtime_ns, cached, now, wall_now)
+            stack.extend(os.path.join(dir_path, name) for name in cached.subdirs)
+
+        for dir_path in [d for d in self._dirs if d not in seen]:
+            self._listing = None
+            gone = self._dirs.pop(dir_path)
+            for name in gone.files:
+                self._forget(os.path.join(dir_path, name), wall_now)
+        self._built = True
+
+    def _scan(self, dir_path: str, mtime_ns: int, cached: Optional[_Dir],
+              now: float, wall_now: float) -> _Dir:
+        """List one directory again, keeping first-seen times of known files."""
+        previous = cached.files if cached else {}
+        listing = _Dir(mtime_ns=mtime_ns, subdirs=[], stat_time=now)
+        try:
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    try:
+                        # Like rglob: symlinked folders are not descended into
+                        if entry.is_dir(follow_symlinks=False):
+                            listing.subdirs.append(entry.name)
+                        elif entry.is_file() and is_project_file(Path(entry.path)):
+                            known = previous.get(entry.name)
+                            # Files found by the first scan don't count as new
+                            first_seen = known[1] if known else (wall_now if self._built else 0.0)
+                            listing.files[entry.name] = (entry.stat().st_mtime, first_seen)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+
+        for name in previous.keys() - listing.files.keys():
+            self._forget(os.path.join(dir_path, name), wall_now)
+        for name in listing.files:
+            self._removed.pop(self._relative(os.path.join(dir_path, name)), None)
+        self._dirs[dir_path] = listing
+        self._listing = None
+        return listing
+
+    def _relative(self, path: str) -> str:
+        return str(Path(path).relative_to(self.root))
+
+    def _forget(self, path: str, wall_now: float) -> None:
+        self._removed[self._relative(path)] = wall_now
+        if len(self._removed) > MAX_REMOVED:
+            # Dicts keep insertion order: drop the oldest removals
+            for key in list(self._removed)[:len(self._removed) - MAX_REMOVED]:
+                del self._removed[key]
+
+    def _entries(self) -> List[dict]:
+        """Indexed files sorted by relative path (cached between changes)."""
+        if self._listing is None:
+            files = []
+            root = str(self.root)
+            for dir_path, listing in self._dirs.items():
+                prefix = os.path.relpath(dir_path, root) + os.sep if dir_path != root else ''
+                for name, (mtime, first_seen) in listing.files.items():
+                    files.append({
+                        'path': os.path.join(dir_path, name),
+                        'relative_path': prefix + name,
+                        'name': name,
+                        'mtime': mtime,
+                        '_first_seen': first_seen,
+                    })
+            files.sort(key=lambda x: x['relative_path'])
+            self._listing = files
+        return self._listing
+
+    def count(self) -> int:
+        """Number of indexed files (refreshed by directory mtimes)."""
+        with self._lock:
+            self._refresh(None)
+            return sum(len(listing.files) for listing in self._dirs.values())
+
+    def files(self, max_age: Optional[float] = FILE_STAT_TTL) -> List[dict]:
+        """Indexed files as get_project_files() returns them."""
+        with self._lock:
+            self._refresh(max_age)
+            entries = self._entries()
+        return [
+            {key: value for key, value in f.items() if key != '_first_seen'}
+            for f in entries
+        ]
+
+    def changed_since(self, since: float, max_age: Optional[float] = FILE_STAT_TTL) -> dict:
+        """Files added, modified or removed after a point in time.
+
+        A file counts as changed if its mtime is later than since, or if
+        the index first saw it after since (moved in with an old mtime).
+
+        Args:
+            since: Unix timestamp
+            max_age: See refresh()
+
+        Returns:
+            Dict with 'changed' (file dicts like files()) and 'removed'
+            (relative paths)
+        """
+        with self._lock:
+            self._refresh(max_age)
+            entries = self._entries()
+            removed = sorted(path for path, when in self._removed.items() if when > since)
+        changed = [
+            {key: value for key, value in f.items() if key != '_first_seen'}
+            for f in entries
+            if f['mtime'] > since or f['_first_seen'] > since
+        ]
+        return {'changed': changed, 'removed': removed}
+
+
+_indexes: Dict[str, ProjectFileIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_file_index(project_path: Path) -> ProjectFileIndex:
+    """Shared index for a project folder (built on first use)."""
+    key = str(Path(project_path).expanduser())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = ProjectFileIndex(Path(key))
+        return index
@@ -2,36 +2,268 @@
 
 Unified logging for QuestionForge (RFC-001).
 All logs go to logs/session.jsonl (shared by qf-pipeline and qf-scaffolding).
+
+Timings of nested stages are logged as spans: one "span_end" event per
+stage, with data.span_id and parent_id pointing at the enclosing span (see
+LogSpan).
+
+Writes are buffered: log_event() queues the line and a background thread
+per log file appends queued lines in batches, each batch as one write
+under fcntl.flock (so lines from several processes never interleave).
+A batch is written FLUSH_INTERVAL seconds after its first entry, as soon
+as FLUSH_MAX_ENTRIES are waiting, right away for level "error", and at
+interpreter exit. Call flush_logs() before reading the log from the same
+process (get_session_state() does).
+
+get_session_state() keeps a checkpoint in logs/session_state.json (byte
+offset read so far plus the state derived from it), so resuming only parses
+events added since the last call. rotate_session_log() moves session.jsonl
+to logs/archive/ (gzip) and starts a new file; the checkpoint carries the
+archived events' state over.
+
+Rotation is opt-in (ROTATE_BYTES is None by default): qf-scaffolding
+(src/utils/logger.ts) appends to session.jsonl without the flock, so its
+lines written during a rotation would be lost, and its getSessionState()
+reads session.jsonl only, so its totals would restart after each rotation.
 """
 
+import atexit
+import copy
 import fcntl
+import gzip
 import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextlib import ContextDecorator
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+logger = logging.getLogger(__name__)
 
 # Schema version per RFC-001
 SCHEMA_VERSION = 1
 
+# Longest time (seconds) an entry waits in the buffer
+FLUSH_INTERVAL = 0.5
+
+# Flush as soon as this many entries are waiting
+FLUSH_MAX_ENTRIES = 256
+
+# Rotate session.jsonl when a write takes it past this size (None = never;
+# only set it when no qf-scaffolding process shares the log, see above)
+ROTATE_BYTES: Optional[int] = None
+
+# Checkpoint written by get_session_state() next to session.jsonl
+STATE_FILENAME = "session_state.json"
+STATE_VERSION = 1
+
+# Bytes before the checkpoint offset compared on resume, to notice a log
+# that was rewritten rather than appended to
+_TAIL_BYTES = 64
+
+# Number of most recent errors kept in the session state
+_MAX_ERRORS = 5
+
+
+def _open_locked(log_file: Path, mode: str):
+    """Open a log file with an exclusive flock.
+
+    Retries if the file was rotated while waiting for the lock, so nothing
+    is written to (or read from) a file that has just been archived.
+    """
+    while True:
+        f = open(log_file, mode)
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            if os.stat(log_file).st_ino == os.fstat(f.fileno()).st_ino:
+                return f
+        except FileNotFoundError:
+            pass
+        fcntl.flock(f, fcntl.LOCK_UN)
+        f.close()
+
+
+def _append_lines(log_file: Path, lines: List[str]) -> int:
+    """Append lines to a log file in one write under an exclusive flock.
+
+    Returns:
+        Size of the file after the write
+    """
+    log_file.parent.mkdir(exist_ok=True)
+    f = _open_locked(log_file, "ab")
+    try:
+        f.write("".join(lines).encode("utf-8"))
+        f.flush()
+        return os.fstat(f.fileno()).st_size
+    finally:
+        fcntl.flock(f, fcntl.LOCK_UN)
+        f.close()
+
+
+class _LogWriter:
+    """Background thread appending buffered lines to one log file."""
+
+    def __init__(self, log_file: Path):
+        self.log_file = log_file
+        self._pending: List[str] = []
+        self._urgent = False
+        self._closed = False
+        self._cond = threading.Condition()
+        # Taking a batch and writing it happen under one lock, so batches
+        # reach the file in the order their lines were queued
+        self._flush_lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="qf-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, line: str, urgent: bool = False) -> None:
+        """Queue one line (ending in a newline)."""
+        with self._cond:
+            self._pending.append(line)
+            if urgent:
+                self._urgent = True
+            if len(self._pending) == 1 or urgent or len(self._pending) >= FLUSH_MAX_ENTRIES:
+                self._cond.notify()
+
+    def flush(self) -> None:
+        """Write everything queued so far."""
+        with self._flush_lock:
+            with self._cond:
+                lines, self._pending = self._pending, []
+                self._urgent = False
+            if not lines:
+                return
+            try:
+                size = _append_lines(self.log_file, lines)
+                if ROTATE_BYTES and size > ROTATE_BYTES:
+                    _rotate(self.log_file)
+            except OSError as e:
+                logger.warning(f"Could not write {len(lines)} log entries to {self.log_file}: {e}")
+            except Exception as e:
+                # Never let a bad log (or rotation) stop the writer thread
+                logger.warning(f"Could not write or rotate {self.log_file}: {e}")
+
+    def close(self) -> None:
+        """Stop the thread after writing what is queued."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout=5)
+        self.flush()
+
+    def _due(self) -> bool:
+        return self._closed or self._urgent or len(self._pending) >= FLUSH_MAX_ENTRIES
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._due():
+                    # Collect a batch; woken early by size, errors or close
+                    self._cond.wait(FLUSH_INTERVAL)
+                closed = self._closed
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Log writer for {self.log_file} failed: {e}")
+            if closed:
+                return
+
+
+_writers: Dict[str, _LogWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def _get_writer(log_file: Path) -> _LogWriter:
+    """Writer for a log file (started on first use)."""
+    key = str(log_file)
+    writer = _writers.get(key)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(key)
+            if writer is None:
+                writer = _writers[key] = _LogWriter(log_file)
+    return writer
+
+
+def flush_logs(project_path: Optional[Path] = None) -> None:
+    """Write all buffered log entries now.
+
+    Args:
+        project_path: Only flush this project's session.jsonl (default: all)
+    """
+    if project_path is not None:
+        writer = _writers.get(str(Path(project_path) / "logs" / "session.jsonl"))
+        writers = [writer] if writer else []
+    else:
+        writers = list(_writers.values())
+    for writer in writers:
+        writer.flush()
+
+
+def _close_writers() -> None:
+    with _writers_lock:
+        writers = list(_writers.values())
+        _writers.clear()
+    for writer in writers:
+        writer.close()
+
+
+def _forget_writers_after_fork() -> None:
+    # The writer threads do not exist in a forked child, and the parent
+    # writes its own queued lines
+    global _writers_lock
+    _writers.clear()
+    _writers_lock = threading.Lock()
+
+
+atexit.register(_close_writers)
+os.register_at_fork(after_in_child=_forget_writers_after_fork)
+
+
+# session.yaml path -> (mtime_ns, session id)
+_session_ids: Dict[str, Tuple[int, str]] = {}
+
 
 def _read_session_id(project_path: Path) -> str:
     """Read session_id from session.yaml.
 
+    The id is cached and only re-read when session.yaml changes (a new
+    session started in the same project).
+
     Args:
         project_path: Project directory containing session.yaml
 
     Returns:
         Session ID string, or "unknown" if not found
     """
+    session_yaml = project_path / "session.yaml"
+    try:
+        mtime_ns = session_yaml.stat().st_mtime_ns
+    except OSError:
+        return "unknown"
+
+    key = str(session_yaml)
+    cached = _session_ids.get(key)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    session_id = "unknown"
     try:
         import yaml
-        session_yaml = project_path / "session.yaml"
-        if session_yaml.exists():
-            data = yaml.safe_load(session_yaml.read_text())
-            return data.get("session", {}).get("id", "unknown")
+        data = yaml.safe_load(session_yaml.read_text())
+        session_id = data.get("session", {}).get("id", "unknown")
     except Exception:
         pass
-    return "unknown"
+    _session_ids[key] = (mtime_ns, session_id)
+    return session_id
 
 
 def log_action(
@@ -88,7 +320,8 @@ def log_event(
     """Log event to logs/session.jsonl (RFC-001 compliant).
 
     This is the shared logging format used by both qf-pipeline and qf-scaffolding.
-    Thread-safe with file locking.
+    The entry is queued and written by the project's background log writer
+    (see module docstring); error entries are written without delay.
 
     Args:
         project_path: Project directory
@@ -104,10 +337,6 @@ def log_event(
     if project_path is None:
         return
 
-    project_path = Path(project_path)
-    logs_dir = project_path / "logs"
-    logs_dir.mkdir(exist_ok=True)
-
     # Build log entry per RFC-001 schema
     log_entry = {
         "ts": datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
@@ -127,58 +356,367 @@ def log_event(
     if parent_id:
         log_entry["parent_id"] = parent_id
 
-    # Append to session.jsonl (shared log) with file locking
-    session_log = logs_dir / "session.jsonl"
-    with open(session_log, "a", encoding="utf-8") as f:
-        fcntl.flock(f, fcntl.LOCK_EX)
-        try:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
-        finally:
-            fcntl.flock(f, fcntl.LOCK_UN)
+    # Queue for session.jsonl (shared log); serialized now so later
+    # changes to data don't reach the log
+    session_log = Path(project_path) / "logs" / "session.jsonl"
+    _get_writer(session_log).write(
+        json.dumps(log_entry, ensure_ascii=False) + "\n",
+        urgent=(level == "error")
+    )
 
 
 def get_session_state(project_path: Path) -> Dict[str, Any]:
     """Read session.jsonl and determine current state for resumption.
 
+    Only events added since the previous call are parsed: the state
+    derived so far is checkpointed in logs/session_state.json. Events in
+    rotated logs (logs/archive/) are included.
+
     Args:
         project_path: Project directory
 
     Returns:
         Dict with session state info
     """
+    flush_logs(project_path)
     log_file = Path(project_path) / "logs" / "session.jsonl"
 
     if not log_file.exists():
         return {"status": "no_session", "events": 0}
 
-    events = []
     try:
-        with open(log_file, encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    events.append(json.loads(line))
+        f = _open_locked(log_file, "rb")
+        try:
+            checkpoint = _update_checkpoint(log_file, f)
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+            f.close()
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
-    if not events:
+    state = checkpoint["state"]
+    if not state["total_events"]:
         return {"status": "empty", "events": 0}
 
-    # Find last completed stage/tool
-    last_complete = None
-    for e in reversed(events):
-        if e.get("event") in ("stage_complete", "tool_end"):
-            if e.get("data", {}).get("success", True):
-                last_complete = e
-                break
+    return {
+        "status": "resumable",
+        "total_events": state["total_events"],
+        "last_activity": state["last_activity"],
+        "last_complete": state["last_complete"],
+        "error_count": state["error_count"],
+        "errors": state["errors"],  # Last 5 errors
+        "skipped_lines": state.get("skipped_lines", 0)
+    }
+
 
-    # Count errors
-    errors = [e for e in events if e.get("level") == "error"]
+def rotate_session_log(project_path: Path, keep: Optional[int] = None) -> Optional[Path]:
+    """Archive logs/session.jsonl and start a new, empty log.
 
+    The log is gzipped to logs/archive/session-<UTC time>.jsonl.gz. The
+    resume checkpoint is brought up to date first, so get_session_state()
+    still counts the archived events. Happens automatically when a write
+    takes the log past ROTATE_BYTES (if set). Only call this while no
+    qf-scaffolding process is writing to the log.
+
+    Args:
+        project_path: Project directory
+        keep: Archives to keep (oldest are deleted); None keeps all
+
+    Returns:
+        Path of the archive, or None if there was no log to rotate
+    """
+    flush_logs(project_path)
+    return _rotate(Path(project_path) / "logs" / "session.jsonl", keep)
+
+
+def _rotate(log_file: Path, keep: Optional[int] = None) -> Optional[Path]:
+    if not log_file.exists():
+        return None
+
+    logs_dir = log_file.parent
+    archive_dir = logs_dir / "archive"
+    archive_dir.mkdir(exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    archive = archive_dir / f"{log_file.stem}-{stamp}.jsonl.gz"
+
+    f = _open_locked(log_file, "rb")
+    try:
+        checkpoint = _update_checkpoint(log_file, f)
+
+        f.seek(0)
+        with gzip.open(archive, "wb") as out:
+            shutil.copyfileobj(f, out)
+
+        # New inode: writers waiting for the lock on the old file reopen
+        fresh = logs_dir / f".{log_file.name}.new"
+        fresh.touch()
+        os.replace(fresh, log_file)
+
+        state = checkpoint["state"]
+        _save_checkpoint(logs_dir, {
+            "v": STATE_VERSION,
+            "inode": os.stat(log_file).st_ino,
+            "offset": 0,
+            "tail": "",
+            "base": state,
+            "state": state,
+        })
+    finally:
+        fcntl.flock(f, fcntl.LOCK_UN)
+        f.close()
+
+    if keep is not None:
+        archives = sorted(archive_dir.glob(f"{log_file.stem}-*.jsonl.gz"))
+        for old in archives[:max(len(archives) - keep, 0)]:
+            old.unlink()
+
+    logger.info(f"Rotated {log_file} to {archive}")
+    return archive
+
+
+def _empty_state() -> Dict[str, Any]:
     return {
-        "status": "resumable",
-        "total_events": len(events),
-        "last_activity": events[-1].get("ts") if events else None,
-        "last_complete": last_complete,
-        "error_count": len(errors),
-        "errors": errors[-5:] if errors else []  # Last 5 errors
+        "total_events": 0,
+        "last_activity": None,
+        "last_complete": None,
+        "error_count": 0,
+        "errors": [],
+        "skipped_lines": 0,
+    }
+
+
+def _apply_event(state: Dict[str, Any], event: Dict[str, Any]) -> None:
+    """Fold one event into the derived session state."""
+    state["total_events"] += 1
+    state["last_activity"] = event.get("ts")
+    # Last completed stage/tool
+    if event.get("event") in ("stage_complete", "tool_end"):
+        if event.get("data", {}).get("success", True):
+            state["last_complete"] = event
+    if event.get("level") == "error":
+        state["error_count"] += 1
+        state["errors"] = (state["errors"] + [event])[-_MAX_ERRORS:]
+
+
+def _load_checkpoint(logs_dir: Path) -> Optional[Dict[str, Any]]:
+    try:
+        checkpoint = json.loads((logs_dir / STATE_FILENAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(checkpoint, dict) or checkpoint.get("v") != STATE_VERSION:
+        return None
+    return checkpoint
+
+
+def _save_checkpoint(logs_dir: Path, checkpoint: Dict[str, Any]) -> None:
+    # Written atomically: a reader never sees a half-written checkpoint
+    tmp = logs_dir / f".{STATE_FILENAME}.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps(checkpoint, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, logs_dir / STATE_FILENAME)
+
+
+def _update_checkpoint(log_file: Path, f) -> Dict[str, Any]:
+    """Fold the events after the checkpoint into it and save it.
+
+    Args:
+        log_file: session.jsonl
+        f: The log opened "rb" and locked (see _open_locked)
+
+    Returns:
+        Updated checkpoint
+    """
+    logs_dir = log_file.parent
+    inode = os.fstat(f.fileno()).st_ino
+    checkpoint = loaded = _load_checkpoint(logs_dir)
+
+    offset = 0
+    base = _empty_state()
+    state = None
+    if checkpoint:
+        base = checkpoint.get("base") or base
+        offset = checkpoint.get("offset", 0)
+        tail = bytes.fromhex(checkpoint.get("tail", ""))
+        f.seek(max(offset - len(tail), 0))
+        if checkpoint.get("inode") == inode and f.read(len(tail)) == tail:
+            state = checkpoint["state"]
+    if state is None:
+        # No checkpoint, or the log was replaced or rewritten: start over
+        # from the state carried over from archived logs
+        offset = 0
+        state = copy.deepcopy(base)
+
+    f.seek(offset)
+    for line in f:
+        if not line.endswith(b"\n"):
+            break  # Partly written line: read it next time
+        offset += len(line)
+        if not line.strip():
+            continue
+        try:
+            event = json.loads(line)
+        except ValueError:
+            # Not an event (e.g. a line garbled by another tool): count and skip it
+            state["skipped_lines"] = state.get("skipped_lines", 0) + 1
+            continue
+        if isinstance(event, dict):
+            _apply_event(state, event)
+        else:
+            state["skipped_lines"] = state.get("skipped_lines", 0) + 1
+
+    f.seek(max(offset - _TAIL_BYTES, 0))
+    tail = f.read(min(offset, _TAIL_BYTES))
+    checkpoint = {
+        "v": STATE_VERSION,
+        "inode": inode,
+        "offset": offset,
+        "tail": tail.hex(),
+        "base": base,
+        "state": state,
     }
+    if not loaded or (loaded.get("inode"), loaded.get("offset")) != (inode, offset):
+        _save_checkpoint(logs_dir, checkpoint)
+    return checkpoint
+
+
+class LogSpan(ContextDecorator):
+    """Timed stage logged to logs/session.jsonl as a "span_end" event.
+
+    Use as a context manager or decorator, or call start()/end() where a
+    with-block does not fit (e.g. a handler with several early returns).
+    Spans opened with child() are linked by parent_id to the span_id of
+    the enclosing span, so a log reader can rebuild the tree. Each event
+    carries data.span (stage name), data.span_id and any counts set on
+    the span; duration_ms is the wall-clock time of the stage (whole
+    milliseconds, per the RFC-001 schema). Children are logged before
+    their parent: each event is written when its stage ends.
+
+    Example:
+        with LogSpan(project, session_id, "step4_export", "export") as root:
+            with root.child("parse") as parse:
+                questions = parse_file(path)
+                parse.set(questions=len(questions))
+            root.add(step_result.span)  # tree timed by qti-core (src/spans.py)
+
+    With project_path None nothing is written, like log_event.
+    """
+
+    def __init__(
+        self,
+        project_path: Optional[Path],
+        session_id: str,
+        tool: str,
+        name: str,
+        parent_id: Optional[str] = None,
+        data: Optional[Dict[str, Any]] = None,
+        mcp: str = "qf-pipeline"
+    ):
+        self.project_path = project_path
+        self.session_id = session_id
+        self.tool = tool
+        self.name = name
+        self.parent_id = parent_id
+        self.data = dict(data or {})
+        self.mcp = mcp
+        self.span_id = uuid.uuid4().hex[:12]
+        self._start: Optional[float] = None
+
+    def set(self, **data: Any) -> None:
+        """Add counts or sizes (questions, bytes_written, ...) to the span."""
+        self.data.update(data)
+
+    def child(self, name: str, **data: Any) -> "LogSpan":
+        """New span nested in this one (enter it to time it)."""
+        return LogSpan(self.project_path, self.session_id, self.tool, name,
+                       parent_id=self.span_id, data=data, mcp=self.mcp)
+
+    def add(self, timed: Any) -> None:
+        """Log a span tree timed elsewhere as a child of this span (see log_spans)."""
+        log_spans(self.project_path, self.session_id, self.tool, timed,
+                  parent_id=self.span_id, mcp=self.mcp)
+
+    def start(self) -> "LogSpan":
+        """Start the clock."""
+        self._start = time.perf_counter()
+        return self
+
+    def end(self, error: Optional[str] = None) -> None:
+        """Stop the clock and write the span_end event.
+
+        Args:
+            error: Why the stage failed; logged as data.error at level "error"
+        """
+        if error:
+            self.data["error"] = error
+        duration_ms = (time.perf_counter() - self._start) * 1000 if self._start else 0
+        _log_span_end(self.project_path, self.session_id, self.tool, self.name,
+                      self.span_id, self.data, duration_ms, self.parent_id, self.mcp)
+
+    def _recreate_cm(self) -> "LogSpan":
+        # Used as a decorator: every call is its own span (fresh span_id)
+        return LogSpan(self.project_path, self.session_id, self.tool, self.name,
+                       parent_id=self.parent_id, data=self.data, mcp=self.mcp)
+
+    def __enter__(self) -> "LogSpan":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.end(error=exc_type.__name__ if exc_type is not None else None)
+        return False
+
+
+def log_spans(
+    project_path: Optional[Path],
+    session_id: str,
+    tool: str,
+    timed: Any,
+    parent_id: Optional[str] = None,
+    mcp: str = "qf-pipeline"
+) -> Optional[str]:
+    """Log a finished span tree as span_end events (children first).
+
+    For stages timed where the session is not known, e.g. ExportPipeline
+    steps and Step3AutoFix rounds (qti-core src.spans.Span trees).
+
+    Args:
+        project_path: Project directory
+        session_id: Session ID
+        tool: Tool name for every event
+        timed: Object with name, duration_ms, data and children; None is ignored
+        parent_id: span_id of the enclosing span, if any
+        mcp: MCP name (default: "qf-pipeline")
+
+    Returns:
+        span_id given to the root of the tree, or None if nothing was logged
+    """
+    if timed is None:
+        return None
+    span_id = uuid.uuid4().hex[:12]
+    for child in timed.children:
+        log_spans(project_path, session_id, tool, child, parent_id=span_id, mcp=mcp)
+    _log_span_end(project_path, session_id, tool, timed.name, span_id,
+                  timed.data, timed.duration_ms, parent_id, mcp)
+    return span_id
+
+
+def _log_span_end(
+    project_path: Optional[Path],
+    session_id: str,
+    tool: str,
+    name: str,
+    span_id: str,
+    data: Dict[str, Any],
+    duration_ms: float,
+    parent_id: Optional[str],
+    mcp: str
+) -> None:
+    log_event(
+        project_path=project_path,
+        session_id=session_id,
+        tool=tool,
+        event="span_end",
+        level="error" if data.get("error") else "info",
+        data={"span": name, "span_id": span_id, **data},
+        duration_ms=int(round(duration_ms)),
+        parent_id=parent_id,
+        mcp=mcp
+    )
@@ -13,7 +13,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from .methodology import copy_methodology
-from .sources import create_empty_sources_yaml, update_sources_yaml
+from .sources import compact_sources, create_empty_sources_yaml, update_sources_yaml
 from .logger import log_event
 
 logger = logging.getLogger(__name__)
@@ -349,6 +349,7 @@ class SessionManager:
 
             # Copy materials if provided (for m1 entry point)
             materials_copied = 0
+            material_files: List[Path] = []
             if materials_folder:
                 materials_src = Path(materials_folder)
                 materials_dest = project_path / "materials"
@@ -382,10 +383,9 @@ class SessionManager:
                     ignore=ignore_junk
                 )
 
-                # Count files recursively for reporting
-                for item in materials_dest.rglob('*'):
-                    if item.is_file():
-                        materials_copied += 1
+                # One walk: counted for reporting, registered in sources.yaml below
+                material_files = [item for item in materials_dest.rglob('*') if item.is_file()]
+                materials_copied = len(material_files)
 
                 logger.info(f"Copied {materials_copied} files to materials/")
 
@@ -411,32 +411,31 @@ class SessionManager:
 
             # Register copied materials in sources.yaml
             if materials_copied > 0:
+                file_types = {
+                    '.pdf': 'lecture_slides',
+                    '.pptx': 'lecture_slides',
+                    '.ppt': 'lecture_slides',
+                    '.docx': 'document',
+                    '.doc': 'document',
+                    '.txt': 'text',
+                    '.md': 'markdown',
+                    '.mp4': 'video',
+                    '.mp3': 'audio',
+                    '.wav': 'audio',
+                }
+                copied_at = get_timestamp()
                 materials_sources = []
-                for item in materials_dest.rglob('*'):
-                    if item.is_file():
-                        ext = item.suffix.lower()
-                        file_type = {
-                            '.pdf': 'lecture_slides',
-                            '.pptx': 'lecture_slides',
-                            '.ppt': 'lecture_slides',
-                            '.docx': 'document',
-                            '.doc': 'document',
-                            '.txt': 'text',
-                            '.md': 'markdown',
-                            '.mp4': 'video',
-                            '.mp3': 'audio',
-                            '.wav': 'audio',
-                        }.get(ext, 'unknown')
-
-                        materials_sources.append({
-                            "path": f"materials/{item.relative_to(materials_dest)}",
-                            "type": file_type,
-                            "location": "local",
-                            "metadata": {
-                                "original_path": str(materials_src / item.relative_to(materials_dest)),
-                                "copied_at": get_timestamp(),
-                            }
-                        })
+                for item in material_files:
+                    relative = item.relative_to(materials_dest)
+                    materials_sources.append({
+                        "path": f"materials/{relative}",
+                        "type": file_types.get(item.suffix.lower(), 'unknown'),
+                        "location": "local",
+                        "metadata": {
+                            "original_path": str(materials_src / relative),
+                            "copied_at": copied_at,
+                        }
+                    })
 
                 if materials_sources:
                     result = update_sources_yaml(
@@ -497,6 +496,9 @@ class SessionManager:
                     )
                     logger.info(f"Registered questions file in sources.yaml")
 
+            # Leave a complete sources.yaml for tools that read it directly
+            compact_sources(project_path)
+
             # Generate session ID
             session_id = str(uuid.uuid4())
 
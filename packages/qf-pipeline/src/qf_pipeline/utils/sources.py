@@ -1,14 +1,55 @@
 """Sources management for qf-pipeline.
 
 Handles sources.yaml - a shared file updated by both qf-pipeline and qf-scaffolding.
-Uses file locking for thread-safe writes.
+Writers are serialised by an exclusive flock on sources.journal.jsonl (not on
+sources.yaml itself).
+
+Adding sources used to load, extend and re-dump the whole sources.yaml
+under a lock for every batch. SourcesRegistry instead appends added
+sources, one JSON object per line, to sources.journal.jsonl next to it, and
+keeps the registry in memory with indexes by path and content hash:
+
+- add(): lock the journal, read lines other processes appended since the
+  last call, skip duplicates, append the new lines - no YAML on the way
+- compact(): write sources.yaml with every source and empty the journal
+  (done automatically once the journal holds COMPACT_THRESHOLD sources,
+  and by step0_add_file and session creation after they register sources)
+
+sources.yaml plus the journal is the registry; read_sources_yaml() returns
+both. Each compaction increments metadata.generation in sources.yaml, and
+the first journal line records the generation it extends. A journal left
+behind by a compaction that crashed after writing sources.yaml (so its
+entries are already in the YAML) is recognised as stale and discarded;
+entries whose path or hash is already registered are never applied twice. Call compact() before handing sources.yaml to tools that read the
+YAML file directly.
+
+compact() writes a temporary file and os.replace()s sources.yaml, so the
+file gets a new inode on every compaction. A writer that flocks
+sources.yaml itself (as qf-pipeline did before the journal) locks the old
+inode and is NOT excluded; anything that modifies sources.yaml must take
+the journal lock instead, or go through this module.
 """
 
 import fcntl
+import json
+import os
+import tempfile
+import threading
 import yaml
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+SOURCES_FILENAME = "sources.yaml"
+JOURNAL_FILENAME = "sources.journal.jsonl"
+
+# Journal entries that trigger a compaction into sources.yaml
+COMPACT_THRESHOLD = 500
+
+# libyaml bindings when available (several times faster for large files)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
 
 def get_timestamp() -> str:
@@ -56,9 +97,325 @@ def create_empty_sources_yaml(
     with open(sources_file, 'w', encoding='utf-8') as f:
         yaml.safe_dump(data, f, allow_unicode=True, sort_keys=False)
 
+    # A new registry: earlier journal entries no longer apply
+    (project_path / JOURNAL_FILENAME).unlink(missing_ok=True)
+
     return sources_file
 
 
+def _source_key(source: Dict[str, Any]) -> str:
+    """Normalized path used for duplicate detection."""
+    return Path(str(source["path"])).as_posix()
+
+
+class SourcesRegistry:
+    """sources.yaml plus its append-only journal, indexed by path and hash.
+
+    Sources carrying a "hash" field (e.g. "sha256:<hex>") are also
+    duplicates of any registered source with the same hash.
+    """
+
+    def __init__(self, project_path: Path):
+        self.project_path = Path(project_path)
+        self.sources_file = self.project_path / SOURCES_FILENAME
+        self.journal_file = self.project_path / JOURNAL_FILENAME
+        self.metadata: Dict[str, Any] = {}
+        self.sources: List[Dict[str, Any]] = []
+        self._by_path: Dict[str, Dict[str, Any]] = {}
+        self._by_hash: Dict[str, Dict[str, Any]] = {}
+        # (inode, mtime_ns, size) of the loaded sources.yaml
+        self._snapshot_stat: Optional[Tuple[int, int, int]] = None
+        # Journal bytes and entries already applied
+        self._journal_offset = 0
+        # Journal was written against an older sources.yaml (see _refresh)
+        self._journal_stale = False
+        self._journal_entries = 0
+        self._lock = threading.RLock()
+
+    # -- Lookups ------------------------------------------------------------
+
+    def find(self, path: str) -> Optional[Dict[str, Any]]:
+        """Registered source with this path (None if not registered)."""
+        with self._lock:
+            self._refresh()
+            return self._by_path.get(Path(path).as_posix())
+
+    def find_hash(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Registered source with this content hash (None if not registered)."""
+        with self._lock:
+            self._refresh()
+            return self._by_hash.get(content_hash)
+
+    def read(self) -> Dict[str, Any]:
+        """Current metadata and sources (sources.yaml + journal)."""
+        with self._lock:
+            self._refresh()
+            return {"metadata": dict(self.metadata), "sources": list(self.sources)}
+
+    # -- Updates ------------------------------------------------------------
+
+    def add(
+        self,
+        new_sources: List[Dict[str, Any]],
+        updated_by: str = "qf-pipeline"
+    ) -> Dict[str, Any]:
+        """Append sources that are not registered yet.
+
+        Returns:
+            dict with sources_added, duplicates_skipped and total_sources
+        """
+        with self._locked() as journal:
+            processed, skipped = self._process(new_sources, updated_by, check_registered=True)
+            if processed:
+                header = []
+                if self._journal_offset == 0:
+                    header = [{"generation": self.metadata.get("generation", 0)}]
+                lines = "".join(
+                    json.dumps(entry, ensure_ascii=False) + "\n" for entry in header + processed
+                ).encode("utf-8")
+                journal.seek(0, os.SEEK_END)
+                journal.write(lines)
+                journal.flush()
+                self._journal_offset += len(lines)
+                for source in processed:
+                    self._apply(source)
+
+            if self._journal_entries >= COMPACT_THRESHOLD:
+                self._compact(journal)
+
+            return {
+                "sources_added": len(processed),
+                "duplicates_skipped": skipped,
+                "total_sources": len(self.sources),
+            }
+
+    def replace(
+        self,
+        new_sources: List[Dict[str, Any]],
+        updated_by: str = "qf-pipeline"
+    ) -> Dict[str, Any]:
+        """Replace all sources (written straight to sources.yaml).
+
+        Returns:
+            dict with sources_added, duplicates_skipped and total_sources
+        """
+        with self._locked() as journal:
+            processed, skipped = self._process(new_sources, updated_by, check_registered=False)
+            self.sources = []
+            self._by_path.clear()
+            self._by_hash.clear()
+            for source in processed:
+                self._index(source)
+            self.metadata["last_updated"] = get_timestamp()
+            self.metadata["last_updated_by"] = updated_by
+            self._compact(journal)
+            return {
+                "sources_added": len(processed),
+                "duplicates_skipped": skipped,
+                "total_sources": len(self.sources),
+            }
+
+    def compact(self) -> None:
+        """Write every source to sources.yaml and empty the journal."""
+        with self._locked() as journal:
+            if self._journal_entries or not self.sources_file.exists():
+                self._compact(journal)
+
+    # -- Internals ----------------------------------------------------------
+
+    @contextmanager
+    def _locked(self) -> Iterator[Any]:
+        """Hold the journal lock with the registry brought up to date."""
+        with self._lock:
+            with open(self.journal_file, "a+b") as journal:
+                fcntl.flock(journal, fcntl.LOCK_EX)
+                try:
+                    self._refresh(journal)
+                    if self._journal_stale:
+                        # Already folded into sources.yaml by a compaction
+                        # that crashed before emptying the journal
+                        self._journal_offset = 0
+                        self._journal_stale = False
+                    # Drop a line left half-written by a crashed writer
+                    if journal.seek(0, os.SEEK_END) > self._journal_offset:
+                        journal.truncate(self._journal_offset)
+                    yield journal
+                finally:
+                    fcntl.flock(journal, fcntl.LOCK_UN)
+
+    def _refresh(self, journal: Optional[Any] = None) -> None:
+        """Reload sources.yaml if it changed; apply new journal lines."""
+        try:
+            st = os.stat(self.sources_file)
+            snapshot_stat = (st.st_ino, st.st_mtime_ns, st.st_size)
+        except OSError:
+            snapshot_stat = None
+        try:
+            journal_size = os.stat(self.journal_file).st_size
+        except OSError:
+            journal_size = 0
+
+        if snapshot_stat != self._snapshot_stat or journal_size < self._journal_offset:
+            self._load_snapshot(snapshot_stat)
+        if journal_size == self._journal_offset:
+            return
+
+        if journal is None:
+            try:
+                with open(self.journal_file, "rb") as f:
+                    f.seek(self._journal_offset)
+                    data = f.read()
+            except OSError:
+                return
+        else:
+            journal.seek(self._journal_offset)
+            data = journal.read()
+
+        # Only complete lines: a writer may be in the middle of one
+        complete = data[:data.rfind(b"\n") + 1]
+        for number, line in enumerate(complete.splitlines()):
+            try:
+                source = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(source, dict) or self._journal_stale:
+                continue
+            if "path" not in source:
+                # Header: generation of the sources.yaml this journal extends
+                header = self._journal_offset == 0 and number == 0
+                if header and source.get("generation") != self.metadata.get("generation", 0):
+                    self._journal_stale = True
+                continue
+            if _source_key(source) in self._by_path or source.get("hash") in self._by_hash:
+                continue
+            self._apply(source)
+        self._journal_offset += len(complete)
+
+    def _load_snapshot(self, snapshot_stat: Optional[Tuple[int, int, int]]) -> None:
+        data = {}
+        if snapshot_stat is not None:
+            with open(self.sources_file, "r", encoding="utf-8") as f:
+                data = yaml.load(f, Loader=_YAML_LOADER) or {}
+        self.metadata = data.get("metadata") or {}
+        self.sources = []
+        self._by_path.clear()
+        self._by_hash.clear()
+        for source in data.get("sources") or []:
+            self._index(source)
+        self._snapshot_stat = snapshot_stat
+        self._journal_offset = 0
+        self._journal_entries = 0
+        self._journal_stale = False
+
+    def _index(self, source: Dict[str, Any]) -> None:
+        self.sources.append(source)
+        if not isinstance(source, dict) or "path" not in source:
+            return
+        self._by_path.setdefault(_source_key(source), source)
+        if source.get("hash"):
+            self._by_hash.setdefault(source["hash"], source)
+
+    def _apply(self, source: Dict[str, Any]) -> None:
+        """Apply one journal entry."""
+        self._index(source)
+        self._journal_entries += 1
+        self.metadata["last_updated"] = source.get("added_at")
+        self.metadata["last_updated_by"] = source.get("added_by")
+
+    def _process(
+        self,
+        new_sources: List[Dict[str, Any]],
+        updated_by: str,
+        check_registered: bool
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Build registry entries, skipping duplicates within the batch.
+
+        Args:
+            new_sources: Sources as passed to update_sources_yaml()
+            updated_by: Tool identifier
+            check_registered: Also skip paths and hashes already registered
+                (and number IDs after the registered sources)
+
+        Returns:
+            Tuple of (entries to add, number of duplicates skipped)
+        """
+        by_path = self._by_path if check_registered else {}
+        by_hash = self._by_hash if check_registered else {}
+        existing_count = len(self.sources) if check_registered else 0
+        seen_paths = set()
+        seen_hashes = set()
+        processed = []
+        skipped = 0
+        timestamp = get_timestamp()
+        for source in new_sources:
+            key = _source_key(source)
+            content_hash = source.get("hash")
+            if key in by_path or key in seen_paths or (
+                    content_hash and (content_hash in by_hash or content_hash in seen_hashes)):
+                skipped += 1
+                continue
+            seen_paths.add(key)
+            if content_hash:
+                seen_hashes.add(content_hash)
+
+            processed_source = {
+                "id": source.get("id") or generate_source_id(existing_count + len(processed)),
+                "path": source["path"],
+                "location": source.get("location", "local"),
+                "type": source.get("type", "unknown"),
+                "added_at": timestamp,
+                "added_by": updated_by,
+            }
+
+            # Add optional metadata
+            for optional in ("hash", "metadata", "discovered_in", "referenced_in"):
+                if optional in source:
+                    processed_source[optional] = source[optional]
+
+            processed.append(processed_source)
+        return processed, skipped
+
+    def _compact(self, journal: Any) -> None:
+        """Write sources.yaml atomically, then empty the journal (lock held)."""
+        if "created_at" not in self.metadata:
+            self.metadata = {
+                "created_at": get_timestamp(),
+                "created_by": self.metadata.get("last_updated_by", "qf-pipeline"),
+                **self.metadata,
+            }
+        self.metadata["generation"] = self.metadata.get("generation", 0) + 1
+        data = {"metadata": self.metadata, "sources": self.sources}
+
+        fd, tmp_name = tempfile.mkstemp(dir=self.project_path, prefix=".sources.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                yaml.dump(data, f, Dumper=_YAML_DUMPER, allow_unicode=True, sort_keys=False)
+            os.replace(tmp_name, self.sources_file)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        journal.truncate(0)
+        st = os.stat(self.sources_file)
+        self._snapshot_stat = (st.st_ino, st.st_mtime_ns, st.st_size)
+        self._journal_offset = 0
+        self._journal_entries = 0
+
+
+_registries: Dict[str, SourcesRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_sources_registry(project_path: Path) -> SourcesRegistry:
+    """Shared registry for a project folder (loaded on first use)."""
+    key = str(Path(project_path).expanduser().resolve())
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = SourcesRegistry(Path(key))
+        return registry
+
+
 def update_sources_yaml(
     project_path: Path,
     new_sources: List[Dict[str, Any]],
@@ -67,12 +424,16 @@ def update_sources_yaml(
 ) -> Dict[str, Any]:
     """Update sources.yaml thread-safe.
 
+    Appended sources go to the journal (see SourcesRegistry); sources whose
+    path (or hash) is already registered are skipped.
+
     Args:
         project_path: Project directory
         new_sources: List of new sources to add. Each source should have:
             - path: str (required) - path to source file
             - type: str (optional) - type of source (lecture_transcript, etc)
             - location: str (optional) - where file is stored (nextcloud, local, etc)
+            - hash: str (optional) - content hash, e.g. "sha256:<hex>"
             - metadata: dict (optional) - additional metadata
         updated_by: Tool identifier (e.g., "qf-pipeline:step0_start")
         append: True=add to existing, False=replace all
@@ -80,74 +441,19 @@ def update_sources_yaml(
     Returns:
         dict with success status and updated sources count
     """
-    sources_file = project_path / "sources.yaml"
+    project_path = Path(project_path)
 
     # Create if doesn't exist
-    if not sources_file.exists():
+    if not (project_path / SOURCES_FILENAME).exists():
         create_empty_sources_yaml(project_path, created_by=updated_by)
 
     try:
-        with open(sources_file, 'r+', encoding='utf-8') as f:
-            # Lock file for thread-safety
-            fcntl.flock(f, fcntl.LOCK_EX)
-
-            try:
-                data = yaml.safe_load(f) or {}
-
-                # Ensure structure exists
-                if "metadata" not in data:
-                    data["metadata"] = {
-                        "created_at": get_timestamp(),
-                        "created_by": updated_by,
-                    }
-                if "sources" not in data:
-                    data["sources"] = []
-
-                # Process new sources
-                existing_count = len(data["sources"])
-                processed_sources = []
-                for idx, source in enumerate(new_sources):
-                    processed = {
-                        "id": source.get("id") or generate_source_id(existing_count + idx),
-                        "path": source["path"],
-                        "location": source.get("location", "local"),
-                        "type": source.get("type", "unknown"),
-                        "added_at": get_timestamp(),
-                        "added_by": updated_by,
-                    }
-
-                    # Add optional metadata
-                    if "metadata" in source:
-                        processed["metadata"] = source["metadata"]
-                    if "discovered_in" in source:
-                        processed["discovered_in"] = source["discovered_in"]
-                    if "referenced_in" in source:
-                        processed["referenced_in"] = source["referenced_in"]
-
-                    processed_sources.append(processed)
-
-                # Update sources list
-                if append:
-                    data["sources"].extend(processed_sources)
-                else:
-                    data["sources"] = processed_sources
-
-                # Update metadata
-                data["metadata"]["last_updated"] = get_timestamp()
-                data["metadata"]["last_updated_by"] = updated_by
-
-                # Write back
-                f.seek(0)
-                f.truncate()
-                yaml.safe_dump(data, f, allow_unicode=True, sort_keys=False)
-
-                return {
-                    "success": True,
-                    "sources_added": len(processed_sources),
-                    "total_sources": len(data["sources"]),
-                }
-            finally:
-                fcntl.flock(f, fcntl.LOCK_UN)
+        registry = get_sources_registry(project_path)
+        if append:
+            result = registry.add(new_sources, updated_by=updated_by)
+        else:
+            result = registry.replace(new_sources, updated_by=updated_by)
+        return {"success": True, **result}
 
     except Exception as e:
         return {
@@ -157,7 +463,7 @@ def update_sources_yaml(
 
 
 def read_sources_yaml(project_path: Path) -> Dict[str, Any]:
-    """Read sources.yaml.
+    """Read sources.yaml (including journaled sources not yet compacted).
 
     Args:
         project_path: Project directory
@@ -165,7 +471,7 @@ def read_sources_yaml(project_path: Path) -> Dict[str, Any]:
     Returns:
         dict with sources data or error
     """
-    sources_file = project_path / "sources.yaml"
+    sources_file = Path(project_path) / SOURCES_FILENAME
 
     if not sources_file.exists():
         return {
@@ -175,13 +481,12 @@ def read_sources_yaml(project_path: Path) -> Dict[str, Any]:
         }
 
     try:
-        with open(sources_file, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f) or {}
+        data = get_sources_registry(project_path).read()
 
         return {
             "success": True,
-            "metadata": data.get("metadata", {}),
-            "sources": data.get("sources", []),
+            "metadata": data["metadata"],
+            "sources": data["sources"],
         }
     except Exception as e:
         return {
@@ -189,3 +494,23 @@ def read_sources_yaml(project_path: Path) -> Dict[str, Any]:
             "error": str(e),
             "sources": []
         }
+
+
+def compact_sources(project_path: Path) -> Dict[str, Any]:
+    """Fold the journal into sources.yaml.
+
+    Args:
+        project_path: Project directory
+
+    Returns:
+        dict with success status and total sources count
+    """
+    try:
+        registry = get_sources_registry(project_path)
+        registry.compact()
+        return {"success": True, "total_sources": len(registry.sources)}
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e),
+        }
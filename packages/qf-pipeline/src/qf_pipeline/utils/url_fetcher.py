@@ -1,20 +1,56 @@
 """URL fetching and conversion utility for qf-pipeline.
 
 Automatically fetches URLs and converts HTML content to markdown.
+
+- One pooled httpx.AsyncClient per event loop (keep-alive connections are
+  reused across fetches; close_client() on shutdown)
+- fetch_many(): fetch several URLs concurrently, at most max_concurrency at
+  a time
+- An on-disk HTTP cache: responses with an ETag or Last-Modified header are
+  kept, and the next fetch of the URL is a conditional request
+  (If-None-Match / If-Modified-Since). A 304 reuses the cached body, so
+  re-adding the same course pages to a new project downloads nothing.
+  Cache reads and writes, like saving the markdown, run on the worker pool
+  (run_blocking) so the event loop never waits for the disk.
+
+Cache location: $QF_HTTP_CACHE, else $XDG_CACHE_HOME/questionforge/http
+(default ~/.cache/questionforge/http). Set QF_HTTP_CACHE=off to disable.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
+import os
 import re
+import tempfile
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from urllib.parse import urlparse
 from datetime import datetime
 
 import httpx
 from markdownify import markdownify as md
 
+from .concurrency import run_blocking
+
 logger = logging.getLogger(__name__)
 
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) QuestionForge/1.0'
+
+# Connection pool of the shared client
+POOL_LIMITS = httpx.Limits(
+    max_connections=20,
+    max_keepalive_connections=10,
+    keepalive_expiry=30.0
+)
+
+# Default number of URLs fetch_many() downloads at once
+DEFAULT_CONCURRENCY = 4
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
 
 def is_url(source: str) -> bool:
     """Check if source is a URL.
@@ -67,10 +103,190 @@ def generate_filename_from_url(url: str, suffix: str = ".md") -> str:
     return f"{base}_{timestamp}{suffix}"
 
 
+def get_client() -> httpx.AsyncClient:
+    """Get the shared client for the running event loop (created on first use).
+
+    A client's connections belong to the loop that opened them, so a new
+    client is created when called from another loop.
+
+    Returns:
+        Pooled AsyncClient (timeout 30 s, follows redirects)
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            timeout=30.0,
+            follow_redirects=True,
+            limits=POOL_LIMITS,
+            headers={'User-Agent': USER_AGENT}
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client and its keep-alive connections."""
+    global _client, _client_loop
+    client, _client, _client_loop = _client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+def default_cache_dir() -> Optional[Path]:
+    """Get the HTTP cache directory from the environment.
+
+    Returns:
+        Cache directory, or None if QF_HTTP_CACHE=off
+    """
+    configured = os.environ.get('QF_HTTP_CACHE')
+    if configured:
+        if configured.lower() in ('off', '0', 'false', 'no'):
+            return None
+        return Path(configured).expanduser()
+    cache_home = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(cache_home) / 'questionforge' / 'http'
+
+
+class HTTPCache:
+    """Responses on disk, revalidated with ETag / Last-Modified.
+
+    Each URL has two files named by a hash of the URL: <key>.body (the raw
+    response body) and <key>.json (content type, validators, fetch time).
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+        return self.directory / f'{key}.json', self.directory / f'{key}.body'
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """Get the cached entry for a URL.
+
+        Returns:
+            Entry metadata (url, content_type, etag, last_modified, stored),
+            or None if the URL is not cached
+        """
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get('url') != url or not body_path.exists():
+            return None
+        return entry
+
+    def conditional_headers(self, entry: Dict[str, Any]) -> Dict[str, str]:
+        """Request headers that revalidate a cached entry."""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load(self, url: str, entry: Dict[str, Any]) -> Optional[httpx.Response]:
+        """Rebuild the cached response for a URL (None if the body is gone)."""
+        _, body_path = self._paths(url)
+        try:
+            body = body_path.read_bytes()
+        except OSError:
+            return None
+        return httpx.Response(
+            200,
+            headers={'content-type': entry.get('content_type', '')},
+            content=body,
+            request=httpx.Request('GET', url)
+        )
+
+    def store(self, url: str, response: httpx.Response) -> bool:
+        """Cache a 200 response that has validators and allows storing.
+
+        Returns:
+            True if the response was cached
+        """
+        etag = response.headers.get('etag')
+        last_modified = response.headers.get('last-modified')
+        if not (etag or last_modified):
+            return False
+        if 'no-store' in response.headers.get('cache-control', '').lower():
+            return False
+
+        meta_path, body_path = self._paths(url)
+        entry = {
+            'url': url,
+            'content_type': response.headers.get('content-type', ''),
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored': datetime.now().isoformat(),
+        }
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Body first, metadata last: an entry is only visible once complete
+            _write_atomic(body_path, response.content)
+            _write_atomic(meta_path, json.dumps(entry).encode('utf-8'))
+        except OSError as e:
+            logger.warning(f"Could not cache {url}: {e}")
+            return False
+        return True
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _save_text(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding='utf-8')
+
+
+async def _get(
+    client: httpx.AsyncClient,
+    url: str,
+    cache: Optional[HTTPCache]
+) -> Tuple[httpx.Response, bool]:
+    """GET a URL, revalidating a cached copy if there is one.
+
+    Returns:
+        Tuple of (response, from_cache)
+
+    Raises:
+        httpx.HTTPStatusError: On a 4xx/5xx response
+        httpx.RequestError: On connection errors and timeouts
+    """
+    entry = await run_blocking(cache.lookup, url) if cache else None
+    headers = cache.conditional_headers(entry) if entry else None
+
+    response = await client.get(url, headers=headers)
+    if response.status_code == 304 and entry:
+        cached = await run_blocking(cache.load, url, entry)
+        if cached is not None:
+            return cached, True
+        # Body vanished since lookup(): fetch unconditionally
+        response = await client.get(url)
+
+    response.raise_for_status()
+    if cache:
+        await run_blocking(cache.store, url, response)
+    return response, False
+
+
 async def fetch_url_to_markdown(
     url: str,
     output_dir: Path,
-    filename: Optional[str] = None
+    filename: Optional[str] = None,
+    use_cache: bool = True,
+    cache_dir: Optional[Path] = None
 ) -> Tuple[bool, str, Optional[Path]]:
     """Fetch URL content and save as markdown.
 
@@ -78,32 +294,29 @@ async def fetch_url_to_markdown(
         url: URL to fetch
         output_dir: Directory to save the markdown file
         filename: Optional filename (auto-generated if not provided)
+        use_cache: Revalidate against / store in the HTTP cache
+        cache_dir: Cache directory (default: default_cache_dir())
 
     Returns:
         Tuple of (success, message, file_path)
     """
     try:
-        # Ensure output directory exists
-        output_dir.mkdir(parents=True, exist_ok=True)
-
         # Generate filename if not provided
         if not filename:
             filename = generate_filename_from_url(url)
 
         output_path = output_dir / filename
 
+        if use_cache and cache_dir is None:
+            cache_dir = default_cache_dir()
+        cache = HTTPCache(cache_dir) if use_cache and cache_dir else None
+
         logger.info(f"Fetching URL: {url}")
 
         # Fetch the URL
-        async with httpx.AsyncClient(
-            timeout=30.0,
-            follow_redirects=True,
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) QuestionForge/1.0'
-            }
-        ) as client:
-            response = await client.get(url)
-            response.raise_for_status()
+        response, from_cache = await _get(get_client(), url, cache)
+        if from_cache:
+            logger.info(f"Not modified, using cached copy of {url}")
 
         content_type = response.headers.get('content-type', '')
         content = response.text
@@ -123,11 +336,12 @@ async def fetch_url_to_markdown(
         final_content = f"<!-- Source: {url} -->\n<!-- Fetched: {datetime.now().isoformat()} -->\n\n{markdown_content}"
 
         # Save to file
-        output_path.write_text(final_content, encoding='utf-8')
+        await run_blocking(_save_text, output_path, final_content)
 
         logger.info(f"Saved to: {output_path}")
 
-        return True, f"URL fetched and saved to {output_path.name}", output_path
+        cached_note = " (not modified, from cache)" if from_cache else ""
+        return True, f"URL fetched and saved to {output_path.name}{cached_note}", output_path
 
     except httpx.HTTPStatusError as e:
         msg = f"HTTP error fetching URL: {e.response.status_code}"
@@ -143,6 +357,55 @@ async def fetch_url_to_markdown(
         return False, msg, None
 
 
+async def fetch_many(
+    urls: Iterable[str],
+    output_dir: Path,
+    max_concurrency: int = DEFAULT_CONCURRENCY,
+    use_cache: bool = True,
+    cache_dir: Optional[Path] = None
+) -> List[Tuple[bool, str, Optional[Path]]]:
+    """Fetch several URLs concurrently and save each as markdown.
+
+    All fetches share the pooled client; at most max_concurrency run at a
+    time. A failed URL does not stop the others.
+
+    Args:
+        urls: URLs to fetch
+        output_dir: Directory to save the markdown files
+        max_concurrency: Maximum number of fetches in flight
+        use_cache: Revalidate against / store in the HTTP cache
+        cache_dir: Cache directory (default: default_cache_dir())
+
+    Returns:
+        One (success, message, file_path) tuple per URL, in input order
+    """
+    urls = list(urls)
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    # Generated names only differ by timestamp (per second): make them unique
+    filenames = []
+    taken = set()
+    for url in urls:
+        name = base = generate_filename_from_url(url)
+        n = 2
+        while name in taken:
+            name = f"{base[:-len('.md')]}_{n}.md"
+            n += 1
+        taken.add(name)
+        filenames.append(name)
+
+    async def fetch_one(url: str, filename: str) -> Tuple[bool, str, Optional[Path]]:
+        async with semaphore:
+            return await fetch_url_to_markdown(
+                url, output_dir, filename=filename,
+                use_cache=use_cache, cache_dir=cache_dir
+            )
+
+    return list(await asyncio.gather(
+        *(fetch_one(url, filename) for url, filename in zip(urls, filenames))
+    ))
+
+
 def html_to_markdown(html: str, source_url: str = "") -> str:
     """Convert HTML to clean markdown.
 
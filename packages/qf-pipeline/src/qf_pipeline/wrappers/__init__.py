@@ -8,6 +8,10 @@ RFC-012 UPDATE (2026-01-24):
   - This guarantees consistency with manual terminal workflow
   - Archived wrappers (no longer used): validator.py, generator.py, packager.py, resources.py
   - Kept wrappers: parser.py (used by step1_* tools), errors.py
+
+step4_export runs qti-core's ExportPipeline in-process (exporter.py). The
+pipeline shares its code with the scripts and writes the same files, but
+parses the markdown once instead of once per script.
 """
 
 import sys
@@ -34,6 +38,9 @@ if not QTI_GENERATOR_PATH.exists():
 # Parser - used by step1_* tools for guided build
 from .parser import parse_markdown, parse_question, parse_file
 
+# Exporter - used by step4_export
+from .exporter import ExportPipeline, StepResult
+
 # Errors - used for error handling
 from .errors import WrapperError, ParsingError, GenerationError, PackagingError, ValidationError, ResourceError
 
@@ -56,6 +63,9 @@ __all__ = [
     "parse_markdown",
     "parse_question",
     "parse_file",
+    # Exporter (ACTIVE - used by step4_export)
+    "ExportPipeline",
+    "StepResult",
     # Validator (ARCHIVED - only validate_markdown used by step2_validate_content)
     "validate_markdown",
     "validate_file",  # Deprecated, kept for compatibility
@@ -0,0 +1,12 @@
+"""Wrapper for ExportPipeline from qti-core.
+
+Runs the five export steps (validate → folder → resources → XML → ZIP)
+in-process instead of starting one python3 subprocess per script. The
+pipeline writes the same files as the scripts, so step4_export output
+is unchanged.
+"""
+
+# Import from qti-core (path configured in __init__.py)
+from src.pipeline import ExportPipeline, StepResult
+
+__all__ = ["ExportPipeline", "StepResult"]
@@ -50,7 +50,7 @@ def parse_question(content: str) -> Optional[dict]:
         parser = MarkdownQuizParser(content)
         result = parser.parse()
         if result.get("questions"):
-            return result["questions"][0]
+            return result["questions"][0].to_dict()
         return None
     except Exception as e:
         raise ParsingError(f"Failed to parse question: {e}", source_error=e)
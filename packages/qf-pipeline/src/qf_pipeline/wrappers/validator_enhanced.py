@@ -13,7 +13,7 @@ from .errors import ValidationError
 
 # Import BOTH validators
 from validate_mqg_format import validate_content  # Quality check
-from .parser import parse_markdown  # Exportability check
+from src.parser.markdown_parser import MarkdownQuizParser  # Exportability check
 
 
 def validate_markdown(content: str) -> dict:
@@ -36,12 +36,15 @@ def validate_markdown(content: str) -> dict:
         ValidationError: If validation process fails.
     """
     try:
+        # Both checks read the same single parse of the content
+        parser = MarkdownQuizParser(content)
+
         # 1. Quality check (validate_mqg_format)
-        is_quality_valid, quality_issues = validate_content(content)
+        is_quality_valid, quality_issues = validate_content(content, parser=parser)
         
         # 2. Exportability check (markdown_parser)
         try:
-            parser_result = parse_markdown(content)
+            parser_result = parser.parse()
             questions_found = len(parser_result.get('questions', []))
             exportable = questions_found > 0
             export_blocker = None if exportable else "Parser found 0 questions - export will fail!"
@@ -0,0 +1,88 @@
+"""Tests for utils/concurrency.py"""
+
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+from qf_pipeline.utils.concurrency import run_blocking, run_subprocess
+
+
+def test_run_blocking_returns_result():
+    """run_blocking should pass args/kwargs and return the result."""
+    result = asyncio.run(run_blocking(lambda a, b=0: a + b, 2, b=3))
+    assert result == 5
+
+
+def test_run_blocking_runs_off_event_loop():
+    """The function should run in a worker thread, not the loop thread."""
+    async def main():
+        return threading.get_ident(), await run_blocking(threading.get_ident)
+
+    loop_thread, worker_thread = asyncio.run(main())
+    assert loop_thread != worker_thread
+
+
+def test_run_blocking_does_not_block_loop():
+    """Other coroutines should keep running while blocking work runs."""
+    async def main():
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(run_blocking(time.sleep, 0.2), ticker())
+        return ticks
+
+    ticks = asyncio.run(main())
+    assert len(ticks) == 5
+    assert ticks[-1] - ticks[0] < 0.2
+
+
+def test_run_blocking_propagates_exceptions():
+    """Exceptions raised in the worker should reach the caller."""
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(run_blocking(fail))
+
+
+def test_run_subprocess_captures_output():
+    """run_subprocess should behave like subprocess.run(capture_output=True)."""
+    result = asyncio.run(run_subprocess(
+        [sys.executable, '-c', 'import sys; print("ut"); print("err", file=sys.stderr); sys.exit(3)']
+    ))
+    assert isinstance(result, subprocess.CompletedProcess)
+    assert result.returncode == 3
+    assert result.stdout.strip() == "ut"
+    assert result.stderr.strip() == "err"
+
+
+def test_run_subprocess_timeout_raises():
+    """A slow process should be killed and raise TimeoutExpired."""
+    with pytest.raises(subprocess.TimeoutExpired):
+        asyncio.run(run_subprocess(
+            [sys.executable, '-c', 'import time; time.sleep(10)'],
+            timeout=0.2
+        ))
+
+
+def test_run_subprocess_cancel_kills_process():
+    """Cancelling the awaiting task should kill the child process."""
+    async def main():
+        task = asyncio.create_task(run_subprocess(
+            [sys.executable, '-c', 'import time; time.sleep(10)']
+        ))
+        await asyncio.sleep(0.3)
+        task.cancel()
+        start = time.monotonic()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return time.monotonic() - start
+
+    assert asyncio.run(main()) < 5
@@ -0,0 +1,98 @@
+"""Tests for utils/file_index.py"""
+
+import os
+import time
+
+import pytest
+
+from qf_pipeline.utils.file_index import ProjectFileIndex, is_project_file
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Project folder with markdown files, skipped files and subfolders."""
+    for rel in ["questions/q1.md", "questions/q2.md", "notes.md", "README.md",
+                ".hidden.md", "_archive/old.md", "deep/a/b/c.md", "data.txt"]:
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel)
+    return tmp_path
+
+
+def _rglob_files(root):
+    """The listing get_project_files produced before the index."""
+    return sorted(
+        (str(f.relative_to(root)), f.stat().st_mtime)
+        for f in root.rglob("*.md") if is_project_file(f)
+    )
+
+
+def _scans(index, monkeypatch):
+    scanned = []
+    scan = index._scan
+    monkeypatch.setattr(index, "_scan", lambda d, *a: scanned.append(d) or scan(d, *a))
+    return scanned
+
+
+def test_index_matches_rglob(project):
+    files = ProjectFileIndex(project).files()
+    assert [(f["relative_path"], f["mtime"]) for f in files] == _rglob_files(project)
+    assert [f["relative_path"] for f in files] == [
+        "deep/a/b/c.md", "notes.md", "questions/q1.md", "questions/q2.md"
+    ]
+
+
+def test_unchanged_folders_are_not_listed_again(project, monkeypatch):
+    index = ProjectFileIndex(project)
+    assert index.count() == 4
+    scanned = _scans(index, monkeypatch)
+
+    assert index.count() == 4
+    assert scanned == []
+
+    (project / "questions" / "q3.md").write_text("new")
+    assert index.count() == 5
+    assert scanned == [str(project / "questions")]
+
+
+def test_removed_folder_and_files_are_dropped(project):
+    index = ProjectFileIndex(project)
+    index.refresh()
+    (project / "questions" / "q1.md").unlink()
+    for path in sorted((project / "deep").rglob("*"), reverse=True):
+        path.unlink() if path.is_file() else path.rmdir()
+    (project / "deep").rmdir()
+
+    assert [f["relative_path"] for f in index.files()] == ["notes.md", "questions/q2.md"]
+
+
+def test_in_place_edits_seen_after_max_age(project):
+    index = ProjectFileIndex(project)
+    index.refresh()
+    q1 = project / "questions" / "q1.md"
+    os.utime(q1, (time.time() + 100, time.time() + 100))
+
+    cached = {f["name"]: f["mtime"] for f in index.files(max_age=None)}
+    fresh = {f["name"]: f["mtime"] for f in index.files(max_age=0)}
+    assert cached["q1.md"] != q1.stat().st_mtime
+    assert fresh["q1.md"] == q1.stat().st_mtime
+
+
+def test_changed_since(project):
+    index = ProjectFileIndex(project)
+    index.refresh()
+    since = time.time()
+    old = since - 3600
+
+    (project / "questions" / "q1.md").unlink()
+    moved_in = project / "questions" / "moved.md"
+    moved_in.write_text("old file moved into the project")
+    os.utime(moved_in, (old, old))
+    edited = project / "notes.md"
+    edited.write_text("edited")
+    os.utime(edited, (since + 1, since + 1))
+
+    changes = index.changed_since(since, max_age=0)
+    assert [f["relative_path"] for f in changes["changed"]] == ["notes.md", "questions/moved.md"]
+    assert changes["removed"] == ["questions/q1.md"]
+    assert index.changed_since(time.time() + 10) == {"changed": [], "removed": []}
@@ -0,0 +1,253 @@
+"""Tests for utils/logger.py (RFC-001 session log)"""
+
+import gzip
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from qf_pipeline.utils import logger
+from qf_pipeline.utils.logger import (
+    LogSpan,
+    flush_logs,
+    get_session_state,
+    log_action,
+    log_event,
+    log_spans,
+    rotate_session_log,
+)
+
+
+def _lines(log_file):
+    return log_file.read_text(encoding="utf-8").splitlines() if log_file.exists() else []
+
+
+def _events(project):
+    flush_logs(project)
+    lines = (project / "logs" / "session.jsonl").read_text(encoding="utf-8").splitlines()
+    return [json.loads(line) for line in lines]
+
+
+def test_nested_spans_are_linked_by_parent_id(tmp_path):
+    """Child span_end events point at the span_id of their parent."""
+    with LogSpan(tmp_path, "sess-1", "step4_export", "export", data={"file": "q.md"}) as root:
+        with root.child("parse") as parse:
+            parse.set(questions=12, bytes_read=2048)
+        root.set(bytes_written=4096)
+
+    parse_event, root_event = _events(tmp_path)
+    assert [e["event"] for e in (parse_event, root_event)] == ["span_end", "span_end"]
+    assert parse_event["data"] == {
+        "span": "parse", "span_id": parse.span_id, "questions": 12, "bytes_read": 2048
+    }
+    assert parse_event["parent_id"] == root.span_id == root_event["data"]["span_id"]
+    assert "parent_id" not in root_event
+    assert root_event["data"]["bytes_written"] == 4096
+    assert isinstance(root_event["duration_ms"], int)
+    assert root_event["session_id"] == "sess-1"
+
+
+def test_failed_span_is_logged_as_error(tmp_path):
+    with pytest.raises(RuntimeError):
+        with LogSpan(tmp_path, "sess-1", "step4_export", "zip"):
+            raise RuntimeError("disk full")
+
+    event, = _events(tmp_path)
+    assert event["level"] == "error"
+    assert event["data"]["error"] == "RuntimeError"
+
+
+def test_decorator_logs_one_span_per_call(tmp_path):
+    @LogSpan(tmp_path, "sess-1", "step3_autofix", "round")
+    def fix_round():
+        return "done"
+
+    assert fix_round() == fix_round() == "done"
+    first, second = _events(tmp_path)
+    assert first["data"]["span_id"] != second["data"]["span_id"]
+
+
+def test_log_spans_writes_tree_timed_elsewhere(tmp_path):
+    """Trees timed by qti-core (src.spans.Span) are logged children first."""
+    tree = SimpleNamespace(name="create_zip", duration_ms=812.4, data={"success": True}, children=[
+        SimpleNamespace(name="manifest", duration_ms=3.1, data={"bytes": 48211}, children=[]),
+        SimpleNamespace(name="zip", duration_ms=806.0, data={"bytes_written": 2481190}, children=[]),
+    ])
+    root_id = log_spans(tmp_path, "sess-1", "step4_export", tree, parent_id="abc")
+
+    manifest, zip_event, root = _events(tmp_path)
+    assert [e["data"]["span"] for e in (manifest, zip_event, root)] == ["manifest", "zip", "create_zip"]
+    assert manifest["parent_id"] == zip_event["parent_id"] == root_id
+    assert root["parent_id"] == "abc"
+    assert (root["duration_ms"], zip_event["data"]["bytes_written"]) == (812, 2481190)
+
+
+def test_span_without_project_writes_nothing(tmp_path):
+    with LogSpan(None, "", "step4_export", "export") as span:
+        span.set(question_count=1)
+    assert log_spans(None, "", "step4_export", None) is None
+    assert not (tmp_path / "logs").exists()
+
+
+def test_events_are_written_in_batches(tmp_path, monkeypatch):
+    """Entries wait in the buffer until the interval, size or an error."""
+    monkeypatch.setattr(logger, "FLUSH_INTERVAL", 60)
+    monkeypatch.setattr(logger, "FLUSH_MAX_ENTRIES", 1000)
+    log_file = tmp_path / "logs" / "session.jsonl"
+
+    for i in range(5):
+        log_event(tmp_path, "sess-1", "step3_autofix", "fix_applied", data={"i": i})
+    assert not log_file.exists()
+
+    log_event(tmp_path, "sess-1", "step3_autofix", "tool_error", level="error")
+    deadline = time.monotonic() + 5
+    while len(_lines(log_file)) < 6 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # The error entry flushes everything queued before it, in order
+    events = [json.loads(line) for line in _lines(log_file)]
+    assert [e.get("data", {}).get("i") for e in events] == [0, 1, 2, 3, 4, None]
+
+
+def test_concurrent_writers_keep_lines_whole(tmp_path):
+    def worker(n):
+        for i in range(200):
+            log_event(tmp_path, "sess-1", f"worker{n}", "tick", data={"i": i})
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    events = _events(tmp_path)
+    assert len(events) == 800
+    for n in range(4):
+        assert [e["data"]["i"] for e in events if e["tool"] == f"worker{n}"] == list(range(200))
+
+
+def test_log_action_rereads_session_id_only_when_session_changes(tmp_path):
+    session_yaml = tmp_path / "session.yaml"
+    session_yaml.write_text("session:\n  id: first\n")
+    log_action(tmp_path, "step1_start", "started")
+    log_action(tmp_path, "step1_next", "next")
+
+    session_yaml.write_text("session:\n  id: second-session\n")
+    log_action(tmp_path, "step0_start", "new session")
+
+    assert [e["session_id"] for e in _events(tmp_path)] == ["first", "first", "second-session"]
+
+
+def test_session_state_sees_buffered_events(tmp_path, monkeypatch):
+    monkeypatch.setattr(logger, "FLUSH_INTERVAL", 60)
+    log_event(tmp_path, "sess-1", "step4_export", "tool_end", data={"success": True})
+
+    state = get_session_state(tmp_path)
+    assert state["total_events"] == 1
+    assert state["last_complete"]["tool"] == "step4_export"
+
+
+def _log_run(project, count, start=0):
+    for i in range(start, start + count):
+        log_event(project, "sess-1", "step2_validate", "tool_end", data={"success": True, "i": i})
+        if i % 10 == 0:
+            log_event(project, "sess-1", "step2_validate", "tool_error", level="error", data={"i": i})
+
+
+def test_session_state_resumes_from_checkpoint(tmp_path, monkeypatch):
+    """Later calls only parse the events added since the checkpoint."""
+    _log_run(tmp_path, 50)
+    first = get_session_state(tmp_path)
+    assert (first["total_events"], first["error_count"]) == (55, 5)
+
+    parsed = []
+    apply_event = logger._apply_event
+    monkeypatch.setattr(logger, "_apply_event", lambda state, e: parsed.append(e) or apply_event(state, e))
+    _log_run(tmp_path, 5, start=50)
+    state = get_session_state(tmp_path)
+
+    assert len(parsed) == 6
+    assert (state["total_events"], state["error_count"]) == (61, 6)
+    assert state["last_complete"]["data"]["i"] == 54
+    assert [e["data"]["i"] for e in state["errors"]] == [10, 20, 30, 40, 50]
+
+
+def test_rewritten_log_is_read_again(tmp_path):
+    _log_run(tmp_path, 20)
+    get_session_state(tmp_path)
+
+    # Same size, different content: the checkpoint no longer matches
+    log_file = tmp_path / "logs" / "session.jsonl"
+    log_file.write_text(log_file.read_text().replace('"i": 19', '"i": 91'))
+    assert get_session_state(tmp_path)["last_complete"]["data"]["i"] == 91
+
+
+def test_partly_written_line_is_read_when_complete(tmp_path):
+    _log_run(tmp_path, 1)
+    flush_logs(tmp_path)
+    log_file = tmp_path / "logs" / "session.jsonl"
+    line = json.dumps({"ts": "t", "tool": "x", "event": "tool_end", "level": "info"})
+    with open(log_file, "a") as f:
+        f.write(line[:20])
+    assert get_session_state(tmp_path)["total_events"] == 2
+
+    with open(log_file, "a") as f:
+        f.write(line[20:] + "\n")
+    state = get_session_state(tmp_path)
+    assert state["total_events"] == 3
+    assert state["last_complete"]["tool"] == "x"
+
+
+def test_rotation_keeps_resume_state(tmp_path):
+    _log_run(tmp_path, 30)
+    archive = rotate_session_log(tmp_path)
+
+    assert archive.name.endswith(".jsonl.gz")
+    assert (tmp_path / "logs" / "session.jsonl").read_text() == ""
+    state = get_session_state(tmp_path)
+    assert (state["total_events"], state["error_count"]) == (33, 3)
+
+    _log_run(tmp_path, 2, start=30)
+    state = get_session_state(tmp_path)
+    assert (state["total_events"], state["error_count"]) == (36, 4)
+    assert state["last_complete"]["data"]["i"] == 31
+
+    with gzip.open(archive, "rt") as f:
+        assert len(f.read().splitlines()) == 33
+
+
+def test_log_rotates_past_size_limit(tmp_path, monkeypatch):
+    # Opt-in: qf-scaffolding appends to the same log without the lock
+    assert logger.ROTATE_BYTES is None
+    monkeypatch.setattr(logger, "ROTATE_BYTES", 2000)
+    monkeypatch.setattr(logger, "FLUSH_MAX_ENTRIES", 5)
+    _log_run(tmp_path, 40)
+    flush_logs(tmp_path)
+
+    archives = sorted((tmp_path / "logs" / "archive").glob("session-*.jsonl.gz"))
+    assert archives
+    assert get_session_state(tmp_path)["total_events"] == 44
+
+    rotate_session_log(tmp_path, keep=1)
+    assert len(list((tmp_path / "logs" / "archive").glob("*.gz"))) == 1
+    assert get_session_state(tmp_path)["total_events"] == 44
+
+
+def test_rotation_skips_corrupt_lines(tmp_path, monkeypatch):
+    monkeypatch.setattr(logger, "ROTATE_BYTES", 2000)
+    log_file = tmp_path / "logs" / "session.jsonl"
+    _log_run(tmp_path, 2)
+    flush_logs(tmp_path)
+    with open(log_file, "a") as f:
+        f.write("not json\n[1, 2]\n")
+
+    # The writer thread rotates on its own and keeps writing afterwards
+    _log_run(tmp_path, 40, start=2)
+    time.sleep(3 * logger.FLUSH_INTERVAL)
+    assert list((tmp_path / "logs" / "archive").glob("session-*.jsonl.gz"))
+    assert logger._writers[str(log_file)]._thread.is_alive()
+
+    state = get_session_state(tmp_path)
+    assert state["total_events"] == 47
+    assert state["skipped_lines"] == 2
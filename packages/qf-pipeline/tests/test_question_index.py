@@ -0,0 +1,102 @@
+"""Tests for step1/question_index.py"""
+
+import os
+
+from qf_pipeline.step1.question_index import QuestionIndex, get_question_index
+
+
+def _bank(count, frontmatter=True):
+    """Questions separated by --- lines, as Step 1 files are written."""
+    blocks = [
+        f"# Q{n:03d} Title {n}\n^identifier MC_Q{n:03d}\n^type multiple_choice_single\n\nText {n}\n"
+        for n in range(1, count + 1)
+    ]
+    head = "---\ntitle: Bank\n---\n\n" if frontmatter else ""
+    return head + "\n---\n\n".join(blocks)
+
+
+def _layout(index):
+    return [(s.question_id, s.start, s.end, s.line_start, s.line_end, s.content_hash)
+            for s in index.spans]
+
+
+def test_index_finds_each_block():
+    index = QuestionIndex(_bank(3))
+
+    assert len(index) == 3
+    span = index.get("MC_Q002")
+    assert index.text(span).startswith("# Q002 Title 2")
+    assert "MC_Q001" not in index.text(span)
+    assert index.content.split("\n")[span.line_start - 1] == "# Q002 Title 2"
+    # IDs that only appear in the text fall back to the first block mentioning them
+    assert index.get("Title 3").question_id == "MC_Q003"
+    assert index.get("MC_Q999") is None
+
+
+def test_header_only_files_are_split_on_headers():
+    index = QuestionIndex("# Q001 A\n^identifier A1\nx\n\n# Q002 B\n^identifier B2\ny\n")
+
+    assert [s.question_id for s in index.spans] == ["A1", "B2"]
+    assert index.get("B2").line_start == 5
+
+
+def test_edits_keep_offsets_in_step_with_a_rescan():
+    index = QuestionIndex(_bank(5))
+
+    index.replace("MC_Q002", "# Q002 Fixed\n^identifier MC_Q002\n^type essay\n\nOne\nTwo\nThree")
+    assert _layout(index) == _layout(QuestionIndex(index.content))
+    assert "Three" in index.text(index.get("MC_Q002"))
+    assert "Text 3" in index.text(index.get("MC_Q003"))
+
+    index.delete("MC_Q003")
+    index.delete("MC_Q005")
+    index.delete("MC_Q001")
+    assert _layout(index) == _layout(QuestionIndex(index.content))
+    assert [s.question_id for s in index.spans] == ["MC_Q002", "MC_Q004"]
+    assert index.content.startswith("---\ntitle: Bank\n---\n")
+    assert not index.content.rstrip().endswith("---")
+    assert "---\n\n---" not in index.content
+
+
+def test_replace_that_adds_a_question_rescans():
+    index = QuestionIndex(_bank(2, frontmatter=False))
+
+    index.replace("MC_Q001", "---\n# Q001 A\n^identifier MC_Q001\n\n---\n\n# Q009 New\n^identifier MC_Q009\n")
+    assert [s.question_id for s in index.spans] == ["MC_Q001", "MC_Q009", "MC_Q002"]
+    assert not index.content.startswith("---")
+
+
+def test_cached_index_is_revalidated_by_content(tmp_path):
+    path = tmp_path / "bank.md"
+    path.write_text(_bank(3), encoding="utf-8")
+
+    index = get_question_index(path)
+    assert get_question_index(path) is index
+
+    index.delete("MC_Q002")
+    index.save(path)
+    assert get_question_index(path) is index
+    assert path.read_text(encoding="utf-8") == index.content
+
+    # Same-size edit that keeps the mtime (coarse timestamps on a share)
+    stat = path.stat()
+    path.write_text(index.content.replace("Text 3", "Edit 3"), encoding="utf-8")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert path.stat().st_size == stat.st_size
+    fresh = get_question_index(path)
+    assert fresh is not index and "Edit 3" in fresh.questions()["MC_Q003"]
+
+    path.write_text(_bank(4), encoding="utf-8")
+    os.utime(path, ns=(0, 0))
+    assert len(get_question_index(path)) == 4
+
+
+def test_leading_separator_is_not_frontmatter():
+    content = "---\n" + _bank(3, frontmatter=False)
+    index = QuestionIndex(content)
+    assert [s.question_id for s in index.spans] == ["MC_Q001", "MC_Q002", "MC_Q003"]
+
+    # Frontmatter is still skipped, even if a question follows without a separator
+    index = QuestionIndex(_bank(2))
+    assert [s.question_id for s in index.spans] == ["MC_Q001", "MC_Q002"]
+    assert index.text(index.spans[0]).startswith("# Q001")
@@ -0,0 +1,135 @@
+"""Tests for utils/sources.py"""
+
+import asyncio
+
+import yaml
+
+from qf_pipeline.tools.step0_tools import step0_add_file
+from qf_pipeline.utils import sources
+from qf_pipeline.utils.session_manager import SessionManager
+from qf_pipeline.utils.sources import (
+    JOURNAL_FILENAME,
+    SourcesRegistry,
+    compact_sources,
+    create_empty_sources_yaml,
+    read_sources_yaml,
+    update_sources_yaml,
+)
+
+
+def _yaml_sources(project):
+    with open(project / "sources.yaml", encoding="utf-8") as f:
+        return yaml.safe_load(f)["sources"]
+
+
+def test_appends_go_to_the_journal_until_compacted(tmp_path):
+    create_empty_sources_yaml(tmp_path)
+
+    result = update_sources_yaml(tmp_path, [
+        {"path": "materials/a.pdf", "type": "lecture_slides"},
+        {"path": "materials/b.md", "hash": "sha256:b"},
+    ])
+    assert result == {"success": True, "sources_added": 2, "duplicates_skipped": 0, "total_sources": 2}
+    assert _yaml_sources(tmp_path) == []
+
+    # Duplicates by path (also within a batch) and by hash are skipped
+    result = update_sources_yaml(tmp_path, [
+        {"path": "materials/a.pdf"},
+        {"path": "materials/copy_of_b.md", "hash": "sha256:b"},
+        {"path": "materials/c.txt"},
+        {"path": "materials/c.txt"},
+    ])
+    assert (result["sources_added"], result["duplicates_skipped"]) == (1, 3)
+
+    data = read_sources_yaml(tmp_path)
+    assert [(s["id"], s["path"]) for s in data["sources"]] == [
+        ("src001", "materials/a.pdf"), ("src002", "materials/b.md"), ("src003", "materials/c.txt")
+    ]
+    assert data["metadata"]["created_by"] == "qf-pipeline:step0_start"
+
+    assert compact_sources(tmp_path)["total_sources"] == 3
+    assert _yaml_sources(tmp_path) == data["sources"]
+    assert (tmp_path / JOURNAL_FILENAME).stat().st_size == 0
+
+
+def test_registries_see_each_others_appends(tmp_path, monkeypatch):
+    monkeypatch.setattr(sources, "COMPACT_THRESHOLD", 3)
+    create_empty_sources_yaml(tmp_path)
+    first, second = SourcesRegistry(tmp_path), SourcesRegistry(tmp_path)
+
+    first.add([{"path": "a.md"}])
+    assert second.add([{"path": "a.md"}, {"path": "b.md"}])["sources_added"] == 1
+    # A half-written line from a crashed writer is ignored and dropped
+    with open(tmp_path / JOURNAL_FILENAME, "ab") as f:
+        f.write(b'{"path": "bro')
+    assert first.find("b.md")["id"] == "src002"
+
+    # The third journal entry triggers a compaction
+    first.add([{"path": "c.md"}])
+    assert [s["id"] for s in _yaml_sources(tmp_path)] == ["src001", "src002", "src003"]
+    assert second.add([{"path": "d.md"}])["total_sources"] == 4
+    assert first.find("d.md")["id"] == "src004"
+
+    update_sources_yaml(tmp_path, [{"path": "only.md"}], append=False)
+    assert [s["path"] for s in first.read()["sources"]] == ["only.md"]
+    assert [s["path"] for s in _yaml_sources(tmp_path)] == ["only.md"]
+
+
+def test_create_session_registers_materials_once(tmp_path):
+    materials = tmp_path / "course"
+    (materials / "week1").mkdir(parents=True)
+    for name in ("intro.pdf", "week1/notes.md", "week1/talk.mp3"):
+        (materials / name).write_text(name, encoding="utf-8")
+
+    result = SessionManager().create_session(
+        output_folder=str(tmp_path / "projects"),
+        project_name="bio",
+        entry_point="m1",
+        materials_folder=str(materials),
+    )
+    assert result["success"]
+
+    project = tmp_path / "projects" / "bio"
+    registered = {s["path"]: s["type"] for s in _yaml_sources(project)}
+    assert registered == {
+        "materials/intro.pdf": "lecture_slides",
+        "materials/week1/notes.md": "markdown",
+        "materials/week1/talk.mp3": "audio",
+    }
+    assert (project / JOURNAL_FILENAME).stat().st_size == 0
+
+
+def test_add_file_leaves_sources_yaml_current(tmp_path):
+    project = tmp_path / "project"
+    project.mkdir()
+    create_empty_sources_yaml(project)
+    notes = tmp_path / "notes.md"
+    notes.write_text("# Notes", encoding="utf-8")
+
+    for _ in range(2):
+        result = asyncio.run(step0_add_file(str(project), str(notes), target_folder="materials"))
+        assert result["success"]
+    assert result["already_added"]
+
+    assert [s["path"] for s in _yaml_sources(project)] == ["materials/notes.md"]
+    assert (project / JOURNAL_FILENAME).stat().st_size == 0
+
+
+def test_journal_of_a_crashed_compaction_is_not_replayed(tmp_path):
+    create_empty_sources_yaml(tmp_path)
+    update_sources_yaml(tmp_path, [{"path": "a.md"}, {"path": "b.md", "hash": "sha256:b"}])
+    journal = (tmp_path / JOURNAL_FILENAME).read_bytes()
+
+    # Crash after sources.yaml was replaced but before the journal was emptied
+    compact_sources(tmp_path)
+    (tmp_path / JOURNAL_FILENAME).write_bytes(journal)
+
+    registry = SourcesRegistry(tmp_path)
+    assert [s["path"] for s in registry.read()["sources"]] == ["a.md", "b.md"]
+    assert registry.add([{"path": "c.md"}])["total_sources"] == 3
+    registry.compact()
+    assert [s["path"] for s in _yaml_sources(tmp_path)] == ["a.md", "b.md", "c.md"]
+
+    # A journal without a generation header is de-duplicated instead
+    (tmp_path / JOURNAL_FILENAME).write_bytes(journal.split(b"\n", 1)[1])
+    assert [s["path"] for s in SourcesRegistry(tmp_path).read()["sources"]] == ["a.md", "b.md", "c.md"]
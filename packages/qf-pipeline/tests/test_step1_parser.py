@@ -0,0 +1,43 @@
+"""Tests for step1/parser.py"""
+
+from qf_pipeline.step1.parser import get_question_by_id, parse_file
+
+
+CONTENT = """Intro text
+# Q001 First question
+^type multiple_choice_single
+A) yes
+B) no
+
+# Question 2: Second
+{{blank}}
+## q003b
+| a | b | match pairs
+#Q004
+@field: rubric
+"""
+
+
+def test_headers_in_every_format_are_found():
+    questions = parse_file(CONTENT)
+
+    assert [q.question_id for q in questions] == ["Q001", "Q002", "Q003B", "Q004"]
+    assert [q.title for q in questions] == ["First question", "Second", None, None]
+    assert [(q.line_start, q.line_end) for q in questions] == [(2, 6), (7, 8), (9, 10), (11, 13)]
+
+
+def test_content_and_type_follow_the_header_lines():
+    questions = parse_file(CONTENT)
+    lines = CONTENT.split("\n")
+
+    for q in questions:
+        assert q.raw_content == "\n".join(lines[q.line_start - 1:q.line_end])
+    assert [q.detected_type for q in questions] == [
+        "multiple_choice_single", "text_entry", "match", "text_area"
+    ]
+    assert get_question_by_id(questions, "Q002").raw_content == "# Question 2: Second\n{{blank}}"
+
+
+def test_header_whitespace_does_not_span_lines():
+    assert parse_file("#\nQ001 not a header\n# Q002")[0].question_id == "Q002"
+    assert parse_file("no questions") == []
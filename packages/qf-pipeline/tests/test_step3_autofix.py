@@ -0,0 +1,67 @@
+"""Tests for tools/step3_autofix.py"""
+
+import re
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("httpx")  # qf_pipeline.tools imports the URL fetcher
+
+from qf_pipeline.tools.step3_autofix import Step3AutoFix, autofix_content
+
+FIXTURES = Path(__file__).parent.parent.parent / "qti-core" / "tests" / "fixtures" / "v65"
+
+
+def _bank_with_colons(count: int) -> str:
+    """Build a bank where every question has ^type: and ^points: errors."""
+    template = (FIXTURES / "essay.md").read_text(encoding="utf-8").strip()
+    blocks = []
+    for i in range(1, count + 1):
+        block = re.sub(r"^# Q\d+", f"# Q{i:03d}", template, count=1)
+        block = block.replace("^type essay", "^type: essay")
+        block = block.replace("^points 1", "^points: 1")
+        blocks.append(block)
+    return "\n\n".join(blocks) + "\n"
+
+
+def test_independent_fixes_batched_in_one_round():
+    """All colon errors are fixed in one round, not one error per round."""
+    result, fixed = autofix_content(_bank_with_colons(5))
+
+    assert result.status == "valid"
+    assert result.rounds == 1
+    assert {fix.rule_id for fix in result.fixes_applied} == {"STEP3_001", "STEP3_003"}
+    assert "^type:" not in fixed and "^points:" not in fixed
+
+
+def test_revalidation_reuses_unchanged_blocks(monkeypatch):
+    """Blocks whose text did not change are not parsed again."""
+    from src.parser.markdown_parser import MarkdownQuizParser
+
+    content = _bank_with_colons(1) + "\n" + (FIXTURES / "true_false.md").read_text(encoding="utf-8")
+    fixer = Step3AutoFix(content)
+
+    parsed = []
+    original = MarkdownQuizParser._parse_and_validate_block
+
+    def counting(self, idx, question_block, *args):
+        parsed.append(question_block.question_id)
+        return original(self, idx, question_block, *args)
+
+    monkeypatch.setattr(MarkdownQuizParser, "_parse_and_validate_block", counting)
+    result = fixer.run()
+
+    assert result.status == "valid"
+    # Round 0 parses both blocks; after the fix only the edited block is re-parsed
+    assert parsed == ["Q001", "Q003", "Q001"]
+
+
+def test_rounds_are_timed():
+    """result.span holds one 'round' span per validate → fix round."""
+    result, _ = autofix_content(_bank_with_colons(3))
+
+    rounds = [child for child in result.span.children if child.name == "round"]
+    assert result.span.name == "autofix"
+    assert len(rounds) == result.rounds + 1
+    assert rounds[0].data["fixes_applied"] > 0
+    assert rounds[0].children[0].data["questions"] == 3
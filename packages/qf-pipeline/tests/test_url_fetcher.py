@@ -0,0 +1,139 @@
+"""Tests for utils/url_fetcher.py (against a local HTTP server)"""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("markdownify")
+
+from qf_pipeline.tools.step0_tools import step0_add_urls
+from qf_pipeline.utils.sources import create_empty_sources_yaml, read_sources_yaml
+from qf_pipeline.utils.url_fetcher import close_client, fetch_many, fetch_url_to_markdown
+
+
+PAGES = {
+    "/lecture": ("text/html; charset=utf-8", '"v1"', "<h1>Cellen</h1><p>Mitokondrier</p>"),
+    "/notes.md": ("text/markdown", None, "# Notes\n\nNo validators"),
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serves PAGES with an ETag; answers If-None-Match with 304."""
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.path not in PAGES:
+            self.send_response(404)
+            self.end_headers()
+            return
+        content_type, etag, body = PAGES[self.path]
+        if etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def _fetch(*args, **kwargs):
+    async def run():
+        try:
+            return await fetch_url_to_markdown(*args, **kwargs)
+        finally:
+            await close_client()
+    return asyncio.run(run())
+
+
+def test_second_fetch_is_a_cache_hit(server, tmp_path):
+    url = _url(server, "/lecture")
+    cache_dir = tmp_path / "cache"
+
+    first = _fetch(url, tmp_path / "project1", cache_dir=cache_dir)
+    second = _fetch(url, tmp_path / "project2", cache_dir=cache_dir)
+
+    assert first[0] and second[0]
+    assert "from cache" not in first[1]
+    assert "from cache" in second[1]
+    assert server.requests == [("/lecture", None), ("/lecture", '"v1"')]
+    body = second[2].read_text(encoding="utf-8")
+    assert "# Cellen" in body and "Mitokondrier" in body
+    assert body.split("\n", 2)[2] == first[2].read_text(encoding="utf-8").split("\n", 2)[2]
+
+
+def test_responses_without_validators_are_not_cached(server, tmp_path):
+    url = _url(server, "/notes.md")
+
+    for _ in range(2):
+        ok, message, path = _fetch(url, tmp_path / "out", cache_dir=tmp_path / "cache")
+        assert ok and "from cache" not in message
+    assert path.read_text(encoding="utf-8").endswith("# Notes\n\nNo validators")
+    assert server.requests == [("/notes.md", None), ("/notes.md", None)]
+
+    ok, message, path = _fetch(_url(server, "/missing"), tmp_path / "out", use_cache=False)
+    assert not ok and "404" in message and path is None
+
+
+def test_fetch_many_keeps_order_and_unique_names(server, tmp_path):
+    urls = [_url(server, "/lecture"), _url(server, "/missing"), _url(server, "/lecture")]
+
+    async def run():
+        try:
+            return await fetch_many(urls, tmp_path / "out", max_concurrency=2, use_cache=False)
+        finally:
+            await close_client()
+    results = asyncio.run(run())
+
+    assert [ok for ok, _, _ in results] == [True, False, True]
+    assert results[0][2] != results[2][2]
+    assert results[0][2].exists() and results[2][2].exists()
+
+
+def test_add_urls_registers_fetched_pages(server, tmp_path, monkeypatch):
+    monkeypatch.setenv("QF_HTTP_CACHE", "off")
+    project = tmp_path / "project"
+    project.mkdir()
+    create_empty_sources_yaml(project)
+    urls = [_url(server, "/lecture"), _url(server, "/missing"), _url(server, "/notes.md")]
+
+    async def run():
+        try:
+            return await step0_add_urls(str(project), urls)
+        finally:
+            await close_client()
+    result = asyncio.run(run())
+
+    assert result["success"]
+    assert [f["url"] for f in result["files_added"]] == [urls[0], urls[2]]
+    assert [f["url"] for f in result["failed"]] == [urls[1]]
+    sources = read_sources_yaml(project)["sources"]
+    assert [s["path"] for s in sources] == [f["copied_to"] for f in result["files_added"]]
+    assert all(s["path"].startswith("materials/") and s["location"] == "url" for s in sources)
+    assert (project / sources[0]["path"]).exists()
@@ -0,0 +1 @@
+"""Performance benchmarks for the export pipeline (see benchmarks/README.md)."""
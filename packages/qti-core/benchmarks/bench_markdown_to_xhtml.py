@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: markdown_to_xhtml
+
+Compares the current markdown_to_xhtml() (escape table, precompiled
+patterns, fast path for plain paragraphs, LRU memo) against the previous
+implementation (five str.replace passes, four uncompiled re.sub calls per
+paragraph) on the text fragments XMLGenerator converts for a question bank:
+question texts, options and feedback, where options and feedback repeat a
+lot across questions.
+
+Both implementations must produce identical output; the benchmark checks
+this before timing.
+
+Usage:
+    python benchmarks/bench_markdown_to_xhtml.py [--questions N] [--repeat N]
+"""
+
+import argparse
+import os
+import re
+import sys
+import timeit
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.parser.markdown_parser import markdown_to_xhtml
+
+
+def legacy_markdown_to_xhtml(markdown_text: str) -> str:
+    """markdown_to_xhtml() before the single-pass escape and memo."""
+    def convert_image(match):
+        alt_text = match.group(1)
+        image_path = match.group(2)
+        filename = os.path.basename(image_path)
+        return f'<img src="resources/{filename}" alt="{alt_text}"/>'
+
+    if markdown_text:
+        for char, escape in {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&apos;'}.items():
+            markdown_text = markdown_text.replace(char, escape)
+    else:
+        markdown_text = ''
+
+    xhtml_paragraphs = []
+    for para in markdown_text.split('\n\n'):
+        if not para.strip():
+            continue
+        para = re.sub(r'!\[([^\]]*)\]\(([^)]+)\)', convert_image, para)
+        para = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', para)
+        para = re.sub(r'\*(.+?)\*', r'<em>\1</em>', para)
+        para = re.sub(r'`(.+?)`', r'<code>\1</code>', para)
+        para = para.replace('\n', '<br/>')
+        xhtml_paragraphs.append(f'<p>{para}</p>')
+    return '\n'.join(xhtml_paragraphs)
+
+
+def bank_fragments(num_questions: int) -> list:
+    """Fragments converted for a bank, in generation order."""
+    fragments = []
+    for i in range(num_questions):
+        fragments.append(
+            f"Question {i}: Which of the following describes **cell {i}**?\n\n"
+            f"![Cell diagram](images/cell_{i % 7}.png)\n"
+            f"Consider the *membrane* and the `nucleus` & its <role>."
+        )
+        fragments.extend([
+            f"Option A for question {i}",
+            f"Option B for question {i}",
+            "All of the above",
+            "None of the above",
+        ])
+        fragments.extend([
+            "Correct!",
+            "Incorrect. Review the chapter on cell structure.",
+            "Please answer this question.",
+            "Sant",
+            "Falskt",
+        ])
+    return fragments
+
+
+def run(fragments: list, repeat: int) -> dict:
+    """Time each implementation over all fragments; returns best seconds."""
+    def legacy():
+        for text in fragments:
+            legacy_markdown_to_xhtml(text)
+
+    uncached = markdown_to_xhtml.__wrapped__
+
+    def current_uncached():
+        for text in fragments:
+            uncached(text)
+
+    def current_memoized():
+        markdown_to_xhtml.cache_clear()
+        for text in fragments:
+            markdown_to_xhtml(text)
+
+    return {
+        name: min(timeit.repeat(func, number=1, repeat=repeat))
+        for name, func in (
+            ('legacy', legacy),
+            ('current (no memo)', current_uncached),
+            ('current (memoized)', current_memoized),
+        )
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark markdown_to_xhtml')
+    parser.add_argument('--questions', type=int, default=2000, help='Questions in the synthetic bank')
+    parser.add_argument('--repeat', type=int, default=5, help='Repetitions (best is reported)')
+    args = parser.parse_args()
+
+    fragments = bank_fragments(args.questions)
+
+    mismatches = [text for text in set(fragments)
+                  if markdown_to_xhtml(text) != legacy_markdown_to_xhtml(text)]
+    if mismatches:
+        print(f"✗ Output differs from the legacy implementation for: {mismatches[0]!r}", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"{len(fragments)} fragments ({len(set(fragments))} distinct), "
+          f"best of {args.repeat}")
+    results = run(fragments, args.repeat)
+    baseline = results['legacy']
+    for name, seconds in results.items():
+        print(f"  {name:<20} {seconds * 1000:8.1f} ms  {baseline / seconds:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite: time the export stages on synthetic item banks
+
+Generates QFMD v6.5 banks (benchmarks/synthetic_bank.py) and times each
+stage separately:
+
+    parse          MarkdownQuizParser.parse()
+    validate       MarkdownQuizParser.validate()
+    copy_resources ResourceManager.copy_resources()
+    generate_xml   XMLGenerator.generate_question() for every question
+    create_package QTIPackager.create_package()
+    autofix        Step3AutoFix.run() (qf-pipeline) on a bank with fixable errors
+
+Results are written as JSON so runs can be compared between commits:
+
+    python benchmarks/run_benchmarks.py --output before.json
+    git checkout my-branch
+    python benchmarks/run_benchmarks.py --output after.json --compare before.json
+
+Usage:
+    python benchmarks/run_benchmarks.py [options]
+
+Options:
+    --sizes N,N,...      Bank sizes in questions (default: 100,1000,10000)
+    --stages S,S,...     Stages to run (default: all)
+    --repeat N           Runs per stage; the fastest is reported (default: 3)
+    --image-ratio F      Share of questions with an inline image (default: 0.2)
+    --feedback-ratio F   Share of questions with feedback (default: 1.0)
+    --error-ratio F      Share of questions with fixable errors for autofix (default: 0.2)
+    --output FILE        JSON results file (default: benchmarks/results/<commit>.json)
+    --compare FILE       Earlier results to compare against
+"""
+
+import argparse
+import gc
+import importlib.util
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.synthetic_bank import generate_bank
+from src.parser import MarkdownQuizParser
+from src.generator.xml_generator import XMLGenerator
+from src.generator.resource_manager import ResourceManager, apply_resource_mapping
+from src.packager.qti_packager import QTIPackager
+
+STAGES = ('parse', 'validate', 'copy_resources', 'generate_xml', 'create_package', 'autofix')
+
+DEFAULT_SIZES = (100, 1000, 10000)
+
+AUTOFIX_MODULE = (project_root.parent / 'qf-pipeline' / 'src' / 'qf_pipeline' / 'tools' / 'step3_autofix.py')
+
+
+def _load_autofix():
+    """
+    Load Step3AutoFix from the qf-pipeline package next to qti-core.
+
+    Loaded from its file so the MCP server's dependencies (mcp, httpx) are
+    not needed. Returns None if qf-pipeline is not checked out.
+    """
+    if not AUTOFIX_MODULE.exists():
+        return None
+    spec = importlib.util.spec_from_file_location('step3_autofix', AUTOFIX_MODULE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.Step3AutoFix
+
+
+def _time(func: Callable[[], object], setup: Optional[Callable[[], None]], repeat: int) -> float:
+    """Best wall time of func over repeat runs (setup runs untimed before each)."""
+    best = float('inf')
+    for _ in range(repeat):
+        if setup:
+            setup()
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_size(num_questions: int, stages: List[str], repeat: int, workdir: Path,
+               image_ratio: float, feedback_ratio: float, error_ratio: float) -> Dict[str, float]:
+    """
+    Time the selected stages on one bank size.
+
+    Returns:
+        Stage name -> best seconds
+    """
+    bank = generate_bank(num_questions, image_ratio=image_ratio, feedback_ratio=feedback_ratio)
+    bank_dir = workdir / f'bank_{num_questions}'
+    md_file = bank.write(bank_dir)
+    content = bank.markdown
+    output_dir = workdir / f'out_{num_questions}'
+
+    timings = {}
+    quiz_data = MarkdownQuizParser(content).parse()
+    questions = quiz_data['questions']
+
+    if 'parse' in stages:
+        timings['parse'] = _time(lambda: MarkdownQuizParser(content).parse(), None, repeat)
+
+    if 'validate' in stages:
+        timings['validate'] = _time(lambda: MarkdownQuizParser(content).validate(), None, repeat)
+
+    manager = ResourceManager(md_file, output_dir, media_dir=bank_dir)
+    quiz_dir = output_dir / 'bank'
+
+    def fresh_quiz_dir():
+        # Cold copy: no previous export to reuse
+        if quiz_dir.exists():
+            shutil.rmtree(quiz_dir)
+        manager.prepare_output_structure('bank')
+
+    mapping = {}
+    if 'copy_resources' in stages:
+        timings['copy_resources'] = _time(
+            lambda: mapping.update(manager.copy_resources(questions, quiz_dir)), fresh_quiz_dir, repeat
+        )
+    else:
+        fresh_quiz_dir()
+        mapping.update(manager.copy_resources(questions, quiz_dir))
+    apply_resource_mapping(questions, mapping)
+
+    generator = XMLGenerator()
+    questions_xml = []
+
+    def generate():
+        questions_xml[:] = [
+            (q['identifier'], generator.generate_question(q, language='sv'))
+            for q in questions
+        ]
+
+    if 'generate_xml' in stages:
+        timings['generate_xml'] = _time(generate, None, repeat)
+    else:
+        generate()
+
+    if 'create_package' in stages:
+        packager = QTIPackager(output_dir)
+        metadata = dict(quiz_data['metadata'], questions=questions)
+        timings['create_package'] = _time(
+            lambda: packager.create_package(questions_xml, metadata, 'bank.zip', keep_folder=True),
+            None, repeat
+        )
+
+    if 'autofix' in stages:
+        autofix_cls = _load_autofix()
+        if autofix_cls is None:
+            print("  autofix: skipped (qf-pipeline not found)", file=sys.stderr)
+        else:
+            broken = generate_bank(num_questions, image_ratio=image_ratio,
+                                   feedback_ratio=feedback_ratio, error_ratio=error_ratio).markdown
+            timings['autofix'] = _time(lambda: autofix_cls(broken).run(), None, repeat)
+
+    return timings
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Print each timing relative to an earlier results file."""
+    previous = {(r['questions'], r['stage']): r['seconds'] for r in baseline['results']}
+    print()
+    print(f"Compared with {baseline.get('commit') or '?'} ({baseline.get('timestamp', '?')}):")
+    for r in results['results']:
+        old = previous.get((r['questions'], r['stage']))
+        if old is None:
+            continue
+        ratio = r['seconds'] / old if old else float('inf')
+        flag = '  ⚠️ slower' if ratio > 1.1 else ''
+        print(f"  {r['questions']:>6} {r['stage']:<15} {old:9.3f}s → {r['seconds']:9.3f}s  {ratio:5.2f}x{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the export stages on synthetic item banks',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--sizes', type=str, default=','.join(map(str, DEFAULT_SIZES)),
+                        help='Bank sizes in questions (default: 100,1000,10000)')
+    parser.add_argument('--stages', type=str, default=','.join(STAGES),
+                        help=f"Stages to run (default: {','.join(STAGES)})")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per stage; the fastest is reported (default: 3)')
+    parser.add_argument('--image-ratio', type=float, default=0.2,
+                        help='Share of questions with an inline image (default: 0.2)')
+    parser.add_argument('--feedback-ratio', type=float, default=1.0,
+                        help='Share of questions with feedback (default: 1.0)')
+    parser.add_argument('--error-ratio', type=float, default=0.2,
+                        help='Share of questions with fixable errors for autofix (default: 0.2)')
+    parser.add_argument('--output', type=str,
+                        help='JSON results file (default: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', type=str,
+                        help='Earlier results file to compare against')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        print(f"✗ Unknown stages: {', '.join(unknown)} (choose from {', '.join(STAGES)})", file=sys.stderr)
+        sys.exit(1)
+
+    # Per-question log output would dominate the timings
+    logging.disable(logging.WARNING)
+
+    commit = _git_commit()
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': {
+            'sizes': sizes,
+            'repeat': args.repeat,
+            'image_ratio': args.image_ratio,
+            'feedback_ratio': args.feedback_ratio,
+            'error_ratio': args.error_ratio,
+        },
+        'results': [],
+    }
+
+    print(f"{'Questions':>9} {'Stage':<15} {'Best':>10} {'Per question':>14}")
+    with tempfile.TemporaryDirectory(prefix='qti-bench-') as tmp:
+        for size in sizes:
+            timings = bench_size(size, stages, args.repeat, Path(tmp),
+                                 args.image_ratio, args.feedback_ratio, args.error_ratio)
+            for stage in stages:
+                if stage not in timings:
+                    continue
+                seconds = timings[stage]
+                results['results'].append({
+                    'questions': size,
+                    'stage': stage,
+                    'seconds': round(seconds, 6),
+                    'us_per_question': round(seconds / size * 1e6, 1),
+                })
+                print(f"{size:>9} {stage:<15} {seconds:9.3f}s {seconds / size * 1e6:11.1f} µs")
+            sys.stdout.flush()
+
+    output = Path(args.output) if args.output else (
+        project_root / 'benchmarks' / 'results' / f"{commit or datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print()
+    print(f"Results written: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
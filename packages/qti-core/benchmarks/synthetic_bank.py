@@ -0,0 +1,213 @@
+"""
+Synthetic QFMD v6.5 item banks for benchmarks.
+
+generate_bank() builds a bank of any size by cycling through one template
+question per item type (the 18 item templates in templates/xml; the other
+two templates are the assessmentTest and manifest). The templates are the
+v6.5 test fixtures, with each copy given its own header, identifier and
+question text so nothing is shared between questions by accident.
+
+    bank = generate_bank(1000, image_ratio=0.2, feedback_ratio=0.5)
+    md_file = bank.write(tmp_dir)       # bank.md plus its images
+
+Knobs:
+    image_ratio     share of questions with an inline image in the question
+                    text (hotspot/image questions always have images)
+    feedback_ratio  share of questions that keep their feedback section
+    error_ratio     share of questions with a mechanical error Step 3
+                    auto-fix repairs (^points: 1 instead of ^points 1)
+
+match and graphicgapmatch_v2 questions parse and generate XML, but
+validate() reports them: it checks for 'pairs'/'drop_zones' keys that the
+v6.5 parser does not produce.
+"""
+
+import random
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+FIXTURES = Path(__file__).parent.parent / 'tests' / 'fixtures' / 'v65'
+
+# Item type -> fixture used as its template
+TYPE_TEMPLATES = {
+    'audio_record': 'audio_record.md',
+    'composite_editor': 'composite_editor.md',
+    'essay': 'essay.md',
+    'gapmatch': 'gapmatch.md',
+    'graphicgapmatch_v2': 'graphicgapmatch_v2.md',
+    'hotspot': 'hotspot.md',
+    'inline_choice': 'inline_choice.md',
+    'match': 'match.md',
+    'math_working': 'math_working.md',
+    'multiple_choice_single': 'image_test.md',
+    'multiple_response': 'multiple_response.md',
+    'nativehtml': 'nativehtml.md',
+    'text_area': 'text_area.md',
+    'text_entry': 'text_entry.md',
+    'text_entry_graphic': 'text_entry_graphic.md',
+    'text_entry_math': 'text_entry_math.md',
+    'text_entry_numeric': 'text_entry_numeric.md',
+    'true_false': 'true_false.md',
+}
+
+# Fixture images referenced by the templates
+FIXTURE_IMAGES = ('cell_diagram.png', 'test_image.png', 'feedback_image.png')
+
+# hotspot.md defines its areas in a @field the parser does not read yet;
+# the "## Hotspots" section and an image in the question text make it valid
+_HOTSPOTS_SECTION = """
+## Hotspots
+
+### Hotspot 1
+**Shape**: rect
+**Coordinates**: 100,150,200,250
+**Label**: Mitochondria
+**Correct**: true
+
+### Hotspot 2
+**Shape**: circle
+**Coordinates**: 300,200,50
+**Label**: Nucleus
+**Correct**: false
+"""
+
+_FRONTMATTER = """---
+test_metadata:
+  title: Synthetic benchmark bank ({count} questions)
+  identifier: BENCH_{count}
+  language: sv
+---
+
+"""
+
+_HEADER_RE = re.compile(r'^# Q\d+', re.MULTILINE)
+_QUESTION_RE = re.compile(r'^\^question Q\d+', re.MULTILINE)
+_IDENTIFIER_RE = re.compile(r'^\^identifier (\S+)', re.MULTILINE)
+_POINTS_RE = re.compile(r'^\^points (\S+)', re.MULTILINE)
+_QUESTION_TEXT_RE = re.compile(r'^@field: question_text\n(.*?)\n@end_field$', re.MULTILINE | re.DOTALL)
+_FEEDBACK_RE = re.compile(r'^@field: feedback\n.*?^@end_field\n?', re.MULTILINE | re.DOTALL)
+
+
+@dataclass
+class SyntheticBank:
+    """
+    Generated item bank.
+
+    Attributes:
+        markdown: Bank content (QFMD v6.5)
+        images: Image filename -> bytes, to be stored next to the markdown
+        types: Item type of each question, in order
+    """
+    markdown: str
+    images: Dict[str, bytes] = field(default_factory=dict)
+    types: List[str] = field(default_factory=list)
+
+    @property
+    def question_count(self) -> int:
+        return len(self.types)
+
+    def write(self, folder: Path, filename: str = 'bank.md') -> Path:
+        """
+        Write the bank and its images to a folder.
+
+        Returns:
+            Path of the markdown file
+        """
+        folder = Path(folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        for name, data in self.images.items():
+            (folder / name).write_bytes(data)
+        md_file = folder / filename
+        md_file.write_text(self.markdown, encoding='utf-8')
+        return md_file
+
+
+def _load_templates() -> Dict[str, str]:
+    templates = {}
+    for question_type, fixture in TYPE_TEMPLATES.items():
+        text = (FIXTURES / fixture).read_text(encoding='utf-8').strip()
+        if question_type == 'hotspot':
+            text = _QUESTION_TEXT_RE.sub(
+                lambda m: f'@field: question_text\n{m.group(1)}\n\n![Cell diagram](cell_diagram.png)\n@end_field',
+                text, count=1
+            ) + '\n' + _HOTSPOTS_SECTION
+        elif question_type == 'nativehtml' and not _POINTS_RE.search(text):
+            text = text.replace('\n^type nativehtml', '\n^type nativehtml\n^points 0', 1)
+        templates[question_type] = text
+    return templates
+
+
+def _question(template: str, number: int, image: Optional[str], feedback: bool, error: bool) -> str:
+    """One question from a template, made unique by its number."""
+    text = _HEADER_RE.sub(f'# Q{number:05d}', template, count=1)
+    text = _QUESTION_RE.sub(f'^question Q{number:05d}', text, count=1)
+    text = _IDENTIFIER_RE.sub(lambda m: f'^identifier {m.group(1)}_{number:05d}', text, count=1)
+
+    def question_text(match):
+        body = f'[{number}] {match.group(1)}'
+        if image:
+            body += f'\n\n![Figure {number}]({image})'
+        return f'@field: question_text\n{body}\n@end_field'
+
+    text = _QUESTION_TEXT_RE.sub(question_text, text, count=1)
+    if not feedback:
+        text = _FEEDBACK_RE.sub('', text)
+    if error:
+        text = _POINTS_RE.sub(lambda m: f'^points: {m.group(1)}', text, count=1)
+    return text
+
+
+def generate_bank(num_questions: int,
+                  types: Optional[Sequence[str]] = None,
+                  image_ratio: float = 0.2,
+                  feedback_ratio: float = 1.0,
+                  error_ratio: float = 0.0,
+                  distinct_images: int = 50,
+                  seed: int = 0) -> SyntheticBank:
+    """
+    Generate a QFMD v6.5 item bank.
+
+    Args:
+        num_questions: Number of questions
+        types: Item types to cycle through (default: all of TYPE_TEMPLATES)
+        image_ratio: Share of questions with an inline image
+        feedback_ratio: Share of questions that keep their feedback
+        error_ratio: Share of questions with a Step 3 fixable error
+        distinct_images: Number of different inline images (reused cyclically)
+        seed: Random seed (same arguments give the same bank)
+
+    Returns:
+        SyntheticBank
+    """
+    templates = _load_templates()
+    types = list(types or templates)
+    unknown = [t for t in types if t not in templates]
+    if unknown:
+        raise ValueError(f"No template for question types: {', '.join(unknown)}")
+
+    rng = random.Random(seed)
+    fixture_png = (FIXTURES / 'test_image.png').read_bytes()
+    bank = SyntheticBank(
+        markdown='',
+        images={name: (FIXTURES / name).read_bytes() for name in FIXTURE_IMAGES},
+    )
+
+    blocks = []
+    for number in range(1, num_questions + 1):
+        question_type = types[(number - 1) % len(types)]
+        image = None
+        if rng.random() < image_ratio:
+            image = f'bench_{number % distinct_images:03d}.png'
+            # Distinct bytes per image name so resources are not deduplicated
+            bank.images.setdefault(image, fixture_png + image.encode('ascii'))
+        blocks.append(_question(
+            templates[question_type], number, image,
+            feedback=rng.random() < feedback_ratio,
+            error=rng.random() < error_ratio,
+        ))
+        bank.types.append(question_type)
+
+    bank.markdown = _FRONTMATTER.format(count=num_questions) + '\n\n'.join(blocks) + '\n'
+    return bank
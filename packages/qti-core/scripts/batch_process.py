@@ -2,7 +2,21 @@
 """
 Batch Process: Process Multiple Markdown Files
 
-Processes all markdown files in a folder, skipping already processed files.
+Processes all markdown files in a folder, skipping files that have not
+changed since they were last exported.
+
+Files are exported in parallel by a pool of worker processes; each worker
+runs the five pipeline steps in-process (src/pipeline/ExportPipeline) instead
+of starting run_all.py and the step scripts as subprocesses.
+
+A file is skipped when its ZIP exists and neither the markdown, the media it
+references nor the language changed since the last successful export. This
+is tracked in <output-dir>/.batch_state.json (content hashes, with size and
+mtime to avoid re-reading unchanged media).
+
+The first run after upgrading has no .batch_state.json yet. Existing ZIPs
+that are newer than their markdown and media are adopted into the state
+instead of being re-exported; use --force to rebuild them anyway.
 
 Usage:
     python scripts/batch_process.py --folder <path> [options]
@@ -12,8 +26,10 @@ Options:
     --folder DIR            Folder containing markdown files
     --output-dir DIR        Output base directory (default: ~/Nextcloud/Inspera/QTI_export_INSPERA)
     --language LANG         Question language code (default: sv)
-    --force                 Re-process even if ZIP exists
+    --workers N             Parallel worker processes (default: number of CPUs)
+    --force                 Re-process even if unchanged
     --dry-run              Show what would be processed without doing it
+    --summary-json FILE     Also write the summary (with per-file timings) as JSON
     -v, --verbose          Show detailed information
 
 Exit codes:
@@ -21,10 +37,10 @@ Exit codes:
     1 = Some files had errors
 
 Examples:
-    # Process all files in folder (skip already processed)
+    # Process all files in folder (skip unchanged)
     python scripts/batch_process.py --folder /path/to/folder --language sv
 
-    # Re-process all files (ignore existing ZIPs)
+    # Re-process all files
     python scripts/batch_process.py --folder /path/to/folder --force
 
     # Dry run (see what would be processed)
@@ -32,11 +48,59 @@ Examples:
 """
 
 import sys
-import subprocess
+import json
+import os
+import time
+import hashlib
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
 from datetime import datetime
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.pipeline import ExportPipeline
+from src.parser.markdown_parser import MarkdownQuizParser
+from src.generator.resource_manager import ResourceManager
+from src.generator.resource_store import file_digest
+
+STATE_FILENAME = '.batch_state.json'
+
+# Bump when the meaning of a state entry changes
+STATE_VERSION = 1
+
+
+@dataclass
+class FileResult:
+    """
+    Outcome of exporting one markdown file (returned by worker processes).
+
+    Attributes:
+        name: Markdown filename
+        success: True if all pipeline steps succeeded
+        duration_ms: Wall-clock time for the whole file
+        step_ms: Duration of each step that ran, in STEPS order
+        failed_step: Name of the step that failed, if any
+        error: Error output of the failed step
+        output: Captured output of all steps (printed with --verbose)
+        question_count: Number of questions generated
+        zip_path: Path of the created ZIP
+        fingerprint: State entry to store on success (see fingerprint_file)
+    """
+    name: str
+    success: bool
+    duration_ms: int = 0
+    step_ms: Dict[str, int] = field(default_factory=dict)
+    failed_step: Optional[str] = None
+    error: str = ''
+    output: str = ''
+    question_count: int = 0
+    zip_path: Optional[str] = None
+    fingerprint: Optional[dict] = None
 
 
 def find_markdown_files(folder: Path) -> List[Path]:
@@ -44,33 +108,288 @@ def find_markdown_files(folder: Path) -> List[Path]:
     return sorted(folder.glob("*.md"))
 
 
-def is_already_processed(markdown_file: Path, output_dir: Path) -> bool:
-    """Check if markdown file has already been processed (ZIP exists)."""
-    quiz_name = markdown_file.stem
-    zip_path = output_dir / f"{quiz_name}.zip"
-    return zip_path.exists()
+def load_state(output_dir: Path) -> Dict[str, dict]:
+    """Load per-file export state from the output directory."""
+    state_file = output_dir / STATE_FILENAME
+    if not state_file.exists():
+        return {}
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if state.get('version') != STATE_VERSION:
+        return {}
+    return state.get('files', {})
+
+
+def save_state(output_dir: Path, files: Dict[str, dict]) -> None:
+    """Write per-file export state atomically."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    state_file = output_dir / STATE_FILENAME
+    tmp_file = state_file.with_suffix('.tmp')
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({'version': STATE_VERSION, 'files': files}, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, state_file)
+
+
+def _stat_entry(path: Path, digest: Optional[str] = None) -> Optional[list]:
+    """[size, mtime_ns, sha256] for a file, or None if it does not exist."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns, digest or file_digest(path)]
+
+
+def _same_file(path: Path, entry: Optional[list]) -> bool:
+    """Check a file against a stored entry, hashing only if stat changed."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return entry is None
+    if entry is None:
+        return False
+    if entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+        return True
+    return entry[0] == stat.st_size and file_digest(path) == entry[2]
+
+
+def fingerprint_file(markdown_file: Path, content: str, media_dir: Path,
+                     resources: List[str], language: str) -> dict:
+    """
+    Build the state entry for a successfully exported file.
+
+    Args:
+        markdown_file: Markdown file
+        content: Markdown content that was exported
+        media_dir: Directory resource paths are relative to
+        resources: Resource paths referenced by the questions
+        language: Export language
+
+    Returns:
+        Dictionary stored in .batch_state.json
+    """
+    return {
+        'source': hashlib.sha256(content.encode('utf-8')).hexdigest(),
+        'language': language,
+        'media_dir': str(media_dir),
+        # Missing resources are stored as None, so adding them later triggers a re-export
+        'resources': {path: _stat_entry(media_dir / path) for path in resources},
+        'exported_at': datetime.now().isoformat(),
+    }
+
+
+def is_unchanged(markdown_file: Path, output_dir: Path, language: str,
+                 entry: Optional[dict]) -> Tuple[bool, str]:
+    """
+    Decide whether a file can be skipped.
+
+    Returns:
+        (unchanged, reason) - reason explains why the file must be processed
+    """
+    if not entry:
+        return False, 'never exported'
+    if not (output_dir / f"{markdown_file.stem}.zip").exists():
+        return False, 'ZIP missing'
+    if entry.get('language') != language:
+        return False, 'language changed'
+    source_hash = hashlib.sha256(markdown_file.read_bytes()).hexdigest()
+    if source_hash != entry.get('source'):
+        return False, 'markdown changed'
+    media_dir = Path(entry.get('media_dir', markdown_file.parent))
+    for path, resource_entry in entry.get('resources', {}).items():
+        if not _same_file(media_dir / path, resource_entry):
+            return False, f'resource changed: {path}'
+    return True, 'unchanged'
+
+
+def seed_from_zip(markdown_file: Path, output_dir: Path, language: str) -> Optional[dict]:
+    """
+    Adopt a ZIP exported before .batch_state.json existed.
+
+    Earlier versions skipped any file whose ZIP existed. To keep the first
+    run after upgrading from re-exporting everything, a file without a state
+    entry is trusted if its ZIP is newer than the markdown and every existing
+    resource it references. The language of such a ZIP is not known; the
+    current one is assumed.
+
+    Returns:
+        State entry for the file, or None if it must be exported
+    """
+    zip_path = output_dir / f"{markdown_file.stem}.zip"
+    try:
+        zip_mtime = zip_path.stat().st_mtime_ns
+        if markdown_file.stat().st_mtime_ns > zip_mtime:
+            return None
+        content = markdown_file.read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    media_dir = markdown_file.parent
+    try:
+        questions = MarkdownQuizParser(content).parse()['questions']
+    except Exception:
+        return None
+    manager = ResourceManager(markdown_file, output_dir, media_dir=media_dir)
+    resources = manager.referenced_resources(questions)
+    for path in resources:
+        try:
+            if (media_dir / path).stat().st_mtime_ns > zip_mtime:
+                return None
+        except OSError:
+            continue
+    return fingerprint_file(markdown_file, content, media_dir, resources, language)
+
+
+def process_file(markdown_file: Path, output_dir: Path, language: str, verbose: bool) -> FileResult:
+    """
+    Export a single markdown file in this process.
 
+    Runs in a worker process; all output is captured in the result.
 
-def process_file(markdown_file: Path, output_dir: Path, language: str, verbose: bool) -> bool:
+    Returns:
+        FileResult
     """
-    Process a single markdown file using run_all.py
+    start = time.perf_counter()
+    pipeline = ExportPipeline(markdown_file, output_dir=output_dir, language=language, verbose=verbose)
+
+    for name, _script in ExportPipeline.STEPS:
+        step = pipeline.run_step(name)
+        if not step.success:
+            break
+
+    failed = next((r for r in pipeline.results if not r.success), None)
+    result = FileResult(
+        name=markdown_file.name,
+        success=pipeline.succeeded,
+        step_ms={r.name: r.duration_ms for r in pipeline.results},
+        failed_step=failed.name if failed else None,
+        error=(failed.error_output or failed.output) if failed else '',
+        output=''.join(r.output for r in pipeline.results),
+        question_count=pipeline.question_count,
+        zip_path=pipeline.zip_path,
+    )
+    if result.success:
+        result.fingerprint = fingerprint_file(
+            markdown_file, pipeline.content, pipeline.media_dir, pipeline.resources, language
+        )
+    result.duration_ms = int((time.perf_counter() - start) * 1000)
+    return result
+
+
+def run_batch(files: List[Path], output_dir: Path, language: str,
+              workers: int, verbose: bool, on_result=None) -> List[FileResult]:
+    """
+    Export files with a bounded pool of worker processes.
+
+    Args:
+        files: Markdown files to export
+        output_dir: Output base directory
+        language: Question language code
+        workers: Maximum worker processes (1 = run in this process)
+        verbose: Pass verbose to the pipelines
+        on_result: Optional callback(index, FileResult) as files finish
 
     Returns:
-        True if successful, False if error
+        FileResults in the order of files
     """
-    cmd = [
-        sys.executable,
-        "scripts/run_all.py",
-        str(markdown_file),
-        "--output-dir", str(output_dir),
-        "--language", language
-    ]
+    results: List[Optional[FileResult]] = [None] * len(files)
+
+    def finish(index: int, result: FileResult) -> None:
+        results[index] = result
+        if on_result:
+            on_result(index, result)
+
+    if workers <= 1 or len(files) <= 1:
+        for index, md_file in enumerate(files):
+            finish(index, process_file(md_file, output_dir, language, verbose))
+        return results
 
-    if verbose:
-        cmd.append("--verbose")
+    with ProcessPoolExecutor(max_workers=min(workers, len(files))) as executor:
+        futures = {
+            executor.submit(process_file, md_file, output_dir, language, verbose): index
+            for index, md_file in enumerate(files)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # Worker crashed outside the pipeline's own error handling
+                result = FileResult(name=files[index].name, success=False, error=str(e))
+            finish(index, result)
 
-    result = subprocess.run(cmd)
-    return result.returncode == 0
+    return results
+
+
+def _format_ms(ms: int) -> str:
+    return f"{ms / 1000:.1f}s" if ms >= 1000 else f"{ms}ms"
+
+
+def print_summary(results: List[FileResult], skipped: List[Path], output_dir: Path,
+                  wall_ms: int) -> None:
+    """Print the aggregated batch summary with per-file timings."""
+    processed = [r for r in results if r.success]
+    errors = [r for r in results if not r.success]
+
+    print("=" * 70)
+    print("BATCH PROCESS COMPLETE")
+    print("=" * 70)
+    print(f"✓ Processed:  {len(processed)} files")
+    if skipped:
+        print(f"⊘ Skipped:    {len(skipped)} files (unchanged)")
+    if errors:
+        print(f"✗ Errors:     {len(errors)} files")
+
+    if results:
+        step_names = [name for name, _ in ExportPipeline.STEPS]
+        print()
+        print("Per-file timings:")
+        header = f"  {'File':<32} {'Total':>7} " + ' '.join(f"{name[:9]:>9}" for name in step_names)
+        print(header)
+        for result in sorted(results, key=lambda r: r.duration_ms, reverse=True):
+            steps = ' '.join(
+                f"{_format_ms(result.step_ms[name]) if name in result.step_ms else '-':>9}"
+                for name in step_names
+            )
+            status = '' if result.success else '  ✗'
+            print(f"  {result.name[:32]:<32} {_format_ms(result.duration_ms):>7} {steps}{status}")
+
+        cpu_ms = sum(r.duration_ms for r in results)
+        print()
+        print(f"Wall time:      {_format_ms(wall_ms)}")
+        print(f"Sum of files:   {_format_ms(cpu_ms)}")
+        print(f"Questions:      {sum(r.question_count for r in results)}")
+
+    if errors:
+        print()
+        print("Files with errors:")
+        for result in errors:
+            step = f" ({result.failed_step})" if result.failed_step else ''
+            print(f"  - {result.name}{step}")
+
+    print()
+    print(f"Output directory: {output_dir}")
+    print()
+
+
+def write_summary_json(path: Path, results: List[FileResult], skipped: List[Path],
+                       wall_ms: int) -> None:
+    """Write the batch summary as JSON."""
+    summary = {
+        'timestamp': datetime.now().isoformat(),
+        'wall_ms': wall_ms,
+        'processed': sum(1 for r in results if r.success),
+        'errors': sum(1 for r in results if not r.success),
+        'skipped': [p.name for p in skipped],
+        'files': [
+            {key: value for key, value in asdict(r).items() if key not in ('output', 'fingerprint')}
+            for r in results
+        ],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
 
 
 def main():
@@ -79,14 +398,17 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 Examples:
-  # Process all files in folder (skip already processed)
+  # Process all files in folder (skip unchanged)
   python scripts/batch_process.py --folder /path/to/folder --language sv
 
-  # Re-process all files (ignore existing ZIPs)
+  # Re-process all files
   python scripts/batch_process.py --folder /path/to/folder --force
 
   # Dry run (see what would be processed)
   python scripts/batch_process.py --folder /path/to/folder --dry-run
+
+Without .batch_state.json (first run), existing ZIPs newer than their
+markdown and media are kept; use --force to rebuild them.
         """
     )
 
@@ -110,10 +432,17 @@ Examples:
         help='Question language code (default: sv)'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=os.cpu_count() or 1,
+        help='Parallel worker processes (default: number of CPUs)'
+    )
+
     parser.add_argument(
         '--force',
         action='store_true',
-        help='Re-process even if ZIP exists'
+        help='Re-process even if unchanged'
     )
 
     parser.add_argument(
@@ -122,6 +451,12 @@ Examples:
         help='Show what would be processed without doing it'
     )
 
+    parser.add_argument(
+        '--summary-json',
+        type=str,
+        help='Also write the summary (with per-file timings) to this JSON file'
+    )
+
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -171,22 +506,37 @@ Examples:
     print(f"Folder:     {folder}")
     print(f"Output dir: {output_dir}")
     print(f"Language:   {args.language}")
+    print(f"Workers:    {args.workers}")
     print(f"Found:      {len(markdown_files)} markdown files")
     print()
 
     # Categorize files
+    state = load_state(output_dir)
     to_process = []
     to_skip = []
 
+    seeded = 0
     for md_file in markdown_files:
-        if args.force or not is_already_processed(md_file, output_dir):
+        if str(md_file) not in state and not args.force:
+            entry = seed_from_zip(md_file, output_dir, args.language)
+            if entry:
+                state[str(md_file)] = entry
+                seeded += 1
+        unchanged, reason = is_unchanged(md_file, output_dir, args.language, state.get(str(md_file)))
+        if args.force or not unchanged:
             to_process.append(md_file)
+            if args.verbose:
+                print(f"  + {md_file.name} ({'forced' if args.force else reason})")
         else:
             to_skip.append(md_file)
 
+    if seeded:
+        print(f"Adopted:    {seeded} existing ZIPs (no earlier batch state)")
+        if not args.dry_run:
+            save_state(output_dir, state)
     print(f"To process: {len(to_process)} files")
     if to_skip:
-        print(f"To skip:    {len(to_skip)} files (already processed)")
+        print(f"To skip:    {len(to_skip)} files (unchanged since last export)")
         if args.verbose:
             for md_file in to_skip:
                 print(f"  - {md_file.name}")
@@ -206,43 +556,41 @@ Examples:
         return
 
     # Process files
-    processed = []
-    errors = []
-
-    for idx, md_file in enumerate(to_process, 1):
-        print(f"[{idx}/{len(to_process)}] Processing: {md_file.name}")
-        print("-" * 70)
+    done = 0
 
-        success = process_file(md_file, output_dir, args.language, args.verbose)
+    def report(index: int, result: FileResult) -> None:
+        nonlocal done
+        done += 1
+        status = "✓ Success" if result.success else f"✗ Error ({result.failed_step or 'worker'})"
+        print(f"[{done}/{len(to_process)}] {status}: {result.name} ({_format_ms(result.duration_ms)})")
+        if args.verbose:
+            print(result.output)
+        if not result.success and result.error:
+            for line in result.error.strip().splitlines()[-10:]:
+                print(f"    {line}")
+        sys.stdout.flush()
+
+    start = time.perf_counter()
+    results = run_batch(to_process, output_dir, args.language, args.workers, args.verbose, report)
+    wall_ms = int((time.perf_counter() - start) * 1000)
+    print()
 
-        if success:
-            processed.append(md_file.name)
-            print(f"✓ Success: {md_file.name}")
+    # Remember successful exports for the next run
+    for md_file, result in zip(to_process, results):
+        if result.success:
+            state[str(md_file)] = result.fingerprint
         else:
-            errors.append(md_file.name)
-            print(f"✗ Error: {md_file.name}")
-
-        print()
+            state.pop(str(md_file), None)
+    save_state(output_dir, state)
 
     # Summary
-    print("=" * 70)
-    print("BATCH PROCESS COMPLETE")
-    print("=" * 70)
-    print(f"✓ Processed:  {len(processed)} files")
-    if to_skip:
-        print(f"⊘ Skipped:    {len(to_skip)} files (already processed)")
-    if errors:
-        print(f"✗ Errors:     {len(errors)} files")
-        print()
-        print("Files with errors:")
-        for filename in errors:
-            print(f"  - {filename}")
+    print_summary(results, to_skip, output_dir, wall_ms)
 
-    print()
-    print(f"Output directory: {output_dir}")
-    print()
+    if args.summary_json:
+        write_summary_json(Path(args.summary_json), results, to_skip, wall_ms)
+        print(f"Summary written: {args.summary_json}")
 
-    if errors:
+    if any(not r.success for r in results):
         sys.exit(1)
 
 
@@ -45,6 +45,7 @@ sys.path.insert(0, str(project_root))
 # Import for Question Set generation
 from src.generator.assessment_test_generator import (
     AssessmentTestGenerator,
+    QuestionTagIndex,
     SectionConfig,
     generate_assessment_test
 )
@@ -124,7 +125,8 @@ def _calculate_remaining_counts(
     selected_bloom: Optional[List[str]] = None,
     selected_difficulty: Optional[List[str]] = None,
     selected_custom: Optional[List[str]] = None,
-    selected_points: Optional[List[int]] = None
+    selected_points: Optional[List[int]] = None,
+    tag_index: Optional[QuestionTagIndex] = None
 ) -> tuple:
     """
     Calculate total and remaining counts for each tag category.
@@ -143,90 +145,28 @@ def _calculate_remaining_counts(
         selected_difficulty: Currently selected Difficulty filters (OR within)
         selected_custom: Currently selected Custom filters (OR within)
         selected_points: Currently selected Points filters (OR within)
+        tag_index: Index of questions (built from questions if not given)
 
     Returns:
         Tuple of (bloom_remaining, diff_remaining, custom_remaining, points_remaining)
         Each dict: {tag: (total_count, remaining_count)}
     """
-    bloom_remaining = {}
-    diff_remaining = {}
-    custom_remaining = {}
-    points_remaining = {}
-
-    # Initialize with totals and zero remaining
-    for tag, count in bloom_tags.items():
-        bloom_remaining[tag] = (count, 0)
-    for tag, count in difficulty_tags.items():
-        diff_remaining[tag] = (count, 0)
-    for tag, count in custom_tags.items():
-        custom_remaining[tag] = (count, 0)
-    for points, count in points_distribution.items():
-        points_remaining[points] = (count, 0)
-
-    # Define known tag categories for categorization
-    bloom_tags_set = {'remember', 'understand', 'apply', 'analyze', 'evaluate', 'create'}
-    difficulty_tags_set = {'easy', 'medium', 'hard'}
-
-    # Count remaining (unused) questions per tag
-    for q in questions:
-        if q.get('identifier') in used_question_ids:
-            continue  # Skip used questions
-
-        q_tags = _parse_question_tags(q.get('tags', []))
-        q_tags_normalized = [t.lower() for t in q_tags]
-
-        # Categorize question tags
-        q_bloom = [t for t in q_tags_normalized if t in bloom_tags_set]
-        q_difficulty = [t for t in q_tags_normalized if t in difficulty_tags_set]
-        q_custom = [t for t in q_tags_normalized if t not in bloom_tags_set and t not in difficulty_tags_set]
-
-        q_points = q.get('points', 1)
-
-        # Check if question matches currently selected filters
-        matches_filters = True
-
-        # Check selected_bloom (OR within)
-        if selected_bloom:
-            bloom_match = any(b.lower() in q_bloom for b in selected_bloom)
-            if not bloom_match:
-                matches_filters = False
+    if tag_index is None:
+        tag_index = QuestionTagIndex(questions, parse_tags=_parse_question_tags)
 
-        # Check selected_difficulty (OR within)
-        if selected_difficulty:
-            diff_match = any(d.lower() in q_difficulty for d in selected_difficulty)
-            if not diff_match:
-                matches_filters = False
+    # Unused questions matching the current filters
+    available = tag_index.match(
+        selected_bloom, selected_difficulty, selected_custom, selected_points or None
+    ) & ~tag_index.ids_mask(used_question_ids)
 
-        # Check selected_custom (OR within)
-        if selected_custom:
-            custom_match = any(c.lower() in q_custom for c in selected_custom)
-            if not custom_match:
-                matches_filters = False
+    def remaining(counts: Dict, mask_of) -> Dict:
+        return {key: (count, tag_index.count(mask_of(key) & available))
+                for key, count in counts.items()}
 
-        # Check selected_points (OR within)
-        if selected_points:
-            if q_points not in selected_points:
-                matches_filters = False
-
-        # Only count if matches all filters
-        if matches_filters:
-            # Update remaining counts
-            for tag in q_tags:
-                tag_clean = tag.lstrip('#')
-
-                if tag_clean in bloom_tags:
-                    total, rem = bloom_remaining.get(tag_clean, (0, 0))
-                    bloom_remaining[tag_clean] = (total, rem + 1)
-                elif tag_clean in difficulty_tags:
-                    total, rem = diff_remaining.get(tag_clean, (0, 0))
-                    diff_remaining[tag_clean] = (total, rem + 1)
-                elif tag_clean in custom_tags:
-                    total, rem = custom_remaining.get(tag_clean, (0, 0))
-                    custom_remaining[tag_clean] = (total, rem + 1)
-
-            if q_points in points_distribution:
-                total, rem = points_remaining.get(q_points, (0, 0))
-                points_remaining[q_points] = (total, rem + 1)
+    bloom_remaining = remaining(bloom_tags, tag_index.tag_mask)
+    diff_remaining = remaining(difficulty_tags, tag_index.tag_mask)
+    custom_remaining = remaining(custom_tags, tag_index.tag_mask)
+    points_remaining = remaining(points_distribution, tag_index.points_mask)
 
     return bloom_remaining, diff_remaining, custom_remaining, points_remaining
 
@@ -296,6 +236,9 @@ def ask_create_question_set(quiz_dir: Path, quiz_data: dict) -> bool:
     if not questions:
         return False
 
+    # Tag/points bitsets answer every filter and count below
+    tag_index = QuestionTagIndex(questions, parse_tags=_parse_question_tags)
+
     # Analyze questions
     all_tags = set()
     points_distribution = {}
@@ -415,7 +358,8 @@ def ask_create_question_set(quiz_dir: Path, quiz_data: dict) -> bool:
                     selected_bloom=selected_bloom if selected_bloom else None,
                     selected_difficulty=selected_difficulty if selected_difficulty else None,
                     selected_custom=selected_custom if selected_custom else None,
-                    selected_points=selected_points if selected_points else None
+                    selected_points=selected_points if selected_points else None,
+                    tag_index=tag_index
                 )
 
             # Tag filtering
@@ -508,30 +452,10 @@ def ask_create_question_set(quiz_dir: Path, quiz_data: dict) -> bool:
                 console.print("      [dim](inga filter valda än)[/]")
 
             # Calculate preview count
-            temp_matching = 0
-            for q in questions:
-                if q.get('identifier') in used_question_ids:
-                    continue
-                if selected_points and q.get('points') not in selected_points:
-                    continue
-                if selected_bloom or selected_difficulty or selected_custom:
-                    q_tags = _parse_question_tags(q.get('tags', []))
-                    q_tags_normalized = [t.lower() for t in q_tags]
-                    bloom_tags_set = {'remember', 'understand', 'apply', 'analyze', 'evaluate', 'create'}
-                    difficulty_tags_set = {'easy', 'medium', 'hard'}
-                    q_bloom = [t for t in q_tags_normalized if t in bloom_tags_set]
-                    q_difficulty = [t for t in q_tags_normalized if t in difficulty_tags_set]
-                    q_custom = [t for t in q_tags_normalized if t not in bloom_tags_set and t not in difficulty_tags_set]
-                    if selected_bloom:
-                        if not any(b.lower() in q_bloom for b in selected_bloom):
-                            continue
-                    if selected_difficulty:
-                        if not any(d.lower() in q_difficulty for d in selected_difficulty):
-                            continue
-                    if selected_custom:
-                        if not any(c.lower() in q_custom for c in selected_custom):
-                            continue
-                temp_matching += 1
+            temp_matching = tag_index.count(
+                tag_index.match(selected_bloom, selected_difficulty, selected_custom, selected_points or None)
+                & ~tag_index.ids_mask(used_question_ids)
+            )
 
             console.print(f"      [bold green]→ {temp_matching} frågor matchar[/]")
 
@@ -546,49 +470,11 @@ def ask_create_question_set(quiz_dir: Path, quiz_data: dict) -> bool:
                 break
 
         # Preview: How many questions match filters?
-        matching_count = 0
-        for q in questions:
-            # Skip if already used
-            if q.get('identifier') in used_question_ids:
-                continue
-
-            # Check points filter (if any)
-            if selected_points and q.get('points') not in selected_points:
-                continue
-
-            # Check tags filter with categorized logic (OR within, AND between)
-            if selected_bloom or selected_difficulty or selected_custom:
-                q_tags = _parse_question_tags(q.get('tags', []))
-                q_tags_normalized = [t.lower() for t in q_tags]
-
-                # Define known tag categories
-                bloom_tags_set = {'remember', 'understand', 'apply', 'analyze', 'evaluate', 'create'}
-                difficulty_tags_set = {'easy', 'medium', 'hard'}
-
-                # Categorize question tags
-                q_bloom = [t for t in q_tags_normalized if t in bloom_tags_set]
-                q_difficulty = [t for t in q_tags_normalized if t in difficulty_tags_set]
-                q_custom = [t for t in q_tags_normalized if t not in bloom_tags_set and t not in difficulty_tags_set]
-
-                # Check Bloom filter (OR within category)
-                if selected_bloom:
-                    bloom_match = any(b.lower() in q_bloom for b in selected_bloom)
-                    if not bloom_match:
-                        continue
-
-                # Check Difficulty filter (OR within category)
-                if selected_difficulty:
-                    diff_match = any(d.lower() in q_difficulty for d in selected_difficulty)
-                    if not diff_match:
-                        continue
-
-                # Check Custom tags filter (OR within category)
-                if selected_custom:
-                    custom_match = any(c.lower() in q_custom for c in selected_custom)
-                    if not custom_match:
-                        continue
-
-            matching_count += 1
+        # (OR within category, AND between; questions already used are skipped)
+        section_mask = tag_index.match(
+            selected_bloom, selected_difficulty, selected_custom, selected_points or None
+        ) & ~tag_index.ids_mask(used_question_ids)
+        matching_count = tag_index.count(section_mask)
 
         # Show preview with categorized filter description
         filter_parts = []
@@ -650,48 +536,7 @@ def ask_create_question_set(quiz_dir: Path, quiz_data: dict) -> bool:
 
         # Mark questions as used for this section to prevent duplicates
         # Build the actual list of questions that match this section's filters
-        section_questions = []
-        for q in questions:
-            if q.get('identifier') in used_question_ids:
-                continue
-
-            # Check points filter
-            if selected_points and q.get('points') not in selected_points:
-                continue
-
-            # Check tags filter with categorized logic (OR within, AND between)
-            if selected_bloom or selected_difficulty or selected_custom:
-                q_tags = _parse_question_tags(q.get('tags', []))
-                q_tags_normalized = [t.lower() for t in q_tags]
-
-                # Define known tag categories
-                bloom_tags_set = {'remember', 'understand', 'apply', 'analyze', 'evaluate', 'create'}
-                difficulty_tags_set = {'easy', 'medium', 'hard'}
-
-                # Categorize question tags
-                q_bloom = [t for t in q_tags_normalized if t in bloom_tags_set]
-                q_difficulty = [t for t in q_tags_normalized if t in difficulty_tags_set]
-                q_custom = [t for t in q_tags_normalized if t not in bloom_tags_set and t not in difficulty_tags_set]
-
-                # Check Bloom filter (OR within category)
-                if selected_bloom:
-                    bloom_match = any(b.lower() in q_bloom for b in selected_bloom)
-                    if not bloom_match:
-                        continue
-
-                # Check Difficulty filter (OR within category)
-                if selected_difficulty:
-                    diff_match = any(d.lower() in q_difficulty for d in selected_difficulty)
-                    if not diff_match:
-                        continue
-
-                # Check Custom tags filter (OR within category)
-                if selected_custom:
-                    custom_match = any(c.lower() in q_custom for c in selected_custom)
-                    if not custom_match:
-                        continue
-
-            section_questions.append(q)
+        section_questions = tag_index.select(section_mask)
 
         # Append section config and the filtered questions together
         sections.append({
@@ -37,7 +37,7 @@ from datetime import datetime
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.parser.markdown_parser import MarkdownQuizParser
+from src.parser.bank_cache import load_parse_result
 from src.generator.resource_manager import ResourceManager
 
 
@@ -219,8 +219,8 @@ After resources are copied, run step4_generate_xml.py.
         if args.verbose:
             print("Parsing markdown content...")
 
-        parser = MarkdownQuizParser(markdown_content)
-        quiz_data = parser.parse()
+        # Parsed by step 1 already - reuse its cached result if unchanged
+        quiz_data = load_parse_result(markdown_content).to_parse_dict()
 
         num_questions = len(quiz_data['questions'])
         print(f"Found {num_questions} questions")
@@ -12,6 +12,8 @@ Options:
     --markdown-file FILE    Path to markdown file (overrides metadata.json)
     --quiz-dir DIR          Quiz output directory (overrides metadata.json)
     --language LANG         Question language code (default: en)
+    --workers N             Worker processes for XML generation
+                            (default: auto, 1 = serial)
     -v, --verbose          Show detailed information
 
 Exit codes:
@@ -32,18 +34,18 @@ Example:
 import sys
 import json
 import argparse
-import os
-import re
 from pathlib import Path
 from datetime import datetime
-from typing import Dict
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.parser.markdown_parser import MarkdownQuizParser
-from src.generator.xml_generator import XMLGenerator
+from src.parser.bank_cache import load_parse_result
+from src.generator.xml_generator import XMLGenerationError, XMLGenerator
+from src.generator.resource_manager import apply_resource_mapping
+from src.generator.score_table import build_score_table, write_score_table
+from src.packager.qti_packager import media_references
 
 
 def load_metadata(workflow_dir: Path) -> dict:
@@ -84,107 +86,6 @@ def save_xml_metadata(workflow_dir: Path, xml_files: list, quiz_data: dict, asse
         json.dump(metadata, f, indent=2, ensure_ascii=False)
 
 
-def update_image_paths_in_text(text: str, resource_mapping: Dict[str, str]) -> str:
-    """
-    Replace original image filenames with renamed ones in markdown text.
-
-    Handles markdown image syntax: ![alt](path)
-    Updates paths to use ResourceManager's renamed files (with question ID prefix and sanitization).
-
-    Args:
-        text: Text containing markdown image references
-        resource_mapping: Dict mapping original filenames to renamed filenames
-
-    Returns:
-        Text with updated image paths
-    """
-    # Create normalized mapping with basename keys for easy lookup
-    basename_mapping = {os.path.basename(k): v for k, v in resource_mapping.items()}
-
-    def replace_image(match):
-        alt = match.group(1)
-        original_path = match.group(2)
-        # Extract just the filename to match resource_mapping keys
-        basename = os.path.basename(original_path)
-        # Use renamed path if available, otherwise keep original
-        renamed = basename_mapping.get(basename, basename)
-        return f'![{alt}](resources/{renamed})'
-
-    # Replace markdown image syntax: ![alt](path)
-    return re.sub(r'!\[([^\]]*)\]\(([^)]+)\)', replace_image, text)
-
-
-def normalize_resource_path(path: str) -> str:
-    """Strip resources/ prefix variants to get just the filename for mapping lookup."""
-    for prefix in ['resources/', 'Resources/', './resources/', './Resources/']:
-        if path.startswith(prefix):
-            return path[len(prefix):]
-    return path
-
-
-def apply_resource_mapping(questions: list, resource_mapping: dict, verbose: bool = False):
-    """
-    Update question data with renamed resource paths.
-
-    Args:
-        questions: List of question dictionaries
-        resource_mapping: Dict mapping original filenames to renamed filenames
-        verbose: If True, print detailed updates
-    """
-    # Create normalized mapping (keys without resources/ prefix)
-    normalized_mapping = {normalize_resource_path(k): v for k, v in resource_mapping.items()}
-
-    for question in questions:
-        # 1. Handle explicit image field (hotspot, graphicgapmatch, text_entry_graphic)
-        if 'image' in question and isinstance(question['image'], dict):
-            original_path = question['image'].get('path', '')
-            # Normalize path for lookup
-            lookup_key = normalize_resource_path(original_path)
-            if lookup_key in normalized_mapping:
-                # Set renamed path WITH resources/ prefix for QTI
-                renamed = normalized_mapping[lookup_key]
-                question['image']['path'] = f'resources/{renamed}'
-                if verbose:
-                    print(f"    Updated image path: {original_path} → resources/{renamed}")
-
-        # 2. Handle inline markdown images in question_text
-        if 'question_text' in question and question['question_text']:
-            question['question_text'] = update_image_paths_in_text(
-                question['question_text'], resource_mapping
-            )
-
-        # 3. Handle images in feedback
-        if 'feedback' in question:
-            for key in ['general', 'correct', 'incorrect', 'unanswered']:
-                if key in question['feedback'] and question['feedback'][key]:
-                    question['feedback'][key] = update_image_paths_in_text(
-                        question['feedback'][key], resource_mapping
-                    )
-
-            # Option-specific feedback (for multiple choice questions)
-            if 'option_specific' in question['feedback'] and question['feedback']['option_specific']:
-                for option_id, feedback_text in question['feedback']['option_specific'].items():
-                    if feedback_text:
-                        question['feedback']['option_specific'][option_id] = update_image_paths_in_text(
-                            feedback_text, resource_mapping
-                        )
-
-        # 4. Handle images in Match question premises/responses
-        if 'premises' in question:
-            for premise in question['premises']:
-                if 'text' in premise and premise['text']:
-                    premise['text'] = update_image_paths_in_text(
-                        premise['text'], resource_mapping
-                    )
-
-        if 'match_responses' in question:
-            for response in question['match_responses']:
-                if 'text' in response and response['text']:
-                    response['text'] = update_image_paths_in_text(
-                        response['text'], resource_mapping
-                    )
-
-
 def main():
     parser = argparse.ArgumentParser(
         description='Step 4: Generate QTI XML files',
@@ -224,6 +125,14 @@ After XML generation, run step5_create_zip.py.
         help='Question language code (default: en)'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes for XML generation (default: one per CPU for large '
+             'banks, 1 = serial)'
+    )
+
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -309,8 +218,8 @@ After XML generation, run step5_create_zip.py.
         if args.verbose:
             print("Parsing markdown content...")
 
-        parser = MarkdownQuizParser(markdown_content)
-        quiz_data = parser.parse()
+        # Parsed by step 1 already - reuse its cached result if unchanged
+        quiz_data = load_parse_result(markdown_content).to_parse_dict()
 
         num_questions = len(quiz_data['questions'])
         print(f"Found {num_questions} questions")
@@ -331,56 +240,61 @@ After XML generation, run step5_create_zip.py.
         xml_generator = XMLGenerator()
         xml_files = []
 
-        for i, question in enumerate(quiz_data['questions'], 1):
+        try:
+            xml_contents = xml_generator.generate_questions(
+                quiz_data['questions'],
+                language=args.language,
+                workers=args.workers
+            )
+        except XMLGenerationError as gen_error:
+            # Enhanced error message
+            i = gen_error.index + 1
+            e = gen_error.error
+            question = quiz_data['questions'][gen_error.index]
+            q_id = question.get('identifier', f'Q{i:03d}')
+            q_type = question.get('question_type', 'unknown')
+            q_title = question.get('title', 'Unknown Title')
+
+            print(f"\n{'='*70}", file=sys.stderr)
+            print(f"✗ ERROR: Failed to generate question {i}/{num_questions}", file=sys.stderr)
+            print(f"{'='*70}", file=sys.stderr)
+            print(f"Question ID:   {q_id}", file=sys.stderr)
+            print(f"Question Type: {q_type}", file=sys.stderr)
+            print(f"Title:         {q_title}", file=sys.stderr)
+            print(f"\nError Details: {str(e)}", file=sys.stderr)
+
+            if 'KeyError' in str(type(e).__name__):
+                print(f"\n💡 Suggestion: Missing required field for {q_type} questions.", file=sys.stderr)
+                print(f"   Check that all required sections are present in the markdown.", file=sys.stderr)
+
+            print(f"{'='*70}\n", file=sys.stderr)
+
+            if args.verbose:
+                import traceback
+                traceback.print_exception(type(e), e, e.__traceback__)
+
+            sys.exit(1)
+
+        for i, (question, xml_content) in enumerate(zip(quiz_data['questions'], xml_contents), 1):
             q_id = question.get('identifier', f'Q{i:03d}')
 
             if args.verbose:
-                print(f"  [{i}/{num_questions}] Generating: {q_id}")
-
-            try:
-                xml_content = xml_generator.generate_question(
-                    question,
-                    language=args.language
-                )
-
-                # Save XML file
-                xml_filename = f"{q_id}-item.xml"
-                xml_path = quiz_dir / xml_filename
-
-                with open(xml_path, 'w', encoding='utf-8') as f:
-                    f.write(xml_content)
-
-                xml_files.append({
-                    'identifier': q_id,
-                    'filename': xml_filename,
-                    'path': str(xml_path),
-                    'metadata': question  # Include question metadata (tags, title, points, etc.)
-                })
-
-            except Exception as e:
-                # Enhanced error message
-                q_type = question.get('question_type', 'unknown')
-                q_title = question.get('title', 'Unknown Title')
-
-                print(f"\n{'='*70}", file=sys.stderr)
-                print(f"✗ ERROR: Failed to generate question {i}/{num_questions}", file=sys.stderr)
-                print(f"{'='*70}", file=sys.stderr)
-                print(f"Question ID:   {q_id}", file=sys.stderr)
-                print(f"Question Type: {q_type}", file=sys.stderr)
-                print(f"Title:         {q_title}", file=sys.stderr)
-                print(f"\nError Details: {str(e)}", file=sys.stderr)
-
-                if 'KeyError' in str(type(e).__name__):
-                    print(f"\n💡 Suggestion: Missing required field for {q_type} questions.", file=sys.stderr)
-                    print(f"   Check that all required sections are present in the markdown.", file=sys.stderr)
-
-                print(f"{'='*70}\n", file=sys.stderr)
+                print(f"  [{i}/{num_questions}] Generated: {q_id}")
 
-                if args.verbose:
-                    import traceback
-                    traceback.print_exc()
+            # Save XML file
+            xml_filename = f"{q_id}-item.xml"
+            xml_path = quiz_dir / xml_filename
+
+            with open(xml_path, 'w', encoding='utf-8') as f:
+                f.write(xml_content)
 
-                sys.exit(1)
+            xml_files.append({
+                'identifier': q_id,
+                'filename': xml_filename,
+                'path': str(xml_path),
+                'media': media_references(xml_content),  # Read by step 5 for the manifest
+                'metadata': dict(question)  # Include question metadata (tags, title, points, etc.)
+            })
 
         print(f"✓ Generated {len(xml_files)} XML files")
         print()
@@ -405,8 +319,13 @@ After XML generation, run step5_create_zip.py.
 
         # Save metadata for next step
         save_xml_metadata(workflow_dir, xml_files, quiz_data, assessment_test_xml=assessment_test_xml)
+        score_table_path = write_score_table(workflow_dir, build_score_table(
+            quiz_data['questions'],
+            [(xml_file['identifier'], xml_content) for xml_file, xml_content in zip(xml_files, xml_contents)]
+        ))
         if args.verbose:
             print(f"✓ Saved XML metadata: {workflow_dir / 'xml_files.json'}")
+            print(f"✓ Saved score table:  {score_table_path}")
             print()
 
         # Print summary
@@ -10,7 +10,9 @@ Usage:
 Options:
     --quiz-dir DIR          Quiz output directory (overrides metadata.json)
     --output-name NAME      Output ZIP filename (default: quiz_dir name)
-    --no-keep-folder       Delete extracted folder after zipping
+    --no-keep-folder       Delete extracted folder after zipping (the ZIP is
+                           streamed from memory instead of the folder)
+    --compression-level N  Deflate level 0-9 (default: 6)
     -v, --verbose          Show detailed information
 
 Exit codes:
@@ -39,6 +41,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.packager.qti_packager import QTIPackager
+from src.generator.score_table import read_score_table, write_score_table
 
 
 def load_metadata(workflow_dir: Path) -> dict:
@@ -113,6 +116,14 @@ This is Step 5 (final step) of the QTI generation pipeline.
         help='Delete extracted folder after creating ZIP (default: keep folder)'
     )
 
+    parser.add_argument(
+        '--compression-level',
+        type=int,
+        choices=range(10),
+        metavar='N',
+        help='Deflate level 0-9 for the ZIP (default: 6). Images and audio are always stored uncompressed'
+    )
+
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -225,6 +236,11 @@ This is Step 5 (final step) of the QTI generation pipeline.
             if 'metadata' in xml_file:
                 questions_metadata.append(xml_file['metadata'])
 
+        # Media references recorded by step 4 (older xml_files.json has none)
+        media_index = None
+        if all('media' in xml_file for xml_file in xml_files):
+            media_index = [xml_file['media'] for xml_file in xml_files]
+
         # Get quiz metadata and add questions list
         quiz_metadata = xml_metadata.get('quiz_metadata', {})
         quiz_metadata['questions'] = questions_metadata
@@ -242,7 +258,7 @@ This is Step 5 (final step) of the QTI generation pipeline.
                 print("  Inget Question Set hittades - skapar vanligt quiz-paket")
 
         # Initialize packager
-        packager = QTIPackager(output_dir=str(output_base))
+        packager = QTIPackager(output_dir=str(output_base), compresslevel=args.compression_level)
 
         # Create package
         if args.verbose:
@@ -255,12 +271,20 @@ This is Step 5 (final step) of the QTI generation pipeline.
             output_filename=output_filename,
             keep_folder=not args.no_keep_folder,
             base_dir=str(output_base),
-            assessment_test_xml=assessment_test_xml
+            assessment_test_xml=assessment_test_xml,
+            stream=args.no_keep_folder,
+            media_index=media_index
         )
 
         print(f"✓ Package created successfully")
         print()
 
+        # Packaging rewrote the item files: record their new modification
+        # times, or the validator would re-read every item's XML
+        score_table = read_score_table(workflow_dir)
+        if score_table is not None:
+            write_score_table(workflow_dir, score_table)
+
         # Move ZIP to parent directory (Struktur B: ZIP bredvid folder, inte inne i den)
         zip_path = Path(result['zip_path'])
         parent_dir = quiz_dir.parent
@@ -13,12 +13,21 @@ This script:
 - Calculates expected max scores from sections and question references
 - Compares with declared inspera:maximumScore
 - Reports any discrepancies
+
+Question scores come from the score table step 4 writes
+(.workflow/scores.json); items missing from it are read from their XML.
 """
 
 import sys
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.generator.score_table import load_score_table, read_item_score
 
 
 def parse_assessment_xml(xml_path: Path) -> Tuple[float, List[Dict]]:
@@ -78,66 +87,67 @@ def parse_assessment_xml(xml_path: Path) -> Tuple[float, List[Dict]]:
     return declared_max_score, sections
 
 
-def get_question_score(quiz_dir: Path, item_href: str) -> int:
+def get_question_score(quiz_dir: Path, item_href: str,
+                       scores: Optional[Dict[str, Dict[str, Any]]] = None) -> int:
     """
-    Read individual question XML and extract its score (mapped value).
+    Get a question's score (mapped value) from the score table or its XML.
 
     Args:
         quiz_dir: Directory containing question XML files
         item_href: Filename of the question (e.g., "QUESTION_001-item.xml")
+        scores: Score table entries (load_score_table); the entry is used
+            only if the item file still has the size and modification
+            time it was written with
 
     Returns:
         Point value of the question (default 1 if not found)
     """
     item_path = quiz_dir / item_href
-    if not item_path.exists():
+    try:
+        st = item_path.stat()
+    except OSError:
         print(f"  ⚠ Warning: Question file not found: {item_href}")
         return 1
 
+    entry = scores.get(item_href) if scores else None
+    if (entry is not None and entry.get('bytes') == st.st_size
+            and entry.get('mtime_ns') == st.st_mtime_ns):
+        return entry['score']
+
     try:
-        tree = ET.parse(item_path)
-        root = tree.getroot()
-
-        # Look for responseDeclaration with SCORE identifier
-        ns = {'qti': 'http://www.imsglobal.org/xsd/imsqti_v2p2'}
-        response_decl = root.find(".//qti:responseDeclaration[@identifier='RESPONSE']", ns)
-
-        if response_decl is not None:
-            # Find mapping with correct answer
-            mapping = response_decl.find('.//qti:mapping', ns)
-            if mapping is not None:
-                map_entries = mapping.findall('.//qti:mapEntry', ns)
-                if map_entries:
-                    # Get the mapped value (assuming all correct answers have same value)
-                    mapped_value = map_entries[0].get('mappedValue')
-                    if mapped_value:
-                        return int(float(mapped_value))
-
-        return 1  # Default if not found
+        # Reads only up to the RESPONSE declaration
+        score = read_item_score(item_path)
+        # Get the mapped value (assuming all correct answers have same value)
+        return 1 if score is None else score  # Default if not found
 
     except Exception as e:
         print(f"  ⚠ Warning: Could not parse {item_href}: {e}")
         return 1
 
 
-def calculate_expected_score(quiz_dir: Path, sections: List[Dict]) -> float:
+def calculate_expected_score(quiz_dir: Path, sections: List[Dict],
+                             scores: Optional[Dict[str, Dict[str, Any]]] = None) -> float:
     """
     Calculate expected maximum score based on section configuration.
 
     Args:
         quiz_dir: Directory containing question XML files
         sections: List of section info dicts
+        scores: Score table entries (default: read from quiz_dir/.workflow)
 
     Returns:
         Expected total max score
     """
+    if scores is None:
+        scores = load_score_table(quiz_dir)
+
     total_score = 0.0
 
     for section in sections:
         # Get point value from first question in section (assume all same points)
         if section['item_hrefs']:
             first_item = section['item_hrefs'][0]
-            points_per_question = get_question_score(quiz_dir, first_item)
+            points_per_question = get_question_score(quiz_dir, first_item, scores)
         else:
             points_per_question = 1
 
@@ -10,8 +10,8 @@ import sys
 from pathlib import Path
 
 from src.parser import MarkdownQuizParser
-from src.generator import XMLGenerator
-from src.packager import QTIPackager
+from src.generator import XMLGenerationError, XMLGenerator
+from src.packager import QTIPackager, media_references
 from src.error_handler import ParsingError, ErrorSuggester
 from src.generator.resource_manager import (
     ResourceManager,
@@ -133,10 +133,25 @@ See docs/markdown_specification.md for details.
         help='Validate QTI package structure'
     )
 
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes for XML generation (default: one per CPU for large banks, 1 = serial)'
+    )
+
     parser.add_argument(
         '--no-keep-folder',
         action='store_true',
-        help='Delete extracted folder after creating ZIP (keep ZIP only)'
+        help='Delete extracted folder after creating ZIP (keep ZIP only). The ZIP is streamed from memory'
+    )
+
+    parser.add_argument(
+        '--compression-level',
+        type=int,
+        choices=range(10),
+        metavar='N',
+        help='Deflate level 0-9 for the ZIP (default: 6). Images and audio are always stored uncompressed'
     )
 
     parser.add_argument(
@@ -243,6 +258,10 @@ See docs/markdown_specification.md for details.
         with open(input_path, 'r', encoding='utf-8') as f:
             markdown_content = f.read()
 
+        # One parser for validation and parsing - parse() reuses the
+        # result of validate() instead of parsing the file again
+        quiz_parser = MarkdownQuizParser(markdown_content)
+
         # Validate if requested
         if args.validate_only or args.verbose:
             if args.verbose or args.validate_only:
@@ -254,7 +273,7 @@ See docs/markdown_specification.md for details.
 
             try:
                 from validate_mqg_format import validate_content
-                is_valid, issues = validate_content(markdown_content)
+                is_valid, issues = validate_content(markdown_content, parser=quiz_parser)
 
                 if not is_valid:
                     print("\n✗ Validation failed with the following issues:\n")
@@ -321,7 +340,6 @@ See docs/markdown_specification.md for details.
         if args.verbose:
             print("Parsing markdown content...")
 
-        quiz_parser = MarkdownQuizParser(markdown_content)
         quiz_data = quiz_parser.parse()
 
         num_questions = len(quiz_data['questions'])
@@ -478,57 +496,61 @@ See docs/markdown_specification.md for details.
             print("Generating QTI XML...")
 
         xml_generator = XMLGenerator()
-        questions_xml = []
 
-        for i, question in enumerate(quiz_data['questions'], 1):
-            if args.verbose:
+        if args.verbose:
+            for i, question in enumerate(quiz_data['questions'], 1):
                 print(f"  Generating question {i}/{num_questions}: {question.get('identifier', 'unknown')}")
 
-            try:
-                xml_content = xml_generator.generate_question(
-                    question,
-                    language=args.language
-                )
-
-                questions_xml.append((
-                    question.get('identifier', f'Q{i:03d}'),
-                    xml_content
-                ))
-
-            except Exception as e:
-                # Enhanced error message with question context
-                q_id = question.get('identifier', f'Q{i:03d}')
-                q_type = question.get('type', 'unknown')
-                q_title = question.get('title', 'Unknown Title')
-
-                print(f"\n{'='*70}", file=sys.stderr)
-                print(f"ERROR: Failed to generate question {i}/{num_questions}", file=sys.stderr)
-                print(f"{'='*70}", file=sys.stderr)
-                print(f"Question ID: {q_id}", file=sys.stderr)
-                print(f"Question Type: {q_type}", file=sys.stderr)
-                print(f"Title: {q_title}", file=sys.stderr)
-                print(f"\nError Details: {str(e)}", file=sys.stderr)
-
-                # Suggest fix based on question type
-                if 'KeyError' in str(type(e).__name__):
-                    print(f"\n💡 Suggestion: Missing required field for {q_type} questions.", file=sys.stderr)
-                    print(f"   Check that all required sections are present in the markdown.", file=sys.stderr)
-
-                print(f"{'='*70}\n", file=sys.stderr)
-
-                if not args.verbose:
-                    print("Run with --verbose for full traceback", file=sys.stderr)
-                else:
-                    import traceback
-                    traceback.print_exc()
+        try:
+            xml_contents = xml_generator.generate_questions(
+                quiz_data['questions'],
+                language=args.language,
+                workers=args.workers
+            )
+
+        except XMLGenerationError as gen_error:
+            # Enhanced error message with question context
+            i = gen_error.index + 1
+            e = gen_error.error
+            question = quiz_data['questions'][gen_error.index]
+            q_id = question.get('identifier', f'Q{i:03d}')
+            q_type = question.get('type', 'unknown')
+            q_title = question.get('title', 'Unknown Title')
+
+            print(f"\n{'='*70}", file=sys.stderr)
+            print(f"ERROR: Failed to generate question {i}/{num_questions}", file=sys.stderr)
+            print(f"{'='*70}", file=sys.stderr)
+            print(f"Question ID: {q_id}", file=sys.stderr)
+            print(f"Question Type: {q_type}", file=sys.stderr)
+            print(f"Title: {q_title}", file=sys.stderr)
+            print(f"\nError Details: {str(e)}", file=sys.stderr)
+
+            # Suggest fix based on question type
+            if 'KeyError' in str(type(e).__name__):
+                print(f"\n💡 Suggestion: Missing required field for {q_type} questions.", file=sys.stderr)
+                print(f"   Check that all required sections are present in the markdown.", file=sys.stderr)
+
+            print(f"{'='*70}\n", file=sys.stderr)
+
+            if not args.verbose:
+                print("Run with --verbose for full traceback", file=sys.stderr)
+            else:
+                import traceback
+                traceback.print_exception(type(e), e, e.__traceback__)
 
-                sys.exit(1)
+            sys.exit(1)
+
+        questions_xml = [
+            (question.get('identifier', f'Q{i:03d}'), xml_content)
+            for i, (question, xml_content) in enumerate(zip(quiz_data['questions'], xml_contents), 1)
+        ]
+        media_index = [media_references(xml_content) for xml_content in xml_contents]
 
         # Package into QTI ZIP
         if args.verbose:
             print("Creating QTI package...")
 
-        packager = QTIPackager()
+        packager = QTIPackager(compresslevel=args.compression_level)
 
         # Prepare metadata with questions for labels
         package_metadata = {
@@ -544,7 +566,9 @@ See docs/markdown_specification.md for details.
             package_metadata,
             output_file,
             keep_folder=not args.no_keep_folder,
-            base_dir=str(output_base_dir)
+            base_dir=str(output_base_dir),
+            stream=args.no_keep_folder,
+            media_index=media_index
         )
 
         # Display results
@@ -5,6 +5,6 @@ This module provides functionality to generate QTI 2.2 XML files from
 parsed question data using templates.
 """
 
-from .xml_generator import XMLGenerator
+from .xml_generator import XMLGenerationError, XMLGenerator
 
-__all__ = ['XMLGenerator']
+__all__ = ['XMLGenerator', 'XMLGenerationError']
@@ -25,6 +25,10 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Known tag categories (compared lowercase); other tags are custom tags
+BLOOM_TAGS = frozenset({'remember', 'understand', 'apply', 'analyze', 'evaluate', 'create'})
+DIFFICULTY_TAGS = frozenset({'easy', 'medium', 'hard'})
+
 
 @dataclass
 class SectionConfig:
@@ -44,6 +48,140 @@ class SectionConfig:
     shuffle: bool = True
 
 
+def _split_tags(tags) -> List[str]:
+    """Question tags as _filter_questions has always read them."""
+    if isinstance(tags, str):
+        return [tag.strip() for tag in tags.split(',')]
+    return list(tags or [])
+
+
+def _bitset(ordinals: List[int], size: int) -> int:
+    """Int with the given bits set (built in one pass)."""
+    buffer = bytearray((size + 7) // 8)
+    for i in ordinals:
+        buffer[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+class QuestionTagIndex:
+    """Inverted index of question tags and points for section filtering.
+
+    Built once per bank: every tag and point value maps to a bitset (int) of
+    question ordinals, so a section filter is a few ORs and ANDs instead of
+    re-normalizing every question's tags for every section.
+
+    Filter logic (same as SectionConfig):
+    - Within a category (bloom/difficulty/custom/points): OR
+    - Between categories: AND
+
+    Usage:
+        index = QuestionTagIndex(questions)
+        mask = index.match(bloom=['Remember'], points=[1, 2])
+        index.select(mask & ~index.ids_mask(used_ids))
+    """
+
+    def __init__(self, questions: List[Dict[str, Any]], parse_tags=None):
+        """
+        Args:
+            questions: Question dicts with 'tags', 'points' and 'identifier'
+            parse_tags: Function turning a question's 'tags' value into a
+                list of tag strings (default: list as-is or comma-separated)
+        """
+        parse_tags = parse_tags or _split_tags
+        self.questions = questions
+        self.size = len(questions)
+        self.all = (1 << self.size) - 1
+
+        # category -> lowercase tag -> ordinals; raw tag/points/id -> ordinals
+        categories = {'bloom': {}, 'difficulty': {}, 'custom': {}}
+        raw_tags, points, ids = {}, {}, {}
+        for i, q in enumerate(questions):
+            for tag in parse_tags(q.get('tags', [])):
+                tag = tag.lstrip('#')
+                raw_tags.setdefault(tag, []).append(i)
+                normalized = tag.lower()
+                if normalized in BLOOM_TAGS:
+                    category = 'bloom'
+                elif normalized in DIFFICULTY_TAGS:
+                    category = 'difficulty'
+                else:
+                    category = 'custom'
+                categories[category].setdefault(normalized, []).append(i)
+            points.setdefault(q.get('points', 1), []).append(i)
+            ids.setdefault(q.get('identifier'), []).append(i)
+
+        self._categories = {
+            category: {tag: _bitset(ords, self.size) for tag, ords in tags.items()}
+            for category, tags in categories.items()
+        }
+        self._raw_tags = {tag: _bitset(ords, self.size) for tag, ords in raw_tags.items()}
+        self._points = {value: _bitset(ords, self.size) for value, ords in points.items()}
+        self._ids = {qid: _bitset(ords, self.size) for qid, ords in ids.items()}
+
+    def _any_of(self, category: str, tags: List[str]) -> int:
+        bitsets = self._categories[category]
+        mask = 0
+        for tag in tags:
+            mask |= bitsets.get(tag.lower(), 0)
+        return mask
+
+    def match(
+        self,
+        bloom: Optional[List[str]] = None,
+        difficulty: Optional[List[str]] = None,
+        custom: Optional[List[str]] = None,
+        points: Optional[List[int]] = None
+    ) -> int:
+        """Bitset of the questions matching a filter.
+
+        Empty tag lists mean no filter; points=[] matches nothing (as in
+        SectionConfig.filter_points).
+        """
+        mask = self.all
+        if points is not None:
+            selected = 0
+            for value in points:
+                selected |= self._points.get(value, 0)
+            mask &= selected
+        if bloom:
+            mask &= self._any_of('bloom', bloom)
+        if difficulty:
+            mask &= self._any_of('difficulty', difficulty)
+        if custom:
+            mask &= self._any_of('custom', custom)
+        return mask
+
+    def match_section(self, config: SectionConfig) -> int:
+        """Bitset of the questions a section's filters select."""
+        return self.match(config.filter_bloom, config.filter_difficulty,
+                          config.filter_custom, config.filter_points)
+
+    def tag_mask(self, tag: str) -> int:
+        """Questions carrying a tag (exact spelling, without '#')."""
+        return self._raw_tags.get(tag, 0)
+
+    def points_mask(self, points: Any) -> int:
+        """Questions worth the given points."""
+        return self._points.get(points, 0)
+
+    def ids_mask(self, identifiers) -> int:
+        """Questions with any of the given identifiers."""
+        mask = 0
+        for qid in identifiers:
+            mask |= self._ids.get(qid, 0)
+        return mask
+
+    @staticmethod
+    def count(mask: int) -> int:
+        """Number of questions in a bitset."""
+        return bin(mask).count('1')
+
+    def select(self, mask: int) -> List[Dict[str, Any]]:
+        """Questions in a bitset, in bank order."""
+        bits = bin(mask)[:1:-1]
+        return [self.questions[i] for i, bit in enumerate(bits) if bit == '1']
+
+
 class AssessmentTestGenerator:
     """Generates QTI assessmentTest XML for Question Sets."""
 
@@ -87,6 +225,7 @@ class AssessmentTestGenerator:
 
         # Build sections
         sections_xml = []
+        tag_index = None
         for i, section_data in enumerate(sections, 1):
             # Check if sections is dict (new format) or SectionConfig (old format)
             if isinstance(section_data, dict):
@@ -96,7 +235,9 @@ class AssessmentTestGenerator:
             else:
                 # Backward compatibility: old format (SectionConfig only)
                 section_config = section_data
-                section_questions = self._filter_questions(questions, section_config)
+                if tag_index is None:
+                    tag_index = QuestionTagIndex(questions)
+                section_questions = self._filter_questions(questions, section_config, tag_index)
 
             if not section_questions:
                 continue  # Skip empty sections
@@ -189,8 +330,9 @@ class AssessmentTestGenerator:
         test_part.set('submissionMode', 'simultaneous')
 
         # Generate sections
+        tag_index = QuestionTagIndex(questions)
         for i, section_config in enumerate(sections, 1):
-            section_questions = self._filter_questions(questions, section_config)
+            section_questions = self._filter_questions(questions, section_config, tag_index)
 
             if not section_questions:
                 continue  # Skip empty sections
@@ -208,7 +350,8 @@ class AssessmentTestGenerator:
     def _filter_questions(
         self,
         questions: List[Dict[str, Any]],
-        section_config: SectionConfig
+        section_config: SectionConfig,
+        tag_index: Optional[QuestionTagIndex] = None
     ) -> List[Dict[str, Any]]:
         """Filter questions based on section configuration.
 
@@ -216,52 +359,12 @@ class AssessmentTestGenerator:
         - Within a category (Bloom, Difficulty, Custom): OR
         - Between categories: AND
         Example: (Remember OR Understand) AND Easy AND Cellbiologi
-        """
-        filtered = []
-
-        # Define known tag categories
-        bloom_tags = {'remember', 'understand', 'apply', 'analyze', 'evaluate', 'create'}
-        difficulty_tags = {'easy', 'medium', 'hard'}
 
-        for q in questions:
-            # Check points filter (OR logic within points)
-            if section_config.filter_points is not None:
-                q_points = q.get('points', 1)
-                if q_points not in section_config.filter_points:
-                    continue
-
-            # Get question tags
-            q_tags = q.get('tags', [])
-            if isinstance(q_tags, str):
-                q_tags = [tag.strip() for tag in q_tags.split(',')]
-            q_tags_normalized = [t.lstrip('#').lower() for t in q_tags]
-
-            # Categorize question tags
-            q_bloom = [t for t in q_tags_normalized if t in bloom_tags]
-            q_difficulty = [t for t in q_tags_normalized if t in difficulty_tags]
-            q_custom = [t for t in q_tags_normalized if t not in bloom_tags and t not in difficulty_tags]
-
-            # Check Bloom filter (OR within category)
-            if section_config.filter_bloom:
-                bloom_match = any(b in q_bloom for b in [t.lower() for t in section_config.filter_bloom])
-                if not bloom_match:
-                    continue
-
-            # Check Difficulty filter (OR within category)
-            if section_config.filter_difficulty:
-                diff_match = any(d in q_difficulty for d in [t.lower() for t in section_config.filter_difficulty])
-                if not diff_match:
-                    continue
-
-            # Check Custom tags filter (OR within category)
-            if section_config.filter_custom:
-                custom_match = any(c in q_custom for c in [t.lower() for t in section_config.filter_custom])
-                if not custom_match:
-                    continue
-
-            filtered.append(q)
-
-        return filtered
+        Pass the bank's QuestionTagIndex when filtering several sections.
+        """
+        if tag_index is None:
+            tag_index = QuestionTagIndex(questions)
+        return tag_index.select(tag_index.match_section(section_config))
 
     def _create_section(
         self,
@@ -352,10 +455,6 @@ def parse_question_set_config(frontmatter: Dict[str, Any]) -> Optional[List[Sect
     if not sections_data:
         return None
 
-    # Define known tag categories for auto-categorization
-    bloom_tags = {'remember', 'understand', 'apply', 'analyze', 'evaluate', 'create'}
-    difficulty_tags = {'easy', 'medium', 'hard'}
-
     sections = []
     for s in sections_data:
         filter_config = s.get('filter', {})
@@ -382,9 +481,9 @@ def parse_question_set_config(frontmatter: Dict[str, Any]) -> Optional[List[Sect
 
                 for tag in old_tags:
                     tag_lower = tag.lower()
-                    if tag_lower in bloom_tags:
+                    if tag_lower in BLOOM_TAGS:
                         bloom_list.append(tag)
-                    elif tag_lower in difficulty_tags:
+                    elif tag_lower in DIFFICULTY_TAGS:
                         difficulty_list.append(tag)
                     else:
                         custom_list.append(tag)
@@ -17,9 +17,13 @@ Version: 1.0.0
 """
 
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, TextIO, Tuple
 from dataclasses import dataclass
 import logging
+import os
+import re
+
+from .resource_store import HASH_CACHE_FILENAME, HashCache, place_file
 
 logger = logging.getLogger(__name__)
 
@@ -89,7 +93,8 @@ class ResourceManager:
                  input_file: Path,
                  output_dir: Path,
                  media_dir: Optional[Path] = None,
-                 strict: bool = False):
+                 strict: bool = False,
+                 link_mode: str = 'auto'):
         """
         Initialize ResourceManager.
 
@@ -98,6 +103,8 @@ class ResourceManager:
             output_dir: Path to output directory
             media_dir: Optional media directory (auto-detect if None)
             strict: If True, treat warnings as errors
+            link_mode: How copy_resources() places files: 'reflink',
+                'hardlink', 'copy', or 'auto' (first one the filesystem allows)
 
         Examples:
             # Local workflow
@@ -113,6 +120,8 @@ class ResourceManager:
         self.input_file = Path(input_file).expanduser().resolve()
         self.output_dir = Path(output_dir).expanduser().resolve()
         self.strict = strict
+        self.link_mode = link_mode
+        self.copy_stats: Dict[str, int] = {}
 
         # Auto-detect media directory if not provided
         if media_dir:
@@ -161,6 +170,26 @@ class ResourceManager:
         logger.warning(f"No media directory found, using fallback: {fallback}")
         return fallback
 
+    def referenced_resources(self, questions: List[Dict]) -> List[str]:
+        """
+        List the resources referenced by questions, in first-use order.
+
+        Paths are the original references (relative to media_dir), so call
+        this before apply_resource_mapping() rewrites them.
+
+        Args:
+            questions: List of parsed question dictionaries
+
+        Returns:
+            List of unique resource file paths (relative to media_dir)
+        """
+        resources = []
+        for question in questions:
+            for path in self._extract_resources(question):
+                if path not in resources:
+                    resources.append(path)
+        return resources
+
     def validate_resources(self, questions: List[Dict]) -> List[ResourceIssue]:
         """
         Validate all resources referenced in questions.
@@ -304,7 +333,8 @@ class ResourceManager:
 
         return quiz_dir
 
-    def copy_resources(self, questions: List[Dict], quiz_dir: Path) -> Dict[str, str]:
+    def copy_resources(self, questions: List[Dict], quiz_dir: Path,
+                       check_cancelled: Optional[Callable[[], None]] = None) -> Dict[str, str]:
         """
         Copy all resources to output directory with question ID prefix renaming.
 
@@ -314,16 +344,27 @@ class ResourceManager:
             Renamed: HS_Q014_virus_structure.png
             Format: {question_id}_{original_filename}
 
+        Files are content-addressed: a resource whose destination already has
+        the same SHA-256 is not copied again, and resources with identical
+        contents are stored once (later ones map to the first renamed file).
+        New files are reflinked, hardlinked or copied according to link_mode.
+        Digests are cached in quiz_dir/resource_hashes.json so unchanged
+        files are not re-read on the next export.
+
         Args:
             questions: List of parsed question dictionaries
             quiz_dir: Path to quiz output directory
+            check_cancelled: Called before each resource is copied; an
+                exception it raises stops copying
 
         Returns:
             Mapping dictionary: original_path → renamed_filename
 
         Side effects:
             - Copies files to quiz_dir/resources/
-            - Generates quiz_dir/resource_mapping.json
+            - Generates quiz_dir/resource_mapping.json and resource_hashes.json
+            - Sets self.copy_stats (copied/reflink/hardlink/unchanged/deduplicated
+              counts, bytes_written for newly placed files)
 
         Example:
             copied = rm.copy_resources(questions, quiz_dir)
@@ -334,11 +375,14 @@ class ResourceManager:
 
             # Generated: quiz_dir/resource_mapping.json
         """
-        import shutil
         import json
 
         resources_dir = quiz_dir / "resources"
         copied = {}
+        placed_by_digest: Dict[str, str] = {}
+        hash_cache = HashCache(quiz_dir / HASH_CACHE_FILENAME)
+        stats = {'copy': 0, 'reflink': 0, 'hardlink': 0, 'unchanged': 0, 'deduplicated': 0,
+                 'bytes_written': 0}
 
         logger.info(f"Copying resources for {len(questions)} questions...")
 
@@ -350,6 +394,8 @@ class ResourceManager:
                 # Skip if already copied
                 if resource_path in copied:
                     continue
+                if check_cancelled:
+                    check_cancelled()
 
                 src = self.media_dir / resource_path
 
@@ -358,6 +404,19 @@ class ResourceManager:
                     logger.warning(f"Resource not found, skipping: {resource_path}")
                     continue
 
+                try:
+                    digest = hash_cache.digest(src)
+                except OSError as e:
+                    logger.error(f"Failed to read {resource_path}: {e}")
+                    continue
+
+                # Same bytes as a file already in the package: reuse it
+                if digest in placed_by_digest:
+                    copied[resource_path] = placed_by_digest[digest]
+                    stats['deduplicated'] += 1
+                    logger.info(f"Deduplicated: {resource_path} → {placed_by_digest[digest]}")
+                    continue
+
                 # Generate renamed filename with question ID prefix
                 # Apply sanitization to remove problematic characters
                 original_name = Path(resource_path).name
@@ -370,13 +429,24 @@ class ResourceManager:
                     logger.info(f"Sanitized: {original_name} → {sanitized_name}")
 
                 try:
-                    # Copy file with metadata preservation
-                    shutil.copy2(src, dst)
+                    if dst.exists() and hash_cache.digest(dst) == digest:
+                        stats['unchanged'] += 1
+                        logger.info(f"Unchanged: {resource_path} → {renamed_name}")
+                    else:
+                        hash_cache.forget(dst)
+                        method = place_file(src, dst, self.link_mode)
+                        hash_cache.record(dst, digest)
+                        stats[method] += 1
+                        stats['bytes_written'] += dst.stat().st_size
+                        logger.info(f"Copied ({method}): {resource_path} → {renamed_name}")
                     copied[resource_path] = renamed_name
-                    logger.info(f"Copied: {resource_path} → {renamed_name}")
+                    placed_by_digest[digest] = renamed_name
                 except Exception as e:
                     logger.error(f"Failed to copy {resource_path}: {e}")
 
+        hash_cache.save()
+        self.copy_stats = stats
+
         # Save mapping to JSON file for reference
         mapping_file = quiz_dir / "resource_mapping.json"
         try:
@@ -386,7 +456,12 @@ class ResourceManager:
         except Exception as e:
             logger.error(f"Failed to save mapping file: {e}")
 
-        logger.info(f"Resource copying complete: {len(copied)} files copied")
+        logger.info(
+            f"Resource copying complete: {len(copied)} resources "
+            f"({stats['copy']} copied, {stats['reflink']} reflinked, "
+            f"{stats['hardlink']} hardlinked, {stats['unchanged']} unchanged, "
+            f"{stats['deduplicated']} deduplicated)"
+        )
         return copied
 
     def _extract_resources(self, question: Dict) -> List[str]:
@@ -576,6 +651,109 @@ class ResourceManager:
 
 # Module-level helper functions
 
+def update_image_paths_in_text(text: str, resource_mapping: Dict[str, str]) -> str:
+    """
+    Replace original image filenames with renamed ones in markdown text.
+
+    Handles markdown image syntax: ![alt](path)
+    Updates paths to use ResourceManager's renamed files (with question ID prefix and sanitization).
+
+    Args:
+        text: Text containing markdown image references
+        resource_mapping: Dict mapping original filenames to renamed filenames
+
+    Returns:
+        Text with updated image paths
+    """
+    # Create normalized mapping with basename keys for easy lookup
+    basename_mapping = {os.path.basename(k): v for k, v in resource_mapping.items()}
+
+    def replace_image(match):
+        alt = match.group(1)
+        original_path = match.group(2)
+        # Extract just the filename to match resource_mapping keys
+        basename = os.path.basename(original_path)
+        # Use renamed path if available, otherwise keep original
+        renamed = basename_mapping.get(basename, basename)
+        return f'![{alt}](resources/{renamed})'
+
+    # Replace markdown image syntax: ![alt](path)
+    return re.sub(r'!\[([^\]]*)\]\(([^)]+)\)', replace_image, text)
+
+
+def normalize_resource_path(path: str) -> str:
+    """Strip resources/ prefix variants to get just the filename for mapping lookup."""
+    for prefix in ['resources/', 'Resources/', './resources/', './Resources/']:
+        if path.startswith(prefix):
+            return path[len(prefix):]
+    return path
+
+
+def apply_resource_mapping(questions: list, resource_mapping: dict, verbose: bool = False,
+                           file: Optional[TextIO] = None):
+    """
+    Update question data with renamed resource paths.
+
+    Args:
+        questions: List of question dictionaries
+        resource_mapping: Dict mapping original filenames to renamed filenames
+        verbose: If True, print detailed updates
+        file: Stream for the verbose output (default: sys.stdout)
+    """
+    # Create normalized mapping (keys without resources/ prefix)
+    normalized_mapping = {normalize_resource_path(k): v for k, v in resource_mapping.items()}
+
+    for question in questions:
+        # 1. Handle explicit image field (hotspot, graphicgapmatch, text_entry_graphic)
+        if 'image' in question and isinstance(question['image'], dict):
+            original_path = question['image'].get('path', '')
+            # Normalize path for lookup
+            lookup_key = normalize_resource_path(original_path)
+            if lookup_key in normalized_mapping:
+                # Set renamed path WITH resources/ prefix for QTI
+                renamed = normalized_mapping[lookup_key]
+                question['image']['path'] = f'resources/{renamed}'
+                if verbose:
+                    print(f"    Updated image path: {original_path} → resources/{renamed}", file=file)
+
+        # 2. Handle inline markdown images in question_text
+        if 'question_text' in question and question['question_text']:
+            question['question_text'] = update_image_paths_in_text(
+                question['question_text'], resource_mapping
+            )
+
+        # 3. Handle images in feedback
+        if 'feedback' in question:
+            for key in ['general', 'correct', 'incorrect', 'unanswered']:
+                if key in question['feedback'] and question['feedback'][key]:
+                    question['feedback'][key] = update_image_paths_in_text(
+                        question['feedback'][key], resource_mapping
+                    )
+
+            # Option-specific feedback (for multiple choice questions)
+            if 'option_specific' in question['feedback'] and question['feedback']['option_specific']:
+                for option_id, feedback_text in question['feedback']['option_specific'].items():
+                    if feedback_text:
+                        question['feedback']['option_specific'][option_id] = update_image_paths_in_text(
+                            feedback_text, resource_mapping
+                        )
+
+        # 4. Handle images in Match question premises/responses
+        if 'premises' in question:
+            for premise in question['premises']:
+                if 'text' in premise and premise['text']:
+                    premise['text'] = update_image_paths_in_text(
+                        premise['text'], resource_mapping
+                    )
+
+        if 'match_responses' in question:
+            for response in question['match_responses']:
+                if 'text' in response and response['text']:
+                    response['text'] = update_image_paths_in_text(
+                        response['text'], resource_mapping
+                    )
+
+
 def has_errors(issues: List[ResourceIssue]) -> bool:
     """Check if any issues are ERROR level."""
     return any(issue.level == 'ERROR' for issue in issues)
@@ -0,0 +1,151 @@
+"""
+Content-addressed resource placement for ResourceManager.
+
+ResourceManager.copy_resources() uses these helpers so that re-exporting a
+quiz does not recopy media that has not changed:
+
+- file_digest() hashes file contents (SHA-256)
+- HashCache remembers digests by (path, size, mtime) between exports, so
+  unchanged files are not even re-read
+- place_file() puts a file in the package by reflink (copy-on-write clone),
+  hardlink or copy, whichever the filesystem allows first
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Filename of the digest cache in the quiz directory (excluded from packages)
+HASH_CACHE_FILENAME = 'resource_hashes.json'
+
+# How place_file() may put a file in place, in the order 'auto' tries them
+LINK_MODES = ('reflink', 'hardlink', 'copy')
+
+# Linux FICLONE ioctl (btrfs, XFS, bcachefs, ...)
+_FICLONE = 0x40049409
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """
+    Hash a file's contents.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class HashCache:
+    """
+    File digests keyed by path, trusted while size and mtime are unchanged.
+
+    Attributes:
+        path: JSON file the cache is loaded from and saved to (None = memory only)
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self._entries: Dict[str, List] = {}
+        if path is not None and path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable hash cache {path}: {e}")
+
+    def digest(self, path: Path) -> str:
+        """Get the digest of a file, hashing it only if it changed."""
+        stat = path.stat()
+        key = str(path)
+        entry = self._entries.get(key)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry[2]
+        digest = file_digest(path)
+        self._entries[key] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def record(self, path: Path, digest: str) -> None:
+        """Remember the digest of a file just written with known contents."""
+        stat = path.stat()
+        self._entries[str(path)] = [stat.st_size, stat.st_mtime_ns, digest]
+
+    def forget(self, path: Path) -> None:
+        """Drop a file from the cache (e.g. before replacing it)."""
+        self._entries.pop(str(path), None)
+
+    def save(self) -> None:
+        """Write the cache back to its JSON file."""
+        if self.path is None:
+            return
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self._entries, f, indent=2)
+        except OSError as e:
+            logger.warning(f"Failed to save hash cache {self.path}: {e}")
+
+
+def _reflink(src: Path, dst: Path) -> None:
+    """Clone src to dst sharing data blocks (Linux FICLONE)."""
+    import fcntl  # Not available on Windows - caller falls back
+
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            dst.unlink()
+            raise
+    shutil.copystat(src, dst)
+
+
+def place_file(src: Path, dst: Path, mode: str = 'auto') -> str:
+    """
+    Put a copy of src at dst.
+
+    An existing dst is unlinked first, so a previous hardlink never writes
+    through to another file.
+
+    Args:
+        src: Source file
+        dst: Destination path
+        mode: 'reflink', 'hardlink', 'copy', or 'auto' to try them in that
+              order. reflink/hardlink fall back to copy when unsupported.
+
+    Returns:
+        How the file was placed: 'reflink', 'hardlink' or 'copy'
+    """
+    if mode not in LINK_MODES and mode != 'auto':
+        raise ValueError(f"Unknown link mode: {mode}")
+
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+
+    attempts = LINK_MODES[:-1] if mode == 'auto' else (mode,)
+    for attempt in attempts:
+        try:
+            if attempt == 'reflink':
+                _reflink(src, dst)
+                return 'reflink'
+            if attempt == 'hardlink':
+                os.link(src, dst)
+                return 'hardlink'
+        except (OSError, ImportError, NotImplementedError, AttributeError):
+            continue
+
+    shutil.copy2(src, dst)
+    return 'copy'
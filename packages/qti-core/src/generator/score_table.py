@@ -0,0 +1,202 @@
+"""
+Item Score Table
+
+scripts/validate_question_set.py needs the score of the items each section
+references: the mappedValue of the first mapEntry in the RESPONSE
+declaration (1 if there is none). It used to parse every referenced
+*-item.xml in full to find it.
+
+Step 4 now writes the scores next to its other workflow metadata, in
+.workflow/scores.json:
+
+    {"step": "step4_generate_xml", "timestamp": "...",
+     "items": {"Q001-item.xml": {"points": 2, "score": 1, "bytes": 5120,
+                                 "mtime_ns": 1760000000000000000}, ...}}
+
+points is the question's ^points and score is what the validator reads from
+the XML. bytes and mtime_ns are the size and modification time of the item
+file when the table was written, so an item edited or regenerated without
+updating the table is noticed and read from its XML instead. (The size
+alone would miss edits like mappedValue="1" -> "2".) Items not on disk yet
+when the table is written get no mtime_ns and are always read from the XML.
+
+read_item_score() is that fallback: an incremental parse (XMLPullParser,
+like iterparse) that stops at the end of the RESPONSE declaration or at
+itemBody instead of reading and building the whole document.
+
+Usage:
+    table = build_score_table(questions, questions_xml)
+    write_score_table(quiz_dir / '.workflow', table)    # after writing the items
+
+    scores = load_score_table(quiz_dir)      # None if there is no table
+"""
+
+import io
+import json
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+
+SCORE_TABLE_FILENAME = 'scores.json'
+
+_QTI_NS = '{http://www.imsglobal.org/xsd/imsqti_v2p2}'
+_RESPONSE_DECLARATION = _QTI_NS + 'responseDeclaration'
+_MAPPING = _QTI_NS + 'mapping'
+_MAP_ENTRY = _QTI_NS + 'mapEntry'
+_ITEM_BODY = _QTI_NS + 'itemBody'
+
+# Bytes fed to the parser at a time (the declarations end within ~1 KB)
+_CHUNK_SIZE = 1024
+
+
+def read_item_score(source: Union[str, Path, BinaryIO]) -> Optional[int]:
+    """
+    Score of an item: the first mapEntry mappedValue of its RESPONSE declaration.
+
+    The XML is fed to the parser in small chunks and reading stops once the
+    value is found, at the end of the declaration or at itemBody
+    (declarations come first in QTI items, within the first kilobyte or so).
+
+    Args:
+        source: Item XML file path or binary file object
+
+    Returns:
+        int(float(mappedValue)), or None if the item has no such value
+
+    Raises:
+        ET.ParseError: If the XML before the declaration is malformed
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, 'rb') as f:
+            return read_item_score(f)
+
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    state = _ScoreState()
+    while True:
+        chunk = source.read(_CHUNK_SIZE)
+        if not chunk:
+            parser.close()
+        else:
+            parser.feed(chunk)
+        for event, elem in parser.read_events():
+            if state.update(event, elem):
+                return state.score
+        if not chunk:
+            return None
+
+
+class _ScoreState:
+    """Tracks read_item_score() through the parse events."""
+
+    def __init__(self):
+        self.in_response = False
+        self.in_mapping = False
+        self.mapping_seen = False
+        self.score: Optional[int] = None
+
+    def update(self, event: str, elem: ET.Element) -> bool:
+        """Handle one event; True once the score (or its absence) is known."""
+        tag = elem.tag
+        if event == 'start':
+            if tag == _ITEM_BODY:
+                return True
+            if tag == _RESPONSE_DECLARATION and elem.get('identifier') == 'RESPONSE':
+                self.in_response = True
+            elif self.in_response and tag == _MAPPING and not self.mapping_seen:
+                self.in_mapping = self.mapping_seen = True
+            return False
+
+        if self.in_mapping and tag == _MAP_ENTRY:
+            mapped_value = elem.get('mappedValue')
+            if mapped_value:
+                self.score = int(float(mapped_value))
+            return True
+        # Only the first mapping of the declaration counts
+        return (self.in_mapping and tag == _MAPPING) or (
+            self.in_response and tag == _RESPONSE_DECLARATION)
+
+
+def build_score_table(questions: List[Dict[str, Any]],
+                      questions_xml: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """
+    Score table for generated items.
+
+    Args:
+        questions: Parsed questions, in the same order as questions_xml
+        questions_xml: (identifier, xml_content) per generated item
+
+    Returns:
+        Dict to pass to write_score_table()
+    """
+    items = {}
+    for question, (identifier, xml_content) in zip(questions, questions_xml):
+        data = xml_content.encode('utf-8')
+        try:
+            score = read_item_score(io.BytesIO(data))
+        except (ET.ParseError, ValueError):
+            # Left out: the validator reads the XML and reports the problem
+            continue
+        items[f'{identifier}-item.xml'] = {
+            'points': question.get('points', 1),
+            'score': 1 if score is None else score,
+            'bytes': len(data),
+        }
+    return {
+        'step': 'step4_generate_xml',
+        'timestamp': datetime.now().isoformat(),
+        'items': items,
+    }
+
+
+def write_score_table(workflow_dir: Path, table: Dict[str, Any]) -> Path:
+    """
+    Write the table to workflow_dir/scores.json (compact JSON).
+
+    Item files next to workflow_dir that have the size the table expects
+    get their mtime_ns recorded (see get_question_score() in
+    scripts/validate_question_set.py).
+    """
+    quiz_dir = Path(workflow_dir).parent
+    for href, entry in table['items'].items():
+        try:
+            st = (quiz_dir / href).stat()
+        except OSError:
+            continue
+        if st.st_size == entry['bytes']:
+            entry['mtime_ns'] = st.st_mtime_ns
+
+    path = Path(workflow_dir) / SCORE_TABLE_FILENAME
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(table, f, ensure_ascii=False, separators=(',', ':'))
+    return path
+
+
+def read_score_table(workflow_dir: Path) -> Optional[Dict[str, Any]]:
+    """
+    Whole score table as written by write_score_table().
+
+    Returns:
+        Table dict, or None if there is no (readable) table
+    """
+    path = Path(workflow_dir) / SCORE_TABLE_FILENAME
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            table = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(table, dict) or not isinstance(table.get('items'), dict):
+        return None
+    return table
+
+
+def load_score_table(quiz_dir: Path) -> Optional[Dict[str, Dict[str, Any]]]:
+    """
+    Item entries of a quiz folder's score table.
+
+    Returns:
+        Item filename -> {'points', 'score', 'bytes', 'mtime_ns'}, or None if the folder
+        has no (readable) table
+    """
+    table = read_score_table(Path(quiz_dir) / '.workflow')
+    return table['items'] if table else None
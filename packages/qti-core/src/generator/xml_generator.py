@@ -5,21 +5,77 @@ Generates QTI 2.2 XML files from parsed question data using templates.
 """
 
 import os
-from typing import Dict, List, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Any, Optional
 from pathlib import Path
 import re
 
+from .template_cache import CompiledTemplate, load_template
+
+# Below this many questions, starting worker processes costs more than it saves
+PARALLEL_MIN_QUESTIONS = 200
+
+# XML special characters (translated in one pass; '&' is never re-escaped)
+_XML_ESCAPES = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&apos;'
+})
+
+
+class XMLGenerationError(Exception):
+    """
+    A question failed in XMLGenerator.generate_questions().
+
+    Attributes:
+        index: 0-based position of the question in the input list
+        error: The exception raised while generating it
+    """
+
+    def __init__(self, index: int, error: Exception):
+        super().__init__(index, error)
+        self.index = index
+        self.error = error
+
+    def __str__(self) -> str:
+        return str(self.error)
+
+
+# Per-process generator used by generate_questions() worker processes
+_worker_generator = None
+
+
+def _init_worker(templates_dir: str) -> None:
+    """Create the worker's generator with all templates compiled."""
+    global _worker_generator
+    _worker_generator = XMLGenerator(templates_dir, preload=True)
+
+
+def _generate_chunk(start: int, questions: List[Dict[str, Any]], language: str) -> List[str]:
+    """Generate XML for a slice of questions starting at index start."""
+    return _worker_generator._generate_all(questions, language, start)
+
 
 class XMLGenerator:
     """Generate QTI XML files from question data."""
 
-    def __init__(self, templates_dir: str = None):
+    # Map question types to template names
+    TEMPLATE_MAPPINGS = {
+        'fill_in_the_blank': 'text_entry',  # Same structure as text_entry
+        'matching': 'match',  # Template is named match.xml
+        'gap_match': 'gapmatch'  # Template is named gapmatch.xml
+    }
+
+    def __init__(self, templates_dir: str = None, preload: bool = False):
         """
         Initialize XML generator.
 
         Args:
             templates_dir: Path to XML templates directory.
                           Defaults to project's templates/xml/
+            preload: Compile every template up front (see preload_templates)
         """
         if templates_dir is None:
             # Default to project templates directory
@@ -31,6 +87,27 @@ class XMLGenerator:
         if not self.templates_dir.exists():
             raise ValueError(f"Templates directory not found: {self.templates_dir}")
 
+        self._templates: Dict[str, CompiledTemplate] = {}
+
+        if preload:
+            self.preload_templates()
+
+    def preload_templates(self) -> int:
+        """
+        Read and compile every template in the templates directory.
+
+        Templates are otherwise compiled on first use. Preloading moves that
+        I/O out of the generation loop (e.g. before timing or forking workers).
+
+        Returns:
+            Number of templates loaded
+        """
+        count = 0
+        for template_file in sorted(self.templates_dir.glob('*.xml')):
+            self._templates[template_file.stem] = load_template(template_file)
+            count += 1
+        return count
+
     def generate_question(self, question_data: Dict[str, Any], language: str = 'en') -> str:
         """
         Generate QTI XML for a single question.
@@ -52,24 +129,94 @@ class XMLGenerator:
 
         return xml
 
-    def _load_template(self, question_type: str) -> str:
-        """Load XML template for question type."""
-        # Map question types to template names
-        template_mappings = {
-            'fill_in_the_blank': 'text_entry',  # Same structure as text_entry
-            'matching': 'match',  # Template is named match.xml
-            'gap_match': 'gapmatch'  # Template is named gapmatch.xml
-        }
+    def generate_questions(self, questions: Iterable[Dict[str, Any]], language: str = 'en',
+                           workers: Optional[int] = 1,
+                           chunksize: Optional[int] = None) -> List[str]:
+        """
+        Generate QTI XML for many questions, optionally in worker processes.
+
+        Questions are independent, so with workers > 1 they are split into
+        chunks that a process pool generates in parallel. Results are
+        returned in input order and are identical to calling
+        generate_question() for each question.
+
+        Args:
+            questions: Parsed question dictionaries (resource mapping applied)
+            language: ISO 639-1 language code
+            workers: Number of worker processes. 1 generates serially in this
+                process; None uses one per CPU, falling back to serial for
+                fewer than PARALLEL_MIN_QUESTIONS questions.
+            chunksize: Questions per task (default: about 4 tasks per worker)
+
+        Returns:
+            XML strings, one per question, in input order
 
-        question_type = template_mappings.get(question_type, question_type)
+        Raises:
+            XMLGenerationError: For the first question (in input order) that
+                failed to generate
+        """
+        questions = list(questions)
+
+        if workers is None:
+            if len(questions) < PARALLEL_MIN_QUESTIONS:
+                workers = 1
+            else:
+                workers = os.cpu_count() or 1
+        workers = min(workers, len(questions))
+
+        if workers <= 1:
+            return self._generate_all(questions, language)
+
+        if chunksize is None:
+            chunksize = -(-len(questions) // (workers * 4))
+        chunksize = max(1, chunksize)
+
+        xml_list: List[str] = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(str(self.templates_dir),)) as executor:
+            futures = [
+                executor.submit(_generate_chunk, start, questions[start:start + chunksize], language)
+                for start in range(0, len(questions), chunksize)
+            ]
+            try:
+                # Collect in submission order so output (and the first error)
+                # follow source order regardless of which chunk finishes first
+                for future in futures:
+                    xml_list.extend(future.result())
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        return xml_list
+
+    def _generate_all(self, questions: List[Dict[str, Any]], language: str,
+                      start: int = 0) -> List[str]:
+        """Generate questions serially, wrapping failures in XMLGenerationError."""
+        xml_list = []
+        for offset, question in enumerate(questions):
+            try:
+                xml_list.append(self.generate_question(question, language))
+            except Exception as e:
+                raise XMLGenerationError(start + offset, e) from e
+        return xml_list
+
+    def _load_template(self, question_type: str) -> CompiledTemplate:
+        """Load compiled XML template for question type (cached per process)."""
+        question_type = self.TEMPLATE_MAPPINGS.get(question_type, question_type)
+
+        template = self._templates.get(question_type)
+        if template is not None:
+            return template
 
         template_file = self.templates_dir / f'{question_type}.xml'
 
         if not template_file.exists():
             raise ValueError(f"Template not found for question type: {question_type}")
 
-        with open(template_file, 'r', encoding='utf-8') as f:
-            return f.read()
+        template = load_template(template_file)
+        self._templates[question_type] = template
+        return template
 
     def _normalize_language_code(self, language: str) -> str:
         """
@@ -93,7 +240,7 @@ class XMLGenerator:
         # Return mapped value if exists, otherwise return original
         return language_map.get(language.lower(), language)
 
-    def _fill_template(self, template: str, question_data: Dict[str, Any], language: str) -> str:
+    def _fill_template(self, template: CompiledTemplate, question_data: Dict[str, Any], language: str) -> str:
         """Fill template placeholders with question data."""
         from ..parser.markdown_parser import markdown_to_xhtml
 
@@ -208,9 +355,7 @@ class XMLGenerator:
             )
 
         # Replace all placeholders
-        xml = template
-        for placeholder, value in replacements.items():
-            xml = xml.replace(placeholder, value)
+        xml = template.render(replacements)
 
         # Strip XML comments to prevent validation errors from '--' in content
         xml = self._strip_xml_comments(xml)
@@ -285,18 +430,7 @@ class XMLGenerator:
         if not text:
             return ''
 
-        replacements = {
-            '&': '&amp;',
-            '<': '&lt;',
-            '>': '&gt;',
-            '"': '&quot;',
-            "'": '&apos;'
-        }
-
-        for char, escape in replacements.items():
-            text = text.replace(char, escape)
-
-        return text
+        return text.translate(_XML_ESCAPES)
 
     def _strip_xml_comments(self, xml: str) -> str:
         """
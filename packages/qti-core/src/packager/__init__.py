@@ -5,6 +5,6 @@ This module provides functionality to package QTI XML files into
 IMS Content Package (ZIP) for import into Inspera.
 """
 
-from .qti_packager import QTIPackager
+from .qti_packager import QTIPackager, media_references
 
-__all__ = ['QTIPackager']
+__all__ = ['QTIPackager', 'media_references']
@@ -9,9 +9,11 @@ import os
 import zipfile
 import re
 from pathlib import Path
-from typing import List, Dict, Any, Set, Optional
+from typing import Callable, List, Dict, Any, Optional, TextIO
 from datetime import datetime
 
+from ..spans import span
+
 # Template mappings for question types (must match xml_generator.py)
 TEMPLATE_MAPPINGS = {
     'fill_in_the_blank': 'text_entry',
@@ -19,17 +21,46 @@ TEMPLATE_MAPPINGS = {
     'gap_match': 'gapmatch'
 }
 
+# Already-compressed media: deflating them again costs CPU and saves nothing
+STORED_EXTENSIONS = {
+    '.png', '.jpg', '.jpeg', '.gif', '.webp',
+    '.mp3', '.m4a', '.ogg', '.mp4', '.webm', '.zip'
+}
+
+# Development files that never go into the package
+EXCLUDED_FILES = {'resource_mapping.json', 'resource_hashes.json', 'scores.json'}
+
+# Media references in item XML: <img src="resources/..."> and
+# <object data="resources/..."> (hotspot / graphic backgrounds)
+_MEDIA_REF_RE = re.compile(r'<(?:img[^>]+src|object[^>]+data)="resources/([^"]+)"')
+
+
+def media_references(xml_content: str) -> List[str]:
+    """
+    Media files an item's XML references (sorted, without 'resources/').
+
+    Collect these when the XML is generated and pass them to
+    QTIPackager.create_package(media_index=...) so the manifest does not
+    scan every item again.
+    """
+    return sorted(set(_MEDIA_REF_RE.findall(xml_content)))
+
 
 class QTIPackager:
     """Package QTI XML files into importable ZIP."""
 
-    def __init__(self, output_dir: str = None):
+    def __init__(self, output_dir: str = None, compresslevel: Optional[int] = None,
+                 out: Optional[TextIO] = None):
         """
         Initialize packager.
 
         Args:
             output_dir: Directory for temporary files and final package.
                        Defaults to 'output' in project root.
+            compresslevel: Deflate level 0-9 for XML and other compressible
+                          files (default: zlib default, 6). Media in
+                          STORED_EXTENSIONS is always stored uncompressed.
+            out: Stream for package warnings (default: sys.stdout)
         """
         if output_dir is None:
             project_root = Path(__file__).parent.parent.parent
@@ -37,7 +68,9 @@ class QTIPackager:
 
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.compresslevel = compresslevel
         self.media_files = []  # Track media files for manifest
+        self.out = out
 
     def create_package(
         self,
@@ -46,7 +79,10 @@ class QTIPackager:
         output_filename: str,
         keep_folder: bool = True,
         base_dir: Optional[str] = None,
-        assessment_test_xml: Optional[str] = None
+        assessment_test_xml: Optional[str] = None,
+        stream: bool = False,
+        media_index: Optional[List[List[str]]] = None,
+        check_cancelled: Optional[Callable[[], None]] = None
     ) -> Dict[str, str]:
         """
         Create QTI package ZIP file and optionally keep extracted folder.
@@ -58,6 +94,17 @@ class QTIPackager:
             keep_folder: If True, keep extracted folder alongside ZIP (default: True)
             base_dir: Base directory for output. If None, uses self.output_dir (default: None)
             assessment_test_xml: Optional assessmentTest XML for Question Sets
+            stream: If True, write the XML and manifest straight into the ZIP
+                   without staging them in the package folder. Resources are
+                   read from the folder's resources/ subfolder. No extracted
+                   folder is produced ('folder_path' is None); keep_folder
+                   only decides whether the existing folder is removed.
+            media_index: Media filenames per item, aligned with questions_xml
+                        (media_references() of each item; found by scanning
+                        the XML if None)
+            check_cancelled: Called before each file is added to the ZIP;
+                            an exception it raises stops packaging and the
+                            partial ZIP is removed
 
         Returns:
             Dictionary with 'zip_path' and 'folder_path' (if kept)
@@ -66,6 +113,12 @@ class QTIPackager:
             Resource files should be pre-copied to the output directory by ResourceManager
             before calling this method. This packager only handles XML generation and ZIP creation.
         """
+        if stream:
+            return self._create_package_streaming(
+                questions_xml, metadata, output_filename, keep_folder,
+                base_dir, assessment_test_xml, media_index, check_cancelled
+            )
+
         # Reset media files tracking
         self.media_files = []
 
@@ -76,14 +129,7 @@ class QTIPackager:
         # Based on output filename: quiz.zip → quiz/
         # If output_filename includes directory (e.g., "Export QTI to Inspera/quiz.zip"),
         # preserve that structure for the extracted folder
-        output_file_path = Path(output_filename)
-        package_name = output_file_path.stem
-        if output_file_path.parent != Path('.'):
-            # Output path includes subdirectory, place folder in same location as ZIP
-            package_dir = output_base / output_file_path.parent / package_name
-        else:
-            # Simple filename, place folder directly in base directory
-            package_dir = output_base / package_name
+        package_dir = self._package_dir(output_base, output_filename)
 
         # Preserve existing directory if it exists (resources already copied by ResourceManager)
         # Otherwise create fresh directory structure
@@ -96,7 +142,8 @@ class QTIPackager:
             resources_dir.mkdir(exist_ok=True)
 
             # Write question XML files
-            self._write_question_files(package_dir, questions_xml)
+            with span('write_items', files=len(questions_xml)):
+                self._write_question_files(package_dir, questions_xml)
 
             # Write assessmentTest XML if provided (for Question Sets)
             if assessment_test_xml:
@@ -107,23 +154,29 @@ class QTIPackager:
                     f.write(assessment_test_xml)
 
             # Generate and write manifest
-            manifest_xml = self._generate_manifest(
-                questions_xml, metadata, assessment_test_xml=assessment_test_xml
-            )
-            manifest_path = package_dir / 'imsmanifest.xml'
-            with open(manifest_path, 'w', encoding='utf-8') as f:
-                f.write(manifest_xml)
+            with span('manifest') as manifest_span:
+                manifest_xml = self._generate_manifest(
+                    questions_xml, metadata, assessment_test_xml=assessment_test_xml,
+                    media_index=media_index
+                )
+                manifest_path = package_dir / 'imsmanifest.xml'
+                with open(manifest_path, 'w', encoding='utf-8') as f:
+                    f.write(manifest_xml)
+                manifest_span.set(bytes=manifest_path.stat().st_size)
 
             # Validate package structure
-            validation_result = self.validate_package(package_dir)
+            with span('check'):
+                validation_result = self.validate_package(package_dir)
             if not validation_result['valid']:
-                print(f"Warning: Package validation found issues:")
+                print(f"Warning: Package validation found issues:", file=self.out)
                 for issue in validation_result['issues']:
-                    print(f"  - {issue}")
+                    print(f"  - {issue}", file=self.out)
 
             # Create ZIP package
             zip_path = output_base / output_filename
-            self._create_zip(package_dir, zip_path)
+            with span('zip') as zip_span:
+                zip_span.set(files=self._create_zip(package_dir, zip_path, check_cancelled),
+                             bytes_written=zip_path.stat().st_size)
 
             result = {
                 'zip_path': str(zip_path),
@@ -142,6 +195,96 @@ class QTIPackager:
                 self._cleanup_temp_dir(package_dir)
             raise e
 
+    def _package_dir(self, output_base: Path, output_filename: str) -> Path:
+        """Get the package folder for an output filename (quiz.zip → quiz/)."""
+        output_file_path = Path(output_filename)
+        package_name = output_file_path.stem
+        if output_file_path.parent != Path('.'):
+            # Output path includes subdirectory, place folder in same location as ZIP
+            return output_base / output_file_path.parent / package_name
+        # Simple filename, place folder directly in base directory
+        return output_base / package_name
+
+    def _create_package_streaming(
+        self,
+        questions_xml: List[tuple[str, str]],
+        metadata: Dict[str, Any],
+        output_filename: str,
+        keep_folder: bool,
+        base_dir: Optional[str],
+        assessment_test_xml: Optional[str],
+        media_index: Optional[List[List[str]]] = None,
+        check_cancelled: Optional[Callable[[], None]] = None
+    ) -> Dict[str, str]:
+        """Create the ZIP from in-memory XML (create_package with stream=True)."""
+        self.media_files = []
+
+        output_base = Path(base_dir) if base_dir is not None else self.output_dir
+        package_dir = self._package_dir(output_base, output_filename)
+        resources_dir = package_dir / 'resources'
+
+        zip_path = output_base / output_filename
+        zip_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with span('manifest') as manifest_span:
+            manifest_xml = self._generate_manifest(
+                questions_xml, metadata, assessment_test_xml=assessment_test_xml,
+                media_index=media_index
+            )
+            manifest_span.set(bytes=len(manifest_xml.encode('utf-8')))
+
+        resource_files = []
+        if resources_dir.is_dir():
+            resource_files = sorted(
+                path for path in resources_dir.rglob('*')
+                if path.is_file() and path.name not in EXCLUDED_FILES
+            )
+
+        with span('check'):
+            validation_result = self._check_package(
+                manifest_xml,
+                [f'{identifier}-item.xml' for identifier, _ in questions_xml],
+                resources_dir.is_dir(),
+                bool(resource_files)
+            )
+        if not validation_result['valid']:
+            print(f"Warning: Package validation found issues:", file=self.out)
+            for issue in validation_result['issues']:
+                print(f"  - {issue}", file=self.out)
+
+        try:
+            with span('zip') as zip_span, self._open_zip(zip_path) as zipf:
+                for identifier, xml_content in questions_xml:
+                    if check_cancelled:
+                        check_cancelled()
+                    self._zip_write_str(zipf, f'{identifier}-item.xml', xml_content)
+
+                if assessment_test_xml:
+                    test_identifier = metadata.get('test_metadata', {}).get('identifier', 'QUIZ_001')
+                    self._zip_write_str(zipf, f'ID_{test_identifier}-assessment.xml', assessment_test_xml)
+
+                self._zip_write_str(zipf, 'imsmanifest.xml', manifest_xml)
+
+                for file_path in resource_files:
+                    if check_cancelled:
+                        check_cancelled()
+                    self._zip_write_file(zipf, file_path, file_path.relative_to(package_dir))
+                zip_span.set(files=len(zipf.infolist()))
+            zip_span.set(bytes_written=zip_path.stat().st_size)
+        except Exception:
+            # Don't leave a truncated package behind
+            if zip_path.exists():
+                zip_path.unlink()
+            raise
+
+        if not keep_folder and package_dir.exists():
+            self._cleanup_temp_dir(package_dir)
+
+        return {
+            'zip_path': str(zip_path),
+            'folder_path': None
+        }
+
     def _write_question_files(
         self,
         package_dir: Path,
@@ -159,16 +302,29 @@ class QTIPackager:
         self,
         questions_xml: List[tuple[str, str]],
         metadata: Dict[str, Any],
-        assessment_test_xml: Optional[str] = None
+        assessment_test_xml: Optional[str] = None,
+        media_index: Optional[List[List[str]]] = None
     ) -> str:
-        """Generate imsmanifest.xml for the package."""
+        """
+        Generate imsmanifest.xml for the package.
+
+        Args:
+            questions_xml: List of (identifier, xml_content) tuples
+            metadata: Quiz metadata with 'test_metadata' and 'questions'
+            assessment_test_xml: Optional assessmentTest XML for Question Sets
+            media_index: Media filenames per item, aligned with questions_xml
+                        (scanned from the XML if None)
+
+        Returns:
+            Manifest XML string
+        """
         # Extract metadata
         test_meta = metadata.get('test_metadata', {})
         title = test_meta.get('title', 'Quiz')
         identifier = test_meta.get('identifier', 'QUIZ_001')
 
-        # Detect media files from question XML
-        all_media_files = self._detect_media_files(questions_xml)
+        # Media files referenced by each question's XML
+        media_index = self._index_media_files(questions_xml, media_index)
 
         # Get questions metadata for labels
         questions = metadata.get('questions', [])
@@ -176,17 +332,11 @@ class QTIPackager:
         # Generate resource entries
         resources = []
         for idx, (question_id, xml_content) in enumerate(questions_xml):
-            # Find media files specific to this question
-            question_media = set()
-            for media_file in all_media_files:
-                if media_file in xml_content:
-                    question_media.add(media_file)
-
             # Build file references
             file_refs = [f'      <file href="{question_id}-item.xml"/>']
 
             # Add media file references
-            for media_file in sorted(question_media):
+            for media_file in media_index[idx]:
                 file_refs.append(f'      <file href="resources/{media_file}"/>')
 
             files_xml = '\n'.join(file_refs)
@@ -278,16 +428,43 @@ class QTIPackager:
 
         return manifest
 
-    def _create_zip(self, source_dir: Path, output_path: Path) -> None:
-        """Create ZIP file from directory contents."""
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in source_dir.rglob('*'):
-                if file_path.is_file():
-                    # Skip resource_mapping.json - it's for development reference only
-                    if file_path.name == 'resource_mapping.json':
-                        continue
-                    arcname = file_path.relative_to(source_dir)
-                    zipf.write(file_path, arcname)
+    def _create_zip(self, source_dir: Path, output_path: Path,
+                    check_cancelled: Optional[Callable[[], None]] = None) -> int:
+        """Create ZIP file from directory contents; returns the number of entries."""
+        try:
+            with self._open_zip(output_path) as zipf:
+                for file_path in source_dir.rglob('*'):
+                    if file_path.is_file():
+                        # Skip resource_mapping.json / resource_hashes.json / scores.json - development files only
+                        if file_path.name in EXCLUDED_FILES:
+                            continue
+                        if check_cancelled:
+                            check_cancelled()
+                        arcname = file_path.relative_to(source_dir)
+                        self._zip_write_file(zipf, file_path, arcname)
+                return len(zipf.infolist())
+        except Exception:
+            # Don't leave a truncated package behind
+            if output_path.exists():
+                output_path.unlink()
+            raise
+
+    def _open_zip(self, output_path: Path) -> zipfile.ZipFile:
+        """Open a new deflated ZIP with the configured compression level."""
+        return zipfile.ZipFile(
+            output_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=self.compresslevel
+        )
+
+    def _zip_write_file(self, zipf: zipfile.ZipFile, file_path: Path, arcname) -> None:
+        """Add a file, storing already-compressed media uncompressed."""
+        if file_path.suffix.lower() in STORED_EXTENSIONS:
+            zipf.write(file_path, arcname, compress_type=zipfile.ZIP_STORED)
+        else:
+            zipf.write(file_path, arcname)
+
+    def _zip_write_str(self, zipf: zipfile.ZipFile, arcname: str, content: str) -> None:
+        """Add generated text as a deflated UTF-8 entry."""
+        zipf.writestr(arcname, content.encode('utf-8'))
 
     def _cleanup_temp_dir(self, temp_dir: Path) -> None:
         """Remove temporary directory and its contents."""
@@ -303,31 +480,28 @@ class QTIPackager:
 
             temp_dir.rmdir()
 
-    def _detect_media_files(self, questions_xml: List[tuple[str, str]]) -> Set[str]:
+    def _index_media_files(
+        self,
+        questions_xml: List[tuple[str, str]],
+        media_index: Optional[List[List[str]]] = None
+    ) -> List[List[str]]:
         """
-        Detect media file references in question XML.
+        Collect the media files each question's XML references.
+
+        Also records all referenced files in self.media_files.
 
         Args:
             questions_xml: List of (identifier, xml_content) tuples
+            media_index: References collected at XML generation (scanned
+                        from questions_xml if None or not aligned with it)
 
         Returns:
-            Set of media filenames referenced
+            Sorted media filenames per question, aligned with questions_xml
         """
-        media_files = set()
-
-        for _, xml_content in questions_xml:
-            # Find img src="resources/..." references
-            img_pattern = r'<img[^>]+src="resources/([^"]+)"'
-            for match in re.finditer(img_pattern, xml_content):
-                media_files.add(match.group(1))
-
-            # Find object data="resources/..." references
-            obj_pattern = r'<object[^>]+data="resources/([^"]+)"'
-            for match in re.finditer(obj_pattern, xml_content):
-                media_files.add(match.group(1))
-
-        return media_files
-
+        if media_index is None or len(media_index) != len(questions_xml):
+            media_index = [media_references(xml_content) for _, xml_content in questions_xml]
+        self.media_files = sorted({name for names in media_index for name in names})
+        return media_index
 
     def validate_package(self, package_dir: Path) -> Dict[str, Any]:
         """
@@ -342,35 +516,62 @@ class QTIPackager:
                 - issues: List of issue descriptions
                 - warnings: List of warning messages
         """
+        manifest_path = package_dir / 'imsmanifest.xml'
+        manifest_content = None
+        if manifest_path.exists():
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest_content = f.read()
+
+        resources_dir = package_dir / 'resources'
+        has_resources_dir = resources_dir.exists()
+        has_resources = has_resources_dir and any(resources_dir.iterdir())
+
+        item_names = [path.name for path in package_dir.glob('*-item.xml')]
+
+        return self._check_package(manifest_content, item_names, has_resources_dir, has_resources)
+
+    def _check_package(
+        self,
+        manifest_content: Optional[str],
+        item_names: List[str],
+        has_resources_dir: bool,
+        has_resources: bool
+    ) -> Dict[str, Any]:
+        """
+        Check package contents (shared by folder and streaming packaging).
+
+        Args:
+            manifest_content: imsmanifest.xml text, or None if missing
+            item_names: Filenames of the *-item.xml files
+            has_resources_dir: Whether a resources/ folder exists
+            has_resources: Whether resources/ contains any files
+
+        Returns:
+            Same dictionary as validate_package()
+        """
         issues = []
         warnings = []
 
         # Check imsmanifest.xml exists
-        manifest_path = package_dir / 'imsmanifest.xml'
-        if not manifest_path.exists():
+        if manifest_content is None:
             issues.append("Missing imsmanifest.xml")
 
         # Check resources/ folder exists
-        resources_dir = package_dir / 'resources'
-        if not resources_dir.exists():
+        if not has_resources_dir:
             warnings.append("resources/ folder missing (okay if no media files)")
-        elif not any(resources_dir.iterdir()):
+        elif not has_resources:
             warnings.append("resources/ folder is empty")
 
         # Check for question XML files
-        item_files = list(package_dir.glob('*-item.xml'))
-        if not item_files:
+        if not item_names:
             issues.append("No question XML files (*-item.xml) found")
 
         # Validate manifest if it exists
-        if manifest_path.exists():
-            with open(manifest_path, 'r', encoding='utf-8') as f:
-                manifest_content = f.read()
-
+        if manifest_content is not None:
             # Check each item file is referenced in manifest
-            for item_file in item_files:
-                if item_file.name not in manifest_content:
-                    warnings.append(f"{item_file.name} not referenced in manifest")
+            for item_name in item_names:
+                if item_name not in manifest_content:
+                    warnings.append(f"{item_name} not referenced in manifest")
 
         return {
             'valid': len(issues) == 0,
@@ -6,5 +6,11 @@ structured data for QTI XML generation.
 """
 
 from .markdown_parser import MarkdownQuizParser
+from .parse_result import BlockResult, ParseResult, block_hash
+from .question_model import Question, question_class
+from .bank_cache import load_parse_result
 
-__all__ = ['MarkdownQuizParser']
+__all__ = [
+    'MarkdownQuizParser', 'ParseResult', 'BlockResult', 'block_hash', 'load_parse_result',
+    'Question', 'question_class',
+]
@@ -0,0 +1,167 @@
+"""
+Parsed-Bank Cache
+
+The step scripts (step1_validate, step3_copy_resources, step4_generate_xml)
+each need the parsed question bank. Instead of every step parsing the same
+markdown again, the first one stores its ParseResult on disk and the others
+load it:
+
+    result = load_parse_result(markdown_content)
+    quiz_data = result.to_parse_dict()      # what parser.parse() returns
+    report = result.to_validate_dict()      # what parser.validate() returns
+
+Entries are keyed by the SHA-256 of the markdown content and PARSER_VERSION,
+a digest of the parser package's source files. Editing the markdown or the
+parser therefore misses the cache automatically.
+
+Location: $QTI_PARSE_CACHE, else $XDG_CACHE_HOME/qti-core/parsed (default
+~/.cache/qti-core/parsed). Set QTI_PARSE_CACHE=off to disable caching.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from .markdown_parser import MarkdownQuizParser
+from .parse_result import ParseResult
+
+logger = logging.getLogger(__name__)
+
+# Oldest entries beyond this count are removed when a new one is stored
+MAX_ENTRIES = 200
+
+
+def _parser_version() -> str:
+    """Digest of the parser sources (and Python version, for pickle)."""
+    digest = hashlib.sha256(f'{sys.version_info[0]}.{sys.version_info[1]}'.encode())
+    for source in sorted(Path(__file__).parent.glob('*.py')):
+        digest.update(source.name.encode('utf-8'))
+        digest.update(source.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+PARSER_VERSION = _parser_version()
+
+
+def default_cache_dir() -> Optional[Path]:
+    """
+    Get the cache directory from the environment.
+
+    Returns:
+        Cache directory, or None if QTI_PARSE_CACHE=off
+    """
+    configured = os.environ.get('QTI_PARSE_CACHE')
+    if configured:
+        if configured.lower() in ('off', '0', 'false', 'no'):
+            return None
+        return Path(configured).expanduser()
+    cache_home = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(cache_home) / 'qti-core' / 'parsed'
+
+
+def cache_key(content: str) -> str:
+    """
+    Get the cache key for markdown content under the current parser.
+
+    Args:
+        content: Markdown file content
+
+    Returns:
+        Hex key (content hash + parser version)
+    """
+    content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+    return f'{content_hash}-{PARSER_VERSION}'
+
+
+def load_parse_result(content: str, cache_dir: Optional[Path] = None,
+                      use_cache: bool = True) -> ParseResult:
+    """
+    Get the ParseResult for markdown content, from the cache if possible.
+
+    On a miss the content is parsed with MarkdownQuizParser and the result
+    stored. Cache read/write failures are logged and otherwise ignored.
+    Every call returns a fresh object, so callers may modify it.
+
+    Args:
+        content: Markdown file content
+        cache_dir: Cache directory (default: default_cache_dir())
+        use_cache: If False, always parse and don't touch the cache
+
+    Returns:
+        ParseResult for the content
+    """
+    if use_cache and cache_dir is None:
+        cache_dir = default_cache_dir()
+    if not use_cache or cache_dir is None:
+        return MarkdownQuizParser(content).parse_and_validate()
+
+    entry = Path(cache_dir) / f'{cache_key(content)}.pickle'
+
+    try:
+        with open(entry, 'rb') as f:
+            result = pickle.load(f)
+        if isinstance(result, ParseResult):
+            logger.info(f"Loaded parsed bank from cache: {entry.name}")
+            return result
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable parse cache entry {entry}: {e}")
+
+    result = MarkdownQuizParser(content).parse_and_validate()
+    _store(entry, result)
+    return result
+
+
+def _store(entry: Path, result: ParseResult) -> None:
+    """Write a cache entry atomically and prune old entries."""
+    try:
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=entry.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, entry)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except Exception as e:
+        logger.warning(f"Failed to write parse cache entry {entry}: {e}")
+        return
+
+    _prune(entry.parent)
+
+
+def _prune(cache_dir: Path) -> None:
+    """Remove the oldest entries beyond MAX_ENTRIES."""
+    try:
+        entries = sorted(cache_dir.glob('*.pickle'), key=lambda p: p.stat().st_mtime)
+        for old in entries[:-MAX_ENTRIES]:
+            old.unlink()
+    except OSError:
+        pass
+
+
+def clear_cache(cache_dir: Optional[Path] = None) -> int:
+    """
+    Remove all cache entries.
+
+    Args:
+        cache_dir: Cache directory (default: default_cache_dir())
+
+    Returns:
+        Number of entries removed
+    """
+    cache_dir = cache_dir or default_cache_dir()
+    if cache_dir is None or not Path(cache_dir).exists():
+        return 0
+    removed = 0
+    for entry in Path(cache_dir).glob('*.pickle'):
+        entry.unlink()
+        removed += 1
+    return removed
@@ -39,8 +39,18 @@ import os
 import re
 import yaml
 import logging
+from dataclasses import replace
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Tuple
 
+from .parse_result import BlockResult, ParseResult, block_hash
+from .question_model import Question
+from .tokenizer import (
+    FIELD_CLOSE, FIELD_OPEN, HEADER, HEADING, META,
+    SUBFIELD_CLOSE, SUBFIELD_OPEN, QuestionBlock, Token,
+    header_tokens, split_question_blocks, tokenize,
+)
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -98,6 +108,35 @@ def validate_point_format(question_data: Dict) -> Tuple[bool, str, Optional[int]
     return True, "", None
 
 
+def _deep_copy(question: Optional[Question]) -> Optional[Question]:
+    """Question.deep_copy() that passes None (unparsable block) through."""
+    return question.deep_copy() if question is not None else None
+
+
+def apply_point_corrections(question_data: Dict) -> None:
+    """
+    Auto-correct point values in place (match premise count, float → int).
+
+    Applied by parse_and_validate() to the questions parse() returns.
+
+    Args:
+        question_data: Parsed question dictionary
+    """
+    # Validate and auto-correct match question points
+    is_valid, error, corrected_points = validate_match_question_points(question_data)
+    if not is_valid:
+        logger.warning(error)
+        question_data['points'] = corrected_points
+        logger.info(f"  → Auto-corrected to Points: {corrected_points}")
+
+    # Validate and auto-correct point format (float vs int)
+    is_valid, warning, corrected_points = validate_point_format(question_data)
+    if not is_valid:
+        logger.warning(warning)
+        question_data['points'] = corrected_points
+        logger.info(f"  → Auto-corrected to Points: {corrected_points}")
+
+
 class MarkdownQuizParser:
     """Parse markdown quiz files into structured data."""
 
@@ -111,6 +150,7 @@ class MarkdownQuizParser:
         self.content = markdown_content
         self.metadata = {}
         self.questions = []
+        self._result: Optional[ParseResult] = None
 
     def parse(self) -> Dict[str, Any]:
         """
@@ -121,13 +161,7 @@ class MarkdownQuizParser:
                 - metadata: Test-level configuration
                 - questions: List of parsed question dictionaries
         """
-        self._extract_frontmatter()
-        self._extract_questions()
-
-        return {
-            'metadata': self.metadata,
-            'questions': self.questions
-        }
+        return self.parse_and_validate().to_parse_dict()
 
     def validate(self) -> Dict[str, Any]:
         """
@@ -144,167 +178,160 @@ class MarkdownQuizParser:
                 - questions: List of successfully parsed questions
                 - errors: List of error dicts with question_id, message, suggestion
         """
-        errors = []
+        return self.parse_and_validate().to_validate_dict()
 
-        # Extract frontmatter (same as parse)
-        self._extract_frontmatter()
+    def parse_and_validate(self, block_cache: Optional[Dict[str, BlockResult]] = None) -> ParseResult:
+        """
+        Parse and validate every question block in one pass.
 
-        # Get content after frontmatter/markers
-        content = self.content
+        parse() and validate() both read from this result; it is computed
+        once per parser instance, so calling both costs a single parse.
 
-        # Remove YAML frontmatter if present
-        if content.strip().startswith('---'):
-            match = re.match(r'^---\s*\n(.*?)\n---\s*\n', content, re.DOTALL)
-            if match and ':' in match.group(1):
-                content = content[match.end():]
+        Args:
+            block_cache: Optional dict of BlockResults keyed by block_hash()
+                of the block text. Blocks whose text is already in the cache
+                are not parsed again, and new results are added to it. Used
+                to re-validate an edited document (Step 3 auto-fix) without
+                re-checking unchanged blocks.
 
-        # Find ===QUESTIONS=== marker
-        questions_marker = '===QUESTIONS==='
-        if questions_marker in content:
-            content = content.split(questions_marker, 1)[1]
+        Returns:
+            ParseResult with parsed questions, errors and per-block spans
+        """
+        if self._result is not None:
+            return self._result
 
-        # Split by question headers
-        question_pattern = r'\n(?=# Q\d+[A-Z]?\s)'
-        blocks = re.split(question_pattern, content)
+        self._extract_frontmatter()
 
-        # Filter to actual question blocks
-        question_blocks = []
-        for block in blocks:
-            block = block.strip()
-            if block and re.match(r'^# Q\d+[A-Z]?\s', block):
-                question_blocks.append(block)
+        base_offset, question_blocks = self._split_question_blocks()
+        base_line = self.content.count('\n', 0, base_offset)
 
-        # Validate each question block
-        questions = []
-        for idx, block in enumerate(question_blocks, 1):
-            q_errors = []
-            q_id = f'Q{idx:03d}'
-
-            # Extract question ID from header
-            header_match = re.match(r'^# (Q\d+[A-Z]?)\s', block)
-            if header_match:
-                q_id = header_match.group(1)
-
-            # Get header section (before @field:)
-            header_section = block.split('\n@field:')[0] if '\n@field:' in block else block
-
-            # Validate ^type - MUST be at start of line (v6.5: ^key value format, NO colon)
-            type_match = re.search(r'^\^type\s+(\S+)', header_section, re.MULTILINE)
-            if not type_match:
-                # Check for common format errors
-                if re.search(r'^\^type:', header_section, re.MULTILINE):
-                    # Specific error for colon format (common mistake)
-                    q_errors.append({
-                        'field': 'type',
-                        'message': '^type has colon - QFMD v6.5 uses "^type value" not "^type: value"',
-                        'suggestion': 'Remove the colon: ^type multiple_choice_single'
-                    })
-                elif re.search(r'\^type', header_section):
-                    q_errors.append({
-                        'field': 'type',
-                        'message': '^type not at start of line - each metadata field must be on its own line',
-                        'suggestion': 'Put ^type on its own line'
-                    })
-                else:
-                    q_errors.append({
-                        'field': 'type',
-                        'message': 'Missing ^type field',
-                        'suggestion': 'Add: ^type multiple_choice_single (or other valid type)'
-                    })
+        logger.info(f"Found {len(question_blocks)} questions...")
 
-            # Validate ^identifier - MUST be at start of line (v6.5: ^key value format, NO colon)
-            id_match = re.search(r'^\^identifier\s+(\S+)', header_section, re.MULTILINE)
-            if not id_match:
-                if re.search(r'^\^identifier:', header_section, re.MULTILINE):
-                    q_errors.append({
-                        'field': 'identifier',
-                        'message': '^identifier has colon - QFMD v6.5 uses "^identifier value" not "^identifier: value"',
-                        'suggestion': 'Remove the colon: ^identifier Q001'
-                    })
-                elif re.search(r'\^identifier', header_section):
-                    q_errors.append({
-                        'field': 'identifier',
-                        'message': '^identifier not at start of line',
-                        'suggestion': 'Put ^identifier on its own line'
-                    })
-                else:
-                    q_errors.append({
-                        'field': 'identifier',
-                        'message': 'Missing ^identifier field',
-                        'suggestion': 'Add: ^identifier Q001'
-                    })
+        blocks = []
+        questions = []
+        for idx, question_block in enumerate(question_blocks, 1):
+            start = base_offset + question_block.start_offset
+            end = base_offset + question_block.end_offset
+            line = base_line + question_block.start_line + 1
+
+            key = None
+            cached = None
+            if block_cache is not None:
+                key = block_hash(question_block.text)
+                cached = block_cache.get(key)
+
+            if cached is not None:
+                # Same text parses to the same result; only the position
+                # (and the question number in errors) may have moved
+                block_result = replace(
+                    cached,
+                    index=idx,
+                    start=start,
+                    end=end,
+                    line=line,
+                    errors=[dict(error, question_num=idx) for error in cached.errors],
+                    question=_deep_copy(cached.question)
+                )
             else:
-                q_id = id_match.group(1).strip()
-
-            # Validate ^points - MUST be at start of line (v6.5: ^key value format, NO colon)
-            points_match = re.search(r'^\^points\s+(\d+)', header_section, re.MULTILINE)
-            if not points_match:
-                if re.search(r'^\^points:', header_section, re.MULTILINE):
-                    q_errors.append({
-                        'field': 'points',
-                        'message': '^points has colon - QFMD v6.5 uses "^points value" not "^points: value"',
-                        'suggestion': 'Remove the colon: ^points 1'
-                    })
-                elif re.search(r'\^points', header_section):
-                    q_errors.append({
-                        'field': 'points',
-                        'message': '^points not at start of line or invalid value',
-                        'suggestion': 'Put ^points on its own line with integer value: ^points 1'
-                    })
-                else:
-                    q_errors.append({
-                        'field': 'points',
-                        'message': 'Missing ^points field',
-                        'suggestion': 'Add: ^points 1'
-                    })
+                block_result = self._parse_and_validate_block(idx, question_block, start, end, line)
+                if block_cache is not None:
+                    # The cache keeps its own copy: callers may edit their questions
+                    block_cache[key] = replace(block_result, question=_deep_copy(block_result.question))
+            blocks.append(block_result)
+
+            if block_result.question is not None:
+                # parse() output has point corrections applied; validate()
+                # output does not, so correct a copy (nested fields included:
+                # apply_resource_mapping() edits them in place)
+                question = block_result.question.deep_copy()
+                apply_point_corrections(question)
+                questions.append(question)
+                logger.debug(f"Successfully parsed question {idx}: {question.get('identifier', 'UNKNOWN')}")
+
+        logger.info(f"Successfully parsed {len(questions)} questions")
+
+        self.questions = questions
+        self._result = ParseResult(
+            metadata=self.metadata,
+            blocks=blocks,
+            questions=questions
+        )
+        return self._result
+
+    def _parse_and_validate_block(self, idx: int, question_block: QuestionBlock,
+                                  start: int, end: int, line: int) -> BlockResult:
+        """
+        Parse one question block and collect its validation errors.
+
+        Args:
+            idx: 1-based question number
+            question_block: Block from split_question_blocks()
+            start: Character offset of the block in self.content
+            end: Character offset after the block in self.content
+            line: 1-based line number of the block header in self.content
+
+        Returns:
+            BlockResult for the block
+        """
+        block = question_block.text
+        q_id = question_block.question_id
+        header = header_tokens(question_block.tokens)
+        meta = self._collect_header_meta(header)
+        q_errors = self._validate_header(header, meta)
+
+        if 'identifier' in meta:
+            q_id = meta['identifier'][0].split()[0]
+
+        # Add errors with question context
+        errors = []
+        for err in q_errors:
+            errors.append({
+                'question_num': idx,
+                'question_id': q_id,
+                'field': err['field'],
+                'message': err['message'],
+                'suggestion': err['suggestion']
+            })
 
-            # Add errors with question context
-            for err in q_errors:
+        question_data = None
+        try:
+            question_data = self._parse_question_block(block, question_block.tokens)
+        except Exception as e:
+            logger.error(f"Failed to parse question block {idx}: {e}")
+            if not q_errors:
                 errors.append({
                     'question_num': idx,
                     'question_id': q_id,
-                    'field': err['field'],
-                    'message': err['message'],
-                    'suggestion': err['suggestion']
+                    'field': 'general',
+                    'message': f'Parse error: {str(e)}',
+                    'suggestion': 'Check question format against v6.5 specification'
                 })
-
-            # Try to parse the question if no critical errors
-            if not q_errors:
-                try:
-                    question_data = self._parse_question_block(block)
-                    if question_data:
-                        # Validate question-type-specific fields
-                        type_errors = self._validate_question_type_fields(question_data, idx, q_id)
-                        if type_errors:
-                            for err in type_errors:
-                                errors.append(err)
-                        else:
-                            questions.append(question_data)
-                    else:
-                        errors.append({
-                            'question_num': idx,
-                            'question_id': q_id,
-                            'field': 'general',
-                            'message': 'Question block could not be parsed',
-                            'suggestion': 'Check that all required fields are present and correctly formatted'
-                        })
-                except Exception as e:
+        else:
+            if question_data is None:
+                logger.warning(f"Question block {idx} could not be parsed")
+                if not q_errors:
                     errors.append({
                         'question_num': idx,
                         'question_id': q_id,
                         'field': 'general',
-                        'message': f'Parse error: {str(e)}',
-                        'suggestion': 'Check question format against v6.5 specification'
+                        'message': 'Question block could not be parsed',
+                        'suggestion': 'Check that all required fields are present and correctly formatted'
                     })
-
-        return {
-            'valid': len(errors) == 0,
-            'metadata': self.metadata,
-            'questions': questions,
-            'errors': errors,
-            'total_questions': len(question_blocks),
-            'parsed_questions': len(questions)
-        }
+            elif not q_errors:
+                # Validate question-type-specific fields (only when the
+                # header is valid)
+                errors.extend(self._validate_question_type_fields(question_data, idx, q_id))
+
+        return BlockResult(
+            index=idx,
+            question_id=q_id,
+            text=block,
+            start=start,
+            end=end,
+            line=line,
+            question=question_data,
+            errors=errors
+        )
 
     def _validate_question_type_fields(self, question_data: Dict[str, Any], q_num: int, q_id: str) -> List[Dict[str, Any]]:
         """
@@ -541,118 +568,225 @@ class MarkdownQuizParser:
 
         return metadata
 
-    def _extract_questions(self) -> None:
-        """Extract individual questions from markdown content (v6.3 format)."""
-        content = self.content
+    def _split_question_blocks(self) -> Tuple[int, List[QuestionBlock]]:
+        """
+        Tokenize the question section and split it into question blocks.
+
+        Skips YAML frontmatter and anything before the ===QUESTIONS=== marker.
+
+        Returns:
+            Tuple of (offset of the question section in self.content, blocks)
+        """
+        start = 0
 
         # Remove YAML frontmatter if present at start
-        if content.strip().startswith('---'):
-            match = re.match(r'^---\s*\n(.*?)\n---\s*\n', content, re.DOTALL)
+        if self.content.strip().startswith('---'):
+            match = re.match(r'^---\s*\n(.*?)\n---\s*\n', self.content, re.DOTALL)
             if match and ':' in match.group(1):
-                content = content[match.end():]
+                start = match.end()
 
         # Find ===QUESTIONS=== marker and skip document header
         questions_marker = '===QUESTIONS==='
-        if questions_marker in content:
-            content = content.split(questions_marker, 1)[1]
+        marker_pos = self.content.find(questions_marker, start)
+        if marker_pos != -1:
+            start = marker_pos + len(questions_marker)
 
-        # Split by question headers: # Q001, # Q002, etc.
-        question_pattern = r'\n(?=# Q\d+[A-Z]?\s)'
-        blocks = re.split(question_pattern, content)
+        return start, split_question_blocks(self.content[start:])
 
-        # Filter to actual question blocks
-        question_blocks = []
-        for block in blocks:
-            block = block.strip()
-            if block and re.match(r'^# Q\d+[A-Z]?\s', block):
-                question_blocks.append(block)
+    def _collect_header_meta(self, header: List[Token]) -> Dict[str, List[str]]:
+        """
+        Collect "^key value" lines from the question header in one pass.
 
-        logger.info(f"Found {len(question_blocks)} questions...")
+        A "^key" line with no value takes the next non-empty header line as
+        its value (matching the earlier "^key\\s+(.+)$" regex behaviour).
+        "^key: value" lines are not included (see _validate_header()).
 
-        for idx, block in enumerate(question_blocks, 1):
-            try:
-                question_data = self._parse_question_block(block)
-                if question_data:
-                    # Validate and auto-correct match question points
-                    is_valid, error, corrected_points = validate_match_question_points(question_data)
-                    if not is_valid:
-                        logger.warning(error)
-                        question_data['points'] = corrected_points
-                        logger.info(f"  → Auto-corrected to Points: {corrected_points}")
-
-                    # Validate and auto-correct point format (float vs int)
-                    is_valid, warning, corrected_points = validate_point_format(question_data)
-                    if not is_valid:
-                        logger.warning(warning)
-                        question_data['points'] = corrected_points
-                        logger.info(f"  → Auto-corrected to Points: {corrected_points}")
-
-                    self.questions.append(question_data)
-                    logger.debug(f"Successfully parsed question {idx}: {question_data.get('identifier', 'UNKNOWN')}")
-                else:
-                    logger.warning(f"Question block {idx} could not be parsed")
-            except Exception as e:
-                logger.error(f"Failed to parse question block {idx}: {e}")
+        Args:
+            header: Header tokens (see header_tokens())
+
+        Returns:
+            Dict mapping key (without ^) to stripped values in document order
+        """
+        meta: Dict[str, List[str]] = {}
+        for i, token in enumerate(header):
+            if token.kind != META:
+                continue
+            value = token.value
+            if value and not value[0].isspace():
+                # "^key: value" - not a v6.5 metadata line
                 continue
+            value = value.strip()
+            if not value:
+                value = self._next_nonblank_line(header, i)
+                if value is None:
+                    continue
+            meta.setdefault(token.name, []).append(value)
+        return meta
+
+    def _next_nonblank_line(self, header: List[Token], index: int) -> Optional[str]:
+        """Get the first non-blank header line after index, stripped."""
+        for token in header[index + 1:]:
+            if token.text.strip():
+                return token.text.strip()
+        return None
+
+    def _validate_header(self, header: List[Token], meta: Dict[str, List[str]]) -> List[Dict[str, str]]:
+        """
+        Check ^type, ^identifier and ^points in the question header.
+
+        Each field MUST be at the start of its own line (v6.5: ^key value
+        format, NO colon).
+
+        Args:
+            header: Header tokens (see header_tokens())
+            meta: Header metadata from _collect_header_meta()
+
+        Returns:
+            List of error dicts with field, message and suggestion
+        """
+        q_errors = []
+        header_text = None
+
+        def has_colon_form(key: str) -> bool:
+            return any(
+                token.kind == META and token.name == key and token.value.startswith(':')
+                for token in header
+            )
 
-        logger.info(f"Successfully parsed {len(self.questions)} questions")
+        def mentions(key: str) -> bool:
+            nonlocal header_text
+            if header_text is None:
+                header_text = '\n'.join(token.text for token in header)
+            return f'^{key}' in header_text
+
+        # Validate ^type
+        if 'type' not in meta:
+            if has_colon_form('type'):
+                # Specific error for colon format (common mistake)
+                q_errors.append({
+                    'field': 'type',
+                    'message': '^type has colon - QFMD v6.5 uses "^type value" not "^type: value"',
+                    'suggestion': 'Remove the colon: ^type multiple_choice_single'
+                })
+            elif mentions('type'):
+                q_errors.append({
+                    'field': 'type',
+                    'message': '^type not at start of line - each metadata field must be on its own line',
+                    'suggestion': 'Put ^type on its own line'
+                })
+            else:
+                q_errors.append({
+                    'field': 'type',
+                    'message': 'Missing ^type field',
+                    'suggestion': 'Add: ^type multiple_choice_single (or other valid type)'
+                })
+
+        # Validate ^identifier
+        if 'identifier' not in meta:
+            if has_colon_form('identifier'):
+                q_errors.append({
+                    'field': 'identifier',
+                    'message': '^identifier has colon - QFMD v6.5 uses "^identifier value" not "^identifier: value"',
+                    'suggestion': 'Remove the colon: ^identifier Q001'
+                })
+            elif mentions('identifier'):
+                q_errors.append({
+                    'field': 'identifier',
+                    'message': '^identifier not at start of line',
+                    'suggestion': 'Put ^identifier on its own line'
+                })
+            else:
+                q_errors.append({
+                    'field': 'identifier',
+                    'message': 'Missing ^identifier field',
+                    'suggestion': 'Add: ^identifier Q001'
+                })
 
-    def _parse_question_block(self, block: str) -> Optional[Dict[str, Any]]:
+        # Validate ^points (must start with an integer)
+        if not any(value[0].isdigit() for value in meta.get('points', [])):
+            if has_colon_form('points'):
+                q_errors.append({
+                    'field': 'points',
+                    'message': '^points has colon - QFMD v6.5 uses "^points value" not "^points: value"',
+                    'suggestion': 'Remove the colon: ^points 1'
+                })
+            elif mentions('points'):
+                q_errors.append({
+                    'field': 'points',
+                    'message': '^points not at start of line or invalid value',
+                    'suggestion': 'Put ^points on its own line with integer value: ^points 1'
+                })
+            else:
+                q_errors.append({
+                    'field': 'points',
+                    'message': 'Missing ^points field',
+                    'suggestion': 'Add: ^points 1'
+                })
+
+        return q_errors
+
+    def _parse_question_block(self, block: str, tokens: Optional[List[Token]] = None) -> Optional[Dict[str, Any]]:
         """
         Parse a single question block.
 
         Args:
             block: Markdown text for one question
+            tokens: Tokens for the block (tokenized here if not given)
 
         Returns:
-            Dictionary with question data or None if parsing fails
+            Question (dict-compatible) or None if parsing fails
         """
-        question = {}
+        if tokens is None:
+            tokens = list(tokenize(block))
 
-        # Extract title from first heading
-        title_match = re.search(r'^#\s+(.+)$', block, re.MULTILINE)
-        if title_match:
-            question['title'] = title_match.group(1).strip()
+        # Extract metadata fields (Type, Identifier, Title, Points, etc.)
+        metadata_fields = self._extract_metadata_fields(tokens)
+        question = Question.from_dict(metadata_fields)
 
-        # Extract metadata fields (Type, Identifier, Points, etc.)
-        metadata_fields = self._extract_metadata_fields(block)
-        question.update(metadata_fields)
+        # Fall back to the whole first heading if the header has no title
+        if 'title' not in question:
+            if tokens and tokens[0].kind == HEADER:
+                question.title = tokens[0].text[1:].strip()
+            else:
+                title_match = re.search(r'^#\s+(.+)$', block, re.MULTILINE)
+                if title_match:
+                    question.title = title_match.group(1).strip()
 
         # Extract sections (Question Text, Options, Answer, Feedback)
-        question.update(self._extract_sections(block, metadata_fields))
+        question.update(self._extract_sections(block, metadata_fields, tokens))
 
         return question if question.get('identifier') else None
 
-    def _extract_metadata_fields(self, block: str) -> Dict[str, Any]:
+    def _extract_metadata_fields(self, tokens: List[Token]) -> Dict[str, Any]:
         """Extract ^ prefixed metadata fields from question block header (v6.5 format)."""
         fields = {}
 
         # Only extract metadata from header (before first @field: section)
-        header_match = re.search(r'^(.*?)(?=\n@field:)', block, re.DOTALL)
-        if not header_match:
-            header_text = block
-        else:
-            header_text = header_match.group(1)
+        header = header_tokens(tokens)
 
         # Extract title from # Q001 Title header
-        title_match = re.match(r'^# Q\d+[A-Z]?\s+(.+)$', header_text, re.MULTILINE)
-        if title_match:
-            fields['title'] = title_match.group(1).strip()
+        if header and header[0].kind == HEADER:
+            title = header[0].value.strip() or self._next_nonblank_line(header, 0)
+            if title:
+                fields['title'] = title
+
+        # Collect ^key values in one pass over the header (first value wins,
+        # except ^custom_metadata which may be repeated)
+        meta = self._collect_header_meta(header)
+        values = {key: key_values[0] for key, key_values in meta.items()}
+        custom_metadata_lines = meta.get('custom_metadata', [])
 
         # Extract ^type (v6.5 format)
-        type_match = re.search(r'^\^type\s+(.+)$', header_text, re.MULTILINE)
-        if type_match:
-            fields['question_type'] = type_match.group(1).strip()
+        if 'type' in values:
+            fields['question_type'] = values['type']
 
         # Extract ^identifier (v6.5 format)
-        id_match = re.search(r'^\^identifier\s+(.+)$', header_text, re.MULTILINE)
-        if id_match:
-            fields['identifier'] = id_match.group(1).strip()
+        if 'identifier' in values:
+            fields['identifier'] = values['identifier']
 
         # Extract ^points (v6.5 format)
-        points_match = re.search(r'^\^points\s+(.+)$', header_text, re.MULTILINE)
-        if points_match:
-            points_value = points_match.group(1).strip()
+        if 'points' in values:
+            points_value = values['points']
             if points_value.replace('.', '', 1).isdigit():
                 points_float = float(points_value)
                 if points_float == int(points_float):
@@ -663,19 +797,15 @@ class MarkdownQuizParser:
                 fields['points'] = 1
 
         # Extract ^labels (v6.5 format) - Inspera "Labels" (free-form tags)
-        labels_match = re.search(r'^\^labels\s+(.+)$', header_text, re.MULTILINE)
-        if labels_match:
-            label_value = labels_match.group(1).strip()
+        if 'labels' in values:
             # Space-separated: "#label1 #label2 #label3"
-            fields['labels'] = [label.strip().lstrip('#') for label in label_value.split() if label.strip()]
+            fields['labels'] = [label.strip().lstrip('#') for label in values['labels'].split() if label.strip()]
 
         # Extract ^tags and use as labels if ^labels not present
         # ^tags format: "#EXAMPLE_COURSE #topic1 #topic2 #Remember #Easy"
-        tags_match = re.search(r'^\^tags\s+(.+)$', header_text, re.MULTILINE)
-        if tags_match:
-            tags_value = tags_match.group(1).strip()
+        if 'tags' in values:
             # Parse space-separated hashtags
-            tags_list = [tag.strip().lstrip('#') for tag in tags_value.split() if tag.strip()]
+            tags_list = [tag.strip().lstrip('#') for tag in values['tags'].split() if tag.strip()]
             fields['tags'] = tags_list
             # If no ^labels field, use ^tags as labels for Inspera export
             if 'labels' not in fields:
@@ -683,34 +813,31 @@ class MarkdownQuizParser:
 
         # Extract ^custom_metadata (v6.5 format)
         # Format: ^custom_metadata Field name: value OR ^custom_metadata Field name: v1, v2, v3
-        custom_metadata_matches = re.findall(r'^\^custom_metadata\s+(.+)$', header_text, re.MULTILINE)
-        if custom_metadata_matches:
+        if custom_metadata_lines:
             custom_metadata = {}
-            for match in custom_metadata_matches:
+            for match in custom_metadata_lines:
                 if ':' in match:
                     field_name, values_str = match.split(':', 1)
                     field_name = field_name.strip()
                     # Parse comma-separated values
-                    values = [v.strip() for v in values_str.split(',') if v.strip()]
+                    field_values = [v.strip() for v in values_str.split(',') if v.strip()]
                     if field_name in custom_metadata:
-                        custom_metadata[field_name].extend(values)
+                        custom_metadata[field_name].extend(field_values)
                     else:
-                        custom_metadata[field_name] = values
+                        custom_metadata[field_name] = field_values
             fields['custom_metadata'] = custom_metadata
 
         # Extract ^title (v6.5 format - if separate from header)
-        title_field_match = re.search(r'^\^title\s+(.+)$', header_text, re.MULTILINE)
-        if title_field_match:
-            fields['title'] = title_field_match.group(1).strip()
+        if 'title' in values:
+            fields['title'] = values['title']
 
         # Extract ^language (v6.5 format - optional)
-        lang_match = re.search(r'^\^language\s+(.+)$', header_text, re.MULTILINE)
-        if lang_match:
-            fields['language'] = lang_match.group(1).strip()
+        if 'language' in values:
+            fields['language'] = values['language']
 
         return fields
 
-    def _extract_fields_v65(self, block: str) -> Dict[str, Any]:
+    def _extract_fields_v65(self, tokens: List[Token]) -> Dict[str, Any]:
         """
         Extract fields using v6.5 @field: / @end_field and @@field: / @@end_field markers.
 
@@ -722,25 +849,24 @@ class MarkdownQuizParser:
         Returns a dict with field IDs and their content (which may include nested subfields).
         """
         field_contents = {}
-        lines = block.split('\n')
 
         # Stack to track nested fields: [{field_id, content_lines, is_subfield}, ...]
         field_stack = []
 
-        for line in lines:
+        for token in tokens:
+            kind = token.kind
+
             # Skip markdown header lines (###, ####) - they're for human readability only
-            if re.match(r'^#{2,4}\s+', line):
+            if kind == HEADING:
                 continue
 
-            # Check for @@field: identifier (start of subfield - v6.5)
-            subfield_match = re.match(r'^@@field:\s*(\w+)', line)
-            if subfield_match:
-                field_id = subfield_match.group(1)
-                field_stack.append({'field_id': field_id, 'content': [], 'is_subfield': True})
+            # @@field: identifier (start of subfield - v6.5)
+            if kind == SUBFIELD_OPEN:
+                field_stack.append({'field_id': token.name, 'content': [], 'is_subfield': True})
                 continue
 
-            # Check for @@end_field (end of subfield - v6.5)
-            if line.strip() == '@@end_field':
+            # @@end_field (end of subfield - v6.5)
+            if kind == SUBFIELD_CLOSE:
                 if field_stack and field_stack[-1].get('is_subfield'):
                     completed = field_stack.pop()
                     content_str = '\n'.join(completed['content']).strip()
@@ -755,15 +881,13 @@ class MarkdownQuizParser:
                         field_contents[completed['field_id']] = content_str
                 continue
 
-            # Check for @field: identifier (start of top-level field)
-            field_match = re.match(r'^@field:\s*(\w+)', line)
-            if field_match:
-                field_id = field_match.group(1)
-                field_stack.append({'field_id': field_id, 'content': [], 'is_subfield': False})
+            # @field: identifier (start of top-level field)
+            if kind == FIELD_OPEN:
+                field_stack.append({'field_id': token.name, 'content': [], 'is_subfield': False})
                 continue
 
-            # Check for @end_field (end of top-level field)
-            if line.strip() == '@end_field':
+            # @end_field (end of top-level field)
+            if kind == FIELD_CLOSE:
                 if field_stack and not field_stack[-1].get('is_subfield'):
                     completed = field_stack.pop()
                     content_str = '\n'.join(completed['content']).strip()
@@ -778,7 +902,7 @@ class MarkdownQuizParser:
 
             # Add content to current field (if any)
             if field_stack:
-                field_stack[-1]['content'].append(line)
+                field_stack[-1]['content'].append(token.text)
 
         return field_contents
 
@@ -841,13 +965,16 @@ class MarkdownQuizParser:
             return field_value['metadata']
         return {}
 
-    def _extract_sections(self, block: str, metadata_fields: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_sections(self, block: str, metadata_fields: Dict[str, Any],
+                          tokens: Optional[List[Token]] = None) -> Dict[str, Any]:
         """Extract major sections from question block (v6.5 format with @end_field and @@end_field markers)."""
         sections = {}
+        if tokens is None:
+            tokens = list(tokenize(block))
 
         # v6.5: Extract fields using @field: / @end_field and @@field: / @@end_field
         # Uses stack-based parsing to handle nested subfields
-        field_contents = self._extract_fields_v65(block)
+        field_contents = self._extract_fields_v65(tokens)
 
         # Map field IDs to expected output keys
         if 'question_text' in field_contents:
@@ -982,6 +1109,26 @@ class MarkdownQuizParser:
                 # Remove the image markdown from question text, keep only the text after it
                 sections['question_text'] = re.sub(r'!\[([^\]]*)\]\(([^)]+)\)\s*\n*', '', sections['question_text'], count=1).strip()
 
+        # Legacy "## Section" formats (pre-v6.5). Every pattern needs "##",
+        # so v6.5 blocks (no markdown headings) skip the scans entirely.
+        if '##' in block:
+            self._extract_legacy_sections(block, metadata_fields, sections)
+
+        # Also extract image data from markdown image syntax in question text for hotspot questions
+        if metadata_fields.get('question_type') == 'hotspot' and not sections.get('image'):
+            sections['image'] = self._extract_image_from_markdown(sections.get('question_text', ''))
+
+        # Extract Feedback sections
+        sections['feedback'] = self._extract_feedback(block, metadata_fields.get('type', ''), field_contents)
+
+        # Convert Evolution format to xml_generator expected format
+        self._convert_evolution_format_to_standard(sections, metadata_fields)
+
+        return sections
+
+    def _extract_legacy_sections(self, block: str, metadata_fields: Dict[str, Any],
+                                 sections: Dict[str, Any]) -> None:
+        """Extract "## Section" style content (Evolution/TRA265/legacy formats) into sections."""
         # Extract Options
         options_match = re.search(
             r'##\s+Options\s*\n+(.*?)(?=\n##|\Z)',
@@ -1060,10 +1207,6 @@ class MarkdownQuizParser:
             if hotspot_defs_match:
                 sections['hotspots'] = self._parse_hotspot_definitions(hotspot_defs_match.group(1))
 
-        # Also extract image data from markdown image syntax in question text for hotspot questions
-        if metadata_fields.get('question_type') == 'hotspot' and not sections.get('image'):
-            sections['image'] = self._extract_image_from_markdown(sections.get('question_text', ''))
-
         # Extract Draggable Items section (for graphicgapmatch_v2)
         if metadata_fields.get('question_type') == 'graphicgapmatch_v2':
             draggable_match = re.search(
@@ -1239,14 +1382,6 @@ class MarkdownQuizParser:
         if correct_matches_match:
             sections['match_pairings'] = self._parse_correct_matches(correct_matches_match.group(1))
 
-        # Extract Feedback sections
-        sections['feedback'] = self._extract_feedback(block, metadata_fields.get('type', ''))
-
-        # Convert Evolution format to xml_generator expected format
-        self._convert_evolution_format_to_standard(sections, metadata_fields)
-
-        return sections
-
     def _parse_options(self, options_text: str) -> List[Dict[str, str]]:
         """Parse multiple choice options - supports both manual and GenAI formats."""
         options = []
@@ -1274,12 +1409,14 @@ class MarkdownQuizParser:
 
         return options
 
-    def _extract_feedback(self, block: str, question_type: str = '') -> Dict[str, str]:
+    def _extract_feedback(self, block: str, question_type: str = '',
+                          field_contents: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
         """Extract all feedback sections (v6.5 format with @@field: subfields)."""
         feedback = {}
 
         # v6.5: Extract all fields using @field: / @@field: markers
-        field_contents = self._extract_fields_v65(block)
+        if field_contents is None:
+            field_contents = self._extract_fields_v65(list(tokenize(block)))
 
         # Map feedback subfield IDs to expected output keys
         field_mapping = {
@@ -2636,6 +2773,30 @@ class MarkdownQuizParser:
         return zones
 
 
+# XML special characters (translated in one pass; '&' is never re-escaped)
+_XML_ESCAPES = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&apos;'
+})
+
+# Inline markdown handled by markdown_to_xhtml(), in the order it is applied
+_IMAGE_RE = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
+_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+_ITALIC_RE = re.compile(r'\*(.+?)\*')
+_CODE_RE = re.compile(r'`(.+?)`')
+
+# Anything any of the patterns above could match. Paragraphs without it
+# (most option texts and feedback) skip the substitutions entirely.
+_INLINE_MARKUP_RE = re.compile(r'!\[|[*`]')
+
+# Distinct fragments remembered by markdown_to_xhtml(). Banks repeat the
+# same option labels and feedback boilerplate in many questions.
+XHTML_CACHE_SIZE = 4096
+
+
 def _escape_xml_entities(text: str) -> str:
     """
     Escape special XML characters to prevent parsing errors.
@@ -2649,20 +2810,20 @@ def _escape_xml_entities(text: str) -> str:
     if not text:
         return ''
 
-    replacements = {
-        '&': '&amp;',
-        '<': '&lt;',
-        '>': '&gt;',
-        '"': '&quot;',
-        "'": '&apos;'
-    }
+    return text.translate(_XML_ESCAPES)
 
-    for char, escape in replacements.items():
-        text = text.replace(char, escape)
 
-    return text
+def _convert_image(match) -> str:
+    """Convert markdown image to XHTML img tag with resources/ prefix."""
+    alt_text = match.group(1)
+    image_path = match.group(2)
+    # Extract just the filename (remove any directory path)
+    filename = os.path.basename(image_path)
+    # Note: alt_text is already escaped at this point
+    return f'<img src="resources/{filename}" alt="{alt_text}"/>'
 
 
+@lru_cache(maxsize=XHTML_CACHE_SIZE)
 def markdown_to_xhtml(markdown_text: str) -> str:
     """
     Convert markdown text to XHTML suitable for QTI.
@@ -2675,21 +2836,15 @@ def markdown_to_xhtml(markdown_text: str) -> str:
     - ![alt](path) to <img> tags with resources/ prefix
     - Line breaks preserved
 
+    Results are memoized (LRU, XHTML_CACHE_SIZE entries); clear with
+    markdown_to_xhtml.cache_clear().
+
     Args:
         markdown_text: Markdown formatted text
 
     Returns:
         XHTML formatted text with properly escaped XML entities
     """
-    def convert_image(match):
-        """Convert markdown image to XHTML img tag with resources/ prefix."""
-        alt_text = match.group(1)
-        image_path = match.group(2)
-        # Extract just the filename (remove any directory path)
-        filename = os.path.basename(image_path)
-        # Note: alt_text is already escaped at this point
-        return f'<img src="resources/{filename}" alt="{alt_text}"/>'
-
     # CRITICAL: Escape XML entities FIRST before any other processing
     # This prevents & < > " ' from breaking XML parsing
     markdown_text = _escape_xml_entities(markdown_text)
@@ -2702,14 +2857,16 @@ def markdown_to_xhtml(markdown_text: str) -> str:
         if not para.strip():
             continue
 
-        # Convert markdown images (after escaping - safe for attributes)
-        # Pattern: ![alt text](path/to/image.png)
-        para = re.sub(r'!\[([^\]]*)\]\(([^)]+)\)', convert_image, para)
+        if _INLINE_MARKUP_RE.search(para):
+            # Convert markdown images (after escaping - safe for attributes)
+            # Pattern: ![alt text](path/to/image.png)
+            para = _IMAGE_RE.sub(_convert_image, para)
 
-        # Convert markdown formatting
-        para = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', para)
-        para = re.sub(r'\*(.+?)\*', r'<em>\1</em>', para)
-        para = re.sub(r'`(.+?)`', r'<code>\1</code>', para)
+            # Convert markdown formatting. Each pass sees the output of the
+            # previous one, so *italic* inside **bold** is converted too.
+            para = _BOLD_RE.sub(r'<strong>\1</strong>', para)
+            para = _ITALIC_RE.sub(r'<em>\1</em>', para)
+            para = _CODE_RE.sub(r'<code>\1</code>', para)
 
         # Convert line breaks to <br/>
         para = para.replace('\n', '<br/>')
@@ -2717,4 +2874,4 @@ def markdown_to_xhtml(markdown_text: str) -> str:
         # Wrap in paragraph tag
         xhtml_paragraphs.append(f'<p>{para}</p>')
 
-    return '\n'.join(xhtml_paragraphs)
\ No newline at end of file
+    return '\n'.join(xhtml_paragraphs)
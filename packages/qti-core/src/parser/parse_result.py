@@ -0,0 +1,118 @@
+"""
+Parse Result - combined parse() and validate() output
+
+MarkdownQuizParser.parse_and_validate() parses every question block once and
+returns a ParseResult holding the parsed questions, the validation errors and
+the source span of each block. parse() and validate() are views of it, so a
+caller that needs both pays for one pass over the document.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .question_model import Question
+
+
+def block_hash(text: str) -> str:
+    """
+    Hash a question block's text (key for parse_and_validate() block caches).
+
+    Args:
+        text: Block source text
+
+    Returns:
+        Hex digest of the text
+    """
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class BlockResult:
+    """
+    Parse and validation outcome for one question block.
+
+    Attributes:
+        index: 1-based question number in the file
+        question_id: ^identifier (or header ID like 'Q001' if missing)
+        text: Block source text (stripped)
+        start: Character offset of the block in the source content
+        end: Character offset after the block (content[start:end] == text)
+        line: 1-based line number of the "# Qnnn" header
+        question: Parsed question, or None if the block could not be
+            parsed (point corrections are not applied here)
+        errors: Validation errors for this block (same dicts as validate())
+    """
+    index: int
+    question_id: str
+    text: str
+    start: int
+    end: int
+    line: int
+    question: Optional[Question] = None
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        """True if the block parsed without validation errors."""
+        return self.question is not None and not self.errors
+
+
+@dataclass
+class ParseResult:
+    """
+    Result of MarkdownQuizParser.parse_and_validate().
+
+    Attributes:
+        metadata: Test-level configuration (frontmatter)
+        blocks: One BlockResult per question block, in document order
+        questions: Every question that parsed, with point corrections
+            applied (what parse() returns)
+    """
+    metadata: Dict[str, Any]
+    blocks: List[BlockResult]
+    questions: List[Question]
+
+    @property
+    def errors(self) -> List[Dict[str, Any]]:
+        """All validation errors in document order."""
+        return [error for block in self.blocks for error in block.errors]
+
+    @property
+    def valid(self) -> bool:
+        """True if no block has validation errors."""
+        return not any(block.errors for block in self.blocks)
+
+    @property
+    def valid_questions(self) -> List[Question]:
+        """Questions of error-free blocks, uncorrected (what validate() returns)."""
+        return [block.question for block in self.blocks if block.valid]
+
+    @property
+    def total_questions(self) -> int:
+        """Number of question blocks found."""
+        return len(self.blocks)
+
+    @property
+    def parsed_questions(self) -> int:
+        """Number of question blocks without errors."""
+        return sum(1 for block in self.blocks if block.valid)
+
+    def to_parse_dict(self) -> Dict[str, Any]:
+        """Return the dict parse() returns."""
+        return {
+            'metadata': self.metadata,
+            'questions': self.questions
+        }
+
+    def to_validate_dict(self) -> Dict[str, Any]:
+        """Return the dict validate() returns."""
+        valid_questions = self.valid_questions
+        return {
+            'valid': self.valid,
+            'metadata': self.metadata,
+            'questions': valid_questions,
+            'errors': self.errors,
+            'total_questions': self.total_questions,
+            'parsed_questions': len(valid_questions)
+        }
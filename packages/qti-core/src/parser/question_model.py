@@ -0,0 +1,265 @@
+"""
+Question Model - compact parsed questions
+
+MarkdownQuizParser returns each question as an instance of a Question
+subclass chosen by ^type. Fields are stored in __slots__ instead of a
+per-question dict, which keeps large banks small in memory (the MCP server
+holds whole banks between tool calls) and makes attribute access cheap:
+
+    question.identifier
+    question.points
+
+Questions are also mutable mappings, so existing code written against the
+old question dicts keeps working unchanged:
+
+    question['question_text'] = text
+    question.get('labels', [])
+    'image' in question
+
+A field that was never set is absent from the mapping, exactly like a
+missing dict key. Keys that are not fields of the question's class are kept
+in a small overflow dict, so no parsed data is lost.
+"""
+
+import copy
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type, Union
+
+
+class Question(MutableMapping):
+    """
+    Parsed question (fields shared by all question types).
+
+    Subclasses add the fields of their interaction type and list the
+    ^type values they handle in QUESTION_TYPES.
+    """
+
+    identifier: str
+    question_type: str
+    title: str
+    points: Union[int, float]
+    labels: List[str]
+    tags: List[str]
+    custom_metadata: Dict[str, List[str]]
+    language: str
+    question_text: str
+    feedback: Dict[str, Any]
+    scoring: Dict[str, Any]
+    image: Dict[str, Any]
+
+    FIELDS: Tuple[str, ...] = (
+        'identifier', 'question_type', 'title', 'points', 'labels', 'tags',
+        'custom_metadata', 'language', 'question_text', 'feedback', 'scoring', 'image',
+    )
+    QUESTION_TYPES: Tuple[str, ...] = ()
+
+    __slots__ = FIELDS + ('_extra',)
+
+    _FIELD_SET = frozenset(FIELDS)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.FIELDS = cls.__mro__[1].FIELDS + cls.__slots__
+        cls._FIELD_SET = frozenset(cls.FIELDS)
+        for question_type in cls.QUESTION_TYPES:
+            _QUESTION_CLASSES[question_type] = cls
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, **fields):
+        self._extra: Optional[Dict[str, Any]] = None
+        if data:
+            self.update(data)
+        if fields:
+            self.update(fields)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Question':
+        """
+        Create a question of the class registered for data['question_type'].
+
+        Args:
+            data: Question fields (e.g. a parsed question dict)
+
+        Returns:
+            Question subclass instance (Question for unknown types)
+        """
+        return question_class(data.get('question_type'))(data)
+
+    # -- mapping interface ------------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in self._FIELD_SET:
+            setattr(self, key, value)
+        elif self._extra is None:
+            self._extra = {key: value}
+        else:
+            self._extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._FIELD_SET:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self.FIELDS:
+            if hasattr(self, name):
+                yield name
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self._FIELD_SET:
+            return getattr(self, key, default)
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def copy(self) -> 'Question':
+        """Shallow copy (same class, field values shared)."""
+        return type(self)(self)
+
+    def deep_copy(self) -> 'Question':
+        """Copy whose nested dicts and lists can be changed independently."""
+        return type(self)({key: _copy_value(value) for key, value in self.items()})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict of the set fields (for JSON and other dict-only APIs)."""
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return self.to_dict()
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self._extra = None
+        self.update(state)
+
+
+_QUESTION_CLASSES: Dict[str, Type[Question]] = {}
+
+_IMMUTABLE = (str, int, float, bool, type(None))
+
+
+def _copy_value(value: Any) -> Any:
+    """Copy the containers of a field value (strings and numbers are shared)."""
+    if isinstance(value, _IMMUTABLE):
+        return value
+    if type(value) is dict:
+        return {key: _copy_value(item) for key, item in value.items()}
+    if type(value) is list:
+        return [_copy_value(item) for item in value]
+    return copy.deepcopy(value)
+
+
+def question_class(question_type: Optional[str]) -> Type[Question]:
+    """
+    Get the Question class for a ^type value.
+
+    Args:
+        question_type: Question type (e.g. 'multiple_choice_single')
+
+    Returns:
+        Registered subclass, or Question for unknown/missing types
+    """
+    return _QUESTION_CLASSES.get(question_type, Question)
+
+
+class ChoiceQuestion(Question):
+    """Choice interaction: options with one or more correct answers."""
+
+    options: List[Dict[str, str]]
+    correct_answer: str
+    correct_answers: List[str]
+    correct_answers_dict: Dict[str, str]
+    shuffle_options: bool
+
+    QUESTION_TYPES = ('multiple_choice_single', 'multiple_response', 'true_false')
+    __slots__ = ('options', 'correct_answer', 'correct_answers', 'correct_answers_dict', 'shuffle_options')
+
+
+class InlineChoiceQuestion(Question):
+    """Inline choice interaction: dropdowns in the question text."""
+
+    inline_choices: Dict[str, List[str]]
+    correct_answers_dict: Dict[str, str]
+    correct_answer_text: str
+
+    QUESTION_TYPES = ('inline_choice',)
+    __slots__ = ('inline_choices', 'correct_answers_dict', 'correct_answer_text')
+
+
+class TextEntryQuestion(Question):
+    """Text entry interaction: blanks answered with text, numbers or math."""
+
+    blanks: List[Dict[str, Any]]
+    correct_answer_text: str
+    correct_answers_dict: Dict[str, str]
+    accepted_alternatives: Any
+
+    QUESTION_TYPES = (
+        'text_entry', 'text_entry_numeric', 'text_entry_math',
+        'text_entry_graphic', 'fill_in_the_blank',
+    )
+    __slots__ = ('blanks', 'correct_answer_text', 'correct_answers_dict', 'accepted_alternatives')
+
+
+class MatchQuestion(Question):
+    """Match and gap match interactions: premises paired with responses."""
+
+    premises: List[Dict[str, str]]
+    match_responses: List[Dict[str, str]]
+    match_pairings: List[Dict[str, str]]
+
+    QUESTION_TYPES = ('match', 'matching', 'gapmatch', 'gap_match')
+    __slots__ = ('premises', 'match_responses', 'match_pairings')
+
+
+class GraphicQuestion(Question):
+    """Graphic interactions: hotspots or drag-and-drop zones on an image."""
+
+    hotspots: List[Dict[str, Any]]
+    draggable_items: List[Dict[str, Any]]
+    zones: List[Dict[str, Any]]
+
+    QUESTION_TYPES = ('hotspot', 'graphicgapmatch_v2')
+    __slots__ = ('hotspots', 'draggable_items', 'zones')
+
+
+class ExtendedTextQuestion(Question):
+    """Extended response interactions: essay, editors and recordings."""
+
+    initial_lines: int
+    field_width: str
+    show_word_count: bool
+    editor_prompt: str
+
+    QUESTION_TYPES = (
+        'essay', 'text_area', 'math_working', 'composite_editor',
+        'audio_record', 'nativehtml',
+    )
+    __slots__ = ('initial_lines', 'field_width', 'show_word_count', 'editor_prompt')
@@ -0,0 +1,229 @@
+"""
+QFMD Line Tokenizer - v6.5 Format
+
+Classifies every line of a markdown quiz file once and emits typed tokens:
+
+    HEADER          # Q001 Title                (name='Q001', value=' Title')
+    META            ^type multiple_choice_single (name='type', value=' multiple_...')
+    FIELD_OPEN      @field: question_text       (name='question_text')
+    FIELD_CLOSE     @end_field
+    SUBFIELD_OPEN   @@field: correct_feedback   (name='correct_feedback')
+    SUBFIELD_CLOSE  @@end_field
+    HEADING         ## / ### / #### headings    (human readability only)
+    CONTENT         any other line
+
+MarkdownQuizParser builds question metadata and @field: contents from this one
+stream instead of running a separate regex scan per field. Only lines starting
+with '#', '^' or '@' are matched against a pattern; all other lines are
+CONTENT after a single character check.
+
+META and HEADER values are the raw text after the key/identifier (not
+stripped), so callers can tell "^type value" from "^type: value".
+"""
+
+import re
+from typing import Iterator, List, NamedTuple
+
+# Token kinds
+HEADER = 'header'
+META = 'meta'
+FIELD_OPEN = 'field_open'
+FIELD_CLOSE = 'field_close'
+SUBFIELD_OPEN = 'subfield_open'
+SUBFIELD_CLOSE = 'subfield_close'
+HEADING = 'heading'
+CONTENT = 'content'
+
+# "# Q001 Title" / "# Q001A Title" - identifier must be followed by whitespace
+_HEADER_RE = re.compile(r'# (Q\d+[A-Z]?)(?=\s|$)')
+_HEADING_RE = re.compile(r'#{2,4}\s+')
+_META_RE = re.compile(r'\^(\w+)')
+_FIELD_RE = re.compile(r'@field:\s*(\w+)')
+_SUBFIELD_RE = re.compile(r'@@field:\s*(\w+)')
+
+
+class Token(NamedTuple):
+    """
+    One classified line.
+
+    Attributes:
+        kind: Token kind (HEADER, META, FIELD_OPEN, ...)
+        line_no: 0-based line number in the tokenized text
+        text: The full line (without newline)
+        name: Question ID (HEADER), key (META) or field ID (*_OPEN), else ''
+        value: Raw text after the name (HEADER, META), else ''
+        offset: Character offset of the line start in the tokenized text
+    """
+    kind: str
+    line_no: int
+    text: str
+    name: str = ''
+    value: str = ''
+    offset: int = 0
+
+
+class QuestionBlock(NamedTuple):
+    """
+    Tokens and text for one question (from its "# Qnnn" header to the next).
+
+    Attributes:
+        question_id: Identifier from the header line (e.g. 'Q001')
+        text: Block text with surrounding whitespace stripped
+        tokens: Tokens of the block (trailing blank lines dropped)
+        start_line: Line number of the header line
+        end_line: Line number after the last line of the block
+        start_offset: Character offset of the header line
+        end_offset: Character offset after the block text (text[start:end] == block text)
+    """
+    question_id: str
+    text: str
+    tokens: List[Token]
+    start_line: int
+    end_line: int
+    start_offset: int
+    end_offset: int
+
+
+def classify_line(line: str, line_no: int = 0, offset: int = 0) -> Token:
+    """
+    Classify a single line.
+
+    Args:
+        line: Line without trailing newline
+        line_no: Line number stored in the token
+        offset: Character offset stored in the token
+
+    Returns:
+        Token for the line
+    """
+    first = line[:1]
+
+    if first == '#':
+        match = _HEADER_RE.match(line)
+        if match:
+            return Token(HEADER, line_no, line, match.group(1), line[match.end():], offset)
+        if _HEADING_RE.match(line):
+            return Token(HEADING, line_no, line, offset=offset)
+        return Token(CONTENT, line_no, line, offset=offset)
+
+    if first == '^':
+        match = _META_RE.match(line)
+        if match:
+            return Token(META, line_no, line, match.group(1), line[match.end():], offset)
+        return Token(CONTENT, line_no, line, offset=offset)
+
+    if first == '@':
+        match = _SUBFIELD_RE.match(line)
+        if match:
+            return Token(SUBFIELD_OPEN, line_no, line, match.group(1), offset=offset)
+        match = _FIELD_RE.match(line)
+        if match:
+            return Token(FIELD_OPEN, line_no, line, match.group(1), offset=offset)
+
+    # End markers may be indented or have trailing whitespace
+    if '@' in line:
+        stripped = line.strip()
+        if stripped == '@@end_field':
+            return Token(SUBFIELD_CLOSE, line_no, line, offset=offset)
+        if stripped == '@end_field':
+            return Token(FIELD_CLOSE, line_no, line, offset=offset)
+
+    return Token(CONTENT, line_no, line, offset=offset)
+
+
+def tokenize(text: str) -> Iterator[Token]:
+    """
+    Tokenize markdown text line by line.
+
+    Args:
+        text: Markdown content
+
+    Yields:
+        One Token per line, in order
+    """
+    lines = text.split('\n')
+    last = len(lines) - 1
+    offset = 0
+    for line_no, line in enumerate(lines):
+        token = classify_line(line, line_no, offset)
+        # A bare "# Q001" only starts a question when a newline follows it
+        if token.kind == HEADER and line_no == last and not token.value:
+            token = Token(CONTENT, line_no, line, offset=offset)
+        yield token
+        offset += len(line) + 1
+
+
+def split_question_blocks(text: str) -> List[QuestionBlock]:
+    """
+    Split markdown text into question blocks in a single pass.
+
+    Anything before the first "# Qnnn" header is ignored. A header with
+    nothing after it (no title and no further lines) is not a question.
+    Other headers start at column 0, but the first one may be indented if
+    only whitespace precedes it (e.g. "===QUESTIONS===\n  # Q001 ...").
+
+    Args:
+        text: Question section of a markdown quiz file
+
+    Returns:
+        List of QuestionBlock in document order
+    """
+    blocks: List[QuestionBlock] = []
+    current: List[Token] = []
+
+    def close_block() -> None:
+        # Drop trailing blank lines (the block text is stripped)
+        end = len(current)
+        while end > 1 and not current[end - 1].text.strip():
+            end -= 1
+        tokens = current[:end]
+        if len(tokens) == 1 and not tokens[0].value.strip():
+            return
+        block_text = '\n'.join(token.text for token in tokens).strip()
+        blocks.append(QuestionBlock(
+            question_id=tokens[0].name,
+            text=block_text,
+            tokens=tokens,
+            start_line=tokens[0].line_no,
+            end_line=tokens[-1].line_no + 1,
+            start_offset=tokens[0].offset,
+            end_offset=tokens[0].offset + len(block_text)
+        ))
+
+    leading_blank = True
+    for token in tokenize(text):
+        if leading_blank and token.kind == CONTENT and token.text.strip():
+            # The text used to be stripped before looking for the first header
+            stripped = token.text.lstrip()
+            indent = len(token.text) - len(stripped)
+            token = classify_line(stripped, token.line_no, token.offset + indent)
+        if token.text.strip():
+            leading_blank = False
+
+        if token.kind == HEADER:
+            if current:
+                close_block()
+            current = [token]
+        elif current:
+            current.append(token)
+
+    if current:
+        close_block()
+
+    return blocks
+
+
+def header_tokens(tokens: List[Token]) -> List[Token]:
+    """
+    Get the question header: tokens before the first "@field:" line.
+
+    Args:
+        tokens: Tokens of one question block
+
+    Returns:
+        Leading tokens holding the ^metadata lines
+    """
+    for i in range(1, len(tokens)):
+        if tokens[i].text.startswith('@field:'):
+            return tokens[:i]
+    return tokens
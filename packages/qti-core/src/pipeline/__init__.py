@@ -0,0 +1,10 @@
+"""
+QTI Export Pipeline Module
+
+This module runs the five-step export workflow (validate → folder → resources
+→ XML → ZIP) in a single process, sharing parsed data between the steps.
+"""
+
+from .export_pipeline import ExportCancelled, ExportPipeline, StepResult
+
+__all__ = ['ExportCancelled', 'ExportPipeline', 'StepResult']
@@ -0,0 +1,568 @@
+"""
+Export Pipeline
+
+Runs the five export steps of scripts/step1_validate.py … step5_create_zip.py
+in-process. The markdown file is parsed once and the parsed questions, resource
+mapping and generated XML are carried in memory from step to step, instead of
+every script starting a new interpreter and re-parsing the same file.
+
+The files written are the same as with the scripts: the quiz folder with
+resources/, the .workflow/*.json metadata, the item XML files, imsmanifest.xml
+and the ZIP next to the folder.
+
+Usage:
+    pipeline = ExportPipeline("quiz.md", output_dir="output", language="sv")
+    for result in pipeline.run():
+        print(result.output)
+    if pipeline.succeeded:
+        print(pipeline.zip_path)
+"""
+
+import io
+import json
+import sys
+import threading
+import time
+import traceback
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+from src.parser.markdown_parser import MarkdownQuizParser
+from src.generator.xml_generator import XMLGenerator
+from src.generator.resource_manager import ResourceManager, apply_resource_mapping
+from src.generator.score_table import build_score_table, write_score_table
+from src.packager.qti_packager import QTIPackager, media_references
+from src.spans import Span, record, span
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+class ExportCancelled(Exception):
+    """Raised inside a step when ExportPipeline.cancel() has been called."""
+
+
+@dataclass
+class StepResult:
+    """
+    Outcome of one pipeline step.
+
+    Attributes:
+        name: Step name (see ExportPipeline.STEPS)
+        success: True if the step completed and the next step may run
+        output: Step output (same text the matching script prints to stdout)
+        error_output: Step error output (the script's stderr)
+        duration_ms: Wall-clock time of the step
+        cancelled: True if the step was stopped by ExportPipeline.cancel()
+        span: Timing tree of the step's stages (see src/spans.py)
+    """
+    name: str
+    success: bool
+    output: str = ''
+    error_output: str = ''
+    duration_ms: int = 0
+    cancelled: bool = False
+    span: Optional[Span] = None
+
+
+class ExportPipeline:
+    """Run the QTI export steps in-process with a single parse."""
+
+    # (step name, matching script) in execution order
+    STEPS = (
+        ('validate', 'step1_validate.py'),
+        ('create_folder', 'step2_create_folder.py'),
+        ('copy_resources', 'step3_copy_resources.py'),
+        ('generate_xml', 'step4_generate_xml.py'),
+        ('create_zip', 'step5_create_zip.py'),
+    )
+
+    def __init__(self,
+                 markdown_file: Path,
+                 output_dir: Path = 'output',
+                 quiz_name: Optional[str] = None,
+                 language: str = 'en',
+                 media_dir: Optional[Path] = None,
+                 strict: bool = False,
+                 keep_folder: bool = True,
+                 compresslevel: Optional[int] = None,
+                 verbose: bool = False):
+        """
+        Initialize pipeline.
+
+        Args:
+            markdown_file: Path to markdown quiz file
+            output_dir: Output base directory (quiz folder and ZIP go here)
+            quiz_name: Quiz name (default: markdown filename without extension)
+            language: Question language code
+            media_dir: Media directory (default: markdown file's directory)
+            strict: Treat resource warnings as errors
+            keep_folder: Keep the extracted quiz folder next to the ZIP. If
+                False, the ZIP is streamed from memory without writing the
+                item XML to the quiz folder.
+            compresslevel: Deflate level 0-9 for the ZIP (default: zlib default)
+            verbose: Include detailed information in step output
+        """
+        self.markdown_path = Path(markdown_file).expanduser().resolve()
+        self.output_base = Path(output_dir).expanduser().resolve()
+        self.quiz_name = quiz_name or self.markdown_path.stem
+        self.language = language
+        self.media_dir = Path(media_dir) if media_dir else self.markdown_path.parent
+        self.strict = strict
+        self.keep_folder = keep_folder
+        self.compresslevel = compresslevel
+        self.verbose = verbose
+
+        self.quiz_dir = self.output_base / self.quiz_name
+        self.resources_dir = self.quiz_dir / 'resources'
+        self.workflow_dir = self.quiz_dir / '.workflow'
+
+        # State carried between steps
+        self.content: Optional[str] = None
+        self.quiz_data: Optional[Dict[str, Any]] = None
+        self.validation_report = None
+        self.resource_mapping: Dict[str, str] = {}
+        # Resources the questions reference (original paths, missing ones included)
+        self.resources: List[str] = []
+        self.questions_xml: List[Tuple[str, str]] = []
+        # Media files each item references, aligned with questions_xml
+        self.media_index: List[List[str]] = []
+        self.score_table: Optional[Dict[str, Any]] = None
+        self.assessment_test_xml: Optional[str] = None
+        self.zip_path: Optional[str] = None
+        self.results: List[StepResult] = []
+        self._cancel_event = threading.Event()
+        # Output of the running step. Steps print here, never to sys.stdout:
+        # the MCP server uses stdout for the protocol, and pipelines in other
+        # threads must not see each other's output.
+        self._out: TextIO = io.StringIO()
+        self._err: TextIO = io.StringIO()
+
+    def cancel(self) -> None:
+        """
+        Ask the pipeline to stop.
+
+        Safe to call from another thread. The running step stops at its next
+        checkpoint (per question in generate_xml, per file in copy_resources
+        and while writing the ZIP) and no further steps are started. Files
+        already written are left in place, except a partly written ZIP.
+        """
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """True if cancel() has been called."""
+        return self._cancel_event.is_set()
+
+    def _check_cancelled(self) -> None:
+        """Raise ExportCancelled if cancel() has been called."""
+        if self._cancel_event.is_set():
+            raise ExportCancelled("Export cancelled")
+
+    @property
+    def succeeded(self) -> bool:
+        """True if every step has run successfully."""
+        return len(self.results) == len(self.STEPS) and all(r.success for r in self.results)
+
+    @property
+    def question_count(self) -> int:
+        """Number of questions that were generated."""
+        return len(self.questions_xml)
+
+    def run(self) -> List[StepResult]:
+        """
+        Run all steps in order, stopping at the first failing step.
+
+        Returns:
+            List of StepResult for the steps that were run
+        """
+        for name, _script in self.STEPS:
+            result = self.run_step(name)
+            if not result.success:
+                break
+        return self.results
+
+    def run_step(self, name: str) -> StepResult:
+        """
+        Run a single step by name, capturing its output.
+
+        Steps must be run in STEPS order; each step uses the state left by
+        the previous one.
+
+        Args:
+            name: Step name from STEPS
+
+        Returns:
+            StepResult for the step
+        """
+        step_methods = {
+            'validate': self._validate,
+            'create_folder': self._create_folder,
+            'copy_resources': self._copy_resources,
+            'generate_xml': self._generate_xml,
+            'create_zip': self._create_zip,
+        }
+        if name not in step_methods:
+            raise ValueError(f"Unknown pipeline step: {name}")
+
+        self._out = stdout = io.StringIO()
+        self._err = stderr = io.StringIO()
+        start = datetime.now()
+        cancelled = False
+
+        with span(name) as step_span:
+            try:
+                self._check_cancelled()
+                success = step_methods[name]()
+            except ExportCancelled:
+                print(f"✗ Cancelled: {name}", file=self._err)
+                success = False
+                cancelled = True
+            except Exception as e:
+                print(f"✗ Error: {e}", file=self._err)
+                if self.verbose:
+                    traceback.print_exc(file=self._err)
+                success = False
+            step_span.set(success=success)
+
+        result = StepResult(
+            name=name,
+            success=success,
+            output=stdout.getvalue(),
+            error_output=stderr.getvalue(),
+            duration_ms=int((datetime.now() - start).total_seconds() * 1000),
+            cancelled=cancelled,
+            span=step_span
+        )
+        self.results.append(result)
+        return result
+
+    # ------------------------------------------------------------------
+    # Step 1: Validate (parses the file - the only parse in the pipeline)
+    # ------------------------------------------------------------------
+
+    def _validate(self) -> bool:
+        """Validate markdown format and keep the parsed questions."""
+        # validate_mqg_format lives in the project root, next to src/
+        if str(PROJECT_ROOT) not in sys.path:
+            sys.path.insert(0, str(PROJECT_ROOT))
+        from validate_mqg_format import ValidationReport
+
+        print("=" * 70, file=self._out)
+        print("STEP 1: VALIDATE MARKDOWN FORMAT", file=self._out)
+        print("=" * 70, file=self._out)
+        print(f"Input file: {self.markdown_path}", file=self._out)
+        print(file=self._out)
+
+        if not self.markdown_path.exists():
+            print(f"✗ Error: File not found: {self.markdown_path}", file=self._err)
+            return False
+
+        with open(self.markdown_path, 'r', encoding='utf-8') as f:
+            self.content = f.read()
+
+        with span('parse', bytes_read=self.markdown_path.stat().st_size) as parse_span:
+            parser = MarkdownQuizParser(self.content)
+            result = parser.parse_and_validate()
+            parse_span.set(questions=result.total_questions, errors=len(result.errors))
+
+        report = ValidationReport()
+        report.total_questions = result.total_questions
+        report.valid_questions = result.parsed_questions
+        for error in result.errors:
+            report.add_error(
+                q_num=error.get('question_num', 0),
+                q_id=error.get('question_id', 'UNKNOWN'),
+                message=error.get('message', 'Unknown error'),
+                suggestion=error.get('suggestion', '')
+            )
+        self.validation_report = report
+
+        if not report.is_valid():
+            report_path = self.markdown_path.parent / f"{self.markdown_path.stem}_validation_report.txt"
+            report.save_report(report_path, self.markdown_path)
+            print(f"\n📄 Detailed report saved: {report_path}", file=self._out)
+
+        report.print_report(file=self._out)
+
+        if not report.is_valid():
+            return False
+
+        # Same single pass holds the parsed questions (with point corrections)
+        self.quiz_data = {
+            'metadata': result.metadata or {},
+            'questions': result.questions
+        }
+        return True
+
+    # ------------------------------------------------------------------
+    # Step 2: Create folder structure
+    # ------------------------------------------------------------------
+
+    def _create_folder(self) -> bool:
+        """Create quiz, resources and .workflow directories."""
+        print("=" * 70, file=self._out)
+        print("STEP 2: CREATE OUTPUT FOLDER STRUCTURE", file=self._out)
+        print("=" * 70, file=self._out)
+        print(f"Input file:     {self.markdown_path}", file=self._out)
+        print(f"Quiz name:      {self.quiz_name}", file=self._out)
+        print(f"Output base:    {self.output_base}", file=self._out)
+        print(file=self._out)
+
+        self.quiz_dir.mkdir(parents=True, exist_ok=True)
+        print(f"✓ Created: {self.quiz_dir}/", file=self._out)
+        self.resources_dir.mkdir(exist_ok=True)
+        print(f"✓ Created: {self.resources_dir}/", file=self._out)
+        self.workflow_dir.mkdir(exist_ok=True)
+        print(f"✓ Created: {self.workflow_dir}/ (workflow metadata)", file=self._out)
+        print(file=self._out)
+
+        metadata = {
+            'step': 'step2_create_folder',
+            'timestamp': datetime.now().isoformat(),
+            'input_file': str(self.markdown_path),
+            'quiz_name': self.quiz_name,
+            'quiz_dir': str(self.quiz_dir),
+            'resources_dir': str(self.resources_dir),
+            'output_base': str(self.output_base)
+        }
+        self._write_workflow_json('metadata.json', metadata)
+        return True
+
+    # ------------------------------------------------------------------
+    # Step 3: Copy and rename resources
+    # ------------------------------------------------------------------
+
+    def _copy_resources(self) -> bool:
+        """Validate and copy media resources using the parsed questions."""
+        print("=" * 70, file=self._out)
+        print("STEP 3: COPY AND RENAME RESOURCES", file=self._out)
+        print("=" * 70, file=self._out)
+        print(f"Markdown file:  {self.markdown_path}", file=self._out)
+        print(f"Quiz directory: {self.quiz_dir}", file=self._out)
+        print(f"Resources dir:  {self.resources_dir}", file=self._out)
+        print(file=self._out)
+
+        questions = self.quiz_data['questions']
+        print(f"Found {len(questions)} questions", file=self._out)
+        print(file=self._out)
+
+        resource_manager = ResourceManager(
+            input_file=self.markdown_path,
+            output_dir=self.quiz_dir.parent,
+            media_dir=self.media_dir,
+            strict=self.strict
+        )
+
+        self.resources = resource_manager.referenced_resources(questions)
+
+        print("Validating resources...", file=self._out)
+        with span('validate_resources'):
+            issues = resource_manager.validate_resources(questions)
+        if issues:
+            print(file=self._out)
+            for issue in issues:
+                if not self.verbose and issue.level == 'INFO':
+                    continue
+                icon = {'ERROR': '✗', 'WARNING': '⚠️', 'INFO': 'ℹ️'}.get(issue.level, '•')
+                print(f"{icon} {issue}", file=self._out)
+            print(file=self._out)
+
+            if any(issue.level == 'ERROR' for issue in issues):
+                print("✗ Resource validation failed. Cannot proceed.", file=self._err)
+                return False
+            if any(issue.level == 'WARNING' for issue in issues):
+                if self.strict:
+                    print("✗ Resource validation failed in strict mode (warnings treated as errors).",
+                          file=self._err)
+                    return False
+                print("⚠️  Warnings found but continuing...", file=self._out)
+                print(file=self._out)
+        else:
+            print("✓ All resources validated successfully", file=self._out)
+            print(file=self._out)
+
+        print("Copying and renaming resources...", file=self._out)
+        with span('copy') as copy_span:
+            self.resource_mapping = resource_manager.copy_resources(
+                questions, self.quiz_dir, check_cancelled=self._check_cancelled)
+            copy_span.set(resources=len(self.resource_mapping), **resource_manager.copy_stats)
+        if self.resource_mapping:
+            print(f"✓ Copied {len(self.resource_mapping)} resources:", file=self._out)
+            for original, renamed in self.resource_mapping.items():
+                print(f"  {original}", file=self._out)
+                print(f"    → {renamed}", file=self._out)
+        else:
+            print("ℹ️  No resources to copy (no images in questions)", file=self._out)
+        print(file=self._out)
+
+        self._write_workflow_json('resource_mapping.json', {
+            'step': 'step3_copy_resources',
+            'timestamp': datetime.now().isoformat(),
+            'resource_count': len(self.resource_mapping),
+            'mapping': self.resource_mapping
+        })
+        return True
+
+    # ------------------------------------------------------------------
+    # Step 4: Generate XML
+    # ------------------------------------------------------------------
+
+    def _generate_xml(self) -> bool:
+        """Apply the resource mapping and generate item XML in memory."""
+        print("=" * 70, file=self._out)
+        print("STEP 4: GENERATE QTI XML FILES", file=self._out)
+        print("=" * 70, file=self._out)
+        print(f"Markdown file:  {self.markdown_path}", file=self._out)
+        print(f"Quiz directory: {self.quiz_dir}", file=self._out)
+        print(f"Language:       {self.language}", file=self._out)
+        print(file=self._out)
+
+        questions = self.quiz_data['questions']
+        num_questions = len(questions)
+        print(f"Found {num_questions} questions", file=self._out)
+        print(file=self._out)
+
+        if self.resource_mapping:
+            print(f"Loaded resource mapping with {len(self.resource_mapping)} entries", file=self._out)
+            with span('apply_resource_mapping', resources=len(self.resource_mapping)):
+                apply_resource_mapping(questions, self.resource_mapping, self.verbose, file=self._out)
+            print(file=self._out)
+
+        print("Generating QTI XML files...", file=self._out)
+        xml_generator = XMLGenerator()
+        self.questions_xml = []
+        self.media_index = []
+        xml_files = []
+        # Per question type: [questions, seconds, characters of XML]
+        type_stats = defaultdict(lambda: [0, 0.0, 0])
+
+        for i, question in enumerate(questions, 1):
+            self._check_cancelled()
+            q_id = question.get('identifier', f'Q{i:03d}')
+            if self.verbose:
+                print(f"  [{i}/{num_questions}] Generating: {q_id}", file=self._out)
+
+            try:
+                started = time.perf_counter()
+                xml_content = xml_generator.generate_question(question, language=self.language)
+                stats = type_stats[question.get('question_type', 'unknown')]
+                stats[0] += 1
+                stats[1] += time.perf_counter() - started
+                stats[2] += len(xml_content)
+            except Exception as e:
+                print(f"✗ ERROR: Failed to generate question {i}/{num_questions}", file=self._err)
+                print(f"Question ID:   {q_id}", file=self._err)
+                print(f"Question Type: {question.get('question_type', 'unknown')}", file=self._err)
+                print(f"Title:         {question.get('title', 'Unknown Title')}", file=self._err)
+                print(f"\nError Details: {e}", file=self._err)
+                return False
+
+            self.questions_xml.append((q_id, xml_content))
+            self.media_index.append(media_references(xml_content))
+            xml_filename = f"{q_id}-item.xml"
+            xml_files.append({
+                'identifier': q_id,
+                'filename': xml_filename,
+                'path': str(self.quiz_dir / xml_filename),
+                'metadata': dict(question)
+            })
+
+        print(f"✓ Generated {len(self.questions_xml)} XML files", file=self._out)
+        print(file=self._out)
+
+        for question_type, (count, seconds, chars) in sorted(type_stats.items()):
+            record(f'xml.{question_type}', seconds * 1000, questions=count, chars=chars)
+
+        metadata = self.quiz_data.get('metadata') or {}
+        if metadata.get('question_set'):
+            from src.generator.assessment_test_generator import generate_assessment_test
+            print("Generating assessmentTest for Question Set...", file=self._out)
+            with span('assessment_test'):
+                self.assessment_test_xml = generate_assessment_test(self.quiz_data, language=self.language)
+            if self.assessment_test_xml:
+                test_identifier = metadata.get('test_metadata', {}).get('identifier', 'QUIZ_001')
+                print(f"✓ Generated assessmentTest: ID_{test_identifier}-assessment.xml", file=self._out)
+                print(file=self._out)
+
+        self._write_workflow_json('xml_files.json', {
+            'step': 'step4_generate_xml',
+            'timestamp': datetime.now().isoformat(),
+            'xml_count': len(xml_files),
+            'xml_files': xml_files,
+            'quiz_metadata': metadata,
+            'has_assessment_test': self.assessment_test_xml is not None
+        })
+        # Item scores for scripts/validate_question_set.py (written in
+        # step 5, once the item files exist)
+        with span('score_table') as table_span:
+            self.score_table = build_score_table(questions, self.questions_xml)
+            table_span.set(items=len(self.score_table['items']))
+        return True
+
+    # ------------------------------------------------------------------
+    # Step 5: Create ZIP
+    # ------------------------------------------------------------------
+
+    def _create_zip(self) -> bool:
+        """Write item XML and manifest and create the ZIP package."""
+        output_filename = f"{self.quiz_name}.zip"
+
+        print("=" * 70, file=self._out)
+        print("STEP 5: CREATE QTI PACKAGE (ZIP)", file=self._out)
+        print("=" * 70, file=self._out)
+        print(f"Quiz directory: {self.quiz_dir}", file=self._out)
+        print(f"Output name:    {output_filename}", file=self._out)
+        print(f"Output base:    {self.quiz_dir.parent}", file=self._out)
+        print(file=self._out)
+
+        if not self.questions_xml:
+            print("✗ Error: No XML generated - run generate_xml first", file=self._err)
+            return False
+
+        quiz_metadata = dict(self.quiz_data.get('metadata') or {})
+        quiz_metadata['questions'] = self.quiz_data['questions']
+
+        print("Creating QTI package...", file=self._out)
+        packager = QTIPackager(output_dir=str(self.quiz_dir.parent), compresslevel=self.compresslevel,
+                              out=self._out)
+        result = packager.create_package(
+            questions_xml=self.questions_xml,
+            metadata=quiz_metadata,
+            output_filename=output_filename,
+            keep_folder=self.keep_folder,
+            base_dir=str(self.quiz_dir.parent),
+            assessment_test_xml=self.assessment_test_xml,
+            stream=not self.keep_folder,
+            media_index=self.media_index,
+            check_cancelled=self._check_cancelled
+        )
+        print("✓ Package created successfully", file=self._out)
+        print(file=self._out)
+
+        self.zip_path = result['zip_path']
+        if self.workflow_dir.exists():
+            if self.score_table is not None:
+                write_score_table(self.workflow_dir, self.score_table)
+            self._write_workflow_json('package_info.json', {
+                'step': 'step5_create_zip',
+                'timestamp': datetime.now().isoformat(),
+                'zip_path': result['zip_path'],
+                'folder_path': result.get('folder_path', '')
+            })
+
+        print("=" * 70, file=self._out)
+        print("QTI PACKAGE COMPLETE", file=self._out)
+        print("=" * 70, file=self._out)
+        print(f"ZIP file:       {result['zip_path']}", file=self._out)
+        if result.get('folder_path'):
+            print(f"Folder:         {result['folder_path']}", file=self._out)
+        print(file=self._out)
+        return True
+
+    def _write_workflow_json(self, filename: str, data: Dict[str, Any]) -> None:
+        """Write step metadata to .workflow/ (same files the scripts write)."""
+        with open(self.workflow_dir / filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
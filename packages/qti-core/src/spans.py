@@ -0,0 +1,129 @@
+"""
+Stage Timing Spans
+
+Lightweight, dependency-free timing of nested export stages. Code marks a
+stage with span(); spans opened inside it become its children, so a run of
+ExportPipeline.run_step() yields a tree such as
+
+    create_zip               812.4 ms
+      manifest                 3.1 ms  {'bytes': 48211}
+      zip                    806.0 ms  {'files': 131, 'bytes_written': 2481190}
+
+Nothing is written anywhere: the caller decides what to do with the tree
+(qf-pipeline logs it to logs/session.jsonl, see qf_pipeline.utils.logger).
+
+Usage:
+    with span('generate_xml') as root:
+        with span('assessment_test') as s:
+            xml = generate_assessment_test(...)
+            s.set(bytes=len(xml))
+    print(root.to_dict())
+
+    # Work timed elsewhere (e.g. accumulated per question type)
+    record('xml.multiple_choice_single', duration_ms=42.0, questions=120)
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+
+@dataclass
+class Span:
+    """
+    One timed stage.
+
+    Attributes:
+        name: Stage name (e.g. 'parse', 'zip')
+        duration_ms: Wall-clock time, rounded to 0.1 ms
+        data: Counts and sizes for the stage (questions, bytes, ...)
+        children: Stages timed inside this one, in start order
+    """
+    name: str
+    duration_ms: float = 0.0
+    data: Dict[str, Any] = field(default_factory=dict)
+    children: List['Span'] = field(default_factory=list)
+
+    def set(self, **data: Any) -> None:
+        """Add counts or sizes to the span."""
+        self.data.update(data)
+
+    def find(self, name: str) -> Optional['Span']:
+        """First span with this name in the subtree (depth-first)."""
+        if self.name == name:
+            return self
+        for child in self.children:
+            found = child.find(name)
+            if found is not None:
+                return found
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-compatible copy of the subtree."""
+        result = {'name': self.name, 'duration_ms': self.duration_ms}
+        if self.data:
+            result['data'] = dict(self.data)
+        if self.children:
+            result['children'] = [child.to_dict() for child in self.children]
+        return result
+
+
+# Innermost open span of the current thread/task
+_current = ContextVar('qti_current_span', default=None)  # type: ContextVar[Optional[Span]]
+
+
+@contextmanager
+def span(name: str, **data: Any) -> Iterator[Span]:
+    """
+    Time a block as a child of the innermost open span.
+
+    Without an open span the block becomes a new root; keep the yielded
+    Span to read the tree afterwards. If the block raises, the span keeps
+    its timing and gets data['error'] = exception class name.
+
+    Args:
+        name: Stage name
+        **data: Initial span data
+
+    Yields:
+        The Span (use .set() to add counts once they are known)
+    """
+    current = Span(name, data=dict(data))
+    parent = _current.get()
+    if parent is not None:
+        parent.children.append(current)
+    token = _current.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.data['error'] = type(e).__name__
+        raise
+    finally:
+        current.duration_ms = round((time.perf_counter() - start) * 1000, 1)
+        _current.reset(token)
+
+
+def record(name: str, duration_ms: float, **data: Any) -> Optional[Span]:
+    """
+    Attach an already-measured stage to the innermost open span.
+
+    For work that is timed in pieces, such as XML generation summed per
+    question type. Does nothing when no span is open.
+
+    Returns:
+        The new Span, or None if no span is open
+    """
+    parent = _current.get()
+    if parent is None:
+        return None
+    child = Span(name, duration_ms=round(duration_ms, 1), data=dict(data))
+    parent.children.append(child)
+    return child
+
+
+def current_span() -> Optional[Span]:
+    """Innermost open span, or None."""
+    return _current.get()
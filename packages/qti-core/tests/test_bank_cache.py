@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for src/parser/bank_cache.py (on-disk parsed-bank cache).
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.parser import MarkdownQuizParser, bank_cache
+from src.parser.bank_cache import cache_key, load_parse_result
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'v65'
+
+
+@pytest.fixture
+def content():
+    return (FIXTURES / 'multiple_choice_single.md').read_text(encoding='utf-8')
+
+
+def _no_parsing(monkeypatch):
+    def fail(self, *args, **kwargs):
+        raise AssertionError('parsed instead of loading from cache')
+    monkeypatch.setattr(MarkdownQuizParser, 'parse_and_validate', fail)
+
+
+@pytest.mark.unit
+def test_second_load_comes_from_cache(content, tmp_path, monkeypatch):
+    """A stored result is loaded without parsing and equals a fresh parse."""
+    first = load_parse_result(content, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob('*.pickle'))) == 1
+
+    _no_parsing(monkeypatch)
+    second = load_parse_result(content, cache_dir=tmp_path)
+
+    assert second is not first
+    assert second.to_parse_dict() == first.to_parse_dict()
+    assert second.to_validate_dict() == first.to_validate_dict()
+
+
+@pytest.mark.unit
+def test_content_or_parser_change_misses(content, tmp_path, monkeypatch):
+    """Edited markdown and a new parser version get new cache keys."""
+    key = cache_key(content)
+    assert cache_key(content + '\n') != key
+
+    monkeypatch.setattr(bank_cache, 'PARSER_VERSION', 'other')
+    assert cache_key(content) != key
+
+
+@pytest.mark.unit
+def test_cache_can_be_disabled(content, tmp_path, monkeypatch):
+    """QTI_PARSE_CACHE=off parses without writing anything."""
+    monkeypatch.setenv('QTI_PARSE_CACHE', 'off')
+    assert bank_cache.default_cache_dir() is None
+
+    result = load_parse_result(content)
+    assert result.total_questions == 1
+
+    monkeypatch.setenv('QTI_PARSE_CACHE', str(tmp_path / 'cache'))
+    load_parse_result(content)
+    assert len(list((tmp_path / 'cache').glob('*.pickle'))) == 1
+
+
+@pytest.mark.unit
+def test_corrupt_entry_is_reparsed(content, tmp_path):
+    """An unreadable entry is ignored and replaced."""
+    entry = tmp_path / f'{cache_key(content)}.pickle'
+    entry.write_bytes(b'not a pickle')
+
+    result = load_parse_result(content, cache_dir=tmp_path)
+
+    assert result.total_questions == 1
+    assert entry.read_bytes() != b'not a pickle'
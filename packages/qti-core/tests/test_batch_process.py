@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/batch_process.py (parallel batch export, hash-based skipping).
+"""
+
+import importlib.util
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+FIXTURES = PROJECT_ROOT / 'tests' / 'fixtures' / 'v65'
+
+_spec = importlib.util.spec_from_file_location(
+    'batch_process', PROJECT_ROOT / 'scripts' / 'batch_process.py'
+)
+batch_process = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(batch_process)
+
+
+@pytest.fixture
+def folder(tmp_path, monkeypatch):
+    """Two single-question banks, one with images."""
+    monkeypatch.setenv('QTI_PARSE_CACHE', str(tmp_path / 'parse_cache'))
+    source_dir = tmp_path / 'source'
+    source_dir.mkdir()
+    for name in ('image_test.md', 'true_false.md'):
+        shutil.copy(FIXTURES / name, source_dir / name)
+    for image in FIXTURES.glob('*.png'):
+        shutil.copy(image, source_dir / image.name)
+    return source_dir
+
+
+def _export(folder, output_dir, language='sv'):
+    files = batch_process.find_markdown_files(folder)
+    results = batch_process.run_batch(files, output_dir, language, workers=1, verbose=False)
+    state = {str(f): r.fingerprint for f, r in zip(files, results) if r.success}
+    return results, state
+
+
+@pytest.mark.integration
+def test_export_records_sources_and_resources(folder, tmp_path):
+    """Each file is exported in-process with per-step timings and a fingerprint."""
+    results, state = _export(folder, tmp_path / 'out')
+
+    assert [r.success for r in results] == [True, True]
+    assert set(results[0].step_ms) == {name for name, _ in batch_process.ExportPipeline.STEPS}
+    assert (tmp_path / 'out' / 'image_test.zip').exists()
+    assert state[str(folder / 'image_test.md')]['resources']
+    assert state[str(folder / 'true_false.md')]['resources'] == {}
+
+
+@pytest.mark.integration
+def test_only_changed_files_are_reprocessed(folder, tmp_path):
+    """Source, resource and language changes invalidate a file; touching does not."""
+    output_dir = tmp_path / 'out'
+    _, state = _export(folder, output_dir)
+    image_md, tf_md = folder / 'image_test.md', folder / 'true_false.md'
+
+    def unchanged(md_file, language='sv'):
+        return batch_process.is_unchanged(md_file, output_dir, language, state.get(str(md_file)))[0]
+
+    assert unchanged(image_md) and unchanged(tf_md)
+    assert not unchanged(tf_md, language='en')
+
+    image = next(iter(state[str(image_md)]['resources']))
+    (folder / image).touch()
+    assert unchanged(image_md)
+
+    (folder / image).write_bytes(b'new image')
+    assert not unchanged(image_md)
+    assert unchanged(tf_md)
+
+    tf_md.write_text(tf_md.read_text(encoding='utf-8') + '\n', encoding='utf-8')
+    assert not unchanged(tf_md)
+
+
+@pytest.mark.unit
+def test_state_round_trip(tmp_path):
+    """State is written atomically and ignored if from another version."""
+    batch_process.save_state(tmp_path, {'a.md': {'source': 'x'}})
+    assert batch_process.load_state(tmp_path) == {'a.md': {'source': 'x'}}
+
+    (tmp_path / batch_process.STATE_FILENAME).write_text('{"version": 0, "files": {"a.md": {}}}')
+    assert batch_process.load_state(tmp_path) == {}
+
+
+@pytest.mark.integration
+def test_existing_zips_seed_the_state(folder, tmp_path):
+    """ZIPs from before the state file existed are adopted unless sources are newer."""
+    output_dir = tmp_path / 'out'
+    _export(folder, output_dir)
+    image_md, tf_md = folder / 'image_test.md', folder / 'true_false.md'
+
+    entry = batch_process.seed_from_zip(image_md, output_dir, 'sv')
+    assert entry and entry['resources']
+    assert batch_process.is_unchanged(image_md, output_dir, 'sv', entry)[0]
+
+    zip_mtime = (output_dir / 'true_false.zip').stat().st_mtime_ns
+    os.utime(tf_md, ns=(zip_mtime + 10**9, zip_mtime + 10**9))
+    assert batch_process.seed_from_zip(tf_md, output_dir, 'sv') is None
+    assert batch_process.seed_from_zip(folder / 'missing.md', output_dir, 'sv') is None
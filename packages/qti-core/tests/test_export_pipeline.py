@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Tests for src/pipeline/export_pipeline.py.
+
+The in-process pipeline must produce the same package as running
+scripts/run_all.py (which runs the five step scripts as subprocesses).
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from src.pipeline import ExportPipeline
+
+PROJECT_ROOT = Path(__file__).parent.parent
+FIXTURES = PROJECT_ROOT / 'tests' / 'fixtures' / 'v65'
+
+BANK_FIXTURES = [
+    'multiple_choice_single.md',
+    'multiple_response.md',
+    'true_false.md',
+    'text_entry.md',
+    'inline_choice.md',
+    'essay.md',
+    'image_test.md',
+]
+
+
+@pytest.fixture
+def bank_file(tmp_path):
+    """Build a small item bank (with images) from the v6.5 fixtures."""
+    source_dir = tmp_path / 'source'
+    source_dir.mkdir()
+    for image in FIXTURES.glob('*.png'):
+        shutil.copy(image, source_dir / image.name)
+
+    parts = [(FIXTURES / name).read_text(encoding='utf-8').strip() for name in BANK_FIXTURES]
+    bank = source_dir / 'bank.md'
+    bank.write_text('\n\n'.join(parts) + '\n', encoding='utf-8')
+    return bank
+
+
+def _zip_contents(zip_path: Path) -> dict:
+    """Read package files, ignoring .workflow metadata (timestamps/paths)."""
+    with zipfile.ZipFile(zip_path) as zf:
+        return {
+            name: zf.read(name)
+            for name in zf.namelist()
+            if not name.startswith('.workflow/')
+        }
+
+
+@pytest.mark.integration
+def test_pipeline_runs_all_steps(bank_file, tmp_path):
+    """All five steps succeed and the ZIP contains every item."""
+    pipeline = ExportPipeline(bank_file, output_dir=tmp_path / 'out', language='sv')
+    results = pipeline.run()
+
+    assert [r.name for r in results] == [name for name, _ in ExportPipeline.STEPS]
+    assert pipeline.succeeded
+    assert pipeline.question_count == len(BANK_FIXTURES)
+
+    contents = _zip_contents(Path(pipeline.zip_path))
+    assert 'imsmanifest.xml' in contents
+    assert sum(1 for name in contents if name.endswith('-item.xml')) == len(BANK_FIXTURES)
+    assert any(name.startswith('resources/') for name in contents)
+    assert (pipeline.workflow_dir / 'package_info.json').exists()
+
+
+@pytest.mark.integration
+def test_pipeline_times_each_stage(bank_file, tmp_path):
+    """Every step has a span tree with question counts and bytes written."""
+    pipeline = ExportPipeline(bank_file, output_dir=tmp_path / 'out', language='sv')
+    spans = {r.name: r.span for r in pipeline.run()}
+
+    assert all(spans[name].data['success'] for name, _ in ExportPipeline.STEPS)
+    assert spans['validate'].find('parse').data['questions'] == len(BANK_FIXTURES)
+    assert spans['copy_resources'].find('copy').data['resources'] > 0
+
+    xml_spans = [c for c in spans['generate_xml'].children if c.name.startswith('xml.')]
+    assert sum(c.data['questions'] for c in xml_spans) == len(BANK_FIXTURES)
+    assert spans['generate_xml'].find('xml.essay').data['chars'] > 0
+
+    assert spans['create_zip'].find('manifest').data['bytes'] > 0
+    zip_span = spans['create_zip'].find('zip')
+    assert zip_span.data['bytes_written'] == Path(pipeline.zip_path).stat().st_size
+
+
+@pytest.mark.integration
+def test_pipeline_matches_scripts(bank_file, tmp_path):
+    """In-process export gives the same package as the step scripts."""
+    scripts_out = tmp_path / 'scripts_out'
+    completed = subprocess.run(
+        [sys.executable, 'scripts/run_all.py', str(bank_file),
+         '--output-dir', str(scripts_out), '--language', 'sv'],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, QTI_PARSE_CACHE=str(tmp_path / 'parse_cache'))
+    )
+    assert completed.returncode == 0, completed.stderr
+
+    pipeline = ExportPipeline(bank_file, output_dir=tmp_path / 'pipeline_out', language='sv')
+    pipeline.run()
+    assert pipeline.succeeded
+
+    assert _zip_contents(Path(pipeline.zip_path)) == _zip_contents(scripts_out / 'bank.zip')
+
+
+@pytest.mark.integration
+def test_concurrent_pipelines_keep_their_own_output(bank_file, tmp_path, capsys):
+    """Pipelines in different threads run together; output goes to StepResult only."""
+    pipelines = [
+        ExportPipeline(bank_file, output_dir=tmp_path / f'out{n}', quiz_name=f'quiz{n}', language='sv')
+        for n in range(2)
+    ]
+    threads = [threading.Thread(target=pipeline.run) for pipeline in pipelines]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    captured = capsys.readouterr()
+    assert captured.out == captured.err == ''
+    for n, pipeline in enumerate(pipelines):
+        assert pipeline.succeeded
+        zip_output = pipeline.results[-1].output
+        assert f'quiz{n}' in zip_output and f'quiz{1 - n}' not in zip_output
+        assert 'READY FOR QTI GENERATION' in pipeline.results[0].output
+
+
+@pytest.mark.integration
+def test_pipeline_stops_on_validation_error(tmp_path):
+    """An invalid file stops after step 1 without creating output."""
+    bad = tmp_path / 'bad.md'
+    bad.write_text('# Q001 Missing metadata\n^type: multiple_choice_single\n', encoding='utf-8')
+
+    pipeline = ExportPipeline(bad, output_dir=tmp_path / 'out')
+    results = pipeline.run()
+
+    assert len(results) == 1
+    assert not results[0].success
+    assert 'NOT READY' in results[0].output
+    assert not pipeline.quiz_dir.exists()
+
+
+@pytest.mark.integration
+def test_pipeline_cancel_stops_before_next_step(bank_file, tmp_path):
+    """After cancel() no further steps run and the result is marked cancelled."""
+    pipeline = ExportPipeline(bank_file, output_dir=tmp_path / 'out', language='sv')
+    assert pipeline.run_step('validate').success
+
+    pipeline.cancel()
+    results = pipeline.run()
+
+    assert pipeline.cancelled
+    assert not pipeline.succeeded
+    assert results[-1].cancelled
+    assert not results[-1].success
+    assert not pipeline.quiz_dir.exists()
+
+
+def _cancel_on_check(pipeline, n):
+    """Call pipeline.cancel() at the n-th cancellation checkpoint."""
+    check, calls = pipeline._check_cancelled, []
+
+    def checkpoint():
+        calls.append(1)
+        if len(calls) == n:
+            pipeline.cancel()
+        check()
+    pipeline._check_cancelled = checkpoint
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize('step', ['copy_resources', 'create_zip'])
+def test_pipeline_cancel_stops_inside_file_loops(bank_file, tmp_path, step):
+    """copy_resources and the ZIP writer stop at the next file; no partial ZIP is left."""
+    pipeline = ExportPipeline(bank_file, output_dir=tmp_path / 'out', language='sv', keep_folder=False)
+    for name, _ in ExportPipeline.STEPS:
+        if name == step:
+            break
+        assert pipeline.run_step(name).success
+
+    # Checkpoint 1 is run_step's own; 2 is the first file
+    _cancel_on_check(pipeline, 2)
+    result = pipeline.run_step(step)
+
+    assert result.cancelled and not result.success
+    assert not (tmp_path / 'out' / 'bank.zip').exists()
+    if step == 'copy_resources':
+        assert not list(pipeline.resources_dir.iterdir())
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Tests for XMLGenerator.generate_questions() (serial and process pool).
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.generator import XMLGenerationError, XMLGenerator
+from src.parser import MarkdownQuizParser
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'v65'
+
+
+def _questions():
+    content = '\n\n'.join(
+        path.read_text(encoding='utf-8') for path in sorted(FIXTURES.glob('*.md'))
+    )
+    return MarkdownQuizParser(content).parse()['questions']
+
+
+@pytest.mark.unit
+def test_parallel_output_matches_serial():
+    """Worker processes return the same XML, in source order."""
+    questions = _questions() * 3
+    generator = XMLGenerator()
+
+    expected = [generator.generate_question(q, 'sv') for q in questions]
+    assert generator.generate_questions(questions, 'sv') == expected
+    assert generator.generate_questions(questions, 'sv', workers=2, chunksize=4) == expected
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('workers', [1, 2])
+def test_first_failing_question_is_reported(workers):
+    """The error carries the index of the first failing question."""
+    questions = _questions()
+    questions[2] = dict(questions[2], question_type='no_such_type_a')
+    questions[5] = dict(questions[5], question_type='no_such_type_b')
+
+    with pytest.raises(XMLGenerationError) as excinfo:
+        XMLGenerator().generate_questions(questions, workers=workers, chunksize=1)
+
+    assert excinfo.value.index == 2
+    assert isinstance(excinfo.value.error, ValueError)
+    assert 'no_such_type_a' in str(excinfo.value)
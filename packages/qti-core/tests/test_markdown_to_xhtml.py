@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Tests for markdown_to_xhtml() (src/parser/markdown_parser.py).
+"""
+
+import pytest
+
+from src.parser.markdown_parser import markdown_to_xhtml
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('markdown, xhtml', [
+    ('', ''),
+    ('Correct!', '<p>Correct!</p>'),
+    ('A & B < C > "D" \'E\'', '<p>A &amp; B &lt; C &gt; &quot;D&quot; &apos;E&apos;</p>'),
+    ('&amp;', '<p>&amp;amp;</p>'),
+    ('One\nline\n\n\n\nTwo', '<p>One<br/>line</p>\n<p>Two</p>'),
+    ('**bold** and *italic*', '<p><strong>bold</strong> and <em>italic</em></p>'),
+    ('*a **b** c*', '<p><em>a <strong>b</strong> c</em></p>'),
+    ('Use `x*y*z` here', '<p>Use <code>x<em>y</em>z</code> here</p>'),
+    ('`code`', '<p><code>code</code></p>'),
+    ('![A & B](images/sub/cell.png)', '<p><img src="resources/cell.png" alt="A &amp; B"/></p>'),
+])
+def test_conversion(markdown, xhtml):
+    """Escaping, paragraphs and inline markup (passes apply in order)."""
+    assert markdown_to_xhtml(markdown) == xhtml
+
+
+@pytest.mark.unit
+def test_repeated_fragments_are_memoized():
+    """Converting the same text again is served from the cache."""
+    markdown_to_xhtml.cache_clear()
+    first = markdown_to_xhtml('Please answer this question.')
+    second = markdown_to_xhtml('Please answer this question.')
+
+    assert first is second
+    assert markdown_to_xhtml.cache_info().hits == 1
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for src/packager/qti_packager.py (folder and streaming ZIP modes).
+"""
+
+import zipfile
+
+import pytest
+
+from src.packager import QTIPackager, media_references
+
+ITEM_XML = '<assessmentItem identifier="{0}"><img src="resources/{0}_image.png"/></assessmentItem>'
+QUESTIONS_XML = [(q_id, ITEM_XML.format(q_id)) for q_id in ('Q1', 'Q2')]
+METADATA = {
+    'test_metadata': {'title': 'Quiz', 'identifier': 'QUIZ_1'},
+    'questions': [{'title': 'One'}, {'title': 'Two'}],
+}
+
+
+def _package_dir_with_resources(base):
+    resources = base / 'quiz' / 'resources'
+    resources.mkdir(parents=True)
+    for q_id, _ in QUESTIONS_XML:
+        (resources / f'{q_id}_image.png').write_bytes(b'\x89PNG' + bytes(500))
+    (resources / 'resource_mapping.json').write_text('{}')
+    return base / 'quiz'
+
+
+def _contents(zip_path):
+    with zipfile.ZipFile(zip_path) as zipf:
+        return {info.filename: (zipf.read(info), info.compress_type) for info in zipf.infolist()}
+
+
+@pytest.mark.unit
+def test_streaming_zip_matches_folder_zip(tmp_path):
+    """stream=True gives the same entries without writing XML to disk."""
+    folder_base = tmp_path / 'folder'
+    stream_base = tmp_path / 'stream'
+    _package_dir_with_resources(folder_base)
+    package_dir = _package_dir_with_resources(stream_base)
+
+    folder = QTIPackager(output_dir=str(folder_base)).create_package(
+        QUESTIONS_XML, METADATA, 'quiz.zip', base_dir=str(folder_base)
+    )
+    streamed = QTIPackager(output_dir=str(stream_base)).create_package(
+        QUESTIONS_XML, METADATA, 'quiz.zip', base_dir=str(stream_base), stream=True
+    )
+
+    assert streamed['folder_path'] is None
+    assert not list(package_dir.glob('*.xml'))
+    assert _contents(streamed['zip_path']) == _contents(folder['zip_path'])
+
+    contents = _contents(streamed['zip_path'])
+    assert 'resources/resource_mapping.json' not in contents
+    assert contents['resources/Q1_image.png'][1] == zipfile.ZIP_STORED
+    assert contents['Q1-item.xml'][1] == zipfile.ZIP_DEFLATED
+
+
+@pytest.mark.unit
+def test_streaming_removes_folder_unless_kept(tmp_path):
+    """keep_folder=False removes the pre-copied resources folder."""
+    package_dir = _package_dir_with_resources(tmp_path)
+
+    result = QTIPackager(output_dir=str(tmp_path)).create_package(
+        QUESTIONS_XML, METADATA, 'quiz.zip', keep_folder=False,
+        base_dir=str(tmp_path), stream=True
+    )
+
+    assert not package_dir.exists()
+    assert 'resources/Q2_image.png' in _contents(result['zip_path'])
+
+
+@pytest.mark.unit
+def test_compression_level_is_applied(tmp_path):
+    """compresslevel=0 deflates XML without compressing it."""
+    questions_xml = [('Q1', '<assessmentItem>' + 'x' * 5000 + '</assessmentItem>')]
+    sizes = {}
+    for level in (0, 9):
+        base = tmp_path / str(level)
+        result = QTIPackager(output_dir=str(base), compresslevel=level).create_package(
+            questions_xml, METADATA, 'quiz.zip', base_dir=str(base), stream=True
+        )
+        with zipfile.ZipFile(result['zip_path']) as zipf:
+            sizes[level] = zipf.getinfo('Q1-item.xml').compress_size
+
+    assert sizes[0] > 5000 > sizes[9]
+
+
+@pytest.mark.unit
+def test_manifest_lists_each_items_own_media(tmp_path):
+    """Items get the files they reference, not every name that is a substring."""
+    questions_xml = [
+        ('Q1', '<p><img src="resources/a.png" alt=""/></p>'),
+        ('Q2', '<p>data.png</p><object class="x"\n data="resources/data.png" type="image/png"/>'),
+    ]
+    packager = QTIPackager(output_dir=str(tmp_path))
+
+    assert packager._index_media_files(questions_xml) == [['a.png'], ['data.png']]
+    assert packager.media_files == ['a.png', 'data.png']
+
+    manifest = packager._generate_manifest(questions_xml, METADATA)
+    q2_resource = manifest[manifest.index('identifier="Q2"'):]
+    assert '<file href="resources/data.png"/>' in q2_resource
+    assert '<file href="resources/a.png"/>' not in q2_resource
+
+
+@pytest.mark.unit
+def test_media_index_from_generation_is_used(tmp_path):
+    """References collected at XML generation are not scanned again."""
+    media_index = [media_references(xml) for _, xml in QUESTIONS_XML]
+    assert media_index == [['Q1_image.png'], ['Q2_image.png']]
+
+    packager = QTIPackager(output_dir=str(tmp_path))
+    manifest = packager._generate_manifest(QUESTIONS_XML, METADATA, media_index=[['Q1_image.png'], []])
+    assert packager.media_files == ['Q1_image.png']
+    assert '<file href="resources/Q2_image.png"/>' not in manifest
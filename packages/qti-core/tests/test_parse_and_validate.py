@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for MarkdownQuizParser.parse_and_validate() and ParseResult.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.parser import MarkdownQuizParser, ParseResult
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'v65'
+
+FRONTMATTER = '---\ntest_metadata:\n  title: Test\n---\n'
+
+BAD_BLOCK = '# Q002 Broken\n^type essay\n^points 1\n'
+
+
+def _content() -> str:
+    good = (FIXTURES / 'multiple_choice_single.md').read_text(encoding='utf-8').strip()
+    return FRONTMATTER + good + '\n\n' + BAD_BLOCK
+
+
+@pytest.mark.unit
+def test_result_holds_questions_errors_and_spans():
+    """One result object carries parse output, errors and block spans."""
+    content = _content()
+    result = MarkdownQuizParser(content).parse_and_validate()
+
+    assert isinstance(result, ParseResult)
+    assert result.total_questions == 2
+    assert result.parsed_questions == 1
+    assert not result.valid
+    assert [e['field'] for e in result.errors] == ['identifier']
+
+    first, second = result.blocks
+    assert first.valid and not second.valid
+    assert content[first.start:first.end] == first.text
+    assert content[second.start:second.end] == BAD_BLOCK.strip()
+    assert content.split('\n')[second.line - 1] == '# Q002 Broken'
+
+
+@pytest.mark.unit
+def test_parse_and_validate_views_match_result():
+    """parse() and validate() are views of the same single pass."""
+    parser = MarkdownQuizParser(_content())
+    validated = parser.validate()
+    parsed = parser.parse()
+    result = parser.parse_and_validate()
+
+    assert parser.parse_and_validate() is result
+    assert parsed == result.to_parse_dict()
+    assert validated == result.to_validate_dict()
+    # parse() keeps every question that parsed, validate() only error-free ones
+    assert len(parsed['questions']) == 1
+    assert [q['identifier'] for q in validated['questions']] == ['MC_Q001']
+
+
+@pytest.mark.unit
+def test_questions_do_not_share_nested_fields():
+    """Editing returned questions leaves validate() output and cached blocks alone."""
+    content = _content()
+    block_cache = {}
+    parser = MarkdownQuizParser(content)
+    parsed = parser.parse_and_validate(block_cache=block_cache).questions[0]
+    validated = parser.validate()['questions'][0]
+
+    parsed['feedback']['correct'] = 'rewritten'
+    parsed['labels'].append('rewritten')
+    assert validated['feedback']['correct'] != 'rewritten'
+    assert 'rewritten' not in validated['labels']
+
+    validated['feedback']['correct'] = 'rewritten'
+    again = MarkdownQuizParser(content).parse_and_validate(block_cache=block_cache)
+    assert again.blocks[0].question['feedback']['correct'] != 'rewritten'
+    assert again.questions[0] == MarkdownQuizParser(content).parse()['questions'][0]
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for src/parser/question_model.py (slotted, dict-compatible questions).
+"""
+
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+
+from src.parser import MarkdownQuizParser, Question, question_class
+from src.parser.question_model import ChoiceQuestion, MatchQuestion, TextEntryQuestion
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'v65'
+
+
+@pytest.mark.unit
+def test_class_is_chosen_by_type():
+    """Each interaction type gets its own class; unknown types the base class."""
+    assert question_class('multiple_response') is ChoiceQuestion
+    assert question_class('gapmatch') is MatchQuestion
+    assert question_class('text_entry_numeric') is TextEntryQuestion
+    assert question_class('not_a_type') is Question
+
+    question = Question.from_dict({'question_type': 'true_false', 'identifier': 'TF1'})
+    assert isinstance(question, ChoiceQuestion)
+    assert not hasattr(question, '__dict__')
+
+
+@pytest.mark.unit
+def test_behaves_like_the_question_dict():
+    """Unset fields are missing keys; unknown keys are kept."""
+    data = {'identifier': 'MC1', 'question_type': 'multiple_choice_single',
+            'points': 2, 'options': [{'letter': 'A', 'text': 'Yes'}], 'legacy_key': 'x'}
+    question = Question.from_dict(data)
+
+    assert question == data
+    assert question.points == question['points'] == 2
+    assert 'image' not in question
+    assert question.get('image', 'none') == 'none'
+    with pytest.raises(KeyError):
+        question['image']
+    assert question['legacy_key'] == 'x'
+
+    question['image'] = {'path': 'cell.png'}
+    del question['legacy_key']
+    assert set(question) == {'identifier', 'question_type', 'points', 'options', 'image'}
+    assert len(question) == 5
+
+
+@pytest.mark.unit
+def test_copy_and_pickle_keep_class_and_fields():
+    """Copies are shallow; pickling round-trips (used by the parse cache)."""
+    question = Question.from_dict({'question_type': 'match', 'identifier': 'M1',
+                                   'premises': [], 'extra': 1})
+    copy = question.copy()
+    assert type(copy) is MatchQuestion and copy == question
+    assert copy.premises is question.premises
+
+    restored = pickle.loads(pickle.dumps(question))
+    assert type(restored) is MatchQuestion and restored == question
+
+
+@pytest.mark.integration
+def test_parser_returns_questions():
+    """Parsed questions are Question instances that convert to plain dicts."""
+    content = (FIXTURES / 'multiple_choice_single.md').read_text(encoding='utf-8')
+    questions = MarkdownQuizParser(content).parse()['questions']
+
+    assert isinstance(questions[0], ChoiceQuestion)
+    assert questions[0].title
+    assert json.loads(json.dumps(dict(questions[0]))) == questions[0].to_dict()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for QuestionTagIndex (tag/points bitsets used for section filtering).
+"""
+
+import pytest
+
+from src.generator.assessment_test_generator import (
+    AssessmentTestGenerator,
+    QuestionTagIndex,
+    SectionConfig,
+)
+
+QUESTIONS = [
+    {'identifier': 'Q001', 'tags': ['Remember', 'Easy', 'Cellbiologi'], 'points': 1},
+    {'identifier': 'Q002', 'tags': '#Understand, #Easy, #Cellbiologi', 'points': 1},
+    {'identifier': 'Q003', 'tags': ['remember', 'Medium', 'Evolution'], 'points': 2},
+    {'identifier': 'Q004', 'tags': ['Apply', 'Hard', 'Cellbiologi'], 'points': 3},
+    {'identifier': 'Q005', 'tags': ['Understand', 'Medium', 'Evolution']},
+]
+
+
+def _ids(questions):
+    return [q['identifier'] for q in questions]
+
+
+@pytest.mark.unit
+def test_or_within_and_between_categories():
+    """(Remember OR Understand) AND Easy, tags compared case-insensitively."""
+    index = QuestionTagIndex(QUESTIONS)
+
+    mask = index.match(bloom=['REMEMBER', 'understand'])
+    assert _ids(index.select(mask)) == ['Q001', 'Q002', 'Q003', 'Q005']
+    mask = index.match(bloom=['Remember', 'Understand'], difficulty=['Easy'], custom=['cellbiologi'])
+    assert _ids(index.select(mask)) == ['Q001', 'Q002']
+    # Missing points count as 1; an empty points list matches nothing
+    assert _ids(index.select(index.match(points=[1]))) == ['Q001', 'Q002', 'Q005']
+    assert index.match(points=[]) == 0
+    # Bloom words are never custom tags
+    assert index.match(custom=['Remember']) == 0
+
+
+@pytest.mark.unit
+def test_used_questions_and_counts():
+    """Masks combine with used identifiers; exact tag spelling is kept for counts."""
+    index = QuestionTagIndex(QUESTIONS)
+    available = index.all & ~index.ids_mask({'Q001', 'Q004'})
+
+    assert index.count(available) == 3
+    assert index.count(index.tag_mask('Remember') & available) == 0
+    assert index.count(index.tag_mask('remember') & available) == 1
+    assert index.count(index.points_mask(1) & available) == 2
+
+
+@pytest.mark.unit
+def test_sections_filter_through_one_index():
+    """Sections without explicit questions are filtered as before."""
+    sections = [
+        SectionConfig(name='Easy', filter_difficulty=['Easy']),
+        SectionConfig(name='Two points', filter_points=[2, 3]),
+    ]
+    generator = AssessmentTestGenerator()
+    xml = generator.generate('Quiz', 'QUIZ', sections, QUESTIONS)
+
+    assert xml.count('<assessmentSection') == 2
+    assert _ids(generator._filter_questions(QUESTIONS, sections[1])) == ['Q003', 'Q004']
+    for qid in ('Q001', 'Q002', 'Q003', 'Q004'):
+        assert f'href="{qid}-item.xml"' in xml
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for content-addressed resource copying (src/generator/resource_store.py
+and ResourceManager.copy_resources).
+"""
+
+import pytest
+
+from src.generator.resource_manager import ResourceManager
+from src.generator.resource_store import HashCache, file_digest, place_file
+
+
+def _question(q_id, *images):
+    return {
+        'identifier': q_id,
+        'question_text': ' '.join(f'![img]({name})' for name in images),
+    }
+
+
+@pytest.fixture
+def media(tmp_path):
+    media_dir = tmp_path / 'media'
+    media_dir.mkdir()
+    (media_dir / 'cell.png').write_bytes(b'cell' * 100)
+    (media_dir / 'cell copy.png').write_bytes(b'cell' * 100)
+    (media_dir / 'virus.png').write_bytes(b'virus' * 100)
+    quiz_md = media_dir / 'quiz.md'
+    quiz_md.write_text('')
+    return media_dir
+
+
+def _copy(media_dir, tmp_path, questions, link_mode='copy'):
+    manager = ResourceManager(media_dir / 'quiz.md', tmp_path / 'output',
+                              media_dir=media_dir, link_mode=link_mode)
+    quiz_dir = manager.prepare_output_structure('quiz')
+    return manager, quiz_dir, manager.copy_resources(questions, quiz_dir)
+
+
+@pytest.mark.unit
+def test_identical_media_is_stored_once(media, tmp_path):
+    """Resources with the same bytes map to one packaged file."""
+    questions = [_question('Q1', 'cell.png', 'virus.png'), _question('Q2', 'cell copy.png')]
+    manager, quiz_dir, mapping = _copy(media, tmp_path, questions)
+
+    assert mapping == {
+        'cell.png': 'Q1_cell.png',
+        'virus.png': 'Q1_virus.png',
+        'cell copy.png': 'Q1_cell.png',
+    }
+    assert sorted(p.name for p in (quiz_dir / 'resources').iterdir()) == ['Q1_cell.png', 'Q1_virus.png']
+    assert manager.copy_stats['copy'] == 2
+    assert manager.copy_stats['deduplicated'] == 1
+
+
+@pytest.mark.unit
+def test_unchanged_resources_are_not_recopied(media, tmp_path):
+    """A re-export only places files whose contents changed."""
+    questions = [_question('Q1', 'cell.png', 'virus.png')]
+    _copy(media, tmp_path, questions)
+    cell_dst = tmp_path / 'output' / 'quiz' / 'resources' / 'Q1_cell.png'
+    cell_inode = cell_dst.stat().st_ino
+
+    (media / 'virus.png').write_bytes(b'new virus')
+    manager, quiz_dir, _ = _copy(media, tmp_path, questions)
+
+    assert manager.copy_stats['unchanged'] == 1
+    assert manager.copy_stats['copy'] == 1
+    assert cell_dst.stat().st_ino == cell_inode
+    assert (quiz_dir / 'resources' / 'Q1_virus.png').read_bytes() == b'new virus'
+
+
+@pytest.mark.unit
+def test_place_file_never_writes_through_hardlink(tmp_path):
+    """Replacing a hardlinked destination leaves the old source intact."""
+    old_src, new_src, dst = tmp_path / 'old', tmp_path / 'new', tmp_path / 'dst'
+    old_src.write_bytes(b'old')
+    new_src.write_bytes(b'new')
+
+    assert place_file(old_src, dst, 'hardlink') == 'hardlink'
+    place_file(new_src, dst, 'copy')
+
+    assert old_src.read_bytes() == b'old'
+    assert dst.read_bytes() == b'new'
+    assert place_file(new_src, tmp_path / 'auto', 'auto') in ('reflink', 'hardlink')
+
+
+@pytest.mark.unit
+def test_hash_cache_reuses_digest_until_file_changes(tmp_path, monkeypatch):
+    """Cached digests are reused while size and mtime match."""
+    path = tmp_path / 'image.png'
+    path.write_bytes(b'abc')
+    cache_file = tmp_path / 'hashes.json'
+
+    cache = HashCache(cache_file)
+    assert cache.digest(path) == file_digest(path)
+    cache.save()
+
+    reloaded = HashCache(cache_file)
+    monkeypatch.setattr('src.generator.resource_store.file_digest', lambda p: 'rehashed')
+    assert reloaded.digest(path) != 'rehashed'
+
+    path.write_bytes(b'abcd')
+    assert reloaded.digest(path) == 'rehashed'
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for the step 4 score table (src/generator/score_table.py) and its use
+in scripts/validate_question_set.py.
+"""
+
+import importlib.util
+import os
+import subprocess
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+from benchmarks.synthetic_bank import TYPE_TEMPLATES, generate_bank
+from src.generator.score_table import (
+    build_score_table,
+    load_score_table,
+    read_item_score,
+    write_score_table,
+)
+from src.generator.xml_generator import XMLGenerator
+from src.parser import MarkdownQuizParser
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+_spec = importlib.util.spec_from_file_location(
+    'validate_question_set', PROJECT_ROOT / 'scripts' / 'validate_question_set.py'
+)
+validate_question_set = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(validate_question_set)
+
+NS = {'qti': 'http://www.imsglobal.org/xsd/imsqti_v2p2'}
+
+
+def _full_parse_score(path):
+    """How the validator read scores before the table (whole-document parse)."""
+    decl = ET.parse(path).getroot().find(".//qti:responseDeclaration[@identifier='RESPONSE']", NS)
+    mapping = decl.find('.//qti:mapping', NS) if decl is not None else None
+    entries = mapping.findall('.//qti:mapEntry', NS) if mapping is not None else []
+    if entries and entries[0].get('mappedValue'):
+        return int(float(entries[0].get('mappedValue')))
+    return 1
+
+
+@pytest.fixture
+def quiz_dir(tmp_path):
+    """Item XML for every question type, as step 4 writes it."""
+    questions = MarkdownQuizParser(generate_bank(len(TYPE_TEMPLATES)).markdown).parse()['questions']
+    generator = XMLGenerator()
+    questions_xml = [(q['identifier'], generator.generate_question(q, language='sv')) for q in questions]
+    for identifier, xml_content in questions_xml:
+        (tmp_path / f'{identifier}-item.xml').write_text(xml_content, encoding='utf-8')
+    (tmp_path / '.workflow').mkdir()
+    write_score_table(tmp_path / '.workflow', build_score_table(questions, questions_xml))
+    return tmp_path
+
+
+@pytest.mark.unit
+def test_early_stop_matches_full_parse(quiz_dir):
+    """read_item_score and the table agree with a full parse for every item type."""
+    scores = load_score_table(quiz_dir)
+    items = sorted(quiz_dir.glob('*-item.xml'))
+
+    assert len(items) == len(TYPE_TEMPLATES) == len(scores)
+    for item in items:
+        expected = _full_parse_score(item)
+        score = read_item_score(item)
+        assert (1 if score is None else score) == expected
+        assert scores[item.name]['score'] == expected
+
+
+@pytest.mark.unit
+def test_validator_uses_table_unless_item_changed(quiz_dir, monkeypatch):
+    """Scores come from the table; a rewritten item or no table means reading the XML."""
+    item = sorted(quiz_dir.glob('*-item.xml'))[0]
+    scores = load_score_table(quiz_dir)
+    scores[item.name]['score'] = 7
+
+    reads = []
+    monkeypatch.setattr(validate_question_set, 'read_item_score',
+                        lambda path: reads.append(path) or read_item_score(path))
+
+    assert validate_question_set.get_question_score(quiz_dir, item.name, scores) == 7
+    assert reads == []
+
+    item.write_text(item.read_text(encoding='utf-8') + '\n', encoding='utf-8')
+    assert validate_question_set.get_question_score(quiz_dir, item.name, scores) == _full_parse_score(item)
+    assert validate_question_set.get_question_score(quiz_dir, item.name, None) == _full_parse_score(item)
+    assert len(reads) == 2
+    assert validate_question_set.get_question_score(quiz_dir, 'missing-item.xml', scores) == 1
+
+
+@pytest.mark.unit
+def test_same_size_edit_is_noticed(quiz_dir):
+    """Editing a score without changing the file size invalidates the entry."""
+    scores = load_score_table(quiz_dir)
+    item = next(path for path in sorted(quiz_dir.glob('*-item.xml'))
+                if 'mappedValue="1"' in path.read_text(encoding='utf-8'))
+    assert scores[item.name]['mtime_ns'] == item.stat().st_mtime_ns
+
+    stat = item.stat()
+    item.write_text(item.read_text(encoding='utf-8').replace('mappedValue="1"', 'mappedValue="2"', 1),
+                    encoding='utf-8')
+    os.utime(item, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert item.stat().st_size == scores[item.name]['bytes']
+    assert validate_question_set.get_question_score(quiz_dir, item.name, scores) == 2
+
+
+@pytest.mark.integration
+def test_table_is_used_after_step_scripts(tmp_path, monkeypatch):
+    """Step 5 rewrites the items and re-stamps the table step 4 wrote."""
+    fixtures = PROJECT_ROOT / 'tests' / 'fixtures' / 'v65'
+    parts = [(fixtures / name).read_text(encoding='utf-8').strip()
+             for name in ('multiple_choice_single.md', 'true_false.md', 'text_entry.md', 'essay.md')]
+    bank_file = tmp_path / 'bank.md'
+    bank_file.write_text('\n\n'.join(parts) + '\n', encoding='utf-8')
+    completed = subprocess.run(
+        [sys.executable, 'scripts/run_all.py', str(bank_file),
+         '--output-dir', str(tmp_path / 'out'), '--language', 'sv'],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, QTI_PARSE_CACHE=str(tmp_path / 'parse_cache'))
+    )
+    assert completed.returncode == 0, completed.stderr
+
+    quiz_dir = tmp_path / 'out' / 'bank'
+    scores = load_score_table(quiz_dir)
+    items = sorted(quiz_dir.glob('*-item.xml'))
+    assert items and len(items) == len(scores)
+
+    reads = []
+    monkeypatch.setattr(validate_question_set, 'read_item_score',
+                        lambda path: reads.append(path) or read_item_score(path))
+    for item in items:
+        assert validate_question_set.get_question_score(quiz_dir, item.name, scores) == scores[item.name]['score']
+    assert reads == []
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Tests for the stage timing spans (src/spans.py).
+"""
+
+import pytest
+
+from src.spans import current_span, record, span
+
+
+@pytest.mark.unit
+def test_nested_spans_build_a_tree():
+    """Spans opened inside a span become its children, in start order."""
+    with span('export', file='bank.md') as root:
+        with span('parse') as parse:
+            parse.set(questions=3)
+        with span('zip'):
+            record('manifest', 1.25, bytes=100)
+        assert current_span() is root
+
+    assert current_span() is None
+    assert [child.name for child in root.children] == ['parse', 'zip']
+    assert root.find('parse').data == {'questions': 3}
+    assert root.find('manifest').to_dict() == {
+        'name': 'manifest', 'duration_ms': 1.2, 'data': {'bytes': 100}
+    }
+    assert root.duration_ms >= root.find('parse').duration_ms
+
+
+@pytest.mark.unit
+def test_failing_span_records_error():
+    """An exception is re-raised and the span gets the exception class name."""
+    with span('export') as root:
+        with pytest.raises(ValueError):
+            with span('parse'):
+                raise ValueError('bad input')
+
+    assert root.find('parse').data == {'error': 'ValueError'}
+
+
+@pytest.mark.unit
+def test_record_without_open_span_is_ignored():
+    assert record('xml.essay', 5.0, questions=1) is None
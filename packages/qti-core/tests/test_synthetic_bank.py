@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for the benchmark bank generator (benchmarks/synthetic_bank.py) and a
+smoke run of benchmarks/run_benchmarks.py on a tiny bank.
+"""
+
+from collections import Counter
+
+import pytest
+
+from benchmarks.run_benchmarks import STAGES, bench_size
+from benchmarks.synthetic_bank import TYPE_TEMPLATES, generate_bank
+from src.parser import MarkdownQuizParser
+
+# Validator checks keys the v6.5 parser does not produce for these types
+KNOWN_INVALID_TYPES = {'match', 'graphicgapmatch_v2'}
+
+
+@pytest.mark.unit
+def test_bank_covers_every_type_and_parses():
+    """Every item type is generated, with unique identifiers, and validates."""
+    bank = generate_bank(2 * len(TYPE_TEMPLATES), image_ratio=0.5, feedback_ratio=0.5)
+    result = MarkdownQuizParser(bank.markdown).parse_and_validate()
+
+    assert Counter(q['question_type'] for q in result.questions) == Counter(bank.types)
+    assert set(bank.types) == set(TYPE_TEMPLATES)
+    assert len({q['identifier'] for q in result.questions}) == bank.question_count
+    invalid = {block.question['question_type'] for block in result.blocks if block.errors}
+    assert invalid <= KNOWN_INVALID_TYPES
+
+
+@pytest.mark.unit
+def test_bank_options_are_deterministic():
+    """Same arguments give the same bank; error_ratio adds fixable errors."""
+    assert generate_bank(30, seed=1).markdown == generate_bank(30, seed=1).markdown
+    assert '^points:' not in generate_bank(30).markdown
+    assert generate_bank(30, error_ratio=1.0).markdown.count('^points:') == 30
+
+
+@pytest.mark.integration
+def test_benchmark_runs_every_stage(tmp_path, monkeypatch):
+    """A tiny benchmark run times every stage."""
+    monkeypatch.setenv('QTI_PARSE_CACHE', 'off')
+    timings = bench_size(len(TYPE_TEMPLATES), list(STAGES), 1, tmp_path,
+                         image_ratio=0.5, feedback_ratio=1.0, error_ratio=0.5)
+
+    assert set(timings) == set(STAGES)
+    assert (tmp_path / 'out_18' / 'bank.zip').exists()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Tests for src/generator/template_cache.py and XMLGenerator template loading.
+"""
+
+import pytest
+
+from src.generator import XMLGenerator
+from src.generator.template_cache import CompiledTemplate
+
+
+def _sequential(source, replacements):
+    for placeholder, value in replacements.items():
+        source = source.replace(placeholder, value)
+    return source
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('source, replacements', [
+    ('<a id="{{ID}}">{{TEXT}}</a>{{ID}}', {'{{ID}}': 'Q1', '{{TEXT}}': 'x < y'}),
+    ('{{A}}{{B}}', {'{{A}}': 'uses {{B}}', '{{B}}': 'b'}),
+    ('{{A}}{{B}}', {'{{B}}': 'b', '{{A}}': 'uses {{B}}'}),
+    ('{{A}}{B}}', {'{{A}}': 'x{', '{{B}}': 'b'}),
+    ('{{{A}}}', {'{{A}}': 'x', '{{x}}': 'y'}),
+    ('{{UNUSED}} {{A}}', {'{{A}}': r'\frac{a}{b}'}),
+])
+def test_render_matches_sequential_replace(source, replacements):
+    """render() gives the same result as the ordered str.replace loop."""
+    assert CompiledTemplate(source).render(replacements) == _sequential(source, replacements)
+
+
+@pytest.mark.unit
+def test_templates_are_read_once(monkeypatch):
+    """Generating questions does not re-read template files."""
+    generator = XMLGenerator()
+    assert generator.preload_templates() == len(list(generator.templates_dir.glob('*.xml')))
+
+    def fail(*args, **kwargs):
+        raise AssertionError('template read from disk')
+
+    monkeypatch.setattr('builtins.open', fail)
+    xml = generator.generate_question({
+        'question_type': 'essay',
+        'identifier': 'ESSAY_1',
+        'title': 'Essay',
+        'points': 2,
+        'question_text': 'Explain.',
+    })
+    assert 'ESSAY_1' in xml
+    assert '{{IDENTIFIER}}' not in xml
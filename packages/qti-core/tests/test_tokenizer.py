@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for src/parser/tokenizer.py and the token-based MarkdownQuizParser.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.parser.markdown_parser import MarkdownQuizParser
+from src.parser.tokenizer import (
+    CONTENT, FIELD_CLOSE, FIELD_OPEN, HEADER, HEADING, META,
+    SUBFIELD_CLOSE, SUBFIELD_OPEN, header_tokens, split_question_blocks, tokenize,
+)
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'v65'
+
+
+@pytest.mark.unit
+def test_tokenize_line_kinds():
+    """Each QFMD line type gets its own token kind."""
+    text = '\n'.join([
+        '# Q001 Title',
+        '^type multiple_choice_single',
+        '@field: feedback',
+        '@@field: correct_feedback',
+        'Well done',
+        '  @@end_field',
+        '### Heading',
+        '@end_field',
+    ])
+    tokens = list(tokenize(text))
+
+    assert [t.kind for t in tokens] == [
+        HEADER, META, FIELD_OPEN, SUBFIELD_OPEN, CONTENT, SUBFIELD_CLOSE, HEADING, FIELD_CLOSE
+    ]
+    assert (tokens[0].name, tokens[0].value) == ('Q001', ' Title')
+    assert (tokens[1].name, tokens[1].value) == ('type', ' multiple_choice_single')
+    assert tokens[2].name == 'feedback'
+    assert tokens[3].name == 'correct_feedback'
+
+
+@pytest.mark.unit
+def test_tokenize_non_markers_are_content():
+    """Lines that only look like markers are content."""
+    for line in ['#Q001 x', '# Q001AB x', '#####  deep', '^ space', '@field:', 'mail@end_field']:
+        assert next(tokenize(line)).kind == CONTENT, line
+
+
+@pytest.mark.unit
+def test_split_question_blocks():
+    """Blocks start at each header; preamble and empty headers are skipped."""
+    text = 'Intro text\n\n# Q001 First\n^type essay\n\n# Q002\n\n# Q003 Third\nBody\n\n'
+    blocks = split_question_blocks(text)
+
+    assert [b.question_id for b in blocks] == ['Q001', 'Q003']
+    assert blocks[0].text == '# Q001 First\n^type essay'
+    assert blocks[1].text == '# Q003 Third\nBody'
+    assert blocks[1].start_line == 7
+
+
+@pytest.mark.unit
+def test_first_header_may_be_indented():
+    """Only whitespace before the first header: it still starts a question."""
+    blocks = split_question_blocks('\n  \t# Q001 First\n^type essay\n  # Q002 Not a header\n')
+
+    assert [b.question_id for b in blocks] == ['Q001']
+    assert blocks[0].text == '# Q001 First\n^type essay\n  # Q002 Not a header'
+    assert blocks[0].start_offset == 4
+    assert split_question_blocks('Intro\n  # Q001 First\n') == []
+
+    content = '# Quiz\n===QUESTIONS===\n   # Q001 Capital\n^type essay\n^identifier Q1\n^points 1\n'
+    assert [q['identifier'] for q in MarkdownQuizParser(content).parse()['questions']] == ['Q1']
+
+
+@pytest.mark.unit
+def test_header_tokens_stop_at_first_field():
+    """^metadata after the first @field: is not part of the header."""
+    tokens = list(tokenize('# Q001 T\n^type essay\n@field: question_text\n^points 3\n@end_field'))
+    assert [t.text for t in header_tokens(tokens)] == ['# Q001 T', '^type essay']
+
+
+@pytest.mark.unit
+def test_validate_reports_colon_metadata():
+    """'^type: value' gets the colon-specific error."""
+    content = '# Q001 T\n^type: essay\n^identifier Q1\n^points 1\n'
+    result = MarkdownQuizParser(content).validate()
+
+    assert not result['valid']
+    assert result['errors'][0]['field'] == 'type'
+    assert 'colon' in result['errors'][0]['message']
+    assert result['errors'][0]['question_id'] == 'Q1'
+
+
+@pytest.mark.unit
+def test_parse_and_validate_agree_on_fixtures():
+    """validate() and parse() build the same questions from the token stream."""
+    content = '\n\n'.join(
+        (FIXTURES / name).read_text(encoding='utf-8')
+        for name in ['multiple_choice_single.md', 'multiple_response.md', 'text_entry.md', 'essay.md']
+    )
+    parsed = MarkdownQuizParser(content).parse()
+    validated = MarkdownQuizParser(content).validate()
+
+    assert validated['valid']
+    assert [q['identifier'] for q in parsed['questions']] == \
+        [q['identifier'] for q in validated['questions']]
+    assert parsed['questions'][0]['feedback']['correct'] == 'Correct! Paris is the capital of France.'
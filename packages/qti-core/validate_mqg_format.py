@@ -20,11 +20,12 @@ Exit codes:
 
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from dataclasses import dataclass, field
 
 # Import the parser - single source of truth
 from src.parser.markdown_parser import MarkdownQuizParser
+from src.parser.bank_cache import load_parse_result
 
 
 @dataclass
@@ -57,47 +58,47 @@ class ValidationReport:
         """Add a warning to the report"""
         self.warnings.append(ValidationIssue('WARNING', q_num, q_id, message, suggestion))
 
-    def print_report(self):
-        """Print formatted validation report"""
-        print("=" * 80)
-        print("MQG FORMAT VALIDATION REPORT (v6.5)")
-        print("=" * 80)
-        print()
+    def print_report(self, file=None):
+        """Print formatted validation report (to file, default sys.stdout)"""
+        print("=" * 80, file=file)
+        print("MQG FORMAT VALIDATION REPORT (v6.5)", file=file)
+        print("=" * 80, file=file)
+        print(file=file)
 
         if self.errors:
-            print("❌ ERRORS FOUND:\n")
+            print("❌ ERRORS FOUND:\n", file=file)
             for issue in self.errors:
-                print(f"Question {issue.question_num} ({issue.question_id}):")
-                print(f"  {issue.message}")
+                print(f"Question {issue.question_num} ({issue.question_id}):", file=file)
+                print(f"  {issue.message}", file=file)
                 if issue.suggestion:
-                    print(f"  → Suggestion: {issue.suggestion}")
-                print()
+                    print(f"  → Suggestion: {issue.suggestion}", file=file)
+                print(file=file)
 
         if self.warnings:
-            print("⚠️  WARNINGS:\n")
+            print("⚠️  WARNINGS:\n", file=file)
             for issue in self.warnings:
-                print(f"Question {issue.question_num} ({issue.question_id}):")
-                print(f"  {issue.message}")
-                print()
-
-        print("=" * 80)
-        print("SUMMARY")
-        print("=" * 80)
-        print(f"Total Questions: {self.total_questions}")
-        print(f"✅ Valid: {self.valid_questions}")
-        print(f"❌ Errors: {len(self.errors)}")
-        print(f"⚠️  Warnings: {len(self.warnings)}")
-        print()
+                print(f"Question {issue.question_num} ({issue.question_id}):", file=file)
+                print(f"  {issue.message}", file=file)
+                print(file=file)
+
+        print("=" * 80, file=file)
+        print("SUMMARY", file=file)
+        print("=" * 80, file=file)
+        print(f"Total Questions: {self.total_questions}", file=file)
+        print(f"✅ Valid: {self.valid_questions}", file=file)
+        print(f"❌ Errors: {len(self.errors)}", file=file)
+        print(f"⚠️  Warnings: {len(self.warnings)}", file=file)
+        print(file=file)
 
         if self.is_valid():
-            print("STATUS: ✅ READY FOR QTI GENERATION")
-            print()
-            print("NEXT STEP: Run step 2 to create output folder:")
-            print(f"  python scripts/step2_create_folder.py <your_file.md>")
+            print("STATUS: ✅ READY FOR QTI GENERATION", file=file)
+            print(file=file)
+            print("NEXT STEP: Run step 2 to create output folder:", file=file)
+            print(f"  python scripts/step2_create_folder.py <your_file.md>", file=file)
         else:
-            print(f"STATUS: ❌ NOT READY - Fix {len(self.errors)} error(s) before QTI generation")
-            print()
-            print("→ Go back to Claude Desktop and fix the errors listed above")
+            print(f"STATUS: ❌ NOT READY - Fix {len(self.errors)} error(s) before QTI generation", file=file)
+            print(file=file)
+            print("→ Go back to Claude Desktop and fix the errors listed above", file=file)
 
     def save_report(self, output_path: Path, source_file: Path):
         """
@@ -250,8 +251,8 @@ def validate_markdown_file(file_path: Path, verbose: bool = False, save_report:
         sys.exit(2)
 
     # Use parser.validate() - single source of truth!
-    parser = MarkdownQuizParser(content)
-    result = parser.validate()
+    # (cached on disk so later steps can load the parsed bank)
+    result = load_parse_result(content).to_validate_dict()
 
     # Convert parser result to ValidationReport
     report.total_questions = result['total_questions']
@@ -274,13 +275,17 @@ def validate_markdown_file(file_path: Path, verbose: bool = False, save_report:
     return report
 
 
-def validate_content(content: str, verbose: bool = False):
+def validate_content(content: str, verbose: bool = False, parser: Optional[MarkdownQuizParser] = None):
     """
     Validate markdown content string.
 
+    Pass the parser that will later parse() the same content to reuse its
+    single parse (parse() and validate() share one parse_and_validate()).
+
     Returns: (is_valid, issues_list)
     """
-    parser = MarkdownQuizParser(content)
+    if parser is None:
+        parser = MarkdownQuizParser(content)
     result = parser.validate()
 
     issues = []